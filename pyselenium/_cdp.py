@@ -0,0 +1,232 @@
+import base64
+import hashlib
+import json
+import os
+import socket
+import struct
+import time
+from urllib.parse import urlsplit
+
+# Defined by RFC 6455 to compute the Sec-WebSocket-Accept header of the handshake
+_WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+_CONTINUATION_OPCODE = 0x0
+_TEXT_OPCODE = 0x1
+_CLOSE_OPCODE = 0x8
+_PING_OPCODE = 0x9
+_PONG_OPCODE = 0xA
+
+
+class CdpError(Exception):
+    """Exception raised when the browser responds to a DevTools command with an error, or when a script run by a
+    command throws.
+
+    Attributes:
+        method -- The DevTools method of the command
+        message -- The error message
+    """
+
+    def __init__(self, method, message):
+        super().__init__('%s: %s' % (method, message))
+
+        self.method = method
+        self.message = message
+
+
+class WebSocket:
+    """A minimal blocking RFC 6455 websocket client, which sends and receives text messages"""
+
+    def __init__(self, url, timeout=30):
+        parsed_url = urlsplit(url)
+        path = parsed_url.path + ('?' + parsed_url.query if parsed_url.query else '')
+
+        self._socket = socket.create_connection((parsed_url.hostname, parsed_url.port or 80), timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buffer = b''
+
+        self._handshake(parsed_url.netloc, path or '/')
+
+    def send(self, text):
+        """Sends a text message"""
+
+        self._send_frame(_TEXT_OPCODE, text.encode('utf-8'))
+
+    def receive(self, timeout=None):
+        """Waits for the next text message and returns it. Raises socket.timeout if the timeout expires first."""
+
+        self._socket.settimeout(timeout)
+
+        fragments = []
+
+        while True:
+            final, opcode, payload = self._receive_frame()
+
+            if opcode == _PING_OPCODE:
+                self._send_frame(_PONG_OPCODE, payload)
+            elif opcode == _CLOSE_OPCODE:
+                raise ConnectionError('The websocket was closed by the server')
+            elif opcode in (_TEXT_OPCODE, _CONTINUATION_OPCODE):
+                fragments.append(payload)
+
+                if final:
+                    return b''.join(fragments).decode('utf-8')
+
+    def close(self):
+        """Closes the connection, telling the server first"""
+
+        try:
+            self._send_frame(_CLOSE_OPCODE, struct.pack('!H', 1000))
+        except OSError:
+            pass
+        finally:
+            self._socket.close()
+
+    def _handshake(self, host, path):
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+
+        request = ['GET %s HTTP/1.1' % path,
+                   'Host: %s' % host,
+                   'Upgrade: websocket',
+                   'Connection: Upgrade',
+                   'Sec-WebSocket-Key: %s' % key,
+                   'Sec-WebSocket-Version: 13']
+
+        self._socket.sendall(('\r\n'.join(request) + '\r\n\r\n').encode('latin-1'))
+
+        response = self._read_until(b'\r\n\r\n').decode('latin-1').split('\r\n')
+        expected_accept = base64.b64encode(hashlib.sha1((key + _WEBSOCKET_GUID).encode('ascii')).digest())
+
+        if ' 101 ' not in response[0] + ' ':
+            raise ConnectionError('The websocket handshake failed: %s' % response[0])
+
+        headers = dict(line.lower().split(': ', 1) for line in response[1:] if ': ' in line)
+
+        if headers.get('sec-websocket-accept') != expected_accept.decode('ascii').lower():
+            raise ConnectionError('The websocket handshake failed: unexpected Sec-WebSocket-Accept')
+
+    def _send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+
+        # Frames sent by clients are always masked
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 1 << 16:
+            header += bytes([0x80 | 126]) + struct.pack('!H', length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack('!Q', length)
+
+        mask = os.urandom(4)
+
+        self._socket.sendall(header + mask + _apply_mask(payload, mask))
+
+    def _receive_frame(self):
+        first_byte, second_byte = self._read_exactly(2)
+        length = second_byte & 0x7F
+
+        if length == 126:
+            length = struct.unpack('!H', self._read_exactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self._read_exactly(8))[0]
+
+        mask = self._read_exactly(4) if second_byte & 0x80 else None
+        payload = self._read_exactly(length)
+
+        if mask is not None:
+            payload = _apply_mask(payload, mask)
+
+        return bool(first_byte & 0x80), first_byte & 0x0F, payload
+
+    def _read_exactly(self, size):
+        while len(self._buffer) < size:
+            self._receive_data()
+
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+
+        return data
+
+    def _read_until(self, separator):
+        while separator not in self._buffer:
+            self._receive_data()
+
+        data, _, self._buffer = self._buffer.partition(separator)
+
+        return data
+
+    def _receive_data(self):
+        data = self._socket.recv(65536)
+
+        if not data:
+            raise ConnectionError('The websocket was closed by the server')
+
+        self._buffer += data
+
+
+class CdpConnection:
+    """A connection to a DevTools target, such as a page, that sends commands and keeps the events that the browser
+    sends in between until they are waited for"""
+
+    def __init__(self, websocket):
+        self._websocket = websocket
+        self._next_id = 1
+        self._events = []
+
+    def send(self, method, params=None, timeout=None):
+        """Sends a command and waits for its result. Raises CdpError if the browser responds with an error."""
+
+        message_id = self._next_id
+        self._next_id += 1
+
+        self._websocket.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+
+        while True:
+            message = self._receive(timeout)
+
+            if message.get('id') == message_id:
+                if 'error' in message:
+                    raise CdpError(method, message['error'].get('message'))
+
+                return message.get('result', {})
+
+    def wait_for_event(self, method, timeout):
+        """Waits for the browser to send an event and returns its parameters. Events that were sent since the last
+        wait are returned at once. Raises socket.timeout if the timeout expires first."""
+
+        end_time = time.monotonic() + timeout
+
+        while True:
+            for index, event in enumerate(self._events):
+                if event['method'] == method:
+                    del self._events[:index + 1]
+
+                    return event.get('params', {})
+
+            del self._events[:]
+
+            self._receive(max(0.001, end_time - time.monotonic()))
+
+    def clear_events(self):
+        """Forgets the events received so far"""
+
+        del self._events[:]
+
+    def close(self):
+        """Closes the connection"""
+
+        self._websocket.close()
+
+    def _receive(self, timeout):
+        message = json.loads(self._websocket.receive(timeout))
+
+        if 'method' in message and 'id' not in message:
+            self._events.append(message)
+
+        return message
+
+
+def _apply_mask(payload, mask):
+    # XORed as a single integer, since a byte at a time takes milliseconds on the scripts that embed Selenium's atoms
+    length = len(payload)
+    repeated_mask = (mask * (length // 4 + 1))[:length]
+
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated_mask, 'big')).to_bytes(length, 'big')
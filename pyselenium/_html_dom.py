@@ -0,0 +1,656 @@
+import re
+from html.parser import HTMLParser
+
+from selenium.common.exceptions import InvalidSelectorException
+
+# Elements that never have children, and so no end tag
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track',
+             'wbr'}
+
+# Elements whose text is on lines of its own
+BLOCK_TAGS = {'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure',
+              'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'option',
+              'p', 'pre', 'section', 'table', 'tr', 'ul'}
+
+# Elements whose text is set apart from the text around it by a space, as the cells of a row
+CELL_TAGS = {'td', 'th'}
+
+# Elements that are never displayed, along with everything in them
+HIDDEN_TAGS = {'head', 'noscript', 'script', 'style', 'template', 'title'}
+
+# The open elements that the start of another element closes, as in <li>one<li>two
+_IMPLICITLY_CLOSED_TAGS = {
+    'li': {'li'},
+    'option': {'option'},
+    'optgroup': {'option', 'optgroup'},
+    'thead': {'thead', 'tbody', 'tfoot', 'tr', 'td', 'th'},
+    'tbody': {'thead', 'tbody', 'tfoot', 'tr', 'td', 'th'},
+    'tfoot': {'thead', 'tbody', 'tfoot', 'tr', 'td', 'th'},
+    'tr': {'tr', 'td', 'th'},
+    'td': {'td', 'th'},
+    'th': {'td', 'th'},
+    'dt': {'dt', 'dd'},
+    'dd': {'dt', 'dd'},
+}
+
+# Attributes that are read as 'true' when present and as null when not, as WebElement.get_attribute does
+BOOLEAN_ATTRIBUTES = {'async', 'autofocus', 'autoplay', 'checked', 'compact', 'complete', 'controls', 'declare',
+                      'defaultchecked', 'defaultselected', 'defer', 'disabled', 'draggable', 'ended', 'formnovalidate',
+                      'hidden', 'indeterminate', 'iscontenteditable', 'ismap', 'itemscope', 'loop', 'multiple',
+                      'muted', 'nohref', 'noresize', 'noshade', 'novalidate', 'nowrap', 'open', 'paused', 'pubdate',
+                      'readonly', 'required', 'reversed', 'scoped', 'seamless', 'seeking', 'selected', 'spellcheck',
+                      'truespeed', 'willvalidate'}
+
+_HIDDEN_STYLE_PATTERN = re.compile(r'(^|;)\s*(display\s*:\s*none|visibility\s*:\s*hidden)\s*(;|$)', re.IGNORECASE)
+
+
+class Element:
+    """An element of a parsed page, which holds the state a browser would change on the element, such as the value of
+    an input or whether a checkbox is checked.
+
+    Attributes:
+        tag -- The tag name of the element, in lower case. '#document' for the root of a page
+        attributes -- The attributes of the element, by name in lower case
+        parent -- The element the element is in. None for the root of a page
+        children -- The elements and the text, as strings, in the element
+        value -- The value typed in an input or a textarea. None while it is the one of the markup
+        checked -- Whether a checkbox or a radio button is checked
+        selected -- Whether an option is selected
+        content_document -- The Document loaded in an iframe. None until the frame is switched to
+    """
+
+    def __init__(self, tag, attributes=None, parent=None):
+        self.tag = tag
+        self.attributes = attributes or {}
+        self.parent = parent
+        self.children = []
+        self.value = None
+        self.checked = 'checked' in self.attributes
+        self.selected = 'selected' in self.attributes
+        self.content_document = None
+
+    @property
+    def elements(self):
+        """Gets the child elements, leaving out the text"""
+
+        return [child for child in self.children if isinstance(child, Element)]
+
+    @property
+    def is_displayed(self):
+        """Gets whether the element would be visible, as far as the markup tells: it is not hidden by its tag, by the
+        hidden attribute nor by an inline style, and neither are the elements it is in"""
+
+        element = self
+
+        while element is not None and element.tag != '#document':
+            if element.tag in HIDDEN_TAGS or 'hidden' in element.attributes or \
+                    _HIDDEN_STYLE_PATTERN.search(element.attributes.get('style', '')) is not None or \
+                    (element.tag == 'input' and element.attributes.get('type', '').lower() == 'hidden'):
+                return False
+
+            element = element.parent
+
+        return True
+
+    @property
+    def is_enabled(self):
+        """Gets whether the element is not disabled, neither by itself nor by a disabled fieldset it is in"""
+
+        element = self
+
+        while element is not None:
+            if 'disabled' in element.attributes and element.tag in ('button', 'fieldset', 'input', 'optgroup',
+                                                                    'option', 'select', 'textarea'):
+                return False
+
+            element = element.parent
+
+        return True
+
+    @property
+    def input_type(self):
+        """Gets the type of an input element, in lower case"""
+
+        return self.attributes.get('type', 'text').lower()
+
+    def iter(self):
+        """Yields the elements in the element, in document order, leaving out the element itself"""
+
+        for child in self.elements:
+            yield child
+            yield from child.iter()
+
+    def find_ancestor(self, tag):
+        """Returns the closest element the element is in with the given tag. None if there is none."""
+
+        element = self.parent
+
+        while element is not None and element.tag != tag:
+            element = element.parent
+
+        return element
+
+    def get_attribute(self, name):
+        """Reads an attribute as WebElement.get_attribute does: the current value of inputs, 'true' or None for boolean
+        attributes, and the attribute itself, or None, for the others"""
+
+        name = name.lower()
+
+        if name == 'value' and self.tag in ('input', 'textarea', 'select'):
+            return self.get_value()
+
+        if name in ('checked', 'selected'):
+            return 'true' if getattr(self, name) else None
+
+        if name in BOOLEAN_ATTRIBUTES:
+            return 'true' if name in self.attributes else None
+
+        if name == 'classname':
+            name = 'class'
+
+        return self.attributes.get(name)
+
+    def get_value(self):
+        """Gets the current value of an input, a textarea, an option or a select, which is the one of its selected
+        option"""
+
+        if self.tag == 'select':
+            options = self.get_options()
+            # Browsers select the first option of a drop down when the markup selects none
+            selected_options = [option for option in options if option.selected] or options[:1]
+
+            return selected_options[0].get_value() if len(selected_options) > 0 else ''
+
+        if self.tag == 'option':
+            return self.attributes['value'] if 'value' in self.attributes else ' '.join(self.get_text().split())
+
+        if self.value is not None:
+            return self.value
+
+        if self.tag == 'textarea':
+            return ''.join(child for child in self.children if not isinstance(child, Element))
+
+        if self.tag == 'input' and self.input_type in ('checkbox', 'radio'):
+            return self.attributes.get('value', 'on')
+
+        return self.attributes.get('value', '')
+
+    def get_options(self):
+        """Gets the options of a select element"""
+
+        return [element for element in self.iter() if element.tag == 'option']
+
+    def get_text(self):
+        """Gets the text of the element as the user sees it, as WebElement.text does: text that is not displayed is
+        left out, white space is collapsed and the text of block elements is put on lines of its own"""
+
+        if not self.is_displayed:
+            return ''
+
+        pieces = []
+        self._collect_text(pieces)
+
+        lines = [' '.join(line.split()) for line in ''.join(pieces).split('\n')]
+
+        return '\n'.join(line for line in lines if line != '')
+
+    def _collect_text(self, pieces):
+        for child in self.children:
+            if not isinstance(child, Element):
+                pieces.append(child)
+            elif child.tag == 'br':
+                pieces.append('\n')
+            elif child.is_displayed:
+                separator = '\n' if child.tag in BLOCK_TAGS else ' ' if child.tag in CELL_TAGS else ''
+
+                pieces.append(separator)
+                child._collect_text(pieces)
+                pieces.append(separator)
+
+
+class Document(Element):
+    """The root of a parsed page
+
+    Attributes:
+        url -- The URL the page was loaded from
+    """
+
+    def __init__(self, url):
+        super().__init__('#document')
+
+        self.url = url
+
+
+class _DocumentParser(HTMLParser):
+    def __init__(self, document):
+        super().__init__(convert_charrefs=True)
+
+        self._open_elements = [document]
+
+    def handle_starttag(self, tag, attrs):
+        self._close_implicitly(tag)
+
+        if tag == 'tr' and self._open_elements[-1].tag == 'table':
+            # Rows are always in a section of the table, so browsers put the rows written right in it in a tbody
+            tbody = Element('tbody', parent=self._open_elements[-1])
+            self._open_elements[-1].children.append(tbody)
+            self._open_elements.append(tbody)
+
+        element = Element(tag, {name: '' if value is None else value for name, value in attrs}, self._open_elements[-1])
+        self._open_elements[-1].children.append(element)
+
+        if tag not in VOID_TAGS:
+            self._open_elements.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        # Browsers ignore the slash of self-closing tags, such as <div/>, which still have to be closed
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        # End tags without a matching open element are ignored, as browsers do
+        for index in range(len(self._open_elements) - 1, 0, -1):
+            if self._open_elements[index].tag == tag:
+                del self._open_elements[index:]
+                return
+
+    def handle_data(self, data):
+        self._open_elements[-1].children.append(data)
+
+    def _close_implicitly(self, tag):
+        closed_tags = _IMPLICITLY_CLOSED_TAGS.get(tag, set())
+
+        if tag in BLOCK_TAGS or tag in ('table', 'ul', 'ol'):
+            closed_tags = closed_tags | {'p'}
+
+        while len(self._open_elements) > 1 and self._open_elements[-1].tag in closed_tags:
+            self._open_elements.pop()
+
+
+def parse_document(html, url):
+    """Parses the HTML of a page into a Document"""
+
+    document = Document(url)
+
+    parser = _DocumentParser(document)
+    parser.feed(html)
+    parser.close()
+
+    return document
+
+
+def select_first(root, css_path):
+    """Returns the first element in the root, in document order, that matches the CSS selector. None if there is none.
+    Raises InvalidSelectorException if the selector is not valid or uses a feature that is not supported."""
+
+    selectors = _SelectorParser(css_path).parse()
+
+    for element in root.iter():
+        if any(_matches(element, selector) for selector in selectors):
+            return element
+
+    return None
+
+
+def select_all(root, css_path):
+    """Returns every element in the root that matches the CSS selector, in document order"""
+
+    selectors = _SelectorParser(css_path).parse()
+
+    return [element for element in root.iter() if any(_matches(element, selector) for selector in selectors)]
+
+
+def _matches(element, selector):
+    """Tells whether the element matches a complex selector, given as a list of (combinator, conditions) compounds
+    where the combinator joins the compound to the previous one. Matched from right to left."""
+
+    return _matches_from(element, selector, len(selector) - 1)
+
+
+def _matches_from(element, selector, index):
+    combinator, conditions = selector[index]
+
+    if not all(condition(element) for condition in conditions):
+        return False
+
+    if index == 0:
+        return True
+
+    if combinator == '>':
+        return _is_element(element.parent) and _matches_from(element.parent, selector, index - 1)
+
+    if combinator == '+':
+        previous_sibling = _get_previous_sibling(element)
+
+        return previous_sibling is not None and _matches_from(previous_sibling, selector, index - 1)
+
+    if combinator == '~':
+        sibling = _get_previous_sibling(element)
+
+        while sibling is not None:
+            if _matches_from(sibling, selector, index - 1):
+                return True
+
+            sibling = _get_previous_sibling(sibling)
+
+        return False
+
+    ancestor = element.parent
+
+    while _is_element(ancestor):
+        if _matches_from(ancestor, selector, index - 1):
+            return True
+
+        ancestor = ancestor.parent
+
+    return False
+
+
+def _is_element(node):
+    return node is not None and node.tag != '#document'
+
+
+def _get_siblings(element):
+    return [element] if element.parent is None else element.parent.elements
+
+
+def _get_previous_sibling(element):
+    siblings = _get_siblings(element)
+    index = siblings.index(element)
+
+    return siblings[index - 1] if index > 0 else None
+
+
+class _SelectorParser:
+    """Parses a CSS selector list into lists of (combinator, conditions) compounds, the conditions being functions
+    that take an element. Supports the selectors that Chrome's "Copy selector" writes and most of the others: type,
+    universal, id, class and attribute selectors, the four combinators and the structural, :not, :checked, :disabled
+    and :enabled pseudo-classes."""
+
+    _IDENTIFIER_PATTERN = re.compile(r'-?(?:[_a-zA-Z]|[^\x00-\x7f]|\\[0-9a-fA-F]{1,6}\s?|\\[^\n0-9a-fA-F])'
+                                     r'(?:[_a-zA-Z0-9-]|[^\x00-\x7f]|\\[0-9a-fA-F]{1,6}\s?|\\[^\n0-9a-fA-F])*')
+    _ESCAPE_PATTERN = re.compile(r'\\([0-9a-fA-F]{1,6})\s?|\\(.)')
+    _NTH_PATTERN = re.compile(r'^([+-]?\d*)n\s*(?:([+-])\s*(\d+))?$')
+
+    def __init__(self, text):
+        self._text = text
+        self._position = 0
+
+    def parse(self):
+        selectors = self._parse_selector_list()
+
+        if self._position < len(self._text):
+            self._fail()
+
+        return selectors
+
+    def _parse_selector_list(self):
+        selectors = [self._parse_complex_selector()]
+
+        while self._consume(','):
+            selectors.append(self._parse_complex_selector())
+
+        return selectors
+
+    def _parse_complex_selector(self):
+        self._skip_white_space()
+
+        selector = [(None, self._parse_compound_selector())]
+
+        while True:
+            skipped_white_space = self._skip_white_space()
+
+            if self._position >= len(self._text) or self._peek() in ',)':
+                return selector
+
+            if self._peek() in '>+~':
+                combinator = self._text[self._position]
+                self._position += 1
+                self._skip_white_space()
+            elif skipped_white_space:
+                combinator = ' '
+            else:
+                self._fail()
+
+            selector.append((combinator, self._parse_compound_selector()))
+
+    def _parse_compound_selector(self):
+        conditions = []
+
+        if self._consume('*'):
+            conditions.append(lambda element: True)
+        elif self._peek_identifier():
+            tag = self._parse_identifier().lower()
+            conditions.append(lambda element: element.tag == tag)
+
+        while self._position < len(self._text):
+            character = self._peek()
+
+            if character == '#':
+                self._position += 1
+                element_id = self._parse_identifier()
+                conditions.append(lambda element: element.attributes.get('id') == element_id)
+            elif character == '.':
+                self._position += 1
+                class_name = self._parse_identifier()
+                conditions.append(lambda element: class_name in element.attributes.get('class', '').split())
+            elif character == '[':
+                conditions.append(self._parse_attribute_selector())
+            elif character == ':':
+                conditions.append(self._parse_pseudo_class())
+            else:
+                break
+
+        if len(conditions) == 0:
+            self._fail()
+
+        return conditions
+
+    def _parse_attribute_selector(self):
+        self._position += 1
+        self._skip_white_space()
+
+        name = self._parse_identifier().lower()
+
+        self._skip_white_space()
+
+        if self._consume(']'):
+            return lambda element: name in element.attributes
+
+        match = re.compile(r'([~|^$*]?=)\s*').match(self._text, self._position)
+
+        if match is None:
+            self._fail()
+
+        operator = match.group(1)
+        self._position = match.end()
+
+        if self._peek() in '"\'':
+            value = self._parse_string()
+        else:
+            value = self._parse_identifier()
+
+        self._skip_white_space()
+        ignore_case = self._consume('i') or self._consume('I')
+        self._skip_white_space()
+
+        if not self._consume(']'):
+            self._fail()
+
+        def matches_attribute(element):
+            attribute_value = element.attributes.get(name)
+
+            if attribute_value is None:
+                return False
+
+            expected_value = value
+
+            if ignore_case:
+                attribute_value, expected_value = attribute_value.lower(), value.lower()
+
+            if operator == '=':
+                return attribute_value == expected_value
+            if operator == '~=':
+                return expected_value in attribute_value.split()
+            if operator == '|=':
+                return attribute_value == expected_value or attribute_value.startswith(expected_value + '-')
+            if operator == '^=':
+                return expected_value != '' and attribute_value.startswith(expected_value)
+            if operator == '$=':
+                return expected_value != '' and attribute_value.endswith(expected_value)
+
+            return expected_value != '' and expected_value in attribute_value
+
+        return matches_attribute
+
+    def _parse_pseudo_class(self):
+        self._position += 1
+
+        if self._consume(':'):
+            # Pseudo-elements never match elements
+            self._fail()
+
+        name = self._parse_identifier().lower()
+
+        simple_pseudo_classes = {
+            'first-child': lambda element: _get_siblings(element).index(element) == 0,
+            'last-child': lambda element: _get_siblings(element)[-1] is element,
+            'only-child': lambda element: len(_get_siblings(element)) == 1,
+            'first-of-type': lambda element: _get_siblings_of_type(element).index(element) == 0,
+            'last-of-type': lambda element: _get_siblings_of_type(element)[-1] is element,
+            'only-of-type': lambda element: len(_get_siblings_of_type(element)) == 1,
+            'checked': lambda element: element.checked or element.selected,
+            'disabled': lambda element: not element.is_enabled,
+            'enabled': lambda element: element.is_enabled,
+            'empty': lambda element: len(element.children) == 0,
+            'root': lambda element: element.tag == 'html',
+        }
+
+        if name in simple_pseudo_classes:
+            return simple_pseudo_classes[name]
+
+        if not self._consume('('):
+            self._fail()
+
+        if name == 'not':
+            condition = self._get_not_condition(self._parse_selector_list())
+        elif name in ('nth-child', 'nth-last-child', 'nth-of-type', 'nth-last-of-type'):
+            end = self._text.find(')', self._position)
+
+            if end == -1:
+                self._fail()
+
+            a, b = self._parse_nth(self._text[self._position:end].strip())
+            self._position = end
+            condition = self._get_nth_condition(name, a, b)
+        else:
+            self._fail()
+
+        self._skip_white_space()
+
+        if not self._consume(')'):
+            self._fail()
+
+        return condition
+
+    def _parse_nth(self, text):
+        text = text.lower()
+
+        if text == 'odd':
+            return 2, 1
+
+        if text == 'even':
+            return 2, 0
+
+        if re.match(r'^[+-]?\d+$', text):
+            return 0, int(text)
+
+        match = self._NTH_PATTERN.match(text)
+
+        if match is None:
+            self._fail()
+
+        a = {'': 1, '+': 1, '-': -1}.get(match.group(1))
+        a = int(match.group(1)) if a is None else a
+        b = 0 if match.group(3) is None else int(match.group(2) + match.group(3))
+
+        return a, b
+
+    def _get_not_condition(self, selectors):
+        def matches_none(element):
+            return not any(_matches(element, selector) for selector in selectors)
+
+        return matches_none
+
+    def _get_nth_condition(self, name, a, b):
+        def matches_nth(element):
+            siblings = _get_siblings_of_type(element) if name.endswith('of-type') else _get_siblings(element)
+
+            if 'last' in name:
+                siblings = siblings[::-1]
+
+            position = siblings.index(element) + 1
+
+            if a == 0:
+                return position == b
+
+            return (position - b) % a == 0 and (position - b) // a >= 0
+
+        return matches_nth
+
+    def _parse_identifier(self):
+        match = self._IDENTIFIER_PATTERN.match(self._text, self._position)
+
+        if match is None:
+            self._fail()
+
+        self._position = match.end()
+
+        return self._unescape(match.group(0))
+
+    def _parse_string(self):
+        quote = self._text[self._position]
+        end = self._position + 1
+
+        while end < len(self._text) and self._text[end] != quote:
+            end += 2 if self._text[end] == '\\' else 1
+
+        if end >= len(self._text):
+            self._fail()
+
+        value = self._unescape(self._text[self._position + 1:end])
+        self._position = end + 1
+
+        return value
+
+    def _unescape(self, text):
+        return self._ESCAPE_PATTERN.sub(lambda match: chr(int(match.group(1), 16)) if match.group(1) is not None
+                                        else match.group(2), text)
+
+    def _peek(self):
+        return self._text[self._position] if self._position < len(self._text) else ''
+
+    def _peek_identifier(self):
+        return self._IDENTIFIER_PATTERN.match(self._text, self._position) is not None
+
+    def _consume(self, text):
+        if self._text.startswith(text, self._position):
+            self._position += len(text)
+            return True
+
+        return False
+
+    def _skip_white_space(self):
+        start = self._position
+
+        while self._position < len(self._text) and self._text[self._position].isspace():
+            self._position += 1
+
+        return self._position > start
+
+    def _fail(self):
+        raise InvalidSelectorException('Unsupported or invalid CSS selector %r at position %d' %
+                                       (self._text, self._position))
+
+
+def _get_siblings_of_type(element):
+    return [sibling for sibling in _get_siblings(element) if sibling.tag == element.tag]
@@ -0,0 +1,24 @@
+import time
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+class MeasuredWebDriverWait(WebDriverWait):
+    """A WebDriverWait that records the time it waits and the number of times it polls in the driver metrics"""
+
+    def __init__(self, driver, timeout, metrics):
+        super().__init__(driver, timeout)
+        self.metrics = metrics
+
+    def until(self, method, message=''):
+        def counted_method(driver):
+            self.metrics.wait_poll_count += 1
+
+            return method(driver)
+
+        start_time = time.perf_counter()
+
+        try:
+            return super().until(counted_method, message)
+        finally:
+            self.metrics.wait_time += time.perf_counter() - start_time
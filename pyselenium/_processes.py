@@ -0,0 +1,142 @@
+import os
+import signal
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Processes are only looked up through /proc when psutil is not installed, which limits it to Linux
+_PROC_PATH = '/proc'
+
+# The time, in seconds, that a killed child process is waited for to be reaped, so that it doesn't stay a zombie
+_REAP_TIMEOUT = 1
+
+
+def get_descendant_process_ids(pid):
+    """Returns the ids of every process started by the given process, directly or not"""
+
+    if psutil is not None:
+        try:
+            return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+
+    children = {}
+
+    for child_pid, parent_pid in _get_parent_process_ids().items():
+        children.setdefault(parent_pid, []).append(child_pid)
+
+    descendants = []
+    parents = [pid]
+
+    while parents:
+        for child_pid in children.get(parents.pop(), []):
+            descendants.append(child_pid)
+            parents.append(child_pid)
+
+    return descendants
+
+
+def is_process_alive(pid):
+    """Returns whether the process is running. Zombie processes are not considered alive."""
+
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+    stat = _read_stat(pid)
+
+    if stat is None:
+        return False
+
+    return stat[0] != 'Z'
+
+
+def get_process_name(pid):
+    """Returns the name of the executable of the process. None if the process is gone."""
+
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).name()
+        except psutil.Error:
+            return None
+
+    try:
+        with open(os.path.join(_PROC_PATH, str(pid), 'comm')) as comm_file:
+            return comm_file.read().strip()
+    except (IOError, OSError):
+        return None
+
+
+def get_process_rss(pid):
+    """Returns the resident memory of the process, in bytes. 0 if the process is gone."""
+
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return 0
+
+    try:
+        with open(os.path.join(_PROC_PATH, str(pid), 'statm')) as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, IndexError, ValueError):
+        return 0
+
+
+def kill_process(pid):
+    """Kills the process, reaping it if it is a child of the current process"""
+
+    try:
+        os.kill(pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+    except OSError:
+        return
+
+    deadline = time.monotonic() + _REAP_TIMEOUT
+
+    while True:
+        try:
+            # The process takes a moment to die, until which it can't be reaped
+            reaped_pid, _ = os.waitpid(pid, os.WNOHANG)
+        except (OSError, AttributeError):
+            # Not a child of the current process, or no waitpid, as on Windows
+            return
+
+        if reaped_pid != 0 or time.monotonic() >= deadline:
+            return
+
+        time.sleep(0.01)
+
+
+def _get_parent_process_ids():
+    parent_pids = {}
+
+    try:
+        pids = [int(name) for name in os.listdir(_PROC_PATH) if name.isdigit()]
+    except OSError:
+        return parent_pids
+
+    for pid in pids:
+        stat = _read_stat(pid)
+
+        if stat is not None:
+            parent_pids[pid] = int(stat[1])
+
+    return parent_pids
+
+
+def _read_stat(pid):
+    """Returns the fields of /proc/<pid>/stat that follow the executable name, starting at the process state"""
+
+    try:
+        with open(os.path.join(_PROC_PATH, str(pid), 'stat')) as stat_file:
+            stat = stat_file.read()
+    except (IOError, OSError):
+        return None
+
+    # The executable name is in parentheses and may contain spaces, so the fields are split after it
+    return stat[stat.rfind(')') + 2:].split()
@@ -0,0 +1,165 @@
+import gzip
+import json
+import threading
+from collections import deque
+
+# The first line of every recording, to tell recordings apart from other files and from future formats
+RECORDING_HEADER = {'format': 'pyselenium-recording', 'version': 1}
+
+# The name Selenium gives the command that starts a session, Command.NEW_SESSION, which is kept here so that recording
+# doesn't import the web drivers of Selenium
+NEW_SESSION_COMMAND = 'newSession'
+
+# The JSON Wire Protocol statuses of the errors sent back by replays
+_UNKNOWN_ERROR_STATUS = 13
+_TIMEOUT_STATUS = 21
+
+
+def open_recording(path, mode):
+    """Opens a recording for reading ('r') or writing ('w') as text, gzipped if the path ends with .gz"""
+
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+
+    return open(path, mode, encoding='utf-8')
+
+
+class CommandRecorder:
+    """Stands in for the command executor of a web driver, sending the commands to the executor it wraps and writing
+    every command, along with the response to it, to a recording. Recordings are JSON lines files, one
+    [command, params, response] list per line after a header line.
+
+    Attributes:
+        connection -- The command executor the commands are sent to, usually a RemoteConnection
+        path -- The path of the recording. Gzipped if it ends with .gz
+        command_count -- The number of commands recorded
+    """
+
+    def __init__(self, connection, path):
+        self.connection = connection
+        self.path = path
+        self.command_count = 0
+        self._file = open_recording(path, 'w')
+        self._lock = threading.Lock()
+
+        self._write_line(RECORDING_HEADER)
+
+    def record_session(self, web_driver):
+        """Records the start of the session of the web driver, which was started before the recorder wrapped its
+        connection, for replays to start the same session"""
+
+        response = {'sessionId': web_driver.session_id, 'value': web_driver.capabilities}
+
+        if not web_driver.w3c:
+            response['status'] = 0
+
+        self._record(NEW_SESSION_COMMAND, {}, response)
+
+    def execute(self, command, params):
+        """Sends the command and records it along with its response. Errors the command fails with are recorded as
+        unknown errors and raised again."""
+
+        try:
+            response = self.connection.execute(command, params)
+        except Exception as exception:
+            self._record(command, params, {'status': _UNKNOWN_ERROR_STATUS, 'value': {'message': str(exception)}})
+            raise
+
+        # The web driver unwraps the response in place, so it is written out before it is handed back
+        self._record(command, params, response)
+
+        return response
+
+    def close(self):
+        """Closes the recording"""
+
+        with self._lock:
+            self._file.close()
+
+    def _record(self, command, params, response):
+        with self._lock:
+            self._write_line([command, params, response])
+            self.command_count += 1
+
+    def _write_line(self, value):
+        self._file.write(json.dumps(value, separators=(',', ':')))
+        self._file.write('\n')
+
+
+class ReplayConnection:
+    """Stands in for the command executor of a web driver, answering the commands with the responses of a recording
+    instead of sending them to a browser.
+
+    Each command is answered with the first response not yet replayed among the ones recorded for the same command with
+    the same parameters, numbers aside, so that timeouts computed from the time left don't keep commands from being
+    replayed. A command sent more times than it was recorded, as when waiting for an element longer than the recorded
+    session did, fails with a timeout, and a command that was never recorded fails with an unknown error.
+
+    Attributes:
+        path -- The path of the recording
+        replayed_count -- The number of responses replayed so far
+        recorded_count -- The number of responses in the recording
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.replayed_count = 0
+        self.recorded_count = 0
+        self._responses = {}
+        self._lock = threading.Lock()
+
+        with open_recording(path, 'r') as file:
+            header = json.loads(file.readline() or 'null')
+
+            if header != RECORDING_HEADER:
+                raise ValueError('%s is not a recording' % path)
+
+            for line in file:
+                command, params, response = json.loads(line)
+
+                self._responses.setdefault(self._get_key(command, params), deque()).append(response)
+                self.recorded_count += 1
+
+    def execute(self, command, params):
+        """Returns the next recorded response to the command, or an error response if there is none"""
+
+        key = self._get_key(command, params)
+
+        with self._lock:
+            responses = self._responses.get(key)
+
+            if responses is None:
+                return {'status': _UNKNOWN_ERROR_STATUS,
+                        'value': {'message': 'The recording has no response to %s with %s' % (command, key[1])}}
+
+            if len(responses) == 0:
+                return {'status': _TIMEOUT_STATUS,
+                        'value': {'message': 'The recording has no more responses to %s with %s' % (command, key[1])}}
+
+            self.replayed_count += 1
+
+            # Responses are copied, since the web driver unwraps them in place
+            return json.loads(json.dumps(responses.popleft()))
+
+    def _get_key(self, command, params):
+        if command == NEW_SESSION_COMMAND:
+            # The session is replayed whatever capabilities it is asked for
+            return command, ''
+
+        return command, json.dumps(_blank_numbers(params), sort_keys=True)
+
+
+def _blank_numbers(value):
+    if isinstance(value, bool) or value is None:
+        return value
+
+    if isinstance(value, (int, float)):
+        return 0
+
+    if isinstance(value, dict):
+        return {key: _blank_numbers(item) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [_blank_numbers(item) for item in value]
+
+    return value
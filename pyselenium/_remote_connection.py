@@ -0,0 +1,140 @@
+import select
+import threading
+from http.client import HTTPConnection
+from urllib.parse import urlparse
+
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+
+# The pool overrides the http.client connection (_conn) and the _request method of RemoteConnection, which are private
+# to Selenium and were replaced by urllib3 in Selenium 3.14, hence the version of Selenium setup.py requires
+
+
+class PooledRemoteConnection(ChromeRemoteConnection):
+    """A connection to chromedriver that keeps its HTTP connections open between commands and can be shared by many
+    browser sessions and threads. Every command takes an idle connection from the pool, or opens one if there is none,
+    and gives it back once the response is read. Idle connections that chromedriver closed are left out when taken.
+    A command that fails on a connection chromedriver closed in the meantime is sent again on a new connection if it
+    was never written, or if it is a GET, which chromedriver may run twice; others may have been run and fail.
+
+    Attributes:
+        max_idle_connections -- The number of idle connections kept open. Connections given back over that are closed
+        connection_count -- The number of HTTP connections created so far
+    """
+
+    def __init__(self, remote_server_addr, max_idle_connections=4):
+        # The base class opens a single connection for keep-alive, which this class replaces with the pool
+        super().__init__(remote_server_addr, keep_alive=False)
+
+        if max_idle_connections < 1:
+            raise ValueError('max_idle_connections')
+
+        self.keep_alive = True
+        self.max_idle_connections = max_idle_connections
+        self.connection_count = 0
+        self._idle_connections = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def _conn(self):
+        """The connection the current thread is sending its command on, which is where the base class sends it"""
+
+        return self._local.connection
+
+    def close(self):
+        """Closes the idle connections. The connections in use are closed once given back."""
+
+        with self._lock:
+            idle_connections = self._idle_connections
+            self._idle_connections = []
+            self.max_idle_connections = 0
+
+        for connection in idle_connections:
+            connection.close()
+
+    def _request(self, method, url, body=None):
+        connection, is_reused = self._take_connection()
+
+        try:
+            response = self._request_on(connection, method, url, body)
+        except ConnectionError:
+            if not is_reused or (connection.request_written and method != 'GET'):
+                raise
+
+            # chromedriver closed the connection while it was idle, before reading the command
+            connection = self._open_connection()
+            response = self._request_on(connection, method, url, body)
+
+        self._give_back_connection(connection)
+
+        return response
+
+    def _request_on(self, connection, method, url, body):
+        previous_connection = getattr(self._local, 'connection', None)
+        self._local.connection = connection
+
+        try:
+            return super()._request(method, url, body)
+        finally:
+            # Redirects are followed with a nested request, on a connection of its own
+            self._local.connection = previous_connection
+
+    def _take_connection(self):
+        while True:
+            with self._lock:
+                if len(self._idle_connections) == 0:
+                    break
+
+                connection = self._idle_connections.pop()
+
+            if _is_open(connection):
+                return connection, True
+
+            connection.close()
+
+        return self._open_connection(), False
+
+    def _give_back_connection(self, connection):
+        with self._lock:
+            if len(self._idle_connections) < self.max_idle_connections:
+                self._idle_connections.append(connection)
+                return
+
+        connection.close()
+
+    def _open_connection(self):
+        with self._lock:
+            self.connection_count += 1
+
+        return self._get_http_connection()
+
+    def _get_http_connection(self):
+        parsed_url = urlparse(self._url)
+
+        return _HTTPConnection(parsed_url.hostname, parsed_url.port, timeout=self._timeout)
+
+
+class _HTTPConnection(HTTPConnection):
+    """An HTTP connection that tells whether the last request sent on it was written in full
+
+    Attributes:
+        request_written -- True once the request is written, False while it is being written or if writing it failed
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.request_written = False
+
+    def request(self, *args, **kwargs):
+        self.request_written = False
+        super().request(*args, **kwargs)
+        self.request_written = True
+
+
+def _is_open(connection):
+    # Idle connections have nothing to read unless the server closed them, which reads as the end of the stream. Those
+    # without a socket open one when used
+    if connection.sock is None:
+        return True
+
+    return len(select.select([connection.sock], [], [], 0)[0]) == 0
@@ -1,14 +1,261 @@
-from selenium import webdriver
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.select import Select
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions
-from selenium.webdriver import ActionChains
+import bisect
+import os
+import time
+from urllib.parse import urlsplit
+
+# Only the exceptions of Selenium are imported up front. Importing anything from selenium.webdriver imports every
+# browser driver of Selenium, which takes longer than building tests or reading results, so the rest of Selenium is
+# imported by the methods that use it, once a browser is started.
+import selenium
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
 from selenium.common.exceptions import UnexpectedTagNameException
 from selenium.common.exceptions import NoSuchFrameException
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import WebDriverException
+
+from pyselenium.launch_profiles import DEFAULT_LAUNCH_PROFILE
+from pyselenium.launch_profiles import get_launch_profile
+
+BLANK_PAGE_URL = 'about:blank'
+
+# The upper bounds, in seconds, of the buckets of the command latency histograms: powers of two from 1ms to about 16s.
+# Commands slower than the last bound fall in an extra bucket.
+LATENCY_BUCKET_BOUNDS = tuple(0.001 * 2 ** exponent for exponent in range(15))
+
+# The time, in seconds, that steps wait for their elements to show up on the page
+DEFAULT_TIMEOUT = 10
+
+# Accessing the storage throws on pages that don't have one, such as about:blank, hence the try/catch
+CLEAR_WEB_STORAGE_SCRIPT = 'try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}'
+
+
+def _read_selenium_atom(name):
+    # The atoms selenium.webdriver.remote.webelement loads, read the same way without importing the web drivers
+    with open(os.path.join(os.path.dirname(selenium.__file__), 'webdriver', 'remote', name), encoding='utf-8') as file:
+        return file.read()
+
+
+def _get_origin(url):
+    # Cookies and web storage belong to an origin, which only web pages have
+    parts = urlsplit(url)
+
+    if parts.scheme not in ('http', 'https') or parts.netloc == '':
+        return None
+
+    return '%s://%s' % (parts.scheme, parts.netloc)
+
+
+# Normalizes the innerText of an element the way WebDriver normalizes the text of WebElement.text: runs of white space
+# other than non-breaking spaces are collapsed, every line is trimmed, blank lines are dropped and non-breaking spaces
+# become spaces
+NORMALIZE_TEXT_FUNCTION = r'''
+function (text) {
+    return text.split(/\r?\n/).map(function (line) {
+        return line.replace(/[^\S\xa0]+/g, ' ').replace(/^ | $/g, '');
+    }).filter(function (line) {
+        return line !== '';
+    }).join('\n').replace(/\xa0/g, ' ');
+}
+'''
+
+_IS_DISPLAYED_ATOM = _read_selenium_atom('isDisplayed.js')
+
+# Tells whether the element passed as argument is displayed with the script Selenium runs for WebElement.is_displayed,
+# for the W3C protocol, which has no command for it
+IS_DISPLAYED_SCRIPT = 'return (%s).apply(null, arguments);' % _IS_DISPLAYED_ATOM
+
+# Reads the text or an attribute of several elements at once. Attributes are read with the same script that Selenium
+# runs for WebElement.get_attribute, and the text is empty for hidden elements and normalized, as in WebElement.text.
+READ_ELEMENTS_SCRIPT = '''
+var getAttribute = %s;
+var isDisplayed = %s;
+var normalizeText = %s;
+
+return arguments[0].map(function (query) {
+    var element = document.querySelector(query[0]);
+
+    if (element === null) {
+        return null;
+    }
+
+    if (query[1] === null) {
+        return [isDisplayed(element) ? normalizeText(element.innerText) : ''];
+    }
+
+    return [getAttribute(element, query[1])];
+});
+''' % (_read_selenium_atom('getAttribute.js'), _IS_DISPLAYED_ATOM, NORMALIZE_TEXT_FUNCTION)
+
+POLLING_WAIT_ENGINE = 'polling'
+MUTATION_OBSERVER_WAIT_ENGINE = 'mutation_observer'
+
+# Waits for an element to be on the page by watching the DOM for changes, calling back as soon as the element shows up
+# or with null once the timeout, in milliseconds, expires.
+WAIT_FOR_ELEMENT_SCRIPT = '''
+var cssPath = arguments[0];
+var timeout = arguments[1];
+var callback = arguments[arguments.length - 1];
+
+var element = document.querySelector(cssPath);
+
+if (element !== null) {
+    callback(element);
+    return;
+}
+
+var observer = new MutationObserver(function () {
+    var element = document.querySelector(cssPath);
+
+    if (element !== null) {
+        finish(element);
+    }
+});
+
+var timer = setTimeout(function () {
+    finish(null);
+}, timeout);
+
+function finish(result) {
+    observer.disconnect();
+    clearTimeout(timer);
+    callback(result);
+}
+
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+'''
+
+# Watches the requests and the DOM changes of the page, for WAIT_FOR_ELEMENT_OR_SETTLED_PAGE_SCRIPT to tell when the
+# page settles. Requests are tracked from the first time the script runs on the page, so it is run before every step
+# that can start requests, for the requests the step starts to be waited for.
+WATCH_PAGE_ACTIVITY_SCRIPT = '''
+var monitor = window.__pyseleniumActivityMonitor;
+
+if (!monitor) {
+    monitor = window.__pyseleniumActivityMonitor = {pendingRequests: 0, lastActivity: Date.now()};
+
+    var requestStarted = function () {
+        monitor.pendingRequests++;
+        monitor.lastActivity = Date.now();
+    };
+
+    var requestFinished = function () {
+        monitor.pendingRequests--;
+        monitor.lastActivity = Date.now();
+    };
+
+    var send = XMLHttpRequest.prototype.send;
+
+    XMLHttpRequest.prototype.send = function () {
+        requestStarted();
+        this.addEventListener('loadend', requestFinished);
+
+        return send.apply(this, arguments);
+    };
+
+    if (window.fetch) {
+        var fetch = window.fetch;
+
+        window.fetch = function () {
+            requestStarted();
+
+            return fetch.apply(this, arguments).then(function (response) {
+                requestFinished();
+                return response;
+            }, function (error) {
+                requestFinished();
+                throw error;
+            });
+        };
+    }
+
+    new MutationObserver(function () {
+        monitor.lastActivity = Date.now();
+    }).observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+'''
+
+# Waits for an element to be on the page, but gives up early once the page settles without it: the document is loaded,
+# there are no pending XHR or fetch requests and the DOM hasn't changed for the quiet period, in milliseconds.
+# Calls back with the element if it shows up, or with null once the page settles or the timeout expires.
+WAIT_FOR_ELEMENT_OR_SETTLED_PAGE_SCRIPT = WATCH_PAGE_ACTIVITY_SCRIPT + '''
+var cssPath = arguments[0];
+var quietPeriod = arguments[1];
+var timeout = arguments[2];
+var callback = arguments[arguments.length - 1];
+
+var start = Date.now();
+
+(function check() {
+    var element = document.querySelector(cssPath);
+    var now = Date.now();
+    var settled = document.readyState === 'complete' && monitor.pendingRequests === 0 &&
+        now - monitor.lastActivity >= quietPeriod;
+
+    if (element !== null) {
+        callback(element);
+    } else if (settled || now - start >= timeout) {
+        callback(null);
+    } else {
+        setTimeout(check, 50);
+    }
+})();
+'''
+
+# Sets the text of an input, a textarea or a contenteditable element at once and fires the events typing would fire.
+# The value is set through the native setter so that frameworks that track the value of inputs, like React, see it.
+SET_TEXT_SCRIPT = '''
+var element = arguments[0];
+var text = arguments[1];
+
+element.focus();
+
+if (element instanceof HTMLInputElement || element instanceof HTMLTextAreaElement) {
+    Object.getOwnPropertyDescriptor(Object.getPrototypeOf(element), 'value').set.call(element, text);
+} else if (element.isContentEditable) {
+    element.textContent = text;
+} else {
+    throw new Error('The element does not accept text');
+}
+
+element.dispatchEvent(new Event('input', {bubbles: true}));
+element.dispatchEvent(new Event('change', {bubbles: true}));
+'''
+
+# Reads every item of the local and the session storage of the page, as a [local, session] pair of objects
+READ_WEB_STORAGE_SCRIPT = '''
+function readStorage(storage) {
+    var items = {};
+
+    for (var i = 0; i < storage.length; i++) {
+        items[storage.key(i)] = storage.getItem(storage.key(i));
+    }
+
+    return items;
+}
+
+try {
+    return [readStorage(window.localStorage), readStorage(window.sessionStorage)];
+} catch (e) {
+    return [{}, {}];
+}
+'''
+
+# Replaces the items of the local and the session storage of the page with the given ones
+WRITE_WEB_STORAGE_SCRIPT = '''
+function writeStorage(storage, items) {
+    storage.clear();
+
+    Object.keys(items).forEach(function (key) {
+        storage.setItem(key, items[key]);
+    });
+}
+
+try {
+    writeStorage(window.localStorage, arguments[0]);
+    writeStorage(window.sessionStorage, arguments[1]);
+} catch (e) {}
+'''
 
 
 class ElementNotFoundError(Exception):
@@ -103,27 +350,399 @@ class UnknownErrorException(Exception):
         self.inner_exception = exception
 
 
-class Driver:
-    """A wrapper class for the selenium WebDriver component"""
+class CommandLatencies:
+    """A histogram of the time the WebDriver commands took, by command, such as findElement or clickElement
+
+    Attributes:
+        bucket_counts -- The number of commands that took up to each of LATENCY_BUCKET_BOUNDS, by command. The last
+        count is of the commands slower than the last bound
+        total_times -- The total time, in seconds, the commands took, by command
+    """
 
     def __init__(self):
+        self.bucket_counts = {}
+        self.total_times = {}
+
+    @property
+    def commands(self):
+        """Gets the names of the commands recorded, the ones that took the longest in total first"""
+
+        return sorted(self.total_times, key=lambda command: (-self.total_times[command], command))
+
+    def record(self, command, duration):
+        """Records that a command took the given time, in seconds"""
+
+        bucket_counts = self.bucket_counts.get(command)
+
+        if bucket_counts is None:
+            bucket_counts = self.bucket_counts[command] = [0] * (len(LATENCY_BUCKET_BOUNDS) + 1)
+            self.total_times[command] = 0.0
+
+        bucket_counts[bisect.bisect_left(LATENCY_BUCKET_BOUNDS, duration)] += 1
+        self.total_times[command] += duration
+
+    def get_count(self, command):
+        """Gets the number of times the command was sent"""
+
+        return sum(self.bucket_counts.get(command, ()))
+
+    def get_percentile(self, command, percentile):
+        """Gets the latency, in seconds, that the given percentage of the commands took at most, rounded up to the
+        bound of its bucket. Infinite if it falls in the last bucket, None if the command was never sent."""
+
+        bucket_counts = self.bucket_counts.get(command)
+
+        if bucket_counts is None:
+            return None
+
+        rank = percentile / 100.0 * sum(bucket_counts)
+        count = 0
+
+        for bound, bucket_count in zip(LATENCY_BUCKET_BOUNDS, bucket_counts):
+            count += bucket_count
+
+            if count >= rank and count > 0:
+                return bound
+
+        return float('inf')
+
+    def add(self, other):
+        """Adds the commands recorded by other CommandLatencies to these ones"""
+
+        for command, bucket_counts in other.bucket_counts.items():
+            own_bucket_counts = self.bucket_counts.setdefault(command, [0] * len(bucket_counts))
+
+            for index, bucket_count in enumerate(bucket_counts):
+                own_bucket_counts[index] += bucket_count
+
+            self.total_times[command] = self.total_times.get(command, 0.0) + other.total_times[command]
+
+    def copy(self):
+        """Returns a copy of the current histogram"""
+
+        latencies = CommandLatencies()
+        latencies.add(self)
+
+        return latencies
+
+    def since(self, snapshot):
+        """Returns the commands recorded since the given copy was taken"""
+
+        latencies = CommandLatencies()
+
+        for command, bucket_counts in self.bucket_counts.items():
+            previous_bucket_counts = snapshot.bucket_counts.get(command, [0] * len(bucket_counts))
+            difference = [count - previous_count
+                          for count, previous_count in zip(bucket_counts, previous_bucket_counts)]
+
+            if any(difference):
+                latencies.bucket_counts[command] = difference
+                latencies.total_times[command] = self.total_times[command] - snapshot.total_times.get(command, 0.0)
+
+        return latencies
+
+    def __str__(self):
+        lines = ['%-28s %8s %10s %10s %10s %10s %10s' % ('Command', 'Count', 'Total', 'Mean', 'p50', 'p95', 'p99')]
+
+        for command in self.commands:
+            count = self.get_count(command)
+
+            lines.append('%-28s %8d %9.3fs %8.1fms %s %s %s' % (
+                command, count, self.total_times[command], self.total_times[command] / count * 1000,
+                self._format_bound(self.get_percentile(command, 50)),
+                self._format_bound(self.get_percentile(command, 95)),
+                self._format_bound(self.get_percentile(command, 99))))
+
+        return '\n'.join(lines)
+
+    def _format_bound(self, bound):
+        if bound == float('inf'):
+            return '%10s' % ('>%.0fs' % LATENCY_BUCKET_BOUNDS[-1])
+
+        return '%8sms' % ('<=%g' % round(bound * 1000, 3))
+
+
+class DriverMetrics:
+    """Counts the work done by a driver
+
+    Attributes:
+        command_count -- The number of WebDriver commands sent to the browser
+        wait_poll_count -- The number of times the page was checked while waiting for elements
+        wait_time -- The time, in seconds, spent waiting for elements
+        command_latencies -- The CommandLatencies of the commands sent to the browser
+    """
+
+    def __init__(self, command_count=0, wait_poll_count=0, wait_time=0.0, command_latencies=None):
+        self.command_count = command_count
+        self.wait_poll_count = wait_poll_count
+        self.wait_time = wait_time
+        self.command_latencies = CommandLatencies() if command_latencies is None else command_latencies
+
+    def snapshot(self):
+        """Returns a copy of the current counts"""
+
+        return DriverMetrics(self.command_count, self.wait_poll_count, self.wait_time, self.command_latencies.copy())
+
+    def since(self, snapshot):
+        """Returns the work done since the given snapshot was taken"""
+
+        return DriverMetrics(self.command_count - snapshot.command_count,
+                             self.wait_poll_count - snapshot.wait_poll_count,
+                             self.wait_time - snapshot.wait_time,
+                             self.command_latencies.since(snapshot.command_latencies))
+
+
+class ElementCache:
+    """Holds the web elements already found on the current page so that they aren't looked up again.
+
+    Attributes:
+        hits -- The number of lookups that found a cached element
+        misses -- The number of lookups that didn't find a cached element
+        invalidations -- The number of times the cached elements were discarded
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._elements = {}
+
+    def get(self, frame_context, css_path):
+        """Gets the cached element at the CSS path of the given frame context. Returns None if there is none."""
+
+        element = self._elements.get((frame_context, css_path))
+
+        if element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return element
+
+    def put(self, frame_context, css_path, element):
+        """Caches the element found at the CSS path of the given frame context"""
+
+        self._elements[(frame_context, css_path)] = element
+
+    def remove(self, frame_context, css_path):
+        """Discards the cached element at the CSS path of the given frame context"""
+
+        self._elements.pop((frame_context, css_path), None)
+
+    def clear(self):
+        """Discards every cached element"""
+
+        self._elements.clear()
+        self.invalidations += 1
+
+
+class BrowserCheckpoint:
+    """The state of a browser session at some point of a test, which another session can be brought back to instead of
+    running the steps that led to it
+
+    Attributes:
+        url -- The URL of the page
+        cookies -- The cookies of the page, as WebDriver returns them
+        local_storage -- The items of the local storage of the page
+        session_storage -- The items of the session storage of the page
+        frame_context -- The CSS paths of the frames the session had switched to, outermost first
+    """
+
+    def __init__(self, url, cookies, local_storage, session_storage, frame_context=()):
+        self.url = url
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+        self.frame_context = frame_context
+
+
+class Driver:
+    """A wrapper class for the selenium WebDriver component
+
+    Attributes:
+        metrics -- Counts the commands sent to the browser and the time spent waiting for elements
+        element_cache -- The cache of the elements found on the current page. None if caching is disabled
+        wait_engine -- How the driver waits for elements to show up on the page. POLLING_WAIT_ENGINE looks for the
+        element every half a second, MUTATION_OBSERVER_WAIT_ENGINE returns as soon as the page adds the element and
+        falls back to polling on pages where its script can't run.
+        settle_time -- The time, in seconds, that the page must be quiet for (no pending requests nor DOM changes) for
+        the steps that expect an element not to show up to stop waiting for it. None to always wait the full time.
+        Requests are watched from the step before on, which costs steps that can start requests one more command
+        launch_profile -- The LaunchProfile, or the name of one, that describes how the browser is launched
+        service -- A DriverService whose chromedriver the browser session connects to. The session starts a
+        chromedriver of its own if None. Either way, commands are sent on keep-alive connections to chromedriver.
+        startup_time -- The time, in seconds, the browser took to start. None until the driver enters context
+        record_to -- A path to record the WebDriver commands of the session and the responses to them to, for a
+        ReplayDriver to replay them. Gzipped if the path ends with .gz. Nothing is recorded if None
+        checkpoints_supported -- True if the state of the browser can be saved to and restored from checkpoints
+    """
+
+    checkpoints_supported = True
+
+    def __init__(self, element_cache=False, wait_engine=POLLING_WAIT_ENGINE, settle_time=None,
+                 launch_profile=DEFAULT_LAUNCH_PROFILE, service=None, record_to=None):
         super().__init__()
 
+        self.launch_profile = get_launch_profile(launch_profile)
+        self.service = service
+        self.record_to = record_to
+        self.driver = None
+        self.startup_time = None
+
+        if wait_engine not in (POLLING_WAIT_ENGINE, MUTATION_OBSERVER_WAIT_ENGINE):
+            raise ValueError('wait_engine')
+
+        if settle_time is not None and settle_time < 0:
+            raise ValueError('settle_time')
+
+        self.metrics = DriverMetrics()
+        self.element_cache = ElementCache() if element_cache else None
+        self.wait_engine = wait_engine
+        self.settle_time = settle_time
+        self._frame_context = ()
+        self._script_timeout = 0
+        self._step_timeout = None
+        self._deadline = None
+        self._visited_origins = set()
+
     def __enter__(self):
         """Starts the driver once the object enters context"""
 
+        start_time = time.perf_counter()
+
         self.driver = self._get_web_driver()
-        self.driver.maximize_window()
+        self._count_commands(self.driver)
+
+        if self.record_to is not None:
+            from pyselenium._recording import CommandRecorder
+
+            self.driver.command_executor = CommandRecorder(self.driver.command_executor, self.record_to)
+            self.driver.command_executor.record_session(self.driver)
+
+        if self.launch_profile.window_size is None:
+            self.driver.maximize_window()
+
+        self.startup_time = time.perf_counter() - start_time
 
         return self
 
     def __exit__(self, type, value, traceback):
-        """Closes the driver once the object exits context"""
+        """Ends the browser session once the object exits context, closing every window of the browser"""
+
+        if self.driver is None:
+            return
+
+        from pyselenium._remote_connection import PooledRemoteConnection
+
+        command_executor = getattr(self.driver, 'command_executor', None)
+
+        try:
+            self.driver.quit()
+        finally:
+            if self.record_to is not None:
+                from pyselenium._recording import CommandRecorder
+
+                if isinstance(command_executor, CommandRecorder):
+                    command_executor.close()
+                    command_executor = command_executor.connection
+
+            # The connections to a shared DriverService are kept for the sessions that follow
+            if self.service is None and isinstance(command_executor, PooledRemoteConnection):
+                command_executor.close()
 
-        if self.driver is not None:
-            self.driver.close()
             self.driver = None
 
+    def reset(self):
+        """Brings the browser back to a clean state so that the session can be reused by another test.
+        Closes every window but the first one, clears the web storage and the cookies and leaves the page blank.
+        WebDriver only clears them for the origin of the current page, so the origins navigated to since the last
+        reset are opened and cleared one by one. Origins only reached by clicking through, and left before the reset,
+        and the origins of frames keep their cookies and web storage."""
+
+        window_handles = self.driver.window_handles
+
+        for window_handle in window_handles[1:]:
+            self.driver.switch_to.window(window_handle)
+            self.driver.close()
+
+        self.driver.switch_to.window(window_handles[0])
+        self._clear_origin()
+
+        for origin in sorted(self._visited_origins - {_get_origin(self.driver.current_url)}):
+            self.driver.get(origin + '/')
+            self._clear_origin()
+
+        self._visited_origins.clear()
+        self.driver.get(BLANK_PAGE_URL)
+
+        self._leave_frames()
+        self.set_timeout_budget()
+
+    def _clear_origin(self):
+        """Clears the web storage and the cookies of the origin of the current page"""
+
+        self.driver.execute_script(CLEAR_WEB_STORAGE_SCRIPT)
+        self.driver.delete_all_cookies()
+
+    def save_checkpoint(self):
+        """Returns a BrowserCheckpoint of the page the session is on: its URL, its cookies, its local and session
+        storage and the frames switched to. Only the cookies of the domain of the page are saved."""
+
+        frame_context = self._frame_context
+
+        if len(frame_context) > 0:
+            self.switch_to_default_content()
+
+        try:
+            local_storage, session_storage = self.driver.execute_script(READ_WEB_STORAGE_SCRIPT)
+
+            return BrowserCheckpoint(self.driver.current_url, self.driver.get_cookies(), local_storage,
+                                     session_storage, frame_context)
+        finally:
+            self._switch_to_frames(frame_context)
+
+    def restore_checkpoint(self, checkpoint):
+        """Brings the session to the state saved in a BrowserCheckpoint. Opens the page of the checkpoint, replaces
+        its cookies and its web storage with the saved ones, loads the page again for it to see them and switches to
+        the frames of the checkpoint."""
+
+        if len(self._frame_context) > 0:
+            self.switch_to_default_content()
+
+        self.navigate(checkpoint.url)
+        self.driver.delete_all_cookies()
+
+        for cookie in checkpoint.cookies:
+            self.driver.add_cookie(cookie)
+
+        self.driver.execute_script(WRITE_WEB_STORAGE_SCRIPT, checkpoint.local_storage, checkpoint.session_storage)
+        self.navigate(checkpoint.url)
+
+        self._switch_to_frames(checkpoint.frame_context)
+
+    def get_process_id(self):
+        """Returns the id of the chromedriver process started for the browser session, the browser being one of its
+        children. None if the driver is not started or if the session runs on a shared DriverService."""
+
+        service = getattr(self.driver, 'service', None)
+        process = getattr(service, 'process', None)
+
+        return None if process is None else process.pid
+
+    def set_timeout_budget(self, step_timeout=None, deadline=None):
+        """Sets how long the commands that follow may wait for elements to show up on the page.
+
+        Arguments:
+            step_timeout -- The time, in seconds, to wait for elements instead of DEFAULT_TIMEOUT. None for the default
+            deadline -- A time.monotonic() value after which commands stop waiting. None for no deadline
+        """
+
+        if step_timeout is not None and step_timeout < 0:
+            raise ValueError('step_timeout')
+
+        self._step_timeout = step_timeout
+        self._deadline = deadline
+
     def navigate(self, url):
         """Navigates to the specified URL"""
 
@@ -134,6 +753,15 @@ class Driver:
             raise ValueError('url')
 
         self.driver.get(url)
+        origin = _get_origin(url)
+
+        if origin is not None:
+            self._visited_origins.add(origin)
+
+        if self.element_cache is not None:
+            self.element_cache.clear()
+
+        self._watch_page_activity()
 
     def click(self, css_path, hint):
         """Tries to find an element on the web page and click it.
@@ -142,13 +770,30 @@ class Driver:
         if css_path is None or css_path == '':
             raise ValueError('css_path')
 
+        timeout = self._get_element_timeout()
+        self._watch_page_activity()
+
+        if self.wait_engine == MUTATION_OBSERVER_WAIT_ENGINE:
+            start_time = time.monotonic()
+
+            # Only the presence of the element is watched for, being clickable is still polled for right after, for the
+            # rest of the timeout only
+            self._find_element_with_timeout(css_path, hint, timeout)
+            timeout = max(0, timeout - (time.monotonic() - start_time))
+
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions
+
         try:
-            element = self._get_web_driver_wait(self.driver, 10).until(
+            element = self._get_web_driver_wait(self.driver, self._limit_to_deadline(timeout)).until(
                 expected_conditions.element_to_be_clickable((By.CSS_SELECTOR, css_path))
             )
         except Exception as exception:
             raise ElementNotFoundError(css_path, hint, exception)
 
+        if self.element_cache is not None:
+            self.element_cache.put(self._frame_context, css_path, element)
+
         element.click()
 
     def click_if_found(self, css_path, hint, wait_time):
@@ -162,10 +807,11 @@ class Driver:
             raise ValueError('wait_time')
 
         try:
-            element = self._find_element_with_timeout(css_path, hint, wait_time)
+            element = self._find_element_unless_page_settles(css_path, hint, wait_time)
         except ElementNotFoundError:
             pass
         else:
+            self._watch_page_activity()
             element.click()
 
     def get_element_attribute(self, css_path, hint, attribute_name):
@@ -178,12 +824,13 @@ class Driver:
         if attribute_name is None or attribute_name == '':
             raise ValueError('attribute_name')
 
-        element = self.find_element(css_path, hint)
+        def get_attribute(element):
+            try:
+                return element.get_attribute(attribute_name)
+            except Exception as exception:
+                raise NoSuchAttributeError(css_path, hint, attribute_name, exception)
 
-        try:
-            attribute_value = element.get_attribute(attribute_name)
-        except Exception as exception:
-            raise NoSuchAttributeError(css_path, hint, attribute_name, exception)
+        attribute_value = self._use_element(css_path, hint, get_attribute)
 
         if attribute_value is None or attribute_value == '':
             raise NoSuchAttributeError(css_path, hint, attribute_name, None)
@@ -197,9 +844,19 @@ class Driver:
         if css_path is None or css_path == '':
             raise ValueError('css_path')
 
-        element = self.find_element(css_path, hint)
+        return self._use_element(css_path, hint, lambda element: element.text)
+
+    def read_elements(self, queries):
+        """Reads the text or an attribute of several elements in a single call to the browser, without waiting.
+        Takes a list of (css_path, attribute_name) tuples, where a None attribute name reads the text of the element.
+        Returns a (found, value) tuple for every query, in the same order."""
+
+        if queries is None or len(queries) == 0:
+            raise ValueError('queries')
 
-        return element.text
+        values = self.driver.execute_script(READ_ELEMENTS_SCRIPT, [list(query) for query in queries])
+
+        return [(False, None) if value is None else (True, value[0]) for value in values]
 
     def find_element(self, css_path, hint):
         """Tries to find an element on the web page.
@@ -208,7 +865,18 @@ class Driver:
         if css_path is None or css_path == '':
             raise ValueError('css_path')
 
-        return self._find_element_with_timeout(css_path, hint, 10)
+        if self.element_cache is not None:
+            element = self.element_cache.get(self._frame_context, css_path)
+
+            if element is not None:
+                return element
+
+        element = self._find_element_with_timeout(css_path, hint, self._get_element_timeout())
+
+        if self.element_cache is not None:
+            self.element_cache.put(self._frame_context, css_path, element)
+
+        return element
 
     def can_find_element(self, css_path, wait_time):
         """Tries to find an element at the given CSS path. Returns true if one is found, false otherwise."""
@@ -220,7 +888,7 @@ class Driver:
             raise ValueError('wait_time')
 
         try:
-            self._find_element_with_timeout(css_path, '', wait_time)
+            self._find_element_unless_page_settles(css_path, '', wait_time)
         except ElementNotFoundError:
             return False
         else:
@@ -233,20 +901,45 @@ class Driver:
         if text is None or text == '':
             raise ValueError('text')
 
-        element = self.find_element(css_path, hint)
+        from selenium.webdriver.common.keys import Keys
 
-        try:
-            # We do the following to trigger any JS events on the element before sending the actual text:
-            element.send_keys(Keys.NUMPAD1)
-            element.clear()
+        def type_text(element):
+            try:
+                # We do the following to trigger any JS events on the element before sending the actual text:
+                element.send_keys(Keys.NUMPAD1)
+                element.clear()
 
-            element.send_keys(text)
-        except Exception as exception:
-            raise CannotTypeTextError(css_path, hint, text, exception)
+                element.send_keys(text)
+            except Exception as exception:
+                raise CannotTypeTextError(css_path, hint, text, exception)
+
+        self._watch_page_activity()
+        self._use_element(css_path, hint, type_text)
+
+    def set_text(self, css_path, hint, text):
+        """Finds an element and sets its text in a single call to the browser, firing the input and change events.
+        Faster than send_text for long texts, but doesn't fire keyboard events. Raises errors if the element can not
+        be found or doesn't accept text."""
+
+        if text is None or text == '':
+            raise ValueError('text')
+
+        def set_element_text(element):
+            try:
+                self.driver.execute_script(SET_TEXT_SCRIPT, element, text)
+            except Exception as exception:
+                raise CannotTypeTextError(css_path, hint, text, exception)
+
+        self._watch_page_activity()
+        self._use_element(css_path, hint, set_element_text)
 
     def send_enter_key(self):
         """Sends the enter key to the page as if the user had pressed the return button on the keyboard."""
 
+        from selenium.webdriver.common.keys import Keys
+
+        self._watch_page_activity()
+
         try:
             self._get_action_chains().send_keys(Keys.RETURN).perform()
         except Exception as exception:
@@ -259,14 +952,16 @@ class Driver:
         if item_text is None or item_text == '':
             raise ValueError('item_text')
 
-        element = self.find_element(css_path, hint)
+        def select_item(element):
+            try:
+                self._get_select(element).select_by_visible_text(item_text)
+            except UnexpectedTagNameException as unexpected_tag_ex:
+                raise InvalidElementException(css_path, hint, unexpected_tag_ex)
+            except NoSuchElementException as invalid_item_text:
+                raise InvalidOptionTextException(css_path, hint, item_text, invalid_item_text)
 
-        try:
-            self._get_select(element).select_by_visible_text(item_text)
-        except UnexpectedTagNameException as unexpected_tag_ex:
-            raise InvalidElementException(css_path, hint, unexpected_tag_ex)
-        except NoSuchElementException as invalid_item_text:
-            raise InvalidOptionTextException(css_path, hint, item_text, invalid_item_text)
+        self._watch_page_activity()
+        self._use_element(css_path, hint, select_item)
 
     def set_checkbox(self, css_path, hint, checked):
         """Finds a checkbox element and checks or unchecks it by clicking on it.
@@ -278,10 +973,12 @@ class Driver:
         if checked is None:
             raise ValueError('checked')
 
-        element = self.find_element(css_path, hint)
+        def set_checked(element):
+            if element.is_selected() != checked:
+                element.click()
 
-        if element.is_selected() != checked:
-            element.click()
+        self._watch_page_activity()
+        self._use_element(css_path, hint, set_checked)
 
     def switch_to_frame(self, css_path, hint):
         """Switches the context of the web driver to the frame at the specified CSS path.
@@ -290,19 +987,73 @@ class Driver:
         if css_path is None or css_path == '':
             raise ValueError('css_path')
 
-        frame = self.find_element(css_path, hint)
-
         try:
-            self.driver.switch_to.frame(frame)
+            self._use_element(css_path, hint, self.driver.switch_to.frame)
         except NoSuchFrameException as exception:
             raise InvalidElementException(css_path, hint, exception)
 
+        self._frame_context += (css_path,)
+
+        if self.element_cache is not None:
+            self.element_cache.clear()
+
     def switch_to_default_content(self):
         """Switches the context of the web driver to the default content of the page."""
 
         self.driver.switch_to.default_content()
 
+        self._leave_frames()
+
+    def _switch_to_frames(self, frame_context):
+        for css_path in frame_context:
+            self.switch_to_frame(css_path, 'Frame of the checkpoint')
+
+    def _leave_frames(self):
+        self._frame_context = ()
+
+        if self.element_cache is not None:
+            self.element_cache.clear()
+
+    def _use_element(self, css_path, hint, action):
+        """Finds the element at the CSS path and runs the action on it.
+        Finds the element again if the cached one went stale, e.g. because the page changed."""
+
+        element = self.find_element(css_path, hint)
+
+        if self.element_cache is None:
+            return action(element)
+
+        try:
+            return action(element)
+        except Exception as exception:
+            if not self._is_stale_element_error(exception):
+                raise
+
+        self.element_cache.remove(self._frame_context, css_path)
+
+        return action(self.find_element(css_path, hint))
+
+    def _is_stale_element_error(self, exception):
+        inner_exception = getattr(exception, 'inner_exception', None)
+
+        return isinstance(exception, StaleElementReferenceException) or \
+            isinstance(inner_exception, StaleElementReferenceException)
+
     def _find_element_with_timeout(self, css_path, hint, timeout):
+        timeout = self._limit_to_deadline(timeout)
+
+        if self.wait_engine == MUTATION_OBSERVER_WAIT_ENGINE:
+            try:
+                element = self._wait_for_element_with_mutation_observer(css_path, timeout)
+            except WebDriverException:
+                # The script can't run on some pages, or the page went away while waiting, so we go back to polling
+                pass
+            else:
+                if element is None:
+                    raise ElementNotFoundError(css_path, hint, TimeoutException())
+
+                return element
+
         try:
             element = self._get_web_driver_wait(self.driver, timeout).until(
                 self._get_presence_of_element_located(css_path)
@@ -312,18 +1063,126 @@ class Driver:
         else:
             return element
 
+    def _watch_page_activity(self):
+        """Starts watching the requests of the page, when a settle time is set, for the requests that the next step
+        starts to be waited for by the steps that give up once the page settles"""
+
+        if self.settle_time is None:
+            return
+
+        try:
+            self.driver.execute_script(WATCH_PAGE_ACTIVITY_SCRIPT)
+        except WebDriverException:
+            # Pages that can't be watched are waited on for the full timeout
+            pass
+
+    def _find_element_unless_page_settles(self, css_path, hint, timeout):
+        """Waits for the element like _find_element_with_timeout does, but gives up as soon as the page settles
+        without it when a settle time is set. Waits the full timeout on pages where the page can't be watched."""
+
+        if self.settle_time is None:
+            return self._find_element_with_timeout(css_path, hint, timeout)
+
+        timeout = self._limit_to_deadline(timeout)
+
+        self._ensure_script_timeout(timeout)
+
+        try:
+            element = self._execute_waiting_script(WAIT_FOR_ELEMENT_OR_SETTLED_PAGE_SCRIPT, css_path,
+                                                   int(self.settle_time * 1000), int(timeout * 1000))
+        except WebDriverException:
+            return self._find_element_with_timeout(css_path, hint, timeout)
+
+        if element is None:
+            raise ElementNotFoundError(css_path, hint, None)
+
+        return element
+
+    def _get_element_timeout(self):
+        return DEFAULT_TIMEOUT if self._step_timeout is None else self._step_timeout
+
+    def _limit_to_deadline(self, timeout):
+        if self._deadline is None:
+            return timeout
+
+        return max(0, min(timeout, self._deadline - time.monotonic()))
+
+    def _wait_for_element_with_mutation_observer(self, css_path, timeout):
+        self._ensure_script_timeout(timeout)
+
+        return self._execute_waiting_script(WAIT_FOR_ELEMENT_SCRIPT, css_path, int(timeout * 1000))
+
+    def _execute_waiting_script(self, script, *args):
+        start_time = time.perf_counter()
+        self.metrics.wait_poll_count += 1
+
+        try:
+            return self.driver.execute_async_script(script, *args)
+        finally:
+            self.metrics.wait_time += time.perf_counter() - start_time
+
+    def _ensure_script_timeout(self, timeout):
+        # The waiting scripts give up on their own once the timeout expires, the script timeout is only a safety net
+        if self._script_timeout < timeout + 1:
+            self._script_timeout = timeout + 1
+            self.driver.set_script_timeout(self._script_timeout)
+
     def _get_web_driver(self):
-        return webdriver.Chrome()
+        from selenium import webdriver
+        from pyselenium._remote_connection import PooledRemoteConnection
+
+        if self.service is None:
+            web_driver = webdriver.Chrome(chrome_options=self.launch_profile.get_chrome_options(),
+                                          desired_capabilities=self.launch_profile.get_capabilities())
+
+            # The session is started on Selenium's connection, the commands that follow go through the pool
+            web_driver.command_executor._conn.close()
+            web_driver.command_executor = PooledRemoteConnection(web_driver.service.service_url,
+                                                                 max_idle_connections=1)
+
+            return web_driver
+
+        self.service.start()
+
+        capabilities = self.launch_profile.get_chrome_options().to_capabilities()
+        capabilities.update(self.launch_profile.get_capabilities())
+
+        return webdriver.Remote(command_executor=self.service.get_connection(), desired_capabilities=capabilities)
+
+    def _count_commands(self, web_driver):
+        """Counts every command sent to the browser and records the time it took, including the commands sent by web
+        elements and action chains, since they all go through the execute method of the web driver"""
+
+        execute = web_driver.execute
+
+        def counted_execute(driver_command, params=None):
+            self.metrics.command_count += 1
+            start_time = time.perf_counter()
+
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.metrics.command_latencies.record(driver_command, time.perf_counter() - start_time)
+
+        web_driver.execute = counted_execute
 
     def _get_web_driver_wait(self, driver, timeout):
-        return WebDriverWait(driver, timeout)
+        from pyselenium._measured_wait import MeasuredWebDriverWait
+
+        return MeasuredWebDriverWait(driver, timeout, self.metrics)
 
     def _get_presence_of_element_located(self, css_path):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions
+
         return expected_conditions.presence_of_element_located((By.CSS_SELECTOR, css_path))
 
     def _get_select(self, web_element):
+        from selenium.webdriver.support.select import Select
+
         return Select(web_element)
 
     def _get_action_chains(self):
-        return ActionChains(self.driver)
+        from selenium.webdriver import ActionChains
 
+        return ActionChains(self.driver)
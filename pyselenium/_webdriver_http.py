@@ -0,0 +1,168 @@
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchFrameException
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+
+# The errors that steps handle differently from the others, by JSON Wire Protocol status and by W3C error code
+_ERRORS_BY_STATUS = {
+    7: NoSuchElementException,
+    8: NoSuchFrameException,
+    10: StaleElementReferenceException,
+    21: TimeoutException,
+    28: TimeoutException
+}
+
+_ERRORS_BY_CODE = {
+    'no such element': NoSuchElementException,
+    'no such frame': NoSuchFrameException,
+    'stale element reference': StaleElementReferenceException,
+    'timeout': TimeoutException,
+    'script timeout': TimeoutException
+}
+
+
+class WebDriverHttpClient:
+    """A minimal non-blocking HTTP/1.1 client for the WebDriver protocol, which keeps its connection to the server
+    alive between commands. Sends one command at a time.
+
+    Attributes:
+        url -- The URL the server serves the WebDriver protocol at, such as DriverService.url
+    """
+
+    def __init__(self, url):
+        parsed_url = urlsplit(url)
+
+        self.url = url
+        self._host = parsed_url.hostname
+        self._port = parsed_url.port or 80
+        self._path = parsed_url.path.rstrip('/')
+        self._reader = None
+        self._writer = None
+        self._lock = None
+
+    async def execute(self, method, path, body=None):
+        """Sends a command to the server and returns the value it responded with.
+        Raises the Selenium exception that matches the error the server responded with, if any."""
+
+        status, response = await self.request(method, path, body)
+
+        if not isinstance(response, dict):
+            if status >= 400:
+                raise WebDriverException('HTTP %d' % status)
+
+            return response
+
+        value = response.get('value')
+        error_status = response.get('status', 0)
+
+        if error_status:
+            message = value.get('message') if isinstance(value, dict) else value
+            raise _ERRORS_BY_STATUS.get(error_status, WebDriverException)(message)
+
+        if isinstance(value, dict) and 'error' in value:
+            raise _ERRORS_BY_CODE.get(value['error'], WebDriverException)(value.get('message'))
+
+        if status >= 400:
+            raise WebDriverException('HTTP %d' % status)
+
+        return response
+
+    async def request(self, method, path, body=None):
+        """Sends an HTTP request and returns the status and the JSON body of the response"""
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        data = b'' if body is None else json.dumps(body).encode('utf-8')
+
+        async with self._lock:
+            is_reused_connection = self._writer is not None
+
+            try:
+                return await self._send(method, path, data)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self._disconnect()
+
+                # The server may close idle connections, in which case the request never reached it
+                if not is_reused_connection:
+                    raise
+
+            return await self._send(method, path, data)
+
+    async def close(self):
+        """Closes the connection to the server"""
+
+        writer = self._writer
+        self._disconnect()
+
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, AttributeError):
+                pass
+
+    async def _send(self, method, path, data):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+
+        headers = ['%s %s%s HTTP/1.1' % (method, self._path, path),
+                   'Host: %s:%d' % (self._host, self._port),
+                   'Accept: application/json',
+                   'Connection: keep-alive',
+                   'Content-Length: %d' % len(data)]
+
+        if data:
+            headers.append('Content-Type: application/json;charset=UTF-8')
+
+        self._writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + data)
+        await self._writer.drain()
+
+        status_line = await self._reader.readuntil(b'\r\n')
+        status = int(status_line.split()[1])
+        response_headers = await self._read_headers()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            response_data = await self._read_chunks()
+        else:
+            response_data = await self._reader.readexactly(int(response_headers.get('content-length', 0)))
+
+        if response_headers.get('connection', '').lower() == 'close':
+            self._disconnect()
+
+        return status, json.loads(response_data.decode('utf-8')) if response_data else None
+
+    async def _read_headers(self):
+        headers = {}
+
+        while True:
+            line = (await self._reader.readuntil(b'\r\n')).decode('latin-1').strip()
+
+            if line == '':
+                return headers
+
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    async def _read_chunks(self):
+        chunks = []
+
+        while True:
+            size = int((await self._reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            chunk = await self._reader.readexactly(size + 2)
+
+            if size == 0:
+                return b''.join(chunks)
+
+            chunks.append(chunk[:-2])
+
+    def _disconnect(self):
+        if self._writer is not None:
+            self._writer.close()
+
+        self._reader = None
+        self._writer = None
@@ -0,0 +1,389 @@
+import asyncio
+import time
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchFrameException
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import UnexpectedTagNameException
+from selenium.webdriver.common.keys import Keys
+
+from pyselenium._selenium_wrapper import DEFAULT_TIMEOUT
+from pyselenium._selenium_wrapper import IS_DISPLAYED_SCRIPT
+from pyselenium._selenium_wrapper import SET_TEXT_SCRIPT
+from pyselenium._selenium_wrapper import CannotTypeTextError
+from pyselenium._selenium_wrapper import DriverMetrics
+from pyselenium._selenium_wrapper import ElementNotFoundError
+from pyselenium._selenium_wrapper import InvalidElementException
+from pyselenium._selenium_wrapper import InvalidOptionTextException
+from pyselenium._selenium_wrapper import NoSuchAttributeError
+from pyselenium._selenium_wrapper import UnknownErrorException
+from pyselenium._webdriver_http import WebDriverHttpClient
+from pyselenium.launch_profiles import DEFAULT_LAUNCH_PROFILE
+from pyselenium.launch_profiles import get_launch_profile
+
+# The time, in seconds, between two looks for an element, as in Selenium's WebDriverWait
+POLL_INTERVAL = 0.5
+
+# The keys that web elements are referred to by in the JSON Wire Protocol and in the W3C protocol
+_ELEMENT_KEYS = ('ELEMENT', 'element-6066-11e4-a52e-4f973124dcf9')
+
+
+class AsyncDriver:
+    """A driver that has the same methods as Driver, as coroutines, and speaks the WebDriver protocol to chromedriver
+    without blocking, so that a single thread can run many browser sessions at once.
+
+    Waits for elements by polling the page, sleeping with asyncio.sleep in between.
+
+    Attributes:
+        url -- The URL of a running chromedriver, such as DriverService.url
+        launch_profile -- The LaunchProfile, or the name of one, that describes how the browser is launched
+        metrics -- Counts the commands sent to the browser and the time spent waiting for elements
+        startup_time -- The time, in seconds, the browser took to start. None until the driver enters context
+        w3c -- True if chromedriver speaks the W3C protocol, False if it speaks the JSON Wire Protocol. Told by the
+        response to the new session command
+    """
+
+    def __init__(self, url, launch_profile=DEFAULT_LAUNCH_PROFILE):
+        if url is None or url == '':
+            raise ValueError('url')
+
+        self.url = url
+        self.launch_profile = get_launch_profile(launch_profile)
+        self.metrics = DriverMetrics()
+        self.startup_time = None
+        self.session_id = None
+        self.w3c = False
+        self._client = self._get_http_client()
+        self._step_timeout = None
+        self._deadline = None
+
+    async def __aenter__(self):
+        """Starts the browser session once the object enters context"""
+
+        start_time = time.perf_counter()
+
+        capabilities = self.launch_profile.get_chrome_options().to_capabilities()
+        capabilities.update(self.launch_profile.get_capabilities())
+
+        response = await self._client.execute('POST', '/session', {'desiredCapabilities': capabilities,
+                                                                   'capabilities': {'alwaysMatch': capabilities}})
+        self.metrics.command_count += 1
+
+        # Only the JSON Wire Protocol has the session id at the top of the response
+        self.w3c = 'sessionId' not in response
+        self.session_id = response['value']['sessionId'] if self.w3c else response['sessionId']
+
+        if self.launch_profile.window_size is None:
+            await self._execute('POST', '/window/maximize' if self.w3c else '/window/current/maximize')
+
+        self.startup_time = time.perf_counter() - start_time
+
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        """Ends the browser session once the object exits context"""
+
+        try:
+            if self.session_id is not None:
+                await self._execute('DELETE', '')
+        finally:
+            self.session_id = None
+            await self._client.close()
+
+    def set_timeout_budget(self, step_timeout=None, deadline=None):
+        """Sets how long the commands that follow may wait for elements to show up on the page, as in Driver."""
+
+        if step_timeout is not None and step_timeout < 0:
+            raise ValueError('step_timeout')
+
+        self._step_timeout = step_timeout
+        self._deadline = deadline
+
+    async def navigate(self, url):
+        """Navigates to the specified URL"""
+
+        if url is None:
+            raise TypeError('url')
+
+        if url == '':
+            raise ValueError('url')
+
+        await self._execute('POST', '/url', {'url': url})
+
+    async def click(self, css_path, hint):
+        """Tries to find an element on the web page and click it.
+        Raises an error if the element can't be found or clicked."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        element = await self._find_element_with_timeout(css_path, hint, self._get_element_timeout(),
+                                                        self._is_clickable)
+
+        await self._execute('POST', '/element/%s/click' % element)
+
+    async def click_if_found(self, css_path, hint, wait_time):
+        """Tries to click an element on the web page for the time specified as the wait time.
+        Does nothing if the element is not found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css-path')
+
+        if wait_time is None or wait_time < 0:
+            raise ValueError('wait_time')
+
+        try:
+            element = await self._find_element_with_timeout(css_path, hint, wait_time)
+        except ElementNotFoundError:
+            pass
+        else:
+            await self._execute('POST', '/element/%s/click' % element)
+
+    async def get_element_attribute(self, css_path, hint, attribute_name):
+        """Tries to get an attribute value from an element on the web page.
+        Raises errors if the element can't be found or if it doesn't have the specified attribute."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        if attribute_name is None or attribute_name == '':
+            raise ValueError('attribute_name')
+
+        element = await self.find_element(css_path, hint)
+
+        try:
+            attribute_value = await self._execute('GET', '/element/%s/attribute/%s' % (element, attribute_name))
+        except Exception as exception:
+            raise NoSuchAttributeError(css_path, hint, attribute_name, exception)
+
+        if attribute_value is None or attribute_value == '':
+            raise NoSuchAttributeError(css_path, hint, attribute_name, None)
+
+        return attribute_value
+
+    async def get_element_value(self, css_path, hint):
+        """Tries to get the value of an element on the web page.
+        Raises errors if the element can't be found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        element = await self.find_element(css_path, hint)
+
+        return await self._execute('GET', '/element/%s/text' % element)
+
+    async def find_element(self, css_path, hint):
+        """Tries to find an element on the web page and returns its id.
+         Raises an error if the element can't be found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        return await self._find_element_with_timeout(css_path, hint, self._get_element_timeout())
+
+    async def can_find_element(self, css_path, wait_time):
+        """Tries to find an element at the given CSS path. Returns true if one is found, false otherwise."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        if wait_time is None or wait_time < 0:
+            raise ValueError('wait_time')
+
+        try:
+            await self._find_element_with_timeout(css_path, '', wait_time)
+        except ElementNotFoundError:
+            return False
+        else:
+            return True
+
+    async def send_text(self, css_path, hint, text):
+        """Finds an element and sends the specified text to it as if the user typed it.
+        Raises errors if the element can not be found."""
+
+        if text is None or text == '':
+            raise ValueError('text')
+
+        element = await self.find_element(css_path, hint)
+
+        try:
+            # As in Driver.send_text, to trigger any JS events on the element before sending the actual text
+            await self._send_keys(element, Keys.NUMPAD1)
+            await self._execute('POST', '/element/%s/clear' % element)
+            await self._send_keys(element, text)
+        except Exception as exception:
+            raise CannotTypeTextError(css_path, hint, text, exception)
+
+    async def set_text(self, css_path, hint, text):
+        """Finds an element and sets its text in a single call to the browser, firing the input and change events.
+        Raises errors if the element can not be found or doesn't accept text."""
+
+        if text is None or text == '':
+            raise ValueError('text')
+
+        element = await self.find_element(css_path, hint)
+
+        try:
+            await self._execute_script(SET_TEXT_SCRIPT, [self._get_element_reference(element), text])
+        except Exception as exception:
+            raise CannotTypeTextError(css_path, hint, text, exception)
+
+    async def send_enter_key(self):
+        """Sends the enter key to the page as if the user had pressed the return button on the keyboard."""
+
+        try:
+            # Sent to the element that has the focus, since the W3C protocol has no command for keys sent to the page
+            active_element = await self._execute('GET' if self.w3c else 'POST', '/element/active')
+
+            await self._send_keys(self._get_element_id(active_element), Keys.RETURN)
+        except Exception as exception:
+            raise UnknownErrorException(exception)
+
+    async def select_drop_down_item_by_text(self, css_path, hint, item_text):
+        """Finds a Select element and selects an item by its text.
+        Raises errors if the element can not be found or if it is not a Select web element."""
+
+        if item_text is None or item_text == '':
+            raise ValueError('item_text')
+
+        element = await self.find_element(css_path, hint)
+
+        tag_name = await self._execute('GET', '/element/%s/name' % element)
+
+        if tag_name.lower() != 'select':
+            raise InvalidElementException(css_path, hint, UnexpectedTagNameException(
+                'Select only works on <select> elements, not on <%s>' % tag_name))
+
+        options = await self._execute('POST', '/element/%s/elements' % element,
+                                      {'using': 'xpath',
+                                       'value': './/option[normalize-space(.) = %s]' % _quote_xpath(item_text)})
+
+        if len(options) == 0:
+            raise InvalidOptionTextException(css_path, hint, item_text, NoSuchElementException(
+                'Could not locate element with visible text: %s' % item_text))
+
+        # As Selenium's Select does, every matching option is selected in lists of many, only the first one otherwise
+        is_multiple = await self._execute('GET', '/element/%s/attribute/multiple' % element)
+
+        for option in options if is_multiple else options[:1]:
+            option_element = self._get_element_id(option)
+
+            if not await self._execute('GET', '/element/%s/selected' % option_element):
+                await self._execute('POST', '/element/%s/click' % option_element)
+
+    async def set_checkbox(self, css_path, hint, checked):
+        """Finds a checkbox element and checks or unchecks it by clicking on it.
+        Raises errors if the element can not be found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        if checked is None:
+            raise ValueError('checked')
+
+        element = await self.find_element(css_path, hint)
+
+        if await self._execute('GET', '/element/%s/selected' % element) != checked:
+            await self._execute('POST', '/element/%s/click' % element)
+
+    async def switch_to_frame(self, css_path, hint):
+        """Switches the context of the web driver to the frame at the specified CSS path.
+        Raises errors if the frame can not be found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        frame = await self.find_element(css_path, hint)
+
+        try:
+            await self._execute('POST', '/frame', {'id': self._get_element_reference(frame)})
+        except NoSuchFrameException as exception:
+            raise InvalidElementException(css_path, hint, exception)
+
+    async def switch_to_default_content(self):
+        """Switches the context of the web driver to the default content of the page."""
+
+        await self._execute('POST', '/frame', {'id': None})
+
+    def _get_element_timeout(self):
+        return DEFAULT_TIMEOUT if self._step_timeout is None else self._step_timeout
+
+    def _limit_to_deadline(self, timeout):
+        if self._deadline is None:
+            return timeout
+
+        return max(0, min(timeout, self._deadline - time.monotonic()))
+
+    async def _find_element_with_timeout(self, css_path, hint, timeout, condition=None):
+        """Looks for the element until it is found, and meets the condition if any, or until the timeout expires.
+        Sleeps between two looks without blocking the event loop."""
+
+        start_time = time.monotonic()
+        end_time = start_time + self._limit_to_deadline(timeout)
+        last_exception = None
+
+        try:
+            while True:
+                self.metrics.wait_poll_count += 1
+
+                try:
+                    response = await self._execute('POST', '/element', {'using': 'css selector', 'value': css_path})
+                    element = self._get_element_id(response)
+
+                    if condition is None or await condition(element):
+                        return element
+                except (NoSuchElementException, StaleElementReferenceException) as exception:
+                    last_exception = exception
+
+                remaining_time = end_time - time.monotonic()
+
+                if remaining_time <= 0:
+                    raise ElementNotFoundError(css_path, hint, last_exception)
+
+                await asyncio.sleep(min(POLL_INTERVAL, remaining_time))
+        finally:
+            self.metrics.wait_time += time.monotonic() - start_time
+
+    async def _is_clickable(self, element):
+        return await self._execute_script(IS_DISPLAYED_SCRIPT, [self._get_element_reference(element)]) and \
+            await self._execute('GET', '/element/%s/enabled' % element)
+
+    async def _execute_script(self, script, args):
+        path = '/execute/sync' if self.w3c else '/execute'
+        return await self._execute('POST', path, {'script': script, 'args': args})
+
+    async def _send_keys(self, element, text):
+        # The JSON Wire Protocol takes the characters to type, the W3C protocol takes the text
+        await self._execute('POST', '/element/%s/value' % element, {'value': list(text), 'text': text})
+
+    async def _execute(self, method, path, body=None):
+        self.metrics.command_count += 1
+
+        response = await self._client.execute(method, '/session/%s%s' % (self.session_id, path), body)
+
+        return response.get('value') if isinstance(response, dict) else response
+
+    def _get_element_id(self, element_reference):
+        for key in _ELEMENT_KEYS:
+            if key in element_reference:
+                return element_reference[key]
+
+        raise ValueError('element_reference')
+
+    def _get_element_reference(self, element):
+        return {key: element for key in _ELEMENT_KEYS}
+
+    def _get_http_client(self):
+        return WebDriverHttpClient(self.url)
+
+
+def _quote_xpath(text):
+    """Returns an XPath string literal for the text, which may contain both kinds of quotes"""
+
+    if '"' not in text:
+        return '"%s"' % text
+
+    if "'" not in text:
+        return "'%s'" % text
+
+    return 'concat(%s)' % ', \'"\', '.join('"%s"' % part for part in text.split('"'))
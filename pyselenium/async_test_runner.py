@@ -0,0 +1,106 @@
+import time
+
+from pyselenium.test_runner import TestResult
+from pyselenium.test_runner import is_cut_short_by_deadline
+from pyselenium.test_steps import DeadlineExceededError
+from pyselenium.test_steps import StepResult
+
+
+class AsyncTestRunner:
+    """Runs every test step on an AsyncDriver and collects the execution result, without blocking the event loop, so
+    that many tests can run at once on a single thread, e.g. with asyncio.gather.
+
+    Steps are run with their run_async coroutine, which every step deriving from DriverCallStep has.
+
+    Attributes:
+        test -- The test to be run
+        driver_factory -- A callable that creates the driver for the test, such as a partial of AsyncDriver
+        fail_fast -- If True, the steps that follow a failed step are skipped instead of run
+        reporters -- The Reporters that the result of every step and the result of the test are handed to as soon as
+        they are known
+        compact_results -- If True, the results of the steps are compacted once they are reported and added to the test
+        result, keeping a summary of their exceptions instead of the exceptions
+        payload_directory -- The directory that compacted results write the full details of their exceptions to. The
+        details are dropped if None
+    """
+
+    def __init__(self, test, driver_factory, fail_fast=False, reporters=None, compact_results=False,
+                 payload_directory=None):
+        if driver_factory is None:
+            raise ValueError('driver_factory')
+
+        self.test = test
+        self.driver_factory = driver_factory
+        self.fail_fast = fail_fast
+        self.reporters = reporters or []
+        self.compact_results = compact_results
+        self.payload_directory = payload_directory
+
+    async def run_test(self):
+        """Runs the supplied test and returns the result of the execution"""
+
+        if len(self.test.steps) == 0:
+            raise ValueError('no steps on the test')
+
+        test_result = TestResult(self.test)
+        deadline = None if self.test.timeout is None else time.monotonic() + self.test.timeout
+        failed = False
+
+        async with self.driver_factory() as driver:
+            try:
+                for step in self.test.steps:
+                    if (self.fail_fast and failed) or (deadline is not None and time.monotonic() >= deadline):
+                        break
+
+                    step_result = await self._run_measured_step(step, driver, deadline)
+                    failed = failed or not step_result.success
+
+                    self._add_step_result(test_result, step_result)
+            finally:
+                driver.set_timeout_budget()
+
+        for step in self.test.steps[len(test_result.step_results):]:
+            self._add_step_result(test_result, self._get_skipped_result(step) if self.fail_fast and failed
+                                  else self._get_deadline_exceeded_result(step))
+
+        for reporter in self.reporters:
+            reporter.report_test_result(test_result)
+
+        return test_result
+
+    def _add_step_result(self, test_result, step_result):
+        for reporter in self.reporters:
+            reporter.report_step_result(self.test, len(test_result.step_results), step_result)
+
+        test_result.add_step_result(step_result)
+
+        if self.compact_results:
+            step_result.compact(self.payload_directory)
+
+    async def _run_measured_step(self, step, driver, deadline):
+        started_at = time.time()
+        metrics = driver.metrics.snapshot()
+
+        driver.set_timeout_budget(getattr(step, 'timeout', None), deadline)
+        start_time = time.monotonic()
+
+        step_result = await step.run_async(driver)
+
+        if is_cut_short_by_deadline(step_result, start_time, deadline):
+            step_result.exception = DeadlineExceededError(self.test.timeout)
+
+        step_result.record_timing(started_at, time.time(), driver.metrics.since(metrics))
+
+        return step_result
+
+    def _get_skipped_result(self, step):
+        step_result = StepResult(step)
+        step_result.skip()
+
+        return step_result
+
+    def _get_deadline_exceeded_result(self, step):
+        step_result = StepResult(step)
+        step_result.exception = DeadlineExceededError(self.test.timeout)
+
+        return step_result
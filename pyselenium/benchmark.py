@@ -0,0 +1,397 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from socketserver import ThreadingMixIn
+
+from pyselenium._selenium_wrapper import Driver
+from pyselenium.cdp_driver import CdpDriver
+from pyselenium.simulated_driver import SimulatedDriver
+from pyselenium.test_metadata import Test
+from pyselenium.test_runner import TestRunner
+from pyselenium.test_steps import AssertElementAttributeValue
+from pyselenium.test_steps import AssertElementNotPresent
+from pyselenium.test_steps import AssertElementValue
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import ClickIfFound
+from pyselenium.test_steps import FAST_TYPING_MODE
+from pyselenium.test_steps import Navigate
+from pyselenium.test_steps import SelectDropDownItemByText
+from pyselenium.test_steps import SendEnter
+from pyselenium.test_steps import SetCheckbox
+from pyselenium.test_steps import SwitchFrame
+from pyselenium.test_steps import SwitchToDefaultContent
+from pyselenium.test_steps import TypeText
+
+# The first keys of every results file, to tell results apart from other files and from future formats
+RESULTS_HEADER = OrderedDict([('format', 'pyselenium-benchmark'), ('version', 1)])
+
+# The percentiles of the step durations that are reported
+REPORTED_PERCENTILES = [50, 95, 99]
+
+# The drivers the benchmark can be run on from the command line
+BENCHMARK_DRIVERS = OrderedDict([('chrome', Driver), ('cdp', CdpDriver), ('simulated', SimulatedDriver)])
+
+# The pages the steps are run on
+FIXTURE_PAGES = {
+    '/index.html': '<!DOCTYPE html>'
+                   '<html><head><title>Benchmark</title></head><body>'
+                   '<h1 id="title">Benchmark</h1>'
+                   '<a id="link" href="/index.html">Home</a>'
+                   '<button id="button" type="button">Button</button>'
+                   '<input id="text" name="text">'
+                   '<input id="checkbox" type="checkbox">'
+                   '<select id="select"><option>First</option><option>Second</option></select>'
+                   '<form id="form" action="/index.html"><input id="search" name="q"></form>'
+                   '<iframe id="frame" src="/frame.html"></iframe>'
+                   '</body></html>',
+    '/frame.html': '<!DOCTYPE html>'
+                   '<html><body><p id="inside">Inside the frame</p></body></html>'
+}
+
+
+class BenchmarkServer:
+    """A local HTTP server that serves the fixture pages the steps of the benchmark are run on.
+
+    The server runs in a process of its own, so that the CPU time it spends serving the pages to the browser isn't
+    counted as CPU time of the framework.
+
+    Attributes:
+        pages -- The HTML of the pages, by path
+    """
+
+    def __init__(self, pages=FIXTURE_PAGES):
+        self.pages = pages
+        self._port = None
+        self._process = None
+
+    def __enter__(self):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(target=_serve_pages, args=(self.pages, sender), daemon=True)
+        self._process.start()
+        sender.close()
+
+        try:
+            self._port = receiver.recv()
+        except EOFError:
+            self._process.join()
+            raise RuntimeError('The benchmark server failed to start')
+        finally:
+            receiver.close()
+
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self._process.terminate()
+        self._process.join()
+
+    @property
+    def url(self):
+        """Gets the URL the pages are served at, without a trailing slash"""
+
+        return 'http://127.0.0.1:%d' % self._port
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    # http.server.ThreadingHTTPServer only exists from Python 3.7 on
+    daemon_threads = True
+
+
+def _serve_pages(pages, sender):
+    server = _ThreadingHTTPServer(('127.0.0.1', 0), _get_handler_class(pages))
+    sender.send(server.server_address[1])
+    sender.close()
+    server.serve_forever(poll_interval=0.05)
+
+
+def _get_handler_class(pages):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            page = pages.get(self.path.split('?')[0])
+            body = (page or 'Not found').encode('utf-8')
+
+            self.send_response(200 if page is not None else 404)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class BenchmarkCase:
+    """The steps that are run over and over to measure one type of step
+
+    Attributes:
+        step_type -- The class of the steps that are measured
+        steps -- The steps run on every iteration, some of which can be there only to undo what the measured steps did
+    """
+
+    def __init__(self, step_type, steps):
+        self.step_type = step_type
+        self.steps = steps
+
+    @property
+    def name(self):
+        """Gets the name of the type of step that is measured"""
+
+        return self.step_type.__name__
+
+
+def get_benchmark_cases(url):
+    """Returns a BenchmarkCase for every type of step, to be run on the fixture pages served at the URL"""
+
+    checkbox_steps = [SetCheckbox('#checkbox', 'Checkbox', True), SetCheckbox('#checkbox', 'Checkbox', False)]
+    frame_steps = [SwitchFrame('#frame', 'Frame'), SwitchToDefaultContent()]
+
+    return [
+        BenchmarkCase(Navigate, [Navigate(url + '/index.html')]),
+        BenchmarkCase(Click, [Click('#button', 'Button')]),
+        BenchmarkCase(ClickIfFound, [ClickIfFound('#button', 'Button', 1)]),
+        BenchmarkCase(AssertElementValue, [AssertElementValue('#title', 'Title', 'Benchmark')]),
+        BenchmarkCase(AssertElementAttributeValue, [AssertElementAttributeValue('#link', 'Link', 'id', 'link')]),
+        BenchmarkCase(AssertElementNotPresent, [AssertElementNotPresent('#missing', 'Missing element', 0)]),
+        BenchmarkCase(TypeText, [TypeText('#text', 'Text input', 'text')]),
+        BenchmarkCase(SendEnter, [TypeText('#search', 'Search input', 'query', FAST_TYPING_MODE), SendEnter()]),
+        BenchmarkCase(SelectDropDownItemByText, [SelectDropDownItemByText('#select', 'Select', 'Second')]),
+        BenchmarkCase(SetCheckbox, checkbox_steps),
+        BenchmarkCase(SwitchFrame, frame_steps),
+        BenchmarkCase(SwitchToDefaultContent, frame_steps),
+    ]
+
+
+class StepStatistics:
+    """Collects the measurements of the runs of one type of step
+
+    Attributes:
+        name -- The name of the type of step
+        durations -- The time, in seconds, each run took
+        cpu_times -- The CPU time, in seconds, this process spent on each run, which leaves the browser and the server
+        of the fixture pages out
+        command_counts -- The number of WebDriver commands each run sent to the browser
+        failure_count -- The number of runs that failed, which makes the other measurements unreliable
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.durations = []
+        self.cpu_times = []
+        self.command_counts = []
+        self.failure_count = 0
+
+    def record(self, step_result, cpu_time):
+        """Records the measurements of a run of the step"""
+
+        self.durations.append(step_result.duration)
+        self.cpu_times.append(cpu_time)
+        self.command_counts.append(step_result.command_count)
+
+        if not step_result.success:
+            self.failure_count += 1
+
+    @property
+    def count(self):
+        """Gets the number of runs recorded"""
+
+        return len(self.durations)
+
+    def get_percentile(self, percentile):
+        """Gets the duration, in seconds, that the given percentage of the runs took at most"""
+
+        return _get_percentile(self.durations, percentile)
+
+    def to_dict(self):
+        """Returns the summary of the measurements that results files hold"""
+
+        summary = OrderedDict([('count', self.count), ('failures', self.failure_count)])
+
+        for percentile in REPORTED_PERCENTILES:
+            summary['p%d' % percentile] = self.get_percentile(percentile)
+
+        summary['mean'] = _get_mean(self.durations)
+        summary['cpu_time'] = _get_mean(self.cpu_times)
+        summary['commands'] = _get_mean(self.command_counts)
+
+        return summary
+
+
+class Benchmark:
+    """Runs every type of step many times on fixture pages served by a local HTTP server and measures how long the
+    steps take, how many WebDriver commands they send and how much CPU time the framework spends on them.
+
+    Every case runs as a test of its own in a new driver, and the runs of the first iterations are left out of the
+    measurements, while caches warm up.
+
+    Attributes:
+        driver_factory -- A callable that creates the driver the steps are run on, such as Driver or a partial of it
+        iterations -- The number of times the steps of every case are measured
+        warmup_iterations -- The number of times the steps of every case are run before they are measured
+        step_names -- The names of the types of step to measure. Every type of step if None
+    """
+
+    def __init__(self, driver_factory=Driver, iterations=50, warmup_iterations=3, step_names=None):
+        self.driver_factory = driver_factory
+        self.iterations = iterations
+        self.warmup_iterations = warmup_iterations
+        self.step_names = step_names
+
+    def run(self):
+        """Runs the benchmark and returns the StepStatistics of every type of step measured, by name"""
+
+        statistics = OrderedDict()
+
+        with BenchmarkServer() as server:
+            for case in get_benchmark_cases(server.url):
+                if self.step_names is None or case.name in self.step_names:
+                    statistics[case.name] = self._run_case(case, server.url)
+
+        return statistics
+
+    def _run_case(self, case, url):
+        test = Test('%s benchmark' % case.name)
+        test.add_step(Navigate(url + '/index.html'))
+
+        for iteration in range(self.warmup_iterations + self.iterations):
+            for step in case.steps:
+                test.add_step(step)
+
+        measured_from = 1 + self.warmup_iterations * len(case.steps)
+        statistics = StepStatistics(case.name)
+
+        cpu_time = time.process_time()
+
+        for index, step_result in enumerate(TestRunner(test, driver_factory=self.driver_factory).iter_test()):
+            step_cpu_time = time.process_time() - cpu_time
+
+            if index >= measured_from and type(step_result.step) is case.step_type:
+                statistics.record(step_result, step_cpu_time)
+
+            cpu_time = time.process_time()
+
+        return statistics
+
+
+def get_results(statistics, driver_name, iterations):
+    """Returns the results of a benchmark, as saved to results files"""
+
+    results = OrderedDict(RESULTS_HEADER)
+    results['driver'] = driver_name
+    results['iterations'] = iterations
+    results['python'] = platform.python_version()
+    results['platform'] = platform.platform()
+    results['created_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    results['steps'] = OrderedDict((name, step_statistics.to_dict()) for name, step_statistics in statistics.items())
+
+    return results
+
+
+def save_results(path, results):
+    """Saves the results of a benchmark to a JSON file"""
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+        file.write('\n')
+
+
+def load_results(path):
+    """Loads the results of a benchmark from a JSON file. Raises ValueError if the file doesn't hold results."""
+
+    with open(path, encoding='utf-8') as file:
+        results = json.load(file, object_pairs_hook=OrderedDict)
+
+    if not isinstance(results, dict) or any(results.get(key) != value for key, value in RESULTS_HEADER.items()):
+        raise ValueError('%s does not hold benchmark results' % path)
+
+    return results
+
+
+def format_results(results, baseline=None):
+    """Returns a table of the results of a benchmark. Given the results of an earlier benchmark, such as one run on a
+    previous version or on another driver, the change of the median duration of every type of step is shown too."""
+
+    header = '%-28s %6s %9s %9s %9s %9s %9s' % ('Step', 'Runs', 'p50 ms', 'p95 ms', 'p99 ms', 'CPU ms', 'Commands')
+
+    if baseline is not None:
+        header += ' %9s' % 'p50 diff'
+
+    lines = [header]
+
+    for name, summary in results['steps'].items():
+        line = '%-28s %6d %9.3f %9.3f %9.3f %9.3f %9.1f' % (name, summary['count'], summary['p50'] * 1000,
+                                                            summary['p95'] * 1000, summary['p99'] * 1000,
+                                                            summary['cpu_time'] * 1000, summary['commands'])
+
+        if baseline is not None:
+            line += ' %9s' % _format_change(baseline['steps'].get(name), summary)
+
+        if summary['failures'] > 0:
+            line += ' (%d failed)' % summary['failures']
+
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+
+def main(arguments=None):
+    """Runs the benchmark from the command line"""
+
+    parser = argparse.ArgumentParser(prog='python -m pyselenium.benchmark',
+                                     description='Measures the time PySelenium takes to run every type of step.')
+    parser.add_argument('--driver', choices=list(BENCHMARK_DRIVERS), default='chrome',
+                        help='the driver to run the steps on')
+    parser.add_argument('--launch-profile', default='headless-fast', help='the launch profile of the browser')
+    parser.add_argument('--iterations', type=int, default=50, help='the number of measured runs of every step')
+    parser.add_argument('--warmup-iterations', type=int, default=3,
+                        help='the number of runs of every step before the measured runs')
+    parser.add_argument('--steps', help='the comma separated names of the steps to measure, every step if omitted')
+    parser.add_argument('--output', help='the JSON file to save the results to')
+    parser.add_argument('--baseline', help='a JSON file of earlier results to compare the results with')
+
+    arguments = parser.parse_args(arguments)
+
+    driver_class = BENCHMARK_DRIVERS[arguments.driver]
+    step_names = None if arguments.steps is None else arguments.steps.split(',')
+    baseline = None if arguments.baseline is None else load_results(arguments.baseline)
+
+    benchmark = Benchmark(lambda: driver_class(launch_profile=arguments.launch_profile), arguments.iterations,
+                          arguments.warmup_iterations, step_names)
+    results = get_results(benchmark.run(), arguments.driver, arguments.iterations)
+
+    if arguments.output is not None:
+        save_results(arguments.output, results)
+
+    print(format_results(results, baseline))
+
+
+def _get_percentile(values, percentile):
+    if len(values) == 0:
+        return 0.0
+
+    values = sorted(values)
+
+    # The nearest-rank percentile, which is always one of the values
+    return values[max(0, -(-len(values) * percentile // 100) - 1)]
+
+
+def _get_mean(values):
+    return sum(values) / len(values) if len(values) > 0 else 0.0
+
+
+def _format_change(baseline_summary, summary):
+    if baseline_summary is None or baseline_summary['p50'] == 0:
+        return '-'
+
+    return '%+.1f%%' % ((summary['p50'] / baseline_summary['p50'] - 1) * 100)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,612 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from urllib.request import urlopen
+
+from selenium.webdriver.remote.webelement import getAttribute_js
+
+from pyselenium._cdp import CdpConnection
+from pyselenium._cdp import CdpError
+from pyselenium._cdp import WebSocket
+from pyselenium._selenium_wrapper import BLANK_PAGE_URL
+from pyselenium._selenium_wrapper import CLEAR_WEB_STORAGE_SCRIPT
+from pyselenium._selenium_wrapper import DEFAULT_TIMEOUT
+from pyselenium._selenium_wrapper import NORMALIZE_TEXT_FUNCTION
+from pyselenium._selenium_wrapper import READ_ELEMENTS_SCRIPT
+from pyselenium._selenium_wrapper import SET_TEXT_SCRIPT
+from pyselenium._selenium_wrapper import CannotTypeTextError
+from pyselenium._selenium_wrapper import DriverMetrics
+from pyselenium._selenium_wrapper import ElementNotFoundError
+from pyselenium._selenium_wrapper import InvalidElementException
+from pyselenium._selenium_wrapper import InvalidOptionTextException
+from pyselenium._selenium_wrapper import NoSuchAttributeError
+from pyselenium._selenium_wrapper import UnknownErrorException
+from pyselenium.launch_profiles import DEFAULT_LAUNCH_PROFILE
+from pyselenium.launch_profiles import get_launch_profile
+
+# The time, in seconds, that commands that don't wait for elements may take, such as starting the browser
+COMMAND_TIMEOUT = 30
+
+# The groups of the remote objects the driver creates in the page, which the page holds on to until they are released:
+# the elements found by the steps, and the frames switched to, which are kept until switching back to the page
+ELEMENT_OBJECT_GROUP = 'pyselenium-elements'
+FRAME_OBJECT_GROUP = 'pyselenium-frames'
+
+# The number of elements found before their remote objects are released, all at once, so that releasing them takes a
+# command every so many steps rather than every step
+MAX_HELD_ELEMENTS = 100
+
+# Finds an element in the document of the frame the function is called on, or in the page when called on null.
+# Waits until the element is there, and visible and enabled if required, or until the timeout, in milliseconds, expires.
+# Polls the page from within the page, so that waiting takes a single command.
+WAIT_FOR_ELEMENT_FUNCTION = '''
+function (cssPath, timeout, clickable) {
+    var root = this && this.contentDocument !== undefined ? this.contentDocument : document;
+    var start = Date.now();
+
+    if (root === null) {
+        throw new Error('The frame can not be accessed');
+    }
+
+    function isClickable(element) {
+        var style = window.getComputedStyle(element);
+
+        return element.getClientRects().length > 0 && style.visibility !== 'hidden' && !element.disabled;
+    }
+
+    return new Promise(function (resolve) {
+        (function check() {
+            var element = root.querySelector(cssPath);
+
+            if (element !== null && (!clickable || isClickable(element))) {
+                resolve(element);
+            } else if (Date.now() - start >= timeout) {
+                resolve(null);
+            } else {
+                setTimeout(check, 50);
+            }
+        })();
+    });
+}
+'''
+
+# Scrolls an element into view and returns the point at its center, relative to the top level page
+GET_CLICK_POINT_FUNCTION = '''
+function () {
+    this.scrollIntoView({block: 'center', inline: 'center'});
+
+    var rect = this.getBoundingClientRect();
+    var x = rect.left + rect.width / 2;
+    var y = rect.top + rect.height / 2;
+    var view = this.ownerDocument.defaultView;
+
+    while (view.frameElement) {
+        var frameRect = view.frameElement.getBoundingClientRect();
+
+        x += frameRect.left + view.frameElement.clientLeft;
+        y += frameRect.top + view.frameElement.clientTop;
+        view = view.parent;
+    }
+
+    return [x, y];
+}
+'''
+
+# Returns the text of an element as WebElement.text does, which is empty for hidden elements
+GET_TEXT_FUNCTION = '''
+function () {
+    var normalizeText = %s;
+
+    return this.getClientRects().length > 0 ? normalizeText(this.innerText) : '';
+}
+''' % NORMALIZE_TEXT_FUNCTION
+
+# Selects the options of a select element whose text is the given one, and fires the events the user would fire
+SELECT_OPTION_FUNCTION = '''
+function (text) {
+    if (this.tagName.toLowerCase() !== 'select') {
+        return 'not a select';
+    }
+
+    var options = Array.prototype.filter.call(this.options, function (option) {
+        return option.text.replace(/\\s+/g, ' ').trim() === text;
+    });
+
+    if (options.length === 0) {
+        return 'no such option';
+    }
+
+    options.forEach(function (option) {
+        option.selected = true;
+    });
+
+    this.dispatchEvent(new Event('input', {bubbles: true}));
+    this.dispatchEvent(new Event('change', {bubbles: true}));
+
+    return 'selected';
+}
+'''
+
+CLEAR_VALUE_FUNCTION = '''
+function () {
+    this.focus();
+
+    if (this.select) {
+        this.select();
+    }
+
+    this.value = '';
+    this.dispatchEvent(new Event('input', {bubbles: true}));
+}
+'''
+
+# Runs a script written for execute_script, reading arguments[0], in the document of the frame the function is called on
+FRAME_SCRIPT_FUNCTION = '''
+function () {
+    var document = this && this.contentDocument ? this.contentDocument : window.document;
+    %s
+}
+'''
+
+_LOAD_EVENTS = {'eager': 'Page.domContentEventFired', 'none': None}
+
+
+class CdpDriver:
+    """A driver that has the same methods as Driver but talks to Chrome over the DevTools protocol directly, instead of
+    going through chromedriver, which saves a hop per command. Waits for elements from within the page.
+
+    Attributes:
+        launch_profile -- The LaunchProfile, or the name of one, that describes how the browser is launched
+        debugger_url -- The URL of the DevTools HTTP endpoint of a running Chrome, such as http://127.0.0.1:9222.
+        Chrome is started by the driver if None
+        chrome_executable -- The Chrome executable that is started when there is no debugger URL
+        metrics -- Counts the commands sent to the browser and the time spent waiting for elements
+        startup_time -- The time, in seconds, the browser took to start. None until the driver enters context
+    """
+
+    def __init__(self, launch_profile=DEFAULT_LAUNCH_PROFILE, debugger_url=None, chrome_executable='google-chrome'):
+        self.launch_profile = get_launch_profile(launch_profile)
+        self.debugger_url = debugger_url
+        self.chrome_executable = chrome_executable
+        self.metrics = DriverMetrics()
+        self.startup_time = None
+        self.connection = None
+        self._process = None
+        self._user_data_dir = None
+        self._frames = []
+        self._held_element_count = 0
+        self._step_timeout = None
+        self._deadline = None
+
+    def __enter__(self):
+        """Starts the browser, if there is no debugger URL, and connects to its page once the object enters context"""
+
+        start_time = time.perf_counter()
+
+        debugger_url = self.debugger_url
+
+        if debugger_url is None:
+            debugger_url = self._start_browser()
+
+        self.connection = self._get_connection(self._get_page_websocket_url(debugger_url))
+        self._send('Page.enable')
+
+        self.startup_time = time.perf_counter() - start_time
+
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Disconnects from the browser once the object exits context, quitting it if it was started by the driver"""
+
+        try:
+            if self.connection is not None:
+                self.connection.close()
+        finally:
+            self.connection = None
+            self._stop_browser()
+
+    def reset(self):
+        """Brings the page back to a clean state so that the session can be reused by another test.
+        Clears the cookies of every origin, the web storage of the origin of the current page and leaves the page
+        blank."""
+
+        self._send('Runtime.evaluate', {'expression': CLEAR_WEB_STORAGE_SCRIPT})
+        self._send('Network.clearBrowserCookies')
+        self.navigate(BLANK_PAGE_URL)
+        self.set_timeout_budget()
+
+    def get_process_id(self):
+        """Returns the id of the Chrome process started by the driver. None if it connects to a running Chrome."""
+
+        return None if self._process is None else self._process.pid
+
+    def set_timeout_budget(self, step_timeout=None, deadline=None):
+        """Sets how long the commands that follow may wait for elements to show up on the page, as in Driver."""
+
+        if step_timeout is not None and step_timeout < 0:
+            raise ValueError('step_timeout')
+
+        self._step_timeout = step_timeout
+        self._deadline = deadline
+
+    def navigate(self, url):
+        """Navigates to the specified URL and waits for the page to load as the page load strategy says"""
+
+        if url is None:
+            raise TypeError('url')
+
+        if url == '':
+            raise ValueError('url')
+
+        load_event = _LOAD_EVENTS.get(self.launch_profile.page_load_strategy, 'Page.loadEventFired')
+
+        self.connection.clear_events()
+        result = self._send('Page.navigate', {'url': url})
+
+        if 'errorText' in result:
+            raise UnknownErrorException(CdpError('Page.navigate', result['errorText']))
+
+        if load_event is not None:
+            self.connection.wait_for_event(load_event, COMMAND_TIMEOUT)
+
+        # The remote objects of the previous page went away with it
+        self._frames = []
+        self._held_element_count = 0
+
+    def click(self, css_path, hint):
+        """Tries to find an element on the web page and click it as the user would, with the mouse.
+        Raises an error if the element can't be found or clicked."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        element = self._find_element_with_timeout(css_path, hint, self._get_element_timeout(), clickable=True)
+
+        self._click_element(element)
+
+    def click_if_found(self, css_path, hint, wait_time):
+        """Tries to click an element on the web page for the time specified as the wait time.
+        Does nothing if the element is not found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css-path')
+
+        if wait_time is None or wait_time < 0:
+            raise ValueError('wait_time')
+
+        try:
+            element = self._find_element_with_timeout(css_path, hint, wait_time)
+        except ElementNotFoundError:
+            pass
+        else:
+            self._click_element(element)
+
+    def get_element_attribute(self, css_path, hint, attribute_name):
+        """Tries to get an attribute value from an element on the web page.
+        Raises errors if the element can't be found or if it doesn't have the specified attribute."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        if attribute_name is None or attribute_name == '':
+            raise ValueError('attribute_name')
+
+        element = self.find_element(css_path, hint)
+
+        try:
+            # Reads the attribute as WebElement.get_attribute does, e.g. the current value of inputs
+            attribute_value = self._call_function(element, 'function (name) { return (%s)(this, name); }' %
+                                                  getAttribute_js, [attribute_name])
+        except Exception as exception:
+            raise NoSuchAttributeError(css_path, hint, attribute_name, exception)
+
+        if attribute_value is None or attribute_value == '':
+            raise NoSuchAttributeError(css_path, hint, attribute_name, None)
+
+        return attribute_value
+
+    def get_element_value(self, css_path, hint):
+        """Tries to get the value of an element on the web page.
+        Raises errors if the element can't be found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        return self._call_function(self.find_element(css_path, hint), GET_TEXT_FUNCTION)
+
+    def read_elements(self, queries):
+        """Reads the text or an attribute of several elements in a single call to the browser, without waiting.
+        Takes a list of (css_path, attribute_name) tuples, as Driver.read_elements does."""
+
+        if queries is None or len(queries) == 0:
+            raise ValueError('queries')
+
+        values = self._call_function(self._get_frame(), FRAME_SCRIPT_FUNCTION % READ_ELEMENTS_SCRIPT,
+                                     [[list(query) for query in queries]])
+
+        return [(False, None) if value is None else (True, value[0]) for value in values]
+
+    def find_element(self, css_path, hint):
+        """Tries to find an element on the web page and returns the id of its remote object.
+         Raises an error if the element can't be found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        return self._find_element_with_timeout(css_path, hint, self._get_element_timeout())
+
+    def can_find_element(self, css_path, wait_time):
+        """Tries to find an element at the given CSS path. Returns true if one is found, false otherwise."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        if wait_time is None or wait_time < 0:
+            raise ValueError('wait_time')
+
+        try:
+            self._find_element_with_timeout(css_path, '', wait_time)
+        except ElementNotFoundError:
+            return False
+        else:
+            return True
+
+    def send_text(self, css_path, hint, text):
+        """Finds an element and types the specified text in it, key by key, as the user would.
+        Raises errors if the element can not be found."""
+
+        if text is None or text == '':
+            raise ValueError('text')
+
+        element = self.find_element(css_path, hint)
+
+        try:
+            self._call_function(element, CLEAR_VALUE_FUNCTION)
+
+            for character in text:
+                self._send('Input.dispatchKeyEvent', {'type': 'keyDown', 'text': character})
+                self._send('Input.dispatchKeyEvent', {'type': 'keyUp'})
+        except Exception as exception:
+            raise CannotTypeTextError(css_path, hint, text, exception)
+
+    def set_text(self, css_path, hint, text):
+        """Finds an element and sets its text in a single call to the browser, firing the input and change events.
+        Faster than send_text for long texts, but doesn't fire keyboard events. Raises errors if the element can not
+        be found or doesn't accept text."""
+
+        if text is None or text == '':
+            raise ValueError('text')
+
+        element = self.find_element(css_path, hint)
+
+        try:
+            self._call_function(element, 'function (element, text) { %s }' % SET_TEXT_SCRIPT,
+                                [{'objectId': element}, text])
+        except Exception as exception:
+            raise CannotTypeTextError(css_path, hint, text, exception)
+
+    def send_enter_key(self):
+        """Sends the enter key to the page as if the user had pressed the return button on the keyboard."""
+
+        try:
+            for event_type in ('keyDown', 'keyUp'):
+                self._send('Input.dispatchKeyEvent', {'type': event_type, 'key': 'Enter', 'code': 'Enter',
+                                                      'windowsVirtualKeyCode': 13, 'text': '\r'})
+        except Exception as exception:
+            raise UnknownErrorException(exception)
+
+    def select_drop_down_item_by_text(self, css_path, hint, item_text):
+        """Finds a Select element and selects an item by its text.
+        Raises errors if the element can not be found or if it is not a Select web element."""
+
+        if item_text is None or item_text == '':
+            raise ValueError('item_text')
+
+        result = self._call_function(self.find_element(css_path, hint), SELECT_OPTION_FUNCTION, [item_text])
+
+        if result == 'not a select':
+            raise InvalidElementException(css_path, hint, CdpError('Runtime.callFunctionOn', result))
+
+        if result == 'no such option':
+            raise InvalidOptionTextException(css_path, hint, item_text, CdpError('Runtime.callFunctionOn', result))
+
+    def set_checkbox(self, css_path, hint, checked):
+        """Finds a checkbox element and checks or unchecks it by clicking on it.
+        Raises errors if the element can not be found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        if checked is None:
+            raise ValueError('checked')
+
+        element = self.find_element(css_path, hint)
+
+        if self._call_function(element, 'function () { return this.checked; }') != checked:
+            self._click_element(element)
+
+    def switch_to_frame(self, css_path, hint):
+        """Switches the context of the driver to the frame at the specified CSS path.
+        Raises errors if the frame can not be found or can not be accessed, as cross-origin frames."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        frame = self._find_element_with_timeout(css_path, hint, self._get_element_timeout(),
+                                                object_group=FRAME_OBJECT_GROUP)
+
+        if not self._call_function(frame, 'function () { return !!this.contentDocument; }'):
+            self._send('Runtime.releaseObject', {'objectId': frame})
+
+            raise InvalidElementException(css_path, hint, CdpError('Runtime.callFunctionOn',
+                                                                   'The frame can not be accessed'))
+
+        self._frames.append(frame)
+
+    def switch_to_default_content(self):
+        """Switches the context of the driver to the default content of the page."""
+
+        if len(self._frames) > 0:
+            self._send('Runtime.releaseObjectGroup', {'objectGroup': FRAME_OBJECT_GROUP})
+
+        self._frames = []
+
+    def _get_element_timeout(self):
+        return DEFAULT_TIMEOUT if self._step_timeout is None else self._step_timeout
+
+    def _limit_to_deadline(self, timeout):
+        if self._deadline is None:
+            return timeout
+
+        return max(0, min(timeout, self._deadline - time.monotonic()))
+
+    def _find_element_with_timeout(self, css_path, hint, timeout, clickable=False, object_group=ELEMENT_OBJECT_GROUP):
+        timeout = self._limit_to_deadline(timeout)
+
+        if object_group == ELEMENT_OBJECT_GROUP:
+            self._release_elements_if_full()
+
+        start_time = time.monotonic()
+
+        self.metrics.wait_poll_count += 1
+
+        try:
+            result = self._call(self._get_frame(), WAIT_FOR_ELEMENT_FUNCTION,
+                                [css_path, int(timeout * 1000), clickable], False, timeout + COMMAND_TIMEOUT,
+                                object_group)
+        except CdpError as exception:
+            raise ElementNotFoundError(css_path, hint, exception)
+        finally:
+            self.metrics.wait_time += time.monotonic() - start_time
+
+        object_id = result.get('objectId')
+
+        if object_id is None:
+            raise ElementNotFoundError(css_path, hint, None)
+
+        if object_group == ELEMENT_OBJECT_GROUP:
+            self._held_element_count += 1
+
+        return object_id
+
+    def _release_elements_if_full(self):
+        # The elements found by the previous steps are released before the next one is found, never while in use
+        if self._held_element_count < MAX_HELD_ELEMENTS:
+            return
+
+        self._send('Runtime.releaseObjectGroup', {'objectGroup': ELEMENT_OBJECT_GROUP})
+        self._held_element_count = 0
+
+    def _click_element(self, element):
+        x, y = self._call_function(element, GET_CLICK_POINT_FUNCTION)
+
+        for event_type in ('mouseMoved', 'mousePressed', 'mouseReleased'):
+            self._send('Input.dispatchMouseEvent', {'type': event_type, 'x': x, 'y': y, 'button': 'left',
+                                                    'clickCount': 0 if event_type == 'mouseMoved' else 1})
+
+    def _get_frame(self):
+        return self._frames[-1] if self._frames else None
+
+    def _call_function(self, object_id, function, arguments=None):
+        return self._call(object_id, function, arguments or [], True).get('value')
+
+    def _call(self, object_id, function, arguments, return_by_value, timeout=COMMAND_TIMEOUT,
+              object_group=ELEMENT_OBJECT_GROUP):
+        """Calls the function on the remote object and returns the remote object of the result, which is created in
+        the given object group. Functions called on no object run in the page, with a null this, and only take JSON
+        arguments."""
+
+        if object_id is None:
+            method = 'Runtime.evaluate'
+            params = {'expression': '(%s).apply(null, %s)' % (function, json.dumps(arguments))}
+        else:
+            method = 'Runtime.callFunctionOn'
+            params = {'objectId': object_id,
+                      'functionDeclaration': function,
+                      'arguments': [argument if isinstance(argument, dict) else {'value': argument}
+                                    for argument in arguments]}
+
+        params['returnByValue'] = return_by_value
+        params['awaitPromise'] = True
+        params['objectGroup'] = object_group
+
+        result = self._send(method, params, timeout)
+
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+
+            raise CdpError(method, details.get('exception', {}).get('description', details.get('text')))
+
+        return result['result']
+
+    def _send(self, method, params=None, timeout=COMMAND_TIMEOUT):
+        self.metrics.command_count += 1
+        start_time = time.perf_counter()
+
+        try:
+            return self.connection.send(method, params, timeout)
+        finally:
+            self.metrics.command_latencies.record(method, time.perf_counter() - start_time)
+
+    def _start_browser(self):
+        self._user_data_dir = tempfile.mkdtemp(prefix='pyselenium-')
+
+        arguments = [self.chrome_executable, '--remote-debugging-port=0', '--user-data-dir=%s' % self._user_data_dir]
+        arguments += self.launch_profile.get_chrome_options().arguments
+        arguments.append(BLANK_PAGE_URL)
+
+        self._process = subprocess.Popen(arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        # Chrome writes the port it picked to a file of the user data directory once it listens on it
+        port_file_path = os.path.join(self._user_data_dir, 'DevToolsActivePort')
+        end_time = time.monotonic() + COMMAND_TIMEOUT
+
+        while time.monotonic() < end_time:
+            if self._process.poll() is not None:
+                break
+
+            if os.path.exists(port_file_path):
+                with open(port_file_path) as port_file:
+                    port = port_file.readline().strip()
+
+                if port.isdigit():
+                    return 'http://127.0.0.1:%s' % port
+
+            time.sleep(0.05)
+
+        self._stop_browser()
+
+        raise UnknownErrorException(CdpError('Browser.start', 'Chrome did not start'))
+
+    def _stop_browser(self):
+        if self._process is not None:
+            self._process.terminate()
+
+            try:
+                self._process.wait(COMMAND_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+
+            self._process = None
+
+        if self._user_data_dir is not None:
+            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+            self._user_data_dir = None
+
+    def _get_page_websocket_url(self, debugger_url):
+        with urlopen('%s/json/list' % debugger_url.rstrip('/'), timeout=COMMAND_TIMEOUT) as response:
+            targets = json.loads(response.read().decode('utf-8'))
+
+        pages = [target for target in targets if target.get('type') == 'page']
+
+        if len(pages) == 0:
+            with urlopen('%s/json/new' % debugger_url.rstrip('/'), timeout=COMMAND_TIMEOUT) as response:
+                return json.loads(response.read().decode('utf-8'))['webSocketDebuggerUrl']
+
+        return pages[0]['webSocketDebuggerUrl']
+
+    def _get_connection(self, websocket_url):
+        return CdpConnection(WebSocket(websocket_url, COMMAND_TIMEOUT))
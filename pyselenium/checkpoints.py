@@ -0,0 +1,126 @@
+import threading
+from collections import Counter
+
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import Navigate
+from pyselenium.test_steps import SendEnter
+
+# The steps whose effects outlive the page being loaded again, as restoring a checkpoint does. Values typed in, boxes
+# checked and items selected by the steps after the last of them are lost on restore, so checkpoints only end at them.
+CHECKPOINT_END_STEP_TYPES = (Navigate, Click, SendEnter)
+
+
+def get_step_key(step):
+    """Returns what tells a step apart from other steps: its type and its arguments, so that steps with the same key do
+    the same thing"""
+
+    return (type(step).__name__,) + tuple(sorted((name, repr(value)) for name, value in vars(step).items()))
+
+
+class _TrieNode:
+    __slots__ = ('children', 'test_count')
+
+    def __init__(self):
+        self.children = {}
+        self.test_count = 0
+
+
+class StepPrefixTrie:
+    """A trie of the steps of tests, keyed by get_step_key, that counts how many tests start with every sequence of
+    steps"""
+
+    def __init__(self):
+        self._root = _TrieNode()
+
+    def add(self, steps):
+        """Adds the steps of a test to the trie"""
+
+        node = self._root
+
+        for step in steps:
+            node = node.children.setdefault(get_step_key(step), _TrieNode())
+            node.test_count += 1
+
+    def get_shared_prefix_length(self, steps, min_test_count=2):
+        """Returns the number of steps at the start of the given steps that at least min_test_count of the tests added
+        start with"""
+
+        node = self._root
+        length = 0
+
+        for step in steps:
+            node = node.children.get(get_step_key(step))
+
+            if node is None or node.test_count < min_test_count:
+                break
+
+            length += 1
+
+        return length
+
+
+class CheckpointStore:
+    """Finds the steps that tests start with and share with other tests and keeps the BrowserCheckpoints of the state
+    those steps lead to, so that the first test to run them saves a checkpoint and the others restore it instead of
+    running them. Steps count as the same when their type and their arguments are, so the shared steps are expected
+    to always lead to the same state.
+
+    Every test keeps at least its last step, and tests share the longest prefix that another test shares with them
+    and that ends with one of the CHECKPOINT_END_STEP_TYPES.
+
+    Attributes:
+        min_prefix_length -- The fewest shared steps worth replacing with a restore, which loads the page twice
+    """
+
+    def __init__(self, tests, min_prefix_length=3):
+        if min_prefix_length is None or min_prefix_length < 1:
+            raise ValueError('min_prefix_length')
+
+        self.min_prefix_length = min_prefix_length
+        self._prefix_keys = {}
+        self._checkpoints = {}
+        self._lock = threading.Lock()
+
+        trie = StepPrefixTrie()
+
+        for test in tests:
+            trie.add(test.steps[:-1])
+
+        for test in tests:
+            length = trie.get_shared_prefix_length(test.steps[:-1])
+
+            while length > 0 and not isinstance(test.steps[length - 1], CHECKPOINT_END_STEP_TYPES):
+                length -= 1
+
+            if length >= min_prefix_length:
+                self._prefix_keys[test] = tuple(get_step_key(step) for step in test.steps[:length])
+
+        # A prefix that only one test ends up with is never restored
+        test_counts = Counter(self._prefix_keys.values())
+        self._prefix_keys = {test: key for test, key in self._prefix_keys.items() if test_counts[key] > 1}
+
+    def get_prefix_length(self, test):
+        """Returns the number of steps at the start of the test that a checkpoint stands for. 0 if none does."""
+
+        key = self._prefix_keys.get(test)
+
+        return 0 if key is None else len(key)
+
+    def get(self, test):
+        """Returns the checkpoint of the steps at the start of the test. None if it wasn't saved yet."""
+
+        key = self._prefix_keys.get(test)
+
+        with self._lock:
+            return None if key is None else self._checkpoints.get(key)
+
+    def put(self, test, checkpoint):
+        """Keeps the checkpoint of the steps at the start of the test, unless another test saved it already"""
+
+        key = self._prefix_keys.get(test)
+
+        if key is None:
+            raise ValueError('test')
+
+        with self._lock:
+            self._checkpoints.setdefault(key, checkpoint)
@@ -0,0 +1,159 @@
+import threading
+from contextlib import contextmanager
+from queue import Empty
+from queue import Queue
+
+from pyselenium._selenium_wrapper import Driver
+
+# Queued when the pool is closed, in place of a session, to wake up the threads waiting for one
+_POOL_CLOSED = object()
+
+
+class DriverPool:
+    """Keeps a number of browser sessions warm so that tests don't pay the browser startup cost every time.
+
+    Sessions are started lazily, up to the size of the pool, and are reset to a clean state when they are
+    given back so that the next test gets a session as if it had just been started. Driver.reset tells which cookies
+    and web storage the reset clears.
+
+    Attributes:
+        size -- The maximum number of browser sessions kept by the pool
+        driver_factory -- A callable that creates the drivers of the pool, such as Driver or a partial of it
+        lifecycle_manager -- A ProcessLifecycleManager that tracks the processes of the sessions, tells when a session
+        should be replaced by a new one and kills the processes sessions leave behind. None to not track them
+    """
+
+    def __init__(self, size=1, driver_factory=Driver, lifecycle_manager=None):
+        if size is None or size < 1:
+            raise ValueError('size')
+
+        self.size = size
+        self.driver_factory = driver_factory
+        self.lifecycle_manager = lifecycle_manager
+        self._drivers = []
+        self._idle_drivers = Queue()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Closes every browser session once the pool exits context"""
+
+        self.close()
+
+    def acquire(self, timeout=None):
+        """Hands out a clean browser session, starting a new one if every session is busy and the pool is not full.
+        Blocks until a session is given back otherwise. Raises queue.Empty if the timeout expires first, and
+        RuntimeError if the pool is closed while waiting."""
+
+        while True:
+            idle_drivers = self._idle_drivers
+
+            try:
+                driver = idle_drivers.get_nowait()
+            except Empty:
+                driver = self._start_driver_if_not_full()
+
+                if driver is None:
+                    driver = idle_drivers.get(timeout=timeout)
+
+            if driver is _POOL_CLOSED:
+                # Handed on to the next thread waiting for a session of the closed pool
+                idle_drivers.put(driver)
+                raise RuntimeError('The driver pool was closed')
+
+            # None is queued when a session is discarded, meaning that a new one can be started in its place
+            if driver is not None:
+                return driver
+
+    def release(self, driver):
+        """Takes a browser session back into the pool after resetting it.
+        Sessions that can't be reset, or that the lifecycle manager says should be recycled, are closed and replaced
+        by a new one on the next acquire."""
+
+        if self.lifecycle_manager is not None and self.lifecycle_manager.record_test(driver):
+            self._discard(driver)
+            return
+
+        try:
+            driver.reset()
+        except Exception:
+            self._discard(driver)
+        else:
+            self._idle_drivers.put(driver)
+
+    @contextmanager
+    def session(self):
+        """Acquires a browser session for the duration of a with block"""
+
+        driver = self.acquire()
+
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Closes every browser session started by the pool. The threads waiting for a session stop waiting."""
+
+        with self._lock:
+            drivers = self._drivers
+            idle_drivers = self._idle_drivers
+            self._drivers = []
+            self._idle_drivers = Queue()
+
+        idle_drivers.put(_POOL_CLOSED)
+
+        try:
+            for driver in drivers:
+                try:
+                    driver.__exit__(None, None, None)
+                except Exception:
+                    # The other sessions are closed all the same, and the lifecycle manager kills what this one left
+                    pass
+                finally:
+                    self._forget(driver)
+        finally:
+            if self.lifecycle_manager is not None:
+                self.lifecycle_manager.reap()
+
+    def _start_driver_if_not_full(self):
+        with self._lock:
+            if len(self._drivers) >= self.size:
+                return None
+
+            driver = self._get_web_driver()
+            self._drivers.append(driver)
+
+        try:
+            driver.__enter__()
+        except Exception:
+            self._discard(driver)
+            raise
+
+        if self.lifecycle_manager is not None:
+            self.lifecycle_manager.track(driver)
+
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+
+            self._idle_drivers.put(None)
+
+        try:
+            driver.__exit__(None, None, None)
+        except Exception:
+            pass
+
+        self._forget(driver)
+
+    def _forget(self, driver):
+        if self.lifecycle_manager is not None:
+            self.lifecycle_manager.forget(driver)
+
+    def _get_web_driver(self):
+        return self.driver_factory()
@@ -0,0 +1,90 @@
+import threading
+
+from selenium.webdriver.chrome.service import Service
+
+from pyselenium._remote_connection import PooledRemoteConnection
+
+
+class DriverService:
+    """A long-lived chromedriver process shared by many browser sessions, so that each session doesn't have to start
+    one of its own. Drivers given the service start it on their first use, and it runs until it is stopped.
+
+    Attributes:
+        executable_path -- The path to the chromedriver executable
+        port -- The port chromedriver listens on. A free port is picked if 0
+        max_idle_connections -- The number of keep-alive connections to chromedriver kept open for the sessions to
+        send their commands on, usually the number of sessions running at the same time
+    """
+
+    def __init__(self, executable_path='chromedriver', port=0, max_idle_connections=4):
+        self.executable_path = executable_path
+        self.port = port
+        self.max_idle_connections = max_idle_connections
+        self._service = None
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Stops chromedriver once the service exits context"""
+
+        self.stop()
+
+    @property
+    def url(self):
+        """Gets the URL that chromedriver serves the WebDriver protocol at. None if the service is not running."""
+
+        return None if self._service is None else self._service.service_url
+
+    @property
+    def is_running(self):
+        """Gets whether chromedriver was started and not stopped yet"""
+
+        return self._service is not None
+
+    def start(self):
+        """Starts chromedriver, unless it is already running"""
+
+        with self._lock:
+            if self._service is None:
+                service = self._get_service()
+                service.start()
+
+                self._service = service
+
+    def get_connection(self):
+        """Gets the PooledRemoteConnection to chromedriver that the sessions of the service share. Starts the service
+        if it is not running."""
+
+        self.start()
+
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._get_connection(self.url)
+
+            return self._connection
+
+    def stop(self):
+        """Stops chromedriver. The browser sessions still connected to it stop working."""
+
+        with self._lock:
+            service = self._service
+            connection = self._connection
+            self._service = None
+            self._connection = None
+
+        if connection is not None:
+            connection.close()
+
+        if service is not None:
+            service.stop()
+
+    def _get_connection(self, url):
+        return PooledRemoteConnection(url, self.max_idle_connections)
+
+    def _get_service(self):
+        return Service(self.executable_path, port=self.port)
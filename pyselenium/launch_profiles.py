@@ -0,0 +1,87 @@
+class LaunchProfile:
+    """Describes how Chrome is launched for the tests
+
+    Attributes:
+        name -- The name the profile is referred to by
+        arguments -- The command line arguments Chrome is started with
+        window_size -- The (width, height) of the browser window. The window is maximized if None
+        page_load_strategy -- How long navigating waits for pages to load: 'normal' waits for the load event, 'eager'
+        for the DOM to be ready and 'none' doesn't wait. Chrome's default if None
+    """
+
+    def __init__(self, name, arguments=None, window_size=None, page_load_strategy=None):
+        self.name = name
+        self.arguments = arguments or []
+        self.window_size = window_size
+        self.page_load_strategy = page_load_strategy
+
+    def get_chrome_options(self):
+        """Returns the Chrome options that launch the browser as described by the profile"""
+
+        # Imported here since importing Selenium's web drivers is slow and profiles are also used without a browser
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+
+        for argument in self.arguments:
+            options.add_argument(argument)
+
+        if self.window_size is not None:
+            # Sizing the window from the command line saves a call to the browser once it starts
+            options.add_argument('--window-size=%d,%d' % self.window_size)
+
+        return options
+
+    def get_capabilities(self):
+        """Returns the capabilities to request along with the Chrome options"""
+
+        capabilities = {}
+
+        if self.page_load_strategy is not None:
+            capabilities['pageLoadStrategy'] = self.page_load_strategy
+
+        return capabilities
+
+
+# Turns off what Chrome does at startup and in the background that tests don't need
+_QUIET_STARTUP_ARGUMENTS = [
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-extensions',
+    '--disable-default-apps',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-sync',
+    '--mute-audio'
+]
+
+DEFAULT_LAUNCH_PROFILE = LaunchProfile('default')
+
+HEADLESS_FAST_LAUNCH_PROFILE = LaunchProfile('headless-fast',
+                                             arguments=['--headless', '--disable-gpu'] + _QUIET_STARTUP_ARGUMENTS,
+                                             window_size=(1366, 768),
+                                             page_load_strategy='eager')
+
+# Also fits containers, where there is usually no sandbox and a small /dev/shm, and doesn't load images
+CI_MINIMAL_LAUNCH_PROFILE = LaunchProfile('ci-minimal',
+                                          arguments=['--headless', '--disable-gpu', '--no-sandbox',
+                                                     '--disable-dev-shm-usage',
+                                                     '--blink-settings=imagesEnabled=false'] + _QUIET_STARTUP_ARGUMENTS,
+                                          window_size=(1366, 768),
+                                          page_load_strategy='eager')
+
+LAUNCH_PROFILES = {launch_profile.name: launch_profile for launch_profile in [DEFAULT_LAUNCH_PROFILE,
+                                                                              HEADLESS_FAST_LAUNCH_PROFILE,
+                                                                              CI_MINIMAL_LAUNCH_PROFILE]}
+
+
+def get_launch_profile(launch_profile):
+    """Returns the launch profile with the given name. Returns the argument itself if it is already a profile."""
+
+    if isinstance(launch_profile, LaunchProfile):
+        return launch_profile
+
+    if launch_profile not in LAUNCH_PROFILES:
+        raise ValueError('launch_profile')
+
+    return LAUNCH_PROFILES[launch_profile]
@@ -0,0 +1,209 @@
+import atexit
+import glob
+import itertools
+import os
+import threading
+import weakref
+
+from pyselenium import _processes
+
+# Only processes named like these are ever killed, so that a process id reused by the system doesn't get an unrelated
+# process killed
+_BROWSER_PROCESS_NAMES = ('chrome', 'chromium', 'chromedriver')
+
+# The managers whose processes are killed when the interpreter exits. Weak, so that managers can still be collected.
+_managers_to_reap = weakref.WeakSet()
+
+# Tells apart the pid files of the managers of a process
+_manager_ids = itertools.count()
+
+
+@atexit.register
+def _reap_managers():
+    for manager in list(_managers_to_reap):
+        manager.reap()
+
+
+class ProcessStats:
+    """Represents the processes kept track of by a ProcessLifecycleManager at a point in time
+
+    Attributes:
+        driver_count -- The number of drivers being tracked
+        process_count -- The number of chromedriver and browser processes alive
+        rss -- The resident memory, in bytes, of the processes alive
+    """
+
+    def __init__(self, driver_count, process_count, rss):
+        self.driver_count = driver_count
+        self.process_count = process_count
+        self.rss = rss
+
+
+class _TrackedDriver:
+    def __init__(self, root_pid):
+        self.root_pid = root_pid
+        self.pids = set()
+        self.test_count = 0
+
+
+class ProcessLifecycleManager:
+    """Keeps track of the chromedriver and browser processes started by drivers, tells when a browser should be
+    replaced by a new one and kills the processes that are left behind once their driver is gone.
+
+    Only drivers that start a chromedriver of their own are tracked, since the browsers of drivers connected to a
+    shared DriverService can't be told apart.
+
+    Attributes:
+        max_tests_per_browser -- The number of tests after which a browser should be replaced. None for no limit
+        max_rss -- The resident memory, in bytes, of a browser and its processes after which it should be replaced.
+        None for no limit
+        pid_file -- The path that the tracked process ids are written next to, in a file of each manager named after
+        the path, the id of the worker process and the manager, so that the processes leaked by a worker that crashed
+        are killed by the next manager that uses the path. None to not keep the files
+        recycled_count -- The number of browsers that were told to be replaced
+    """
+
+    def __init__(self, max_tests_per_browser=None, max_rss=None, pid_file=None):
+        if max_tests_per_browser is not None and max_tests_per_browser < 1:
+            raise ValueError('max_tests_per_browser')
+
+        if max_rss is not None and max_rss <= 0:
+            raise ValueError('max_rss')
+
+        self.max_tests_per_browser = max_tests_per_browser
+        self.max_rss = max_rss
+        self.pid_file = pid_file
+        self.recycled_count = 0
+        self._tracked_drivers = {}
+        self._lock = threading.RLock()
+        self._own_pid_file = None
+
+        if pid_file is not None:
+            self._own_pid_file = '%s.%d-%d' % (pid_file, os.getpid(), next(_manager_ids))
+            self._reap_pid_files()
+
+        self._register_at_exit()
+
+    def track(self, driver):
+        """Starts keeping track of the processes of a driver that has just been started"""
+
+        tracked_driver = _TrackedDriver(driver.get_process_id())
+        self._refresh(tracked_driver)
+
+        with self._lock:
+            self._tracked_drivers[driver] = tracked_driver
+            self._write_pid_file()
+
+    def record_test(self, driver):
+        """Records that a driver has run one more test. Returns True if its browser should now be replaced."""
+
+        with self._lock:
+            tracked_driver = self._tracked_drivers.get(driver)
+
+            if tracked_driver is None:
+                return False
+
+            tracked_driver.test_count += 1
+            self._refresh(tracked_driver)
+            self._write_pid_file()
+
+        should_recycle = (self.max_tests_per_browser is not None and
+                          tracked_driver.test_count >= self.max_tests_per_browser) or \
+                         (self.max_rss is not None and self._get_rss(tracked_driver) > self.max_rss)
+
+        if should_recycle:
+            with self._lock:
+                self.recycled_count += 1
+
+        return should_recycle
+
+    def forget(self, driver):
+        """Stops keeping track of a driver that has exited, killing the processes it left behind"""
+
+        with self._lock:
+            tracked_driver = self._tracked_drivers.pop(driver, None)
+            self._write_pid_file()
+
+        if tracked_driver is not None:
+            self._kill(tracked_driver.pids)
+
+    def reap(self):
+        """Kills every process still alive of the drivers being tracked. Runs when the interpreter exits."""
+
+        with self._lock:
+            tracked_drivers = list(self._tracked_drivers.values())
+            self._tracked_drivers.clear()
+            self._write_pid_file()
+
+        for tracked_driver in tracked_drivers:
+            self._kill(tracked_driver.pids)
+
+    def get_stats(self):
+        """Returns the number of processes alive and their memory use"""
+
+        with self._lock:
+            tracked_drivers = list(self._tracked_drivers.values())
+
+        pids = [pid for tracked_driver in tracked_drivers for pid in tracked_driver.pids
+                if _processes.is_process_alive(pid)]
+
+        return ProcessStats(len(tracked_drivers), len(pids), sum(_processes.get_process_rss(pid) for pid in pids))
+
+    def _refresh(self, tracked_driver):
+        # Browsers keep starting processes, such as one renderer per page, so they are looked up again every test
+        if tracked_driver.root_pid is not None:
+            tracked_driver.pids.add(tracked_driver.root_pid)
+            tracked_driver.pids.update(_processes.get_descendant_process_ids(tracked_driver.root_pid))
+
+    def _get_rss(self, tracked_driver):
+        return sum(_processes.get_process_rss(pid) for pid in tracked_driver.pids
+                   if _processes.is_process_alive(pid))
+
+    def _kill(self, pids):
+        for pid in pids:
+            if _processes.is_process_alive(pid) and self._is_browser_process(pid):
+                _processes.kill_process(pid)
+
+    def _is_browser_process(self, pid):
+        name = _processes.get_process_name(pid)
+
+        return name is not None and any(browser_name in name.lower() for browser_name in _BROWSER_PROCESS_NAMES)
+
+    def _register_at_exit(self):
+        # Workers that exit without closing their pool still get their browsers killed
+        _managers_to_reap.add(self)
+
+    def _reap_pid_files(self):
+        # Only the files of workers that are gone are reaped, since the workers still running use their processes
+        for path in glob.glob(glob.escape(self.pid_file) + '.*'):
+            worker_pid = path[len(self.pid_file) + 1:].split('-')[0]
+
+            if not worker_pid.isdigit() or _processes.is_process_alive(int(worker_pid)):
+                continue
+
+            try:
+                with open(path) as pid_file:
+                    pids = [int(line) for line in pid_file if line.strip().isdigit()]
+
+                os.remove(path)
+            except (IOError, OSError):
+                continue
+
+            self._kill(pids)
+
+    def _write_pid_file(self):
+        if self._own_pid_file is None:
+            return
+
+        pids = sorted(pid for tracked_driver in self._tracked_drivers.values() for pid in tracked_driver.pids)
+
+        if len(pids) == 0:
+            try:
+                os.remove(self._own_pid_file)
+            except OSError:
+                pass
+
+            return
+
+        with open(self._own_pid_file, 'w') as pid_file:
+            pid_file.write(''.join('%d%s' % (pid, os.linesep) for pid in pids))
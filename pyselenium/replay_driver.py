@@ -0,0 +1,47 @@
+from selenium import webdriver
+
+from pyselenium._recording import ReplayConnection
+from pyselenium._selenium_wrapper import POLLING_WAIT_ENGINE
+from pyselenium._selenium_wrapper import Driver
+from pyselenium.launch_profiles import DEFAULT_LAUNCH_PROFILE
+
+# The time, in seconds, between checks of the page while waiting for elements. Recorded pages don't change with time,
+# so there is no point in waiting between checks as long as Driver does.
+REPLAY_POLL_INTERVAL = 0.001
+
+
+class ReplayDriver(Driver):
+    """A Driver that answers its WebDriver commands with the responses recorded by a Driver given record_to, instead of
+    sending them to a browser, to run a recorded test again in milliseconds, with neither a browser nor the application.
+
+    Steps that send the same commands as the recorded ones get the same results, so that changes to the steps, to the
+    runners or to the reports can be checked against the recorded session. Commands that were not recorded fail.
+
+    Attributes:
+        recording_path -- The path of the recording to replay
+        connection -- The ReplayConnection that answers the commands. None until the driver enters context
+    """
+
+    def __init__(self, recording_path, element_cache=False, wait_engine=POLLING_WAIT_ENGINE, settle_time=None,
+                 launch_profile=DEFAULT_LAUNCH_PROFILE):
+        super().__init__(element_cache, wait_engine, settle_time, launch_profile)
+
+        self.recording_path = recording_path
+        self.connection = None
+
+    def get_process_id(self):
+        """Returns None, since there is no browser process"""
+
+        return None
+
+    def _get_web_driver(self):
+        self.connection = ReplayConnection(self.recording_path)
+
+        return webdriver.Remote(command_executor=self.connection,
+                                desired_capabilities=self.launch_profile.get_capabilities())
+
+    def _get_web_driver_wait(self, driver, timeout):
+        web_driver_wait = super()._get_web_driver_wait(driver, timeout)
+        web_driver_wait._poll = REPLAY_POLL_INTERVAL
+
+        return web_driver_wait
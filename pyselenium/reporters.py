@@ -0,0 +1,199 @@
+import json
+import re
+import threading
+
+from pyselenium.test_steps import get_exception_message
+
+# The characters XML 1.0 does not allow, not even escaped
+_XML_INVALID_CHARACTERS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+
+class Reporter:
+    """The base class for the reporters, which are handed every step result and test result as soon as the runners have
+    them, to write them out as the suite runs instead of keeping them until it ends. Reporters are shared by the
+    workers of a suite, so results can be reported from several threads at once.
+
+    Reporters are context managers that close their reports on exit.
+    """
+
+    def __init__(self):
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def report_step_result(self, test, index, step_result):
+        """Reports the result of the step at the given index of the test, as soon as the step is run or skipped"""
+
+        pass
+
+    def report_test_result(self, test_result):
+        """Reports the result of a test once every step of the test was run or skipped"""
+
+        pass
+
+    def close(self):
+        """Finishes and closes the report"""
+
+        with self._lock:
+            if self._file is not None and not self._file.closed:
+                self._file.close()
+
+    def _write(self, text):
+        with self._lock:
+            self._file.write(text)
+            self._file.flush()
+
+
+class JsonLinesReporter(Reporter):
+    """Writes a JSON object for every step result and every test result to a JSON lines file, flushing the file after
+    every line so that it can be followed while the suite runs.
+
+    Lines of step results have a "type" of "step" and lines of test results, which come after the lines of their steps,
+    have a "type" of "test". Failures are written as the name and the message of the exception.
+
+    Attributes:
+        path -- The path of the file
+        append -- If True, the lines are added to the end of the file, so that several runs can share it. The file is
+        overwritten otherwise
+    """
+
+    def __init__(self, path, append=False):
+        super().__init__()
+        self.path = path
+        self.append = append
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def report_step_result(self, test, index, step_result):
+        line = {'type': 'step',
+                'test_id': test.test_id,
+                'index': index,
+                'step': type(step_result.step).__name__,
+                'css_path': getattr(step_result.step, 'css_path', None),
+                'success': step_result.success,
+                'skipped': step_result.skipped,
+                'restored': step_result.restored,
+                'error': step_result.exception_name,
+                'message': _get_message(step_result.exception),
+                'started_at': step_result.started_at,
+                'duration': step_result.duration,
+                'wait_time': step_result.wait_time,
+                'command_count': step_result.command_count,
+                'wait_poll_count': step_result.wait_poll_count}
+
+        self._write_line(line)
+
+    def report_test_result(self, test_result):
+        self._write_line({'type': 'test',
+                          'test_id': test_result.test.test_id,
+                          'success': test_result.success,
+                          'error': test_result.exception_name,
+                          'message': _get_message(test_result.exception),
+                          'step_count': len(test_result.step_results),
+                          'failure_count': _count_failures(test_result),
+                          'skipped_count': sum(step_result.skipped for step_result in test_result.step_results),
+                          'duration': test_result.duration,
+                          'wait_time': test_result.wait_time,
+                          'command_count': test_result.command_count,
+                          'wait_poll_count': test_result.wait_poll_count})
+
+    def _write_line(self, line):
+        self._write(json.dumps(line, separators=(',', ':')) + '\n')
+
+
+class JUnitXmlReporter(Reporter):
+    """Writes the tests to a JUnit XML file, which CI servers show, as a testcase element each, written as soon as the
+    test finishes. Tests with failed or skipped steps are reported as failures that list those steps, tests that failed
+    to run as errors, and the outcome of every step is written to the output of the testcase.
+
+    The testsuite element is only closed when the reporter is closed, and its counts are left out, since they aren't
+    known while the suite runs.
+
+    Attributes:
+        path -- The path of the file, which is overwritten
+        suite_name -- The name of the testsuite element
+    """
+
+    def __init__(self, path, suite_name='pyselenium'):
+        super().__init__()
+        self.path = path
+        self.suite_name = suite_name
+        self._file = open(path, 'w', encoding='utf-8')
+
+        self._write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuite name=%s>\n' % _quote_attribute(suite_name))
+
+    def report_test_result(self, test_result):
+        lines = ['  <testcase classname=%s name=%s time="%.3f">' % (_quote_attribute(self.suite_name),
+                                                                    _quote_attribute(test_result.test.test_id),
+                                                                    test_result.duration)]
+        failed_steps = []
+        output = []
+
+        for index, step_result in enumerate(test_result.step_results):
+            line = '%d. [%s] - %s' % (index + 1, type(step_result.step).__name__, _describe_step_result(step_result))
+            output.append(line)
+
+            if not step_result.success:
+                failed_steps.append(line)
+
+        if test_result.exception is not None:
+            lines.append('    <error type=%s message=%s></error>' % (
+                _quote_attribute(test_result.exception_name), _quote_attribute(_get_message(test_result.exception))))
+        elif len(failed_steps) > 0:
+            first_failure = next(step_result for step_result in test_result.step_results if not step_result.success)
+            exception_name = first_failure.exception_name or 'Skipped'
+
+            lines.append('    <failure type=%s message=%s>%s</failure>' % (_quote_attribute(exception_name),
+                                                                           _quote_attribute(failed_steps[0]),
+                                                                           _escape('\n'.join(failed_steps))))
+
+        lines.append('    <system-out>%s</system-out>' % _escape('\n'.join(output)))
+        lines.append('  </testcase>\n')
+
+        self._write('\n'.join(lines))
+
+    def close(self):
+        """Closes the testsuite element and the file"""
+
+        with self._lock:
+            if self._file.closed:
+                return
+
+            self._file.write('</testsuite>\n')
+            self._file.close()
+
+
+# xml.sax.saxutils has the same functions, but importing it imports urllib.request, which takes longer than the
+# rest of the reporters
+def _escape(text):
+    return _XML_INVALID_CHARACTERS.sub('', text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _quote_attribute(value):
+    return '"%s"' % _escape(str(value)).replace('"', '&quot;').replace('\n', '&#10;').replace('\r', '&#13;').replace(
+        '\t', '&#9;')
+
+
+def _describe_step_result(step_result):
+    if step_result.skipped:
+        return 'Skipped'
+
+    if step_result.restored:
+        return 'Restored from checkpoint (%.3fs)' % step_result.duration
+
+    if step_result.success:
+        return 'Success (%.3fs)' % step_result.duration
+
+    return '%s - %s' % (step_result.exception_name, get_exception_message(step_result.exception))
+
+
+def _get_message(exception):
+    return None if exception is None else get_exception_message(exception)
+
+
+def _count_failures(test_result):
+    return sum(not step_result.success and not step_result.skipped for step_result in test_result.step_results)
@@ -0,0 +1,310 @@
+import threading
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from pyselenium._selenium_wrapper import BLANK_PAGE_URL
+from pyselenium._selenium_wrapper import Driver
+from pyselenium._selenium_wrapper import POLLING_WAIT_ENGINE
+
+OPEN_WINDOW_SCRIPT = "window.open('%s');" % BLANK_PAGE_URL
+
+# Commands after which the browser is back at the top level of the page
+_NAVIGATION_COMMANDS = (Command.GET, Command.GO_BACK, Command.GO_FORWARD, Command.REFRESH)
+
+
+class _Window:
+    """Keeps track of the window a web driver sends its commands to and of the frames it switched to in the window"""
+
+    def __init__(self, window_handle):
+        self.home_window_handle = window_handle
+        self.window_handle = window_handle
+        self.frames = []
+
+
+class _WindowWebDriver(RemoteWebDriver):
+    """A web driver that joins the session of another web driver instead of starting one of its own.
+    The elements it finds send their commands through it, so that they go to the window of its driver."""
+
+    def __init__(self, host_web_driver):
+        self._host_web_driver = host_web_driver
+
+        super().__init__(command_executor=host_web_driver.command_executor,
+                         desired_capabilities=dict(host_web_driver.capabilities))
+
+    def start_session(self, desired_capabilities, browser_profile=None):
+        self.session_id = self._host_web_driver.session_id
+        self.capabilities = self._host_web_driver.capabilities
+        self.w3c = getattr(self._host_web_driver, 'w3c', False)
+
+
+class WindowDriver(Driver):
+    """A driver that runs its tests in a window of its own, in a browser shared with other window drivers.
+
+    The windows of a browser are not isolated from each other. Cookies and web storage are shared by every window of
+    the browser, so unlike Driver.reset, reset doesn't clear them and the tests that share a browser shouldn't depend
+    on them being clean. For the same reason, the state of the window can't be restored from checkpoints.
+
+    Window drivers poll for elements. Since the browser runs the commands of its windows one at a time, a script that
+    waits in the browser, as the mutation observer wait engine and the settle time use, would hold up every other
+    window for as long as it waits.
+
+    Attributes:
+        shared_browser -- The SharedBrowser that hosts the window of the driver
+    """
+
+    checkpoints_supported = False
+
+    def __init__(self, shared_browser, element_cache=False):
+        super().__init__(element_cache, POLLING_WAIT_ENGINE, None, shared_browser.launch_profile)
+
+        self.shared_browser = shared_browser
+
+    def __exit__(self, type, value, traceback):
+        """Closes the window of the driver once the object exits context. The browser keeps running."""
+
+        try:
+            if self.driver is not None:
+                self.shared_browser._close_window(self.driver)
+        finally:
+            self.driver = None
+            self.shared_browser._forget_window_driver(self)
+
+    def reset(self):
+        """Brings the window back to a blank page so that it can be reused by another test.
+        Closes the window the test may have switched to, such as a popup, and goes back to the window of the driver."""
+
+        self.shared_browser._go_back_to_home_window(self.driver)
+        self.driver.get(BLANK_PAGE_URL)
+
+        self._leave_frames()
+        self.set_timeout_budget()
+
+    def get_process_id(self):
+        """Returns None, since the processes of the browser belong to the shared browser"""
+
+        return None
+
+    def _get_web_driver(self):
+        return self.shared_browser._open_window()
+
+
+class SharedBrowser:
+    """A browser whose windows host several drivers, so that the tests running at the same time share a browser
+    instead of each starting a browser of its own.
+
+    The commands of the drivers are sent one at a time, each one switching to the window, and to the frames, of its
+    driver first when another driver sent the last command. Window drivers wait for elements by polling, between
+    commands, so the drivers only wait for each other while the browser runs a command that doesn't wait.
+
+    Attributes:
+        driver_factory -- A callable that creates the driver of the browser, such as Driver or a partial of it
+        launch_profile -- The LaunchProfile of the browser
+    """
+
+    def __init__(self, driver_factory=Driver):
+        self.driver_factory = driver_factory
+        self._host_driver = driver_factory()
+        self.launch_profile = self._host_driver.launch_profile
+        self._is_started = False
+        self._current_window = None
+        self._window_drivers = set()
+        self._windows = {}
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Quits the browser once the shared browser exits context"""
+
+        self.close()
+
+    @property
+    def window_count(self):
+        """Gets the number of window drivers created and not exited yet"""
+
+        with self._lock:
+            return len(self._window_drivers)
+
+    def get_window_driver(self, element_cache=False):
+        """Creates a driver whose window is opened in the browser when it enters context"""
+
+        window_driver = WindowDriver(self, element_cache)
+
+        with self._lock:
+            self._window_drivers.add(window_driver)
+
+        return window_driver
+
+    def start(self):
+        """Starts the browser, unless it is already running. Window drivers start it on their first use."""
+
+        with self._lock:
+            if not self._is_started:
+                self._host_driver.__enter__()
+                self._is_started = True
+
+                host_web_driver = self._host_driver.driver
+                self._current_window = self._route_commands(host_web_driver,
+                                                            host_web_driver.current_window_handle)
+
+    def close(self):
+        """Quits the browser. The window drivers still open stop working."""
+
+        with self._lock:
+            is_started = self._is_started
+            self._is_started = False
+            self._current_window = None
+            self._windows = {}
+
+        if is_started:
+            self._host_driver.__exit__(None, None, None)
+
+    def _open_window(self):
+        self.start()
+
+        with self._lock:
+            host_web_driver = self._host_driver.driver
+            window_handles = host_web_driver.window_handles
+
+            host_web_driver.execute_script(OPEN_WINDOW_SCRIPT)
+
+            window_handle = [handle for handle in host_web_driver.window_handles if handle not in window_handles][-1]
+
+            web_driver = self._get_window_web_driver(host_web_driver)
+            self._windows[web_driver] = self._route_commands(web_driver, window_handle)
+
+        return web_driver
+
+    def _close_window(self, web_driver):
+        with self._lock:
+            window = self._windows.pop(web_driver, None)
+
+            if window is None or not self._is_started:
+                return
+
+            window_handles = {window.window_handle, window.home_window_handle}
+
+            for window_handle in window_handles:
+                self._switch_to_window(web_driver, window_handle)
+                web_driver.close()
+
+            self._current_window = None
+
+    def _go_back_to_home_window(self, web_driver):
+        with self._lock:
+            window = self._windows[web_driver]
+
+            if window.window_handle != window.home_window_handle:
+                web_driver.close()
+                self._switch_to_window(web_driver, window.home_window_handle)
+
+    def _forget_window_driver(self, window_driver):
+        with self._lock:
+            self._window_drivers.discard(window_driver)
+
+    def _switch_to_window(self, web_driver, window_handle):
+        web_driver.execute(Command.SWITCH_TO_WINDOW, {'name': window_handle, 'handle': window_handle})
+
+    def _route_commands(self, web_driver, window_handle):
+        """Makes every command of the web driver go to the given window, since all the web drivers share the window
+        the browser sends commands to. Keeps track of the windows and frames the web driver switches to itself, so
+        that it is brought back to them."""
+
+        window = _Window(window_handle)
+        execute = web_driver.execute
+
+        def routed_execute(driver_command, params=None):
+            with self._lock:
+                if self._current_window is not window:
+                    # Commands that fail halfway leave the browser in a window or frame that is not known
+                    self._current_window = None
+
+                    execute(Command.SWITCH_TO_WINDOW, {'name': window.window_handle, 'handle': window.window_handle})
+
+                    for frame in window.frames:
+                        execute(Command.SWITCH_TO_FRAME, {'id': frame})
+
+                    self._current_window = window
+
+                frame = params.get('id') if driver_command == Command.SWITCH_TO_FRAME else None
+
+                response = execute(driver_command, params)
+
+                if driver_command == Command.SWITCH_TO_WINDOW:
+                    window.window_handle = params.get('handle', params.get('name'))
+                    window.frames = []
+                elif driver_command == Command.SWITCH_TO_FRAME:
+                    window.frames = window.frames + [frame] if frame is not None else []
+                elif driver_command == Command.SWITCH_TO_PARENT_FRAME:
+                    window.frames = window.frames[:-1]
+                elif driver_command in _NAVIGATION_COMMANDS:
+                    window.frames = []
+
+                return response
+
+        web_driver.execute = routed_execute
+
+        return window
+
+    def _get_window_web_driver(self, host_web_driver):
+        return _WindowWebDriver(host_web_driver)
+
+
+class WindowDriverFactory:
+    """Creates window drivers for a DriverPool or a SuiteRunner on as few browsers as possible, starting a new browser
+    only once every browser hosts windows_per_browser window drivers.
+
+    Attributes:
+        windows_per_browser -- The maximum number of window drivers hosted by a browser
+        driver_factory -- A callable that creates the drivers of the browsers, such as Driver or a partial of it
+        element_cache -- Whether the window drivers cache elements
+        shared_browsers -- The browsers started so far
+    """
+
+    def __init__(self, windows_per_browser=4, driver_factory=Driver, element_cache=False):
+        if windows_per_browser is None or windows_per_browser < 1:
+            raise ValueError('windows_per_browser')
+
+        self.windows_per_browser = windows_per_browser
+        self.driver_factory = driver_factory
+        self.element_cache = element_cache
+        self.shared_browsers = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Quits every browser once the factory exits context"""
+
+        self.close()
+
+    def __call__(self):
+        """Creates a window driver on the first browser that hosts less than windows_per_browser window drivers"""
+
+        with self._lock:
+            shared_browser = next((shared_browser for shared_browser in self.shared_browsers
+                                   if shared_browser.window_count < self.windows_per_browser), None)
+
+            if shared_browser is None:
+                shared_browser = self._get_shared_browser()
+                self.shared_browsers.append(shared_browser)
+
+            return shared_browser.get_window_driver(self.element_cache)
+
+    def close(self):
+        """Quits every browser started by the factory"""
+
+        with self._lock:
+            shared_browsers = self.shared_browsers
+            self.shared_browsers = []
+
+        for shared_browser in shared_browsers:
+            shared_browser.close()
+
+    def _get_shared_browser(self):
+        return SharedBrowser(self.driver_factory)
@@ -0,0 +1,526 @@
+import time
+from http.cookiejar import CookieJar
+from urllib.parse import urlencode
+from urllib.parse import urljoin
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+from urllib.request import HTTPCookieProcessor
+from urllib.request import Request
+from urllib.request import build_opener
+
+from selenium.common.exceptions import ElementNotVisibleException
+from selenium.common.exceptions import InvalidElementStateException
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchFrameException
+from selenium.common.exceptions import UnexpectedTagNameException
+
+from pyselenium._html_dom import Document
+from pyselenium._html_dom import parse_document
+from pyselenium._html_dom import select_first
+from pyselenium._selenium_wrapper import BLANK_PAGE_URL
+from pyselenium._selenium_wrapper import CannotTypeTextError
+from pyselenium._selenium_wrapper import DriverMetrics
+from pyselenium._selenium_wrapper import ElementNotFoundError
+from pyselenium._selenium_wrapper import InvalidElementException
+from pyselenium._selenium_wrapper import InvalidOptionTextException
+from pyselenium._selenium_wrapper import NoSuchAttributeError
+from pyselenium._selenium_wrapper import UnknownErrorException
+from pyselenium.launch_profiles import DEFAULT_LAUNCH_PROFILE
+from pyselenium.launch_profiles import get_launch_profile
+
+# The time, in seconds, that loading a page may take
+PAGE_LOAD_TIMEOUT = 30
+
+# The types of the inputs that text can be typed in
+TEXT_INPUT_TYPES = {'date', 'datetime-local', 'email', 'month', 'number', 'password', 'search', 'tel', 'text', 'time',
+                    'url', 'week'}
+
+
+class SimulatedDriver:
+    """A driver that has the same methods as Driver but runs the steps on pages it loads and parses itself, without a
+    browser, to check that the steps of a suite and their CSS paths fit the pages in a fraction of the time.
+
+    Pages are loaded from file:// URLs or from HTTP servers, keeping cookies, and are taken as they are served: scripts
+    are not run and elements are either on the page or not, so steps don't wait for elements. Clicks follow links,
+    submit forms and check checkboxes, radio buttons and options, and frames are loaded when switched to.
+
+    Attributes:
+        launch_profile -- The LaunchProfile, or the name of one, of the browser the driver stands in for
+        url_rewrites -- The URL prefixes to replace with others before loading pages, such as
+        {'https://example.com/': 'file:///tmp/example/'}, to run steps written for a site on copies of its pages
+        metrics -- Counts the commands run on the pages
+        startup_time -- The time, in seconds, the driver took to start. None until the driver enters context
+    """
+
+    def __init__(self, launch_profile=DEFAULT_LAUNCH_PROFILE, url_rewrites=None):
+        self.launch_profile = get_launch_profile(launch_profile)
+        self.url_rewrites = url_rewrites or {}
+        self.metrics = DriverMetrics()
+        self.startup_time = None
+        self.document = None
+        self._cookie_jar = CookieJar()
+        self._frames = []
+        self._focused_element = None
+
+    def __enter__(self):
+        """Opens a blank page once the object enters context"""
+
+        start_time = time.perf_counter()
+
+        self.document = Document(BLANK_PAGE_URL)
+
+        self.startup_time = time.perf_counter() - start_time
+
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Closes the page once the object exits context"""
+
+        self.document = None
+        self._frames = []
+
+    @property
+    def current_url(self):
+        """Gets the URL of the page. None if the driver is not started."""
+
+        return None if self.document is None else self.document.url
+
+    def reset(self):
+        """Brings the driver back to a clean state so that it can be reused by another test.
+        Clears the cookies and leaves the page blank."""
+
+        self._cookie_jar.clear()
+        self.navigate(BLANK_PAGE_URL)
+        self.set_timeout_budget()
+
+    def get_process_id(self):
+        """Returns None, since there is no browser process"""
+
+        return None
+
+    def set_timeout_budget(self, step_timeout=None, deadline=None):
+        """Takes the timeouts of the steps, as Driver does. They are not used, since steps never wait for elements."""
+
+        if step_timeout is not None and step_timeout < 0:
+            raise ValueError('step_timeout')
+
+    def navigate(self, url):
+        """Loads and parses the page at the specified URL"""
+
+        if url is None:
+            raise TypeError('url')
+
+        if url == '':
+            raise ValueError('url')
+
+        self._run_command('get', self._load_into, self.document, url)
+
+    def click(self, css_path, hint):
+        """Tries to find an element on the page and click it.
+        Raises an error if the element can't be found, is not displayed or is disabled."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        element = self.find_element(css_path, hint)
+
+        if not element.is_displayed:
+            raise ElementNotFoundError(css_path, hint, ElementNotVisibleException('The element is not displayed'))
+
+        if not element.is_enabled:
+            raise ElementNotFoundError(css_path, hint, InvalidElementStateException('The element is disabled'))
+
+        self._run_command('clickElement', self._click_element, element)
+
+    def click_if_found(self, css_path, hint, wait_time):
+        """Clicks an element on the page if it is there. Does nothing if the element is not found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css-path')
+
+        if wait_time is None or wait_time < 0:
+            raise ValueError('wait_time')
+
+        try:
+            element = self.find_element(css_path, hint)
+        except ElementNotFoundError:
+            pass
+        else:
+            self._run_command('clickElement', self._click_element, element)
+
+    def get_element_attribute(self, css_path, hint, attribute_name):
+        """Tries to get an attribute value from an element on the page, as WebElement.get_attribute reads it.
+        Raises errors if the element can't be found or if it doesn't have the specified attribute."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        if attribute_name is None or attribute_name == '':
+            raise ValueError('attribute_name')
+
+        element = self.find_element(css_path, hint)
+        attribute_value = self._run_command('getElementAttribute', element.get_attribute, attribute_name)
+
+        if attribute_value is None or attribute_value == '':
+            raise NoSuchAttributeError(css_path, hint, attribute_name, None)
+
+        return attribute_value
+
+    def get_element_value(self, css_path, hint):
+        """Tries to get the text of an element on the page, as the user would see it.
+        Raises errors if the element can't be found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        element = self.find_element(css_path, hint)
+
+        return self._run_command('getElementText', element.get_text)
+
+    def read_elements(self, queries):
+        """Reads the text or an attribute of several elements at once. Takes a list of (css_path, attribute_name)
+        tuples, as Driver.read_elements does."""
+
+        if queries is None or len(queries) == 0:
+            raise ValueError('queries')
+
+        return self._run_command('executeScript', self._read_elements, queries)
+
+    def find_element(self, css_path, hint):
+        """Tries to find an element on the page and returns it.
+        Raises an error if the element can't be found or if the CSS path is not supported."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        try:
+            element = self._run_command('findElement', select_first, self._get_frame_document(), css_path)
+        except InvalidSelectorException as exception:
+            raise ElementNotFoundError(css_path, hint, exception)
+
+        if element is None:
+            raise ElementNotFoundError(css_path, hint, NoSuchElementException('No element matches %s' % css_path))
+
+        return element
+
+    def can_find_element(self, css_path, wait_time):
+        """Tries to find an element at the given CSS path. Returns true if one is found, false otherwise."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        if wait_time is None or wait_time < 0:
+            raise ValueError('wait_time')
+
+        try:
+            self.find_element(css_path, '')
+        except ElementNotFoundError:
+            return False
+        else:
+            return True
+
+    def send_text(self, css_path, hint, text):
+        """Finds an element and types the specified text in it, replacing its text.
+        Raises errors if the element can not be found or doesn't accept text."""
+
+        if text is None or text == '':
+            raise ValueError('text')
+
+        element = self.find_element(css_path, hint)
+
+        try:
+            self._run_command('sendKeysToElement', self._type_text, element, text)
+        except Exception as exception:
+            raise CannotTypeTextError(css_path, hint, text, exception)
+
+    def set_text(self, css_path, hint, text):
+        """Finds an element and sets its text, as send_text does, since there are no keyboard events to leave out.
+        Raises errors if the element can not be found or doesn't accept text."""
+
+        self.send_text(css_path, hint, text)
+
+    def send_enter_key(self):
+        """Presses enter on the element clicked or typed in last, which submits the form of a text input"""
+
+        try:
+            self._run_command('sendKeysToActiveElement', self._press_enter)
+        except Exception as exception:
+            raise UnknownErrorException(exception)
+
+    def select_drop_down_item_by_text(self, css_path, hint, item_text):
+        """Finds a Select element and selects an item by its text.
+        Raises errors if the element can not be found or if it is not a Select element."""
+
+        if item_text is None or item_text == '':
+            raise ValueError('item_text')
+
+        element = self.find_element(css_path, hint)
+
+        if element.tag != 'select':
+            raise InvalidElementException(css_path, hint, UnexpectedTagNameException(
+                'Select only works on <select> elements, not on <%s>' % element.tag))
+
+        options = [option for option in element.get_options() if option.get_text() == item_text]
+
+        if len(options) == 0:
+            raise InvalidOptionTextException(css_path, hint, item_text, NoSuchElementException(
+                'Could not locate element with visible text: %s' % item_text))
+
+        # Options are clicked as Select.select_by_visible_text does, which leaves the ones already selected alone
+        for option in options:
+            if not option.selected:
+                self._run_command('clickElement', self._click_element, option)
+
+    def set_checkbox(self, css_path, hint, checked):
+        """Finds a checkbox element and checks or unchecks it by clicking on it.
+        Raises errors if the element can not be found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        if checked is None:
+            raise ValueError('checked')
+
+        element = self.find_element(css_path, hint)
+
+        if element.checked != checked:
+            self._run_command('clickElement', self._click_element, element)
+
+    def switch_to_frame(self, css_path, hint):
+        """Switches the context of the driver to the frame at the specified CSS path, loading the page of the frame.
+        Raises errors if the frame can not be found."""
+
+        if css_path is None or css_path == '':
+            raise ValueError('css_path')
+
+        frame = self.find_element(css_path, hint)
+
+        if frame.tag not in ('iframe', 'frame'):
+            raise InvalidElementException(css_path, hint, NoSuchFrameException('The element is not a frame'))
+
+        if frame.content_document is None:
+            if 'srcdoc' in frame.attributes:
+                frame.content_document = parse_document(frame.attributes['srcdoc'], 'about:srcdoc')
+            else:
+                self._run_command('switchToFrame', self._load_into, frame,
+                                  urljoin(self._get_frame_document().url, frame.attributes.get('src', BLANK_PAGE_URL)))
+
+        self._frames.append(frame)
+
+    def switch_to_default_content(self):
+        """Switches the context of the driver to the page."""
+
+        self._frames = []
+
+    def _run_command(self, command, action, *args):
+        """Runs the action as a command, counting it and recording the time it took in the metrics"""
+
+        self.metrics.command_count += 1
+        start_time = time.perf_counter()
+
+        try:
+            return action(*args)
+        finally:
+            self.metrics.command_latencies.record(command, time.perf_counter() - start_time)
+
+    def _get_frame_document(self):
+        return self._frames[-1].content_document if self._frames else self.document
+
+    def _get_document_of(self, element):
+        while element.parent is not None:
+            element = element.parent
+
+        return element
+
+    def _read_elements(self, queries):
+        values = []
+
+        for css_path, attribute_name in queries:
+            element = select_first(self._get_frame_document(), css_path)
+
+            if element is None:
+                values.append((False, None))
+            elif attribute_name is None:
+                values.append((True, element.get_text()))
+            else:
+                values.append((True, element.get_attribute(attribute_name)))
+
+        return values
+
+    def _click_element(self, element):
+        self._focused_element = element
+
+        if element.tag == 'input' and element.input_type == 'checkbox':
+            element.checked = not element.checked
+        elif element.tag == 'input' and element.input_type == 'radio':
+            self._check_radio_button(element)
+        elif element.tag == 'option':
+            self._select_option(element)
+        elif element.tag == 'label':
+            self._click_labeled_control(element)
+
+        link = element if element.tag == 'a' else element.find_ancestor('a')
+
+        if link is not None and 'href' in link.attributes:
+            self._follow_link(link)
+            return
+
+        button = element if element.tag == 'button' else element.find_ancestor('button')
+
+        if button is not None and button.attributes.get('type', 'submit').lower() == 'submit':
+            self._submit(button)
+        elif element.tag == 'input' and element.input_type in ('submit', 'image'):
+            self._submit(element)
+
+    def _check_radio_button(self, radio_button):
+        name = radio_button.attributes.get('name')
+        group_root = radio_button.find_ancestor('form') or self._get_document_of(radio_button)
+
+        if name is not None:
+            for element in group_root.iter():
+                if element.tag == 'input' and element.input_type == 'radio' and element.attributes.get('name') == name:
+                    element.checked = False
+
+        radio_button.checked = True
+
+    def _select_option(self, option):
+        select = option.find_ancestor('select')
+
+        if select is not None and 'multiple' in select.attributes:
+            option.selected = not option.selected
+            return
+
+        if select is not None:
+            for other_option in select.get_options():
+                other_option.selected = False
+
+        option.selected = True
+
+    def _click_labeled_control(self, label):
+        if 'for' in label.attributes:
+            control = next((element for element in self._get_document_of(label).iter()
+                            if element.attributes.get('id') == label.attributes['for']), None)
+        else:
+            control = next((element for element in label.iter() if element.tag in ('input', 'select', 'textarea')),
+                           None)
+
+        if control is not None and control.tag == 'input' and control.input_type in ('checkbox', 'radio'):
+            self._click_element(control)
+
+    def _follow_link(self, link):
+        href = link.attributes['href'].strip()
+
+        if href.startswith('#') or href.lower().startswith('javascript:'):
+            return
+
+        self._load_into(self._get_document_of(link), urljoin(self._get_document_of(link).url, href))
+
+    def _type_text(self, element, text):
+        if not element.is_displayed:
+            raise ElementNotVisibleException('The element is not displayed')
+
+        if not element.is_enabled or 'readonly' in element.attributes:
+            raise InvalidElementStateException('The element can not be typed in')
+
+        if element.tag == 'textarea' or (element.tag == 'input' and element.input_type in TEXT_INPUT_TYPES):
+            element.value = text
+        elif element.attributes.get('contenteditable', 'false').lower() in ('', 'true'):
+            element.children = [text]
+        else:
+            raise InvalidElementStateException('The element does not accept text')
+
+        self._focused_element = element
+
+    def _press_enter(self):
+        element = self._focused_element
+
+        if element is None or element.tag != 'input' or element.input_type not in TEXT_INPUT_TYPES:
+            return
+
+        form = element.find_ancestor('form')
+
+        if form is None:
+            return
+
+        # Pressing enter in a form submits it as its first submit button would
+        submit_button = next((control for control in form.iter() if
+                              (control.tag == 'button' and control.attributes.get('type', 'submit').lower() == 'submit')
+                              or (control.tag == 'input' and control.input_type in ('submit', 'image'))), None)
+
+        self._submit_form(form, submit_button)
+
+    def _submit(self, submit_button):
+        form = submit_button.find_ancestor('form')
+
+        if form is not None:
+            self._submit_form(form, submit_button)
+
+    def _submit_form(self, form, submit_button):
+        fields = []
+
+        for element in form.iter():
+            name = element.attributes.get('name')
+
+            if not name or not element.is_enabled:
+                continue
+
+            if element.tag == 'input':
+                if element.input_type in ('checkbox', 'radio') and not element.checked:
+                    continue
+
+                if element.input_type in ('submit', 'image', 'button', 'reset', 'file') and \
+                        element is not submit_button:
+                    continue
+
+                fields.append((name, element.get_value()))
+            elif element.tag == 'textarea':
+                fields.append((name, element.get_value()))
+            elif element.tag == 'select':
+                fields += [(name, option.get_value()) for option in element.get_options() if option.selected] or \
+                          [(name, element.get_value())]
+            elif element.tag == 'button' and element is submit_button:
+                fields.append((name, element.attributes.get('value', '')))
+
+        attributes = {} if submit_button is None else submit_button.attributes
+        document = self._get_document_of(form)
+        url = urljoin(document.url, attributes.get('formaction', form.attributes.get('action', '')) or document.url)
+        method = attributes.get('formmethod', form.attributes.get('method', 'get')).lower()
+
+        if method == 'post':
+            self._load_into(document, url, urlencode(fields).encode('utf-8'))
+        else:
+            scheme, netloc, path, _, _ = urlsplit(url)
+            self._load_into(document, urlunsplit((scheme, netloc, path, urlencode(fields), '')))
+
+    def _load_into(self, target, url, data=None):
+        """Loads the page at the URL into the target, which is either the page of the driver, or the document of a
+        frame, or a frame"""
+
+        document = self._load_page(url, data)
+
+        if target is self.document:
+            self.document = document
+            self._frames = []
+            self._focused_element = None
+        elif isinstance(target, Document):
+            next(frame for frame in self._frames if frame.content_document is target).content_document = document
+        else:
+            target.content_document = document
+
+    def _load_page(self, url, data=None):
+        if url == BLANK_PAGE_URL:
+            return Document(url)
+
+        for prefix, replacement in self.url_rewrites.items():
+            if url.startswith(prefix):
+                url = replacement + url[len(prefix):]
+                break
+
+        with self._get_opener().open(Request(url, data), timeout=PAGE_LOAD_TIMEOUT) as response:
+            charset = response.headers.get_content_charset() or 'utf-8'
+
+            return parse_document(response.read().decode(charset, errors='replace'), response.geturl())
+
+    def _get_opener(self):
+        return build_opener(HTTPCookieProcessor(self._cookie_jar))
@@ -0,0 +1,176 @@
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from itertools import islice
+
+from pyselenium._selenium_wrapper import Driver
+from pyselenium.checkpoints import CheckpointStore
+from pyselenium.driver_pool import DriverPool
+from pyselenium.test_runner import TestResult
+from pyselenium.test_runner import TestRunner
+from pyselenium.test_steps import StepResult
+from pyselenium.test_steps import summarize_exception
+
+
+class SuiteResult:
+    """Represents the result of the execution of a suite of tests
+
+    Attributes:
+        test_results -- Holds the results of the tests that have finished, in the order they finished, unless they are
+        not kept
+        test_count -- The number of tests that have finished, whether their results are kept or not
+        elapsed_time -- The time, in seconds, that the suite took to run so far
+    """
+
+    def __init__(self):
+        self.test_results = []
+        self.test_count = 0
+        self.elapsed_time = 0.0
+
+    def add_test_result(self, test_result, keep=True):
+        """Adds a new test execution result to the list, or only counts it if it is not to be kept"""
+
+        if keep:
+            self.test_results.append(test_result)
+
+        self.test_count += 1
+
+    @property
+    def tests_per_minute(self):
+        """Gets the throughput of the suite, in finished tests per minute"""
+
+        if self.elapsed_time <= 0:
+            return 0.0
+
+        return self.test_count * 60 / self.elapsed_time
+
+    def __str__(self):
+        lines = ["Suite result",
+                 "________________________",
+                 "%d tests in %.2f seconds (%.1f tests/min)" % (self.test_count, self.elapsed_time,
+                                                                self.tests_per_minute)]
+
+        for test_result in self.test_results:
+            lines.append("\n%s" % test_result)
+
+        return "\n".join(lines)
+
+
+class SuiteRunner:
+    """Runs a suite of tests concurrently, each worker running its tests on its own browser session
+
+    Attributes:
+        tests -- The tests to be run
+        workers -- The number of tests run at the same time
+        driver_factory -- A callable that creates the drivers of the workers, such as Driver or a partial of it
+        lifecycle_manager -- A ProcessLifecycleManager that recycles the browsers of the workers and kills the processes
+        they leave behind. None to not track them
+        reporters -- The Reporters that the results of the steps and of the tests are handed to as soon as they are
+        known
+        keep_results -- If False, the suite result only counts the tests that finish instead of holding their results,
+        for long suites whose results are written out by reporters to run in constant memory
+        compact_results -- If True, the results of the steps are compacted once they are reported and added to the test
+        result, keeping a summary of their exceptions instead of the exceptions
+        payload_directory -- The directory that compacted results write the full details of their exceptions to. The
+        details are dropped if None
+        restore_checkpoints -- If True, the steps that tests share with other tests at their start are run by the first
+        of those tests only, which saves a checkpoint of the browser after them for the others to restore instead
+        suite_result -- The result of the suite, updated as the tests finish
+    """
+
+    def __init__(self, tests, workers=1, driver_factory=Driver, lifecycle_manager=None, reporters=None,
+                 keep_results=True, compact_results=False, payload_directory=None, restore_checkpoints=False):
+        if tests is None or len(tests) == 0:
+            raise ValueError('tests')
+
+        if workers is None or workers < 1:
+            raise ValueError('workers')
+
+        self.tests = tests
+        self.workers = workers
+        self.driver_factory = driver_factory
+        self.lifecycle_manager = lifecycle_manager
+        self.reporters = reporters or []
+        self.keep_results = keep_results
+        self.compact_results = compact_results
+        self.payload_directory = payload_directory
+        self.restore_checkpoints = restore_checkpoints
+        self._checkpoint_store = None
+        self.suite_result = SuiteResult()
+
+    def run_suite(self):
+        """Runs every test of the suite and returns the result of the execution"""
+
+        for _ in self.iter_results():
+            pass
+
+        return self.suite_result
+
+    def iter_results(self):
+        """Runs every test of the suite and yields each test result as soon as its test finishes.
+        Tests run on threads since the work is bound by the browsers, not by the interpreter.
+
+        A test that fails to run, as when its browser doesn't start, doesn't stop the suite: its result holds the
+        exception, with every step skipped."""
+
+        self.suite_result = SuiteResult()
+        self._checkpoint_store = CheckpointStore(self.tests) if self.restore_checkpoints else None
+        start_time = time.monotonic()
+
+        with self._get_driver_pool() as driver_pool, ThreadPoolExecutor(self.workers) as executor:
+            tests = iter(self.tests)
+            futures = {}
+
+            try:
+                while True:
+                    # Only a few tests are queued ahead of the workers, so that finished tests don't pile up in memory
+                    for test in islice(tests, 2 * self.workers - len(futures)):
+                        futures[executor.submit(self._run_test, test, driver_pool)] = test
+
+                    if len(futures) == 0:
+                        break
+
+                    finished_futures, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                    for future in finished_futures:
+                        test = futures.pop(future)
+
+                        try:
+                            test_result = future.result()
+                        except Exception as exception:
+                            test_result = self._get_error_result(test, exception)
+
+                        self.suite_result.add_test_result(test_result, self.keep_results)
+                        self.suite_result.elapsed_time = time.monotonic() - start_time
+
+                        yield test_result
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _run_test(self, test, driver_pool):
+        return self._get_test_runner(test, driver_pool).run_test()
+
+    def _get_error_result(self, test, exception):
+        test_result = TestResult(test)
+        test_result.exception = summarize_exception(exception, self.payload_directory) if self.compact_results \
+            else exception
+
+        for step in test.steps:
+            step_result = StepResult(step)
+            step_result.skip()
+            test_result.add_step_result(step_result)
+
+        for reporter in self.reporters:
+            reporter.report_test_result(test_result)
+
+        return test_result
+
+    def _get_test_runner(self, test, driver_pool):
+        return TestRunner(test, driver_pool, reporters=self.reporters, compact_results=self.compact_results,
+                          payload_directory=self.payload_directory, checkpoint_store=self._checkpoint_store)
+
+    def _get_driver_pool(self):
+        # As many sessions as workers, so that every worker always has a browser of its own
+        return DriverPool(self.workers, self.driver_factory, self.lifecycle_manager)
@@ -0,0 +1,398 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from pyselenium.test_metadata import Test
+from pyselenium.test_steps import AssertElementAttributeValue
+from pyselenium.test_steps import AssertElementNotPresent
+from pyselenium.test_steps import AssertElementValue
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import ClickIfFound
+from pyselenium.test_steps import Navigate
+from pyselenium.test_steps import SelectDropDownItemByText
+from pyselenium.test_steps import SendEnter
+from pyselenium.test_steps import SetCheckbox
+from pyselenium.test_steps import SwitchFrame
+from pyselenium.test_steps import SwitchToDefaultContent
+from pyselenium.test_steps import TypeText
+
+# The steps that test files can have, by the name they are given in the files, which is the name of their class
+STEP_TYPES = {step_type.__name__: step_type for step_type in [AssertElementAttributeValue,
+                                                              AssertElementNotPresent,
+                                                              AssertElementValue,
+                                                              Click,
+                                                              ClickIfFound,
+                                                              Navigate,
+                                                              SelectDropDownItemByText,
+                                                              SendEnter,
+                                                              SetCheckbox,
+                                                              SwitchFrame,
+                                                              SwitchToDefaultContent,
+                                                              TypeText]}
+
+# Part of the key of the cached test files, to tell apart the files cached by versions of PySelenium whose steps differ
+CACHE_FORMAT = 'pyselenium-tests-1'
+
+YAML_EXTENSIONS = ('.yaml', '.yml')
+
+# The types of the values that steps can be given, which are the scalars of JSON and YAML
+_VALUE_TYPES = (str, int, float, bool, type(None))
+
+# The test files already loaded, by the hash of their content, so that the same file is only validated once
+_loaded_definitions = {}
+_loaded_definitions_lock = threading.Lock()
+
+# Tests are seldom compiled at the same time, so a single lock is shared by the definitions instead of one each
+_compile_lock = threading.Lock()
+
+
+class TestFileError(Exception):
+    """An exception thrown when a test file can't be read or doesn't describe tests as expected
+
+    Attributes:
+        path -- The path of the test file
+        location -- Where in the file the error is, as in tests[2].steps[0]. None if it is not in a test
+        message -- What is wrong
+    """
+
+    def __init__(self, path, location, message):
+        super().__init__('%s: %s' % (path if location is None else '%s, %s' % (path, location), message))
+
+        self.path = path
+        self.location = location
+        self.message = message
+
+
+class TestDefinition:
+    """A test as described in a test file, which is compiled into a Test, along with its steps, the first time it is
+    needed only, so that suites can be loaded and split without building every test.
+
+    Attributes:
+        test_id -- The identifier of the test
+        timeout -- The time, in seconds, that the whole test may take. None for no limit
+        steps -- The steps of the test, as [name, arguments] lists, the name being one of STEP_TYPES and the arguments a
+        dict of the keyword arguments its class is created with
+    """
+
+    __slots__ = ('test_id', 'timeout', 'steps', '_test')
+
+    def __init__(self, test_id, timeout, steps):
+        self.test_id = test_id
+        self.timeout = timeout
+        self.steps = steps
+        self._test = None
+
+    def compile(self):
+        """Returns the Test described by the definition, which is only built the first time"""
+
+        with _compile_lock:
+            if self._test is None:
+                test = Test(self.test_id, self.timeout)
+
+                for name, arguments in self.steps:
+                    test.add_step(STEP_TYPES[name](**arguments))
+
+                self._test = test
+
+            return self._test
+
+    def to_dict(self):
+        """Returns the definition as it is written to test files"""
+
+        test = {'id': self.test_id}
+
+        if self.timeout is not None:
+            test['timeout'] = self.timeout
+
+        test['steps'] = [dict(step=name, **arguments) for name, arguments in self.steps]
+
+        return test
+
+
+class TestFile:
+    """The tests of a test file, which are compiled as they are accessed. Test files are sequences of Tests, and can be
+    handed to the runners as they are.
+
+    Attributes:
+        path -- The path of the test file
+        content_hash -- The SHA-256 hash of the content of the file
+        definitions -- The TestDefinitions of the tests of the file
+    """
+
+    def __init__(self, path, content_hash, definitions):
+        self.path = path
+        self.content_hash = content_hash
+        self.definitions = definitions
+
+    def __len__(self):
+        return len(self.definitions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [definition.compile() for definition in self.definitions[index]]
+
+        return self.definitions[index].compile()
+
+    def __iter__(self):
+        for definition in self.definitions:
+            yield definition.compile()
+
+    def get_shard(self, shard_index, shard_count):
+        """Returns a TestFile with the tests of one of shard_count shards of the file. Tests are assigned to shards by
+        a hash of their identifier, so every machine that loads the same file gets the same shards, and adding a test
+        doesn't move the other tests to other shards."""
+
+        if shard_count is None or shard_count < 1:
+            raise ValueError('shard_count')
+
+        if shard_index is None or not 0 <= shard_index < shard_count:
+            raise ValueError('shard_index')
+
+        definitions = [definition for definition in self.definitions
+                       if get_shard_index(definition.test_id, shard_count) == shard_index]
+
+        return TestFile(self.path, self.content_hash, definitions)
+
+
+def get_shard_index(test_id, shard_count):
+    """Returns the index of the shard that the test with the given identifier belongs to"""
+
+    digest = hashlib.sha1(test_id.encode('utf-8')).digest()
+
+    return int.from_bytes(digest[:8], 'big') % shard_count
+
+
+def load_test_file(path, cache_directory=None):
+    """Loads the tests of a JSON or YAML test file, YAML being told apart by the extension of the file, into a TestFile.
+
+    Test files are validated once per content: files loaded before in the same process are not parsed again, and, given
+    a cache directory, the validated tests are kept there as JSON, under the hash of the content of the file, for the
+    next processes to load them without parsing YAML or validating them again."""
+
+    with open(path, 'rb') as file:
+        content = file.read()
+
+    content_hash = hashlib.sha256(content).hexdigest()
+
+    with _loaded_definitions_lock:
+        definitions = _loaded_definitions.get(content_hash)
+
+    if definitions is None:
+        definitions = _read_cached_definitions(cache_directory, content_hash)
+
+        if definitions is None:
+            definitions = parse_test_definitions(_parse_document(path, content), path)
+            _write_cached_definitions(cache_directory, content_hash, definitions)
+
+        with _loaded_definitions_lock:
+            definitions = _loaded_definitions.setdefault(content_hash, definitions)
+
+    return TestFile(path, content_hash, definitions)
+
+
+def parse_test_definitions(document, path='<document>'):
+    """Validates a test file, as parsed from JSON or YAML, and returns the TestDefinitions of its tests.
+
+    Test files are objects with a list of tests, each test having an id, an optional timeout and a list of steps. Steps
+    are objects with the name of their step class as their "step" and the arguments of the class as the other keys:
+
+        {"tests": [{"id": "Search", "timeout": 60, "steps": [{"step": "Navigate", "url": "http://www.google.com"},
+                                                             {"step": "SendEnter"}]}]}
+    """
+
+    if not isinstance(document, dict) or not isinstance(document.get('tests'), list):
+        raise TestFileError(path, None, 'Test files must be objects with a list of tests')
+
+    unknown_keys = sorted(set(document) - {'tests'})
+
+    if len(unknown_keys) > 0:
+        raise TestFileError(path, None, 'Unknown keys %s' % ', '.join(unknown_keys))
+
+    definitions = []
+    test_ids = set()
+
+    for test_index, test in enumerate(document['tests']):
+        location = 'tests[%d]' % test_index
+        definition = _parse_test(test, path, location)
+
+        if definition.test_id in test_ids:
+            raise TestFileError(path, location, 'The id %r is taken by another test' % definition.test_id)
+
+        test_ids.add(definition.test_id)
+        definitions.append(definition)
+
+    return definitions
+
+
+def save_test_file(path, tests):
+    """Writes tests built in Python to a JSON test file, for suites to move to test files. Only the steps of STEP_TYPES
+    can be written."""
+
+    document = {'tests': [TestDefinition(test.test_id, test.timeout, [_get_step_definition(step, test.test_id)
+                                                                      for step in test.steps]).to_dict()
+                          for test in tests]}
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2)
+        file.write('\n')
+
+
+def _parse_document(path, content):
+    try:
+        text = content.decode('utf-8')
+    except UnicodeDecodeError as error:
+        raise TestFileError(path, None, 'Test files must be UTF-8 (%s)' % error)
+
+    if not path.endswith(YAML_EXTENSIONS):
+        try:
+            return json.loads(text)
+        except ValueError as error:
+            raise TestFileError(path, None, 'Invalid JSON (%s)' % error)
+
+    # PyYAML is only needed for YAML test files, and is only imported when one is loaded
+    try:
+        import yaml
+    except ImportError:
+        raise TestFileError(path, None, 'PyYAML must be installed to load YAML test files')
+
+    # The loader written in C, when PyYAML was built with it, parses large suites many times faster
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+    try:
+        return yaml.load(text, Loader=loader)
+    except yaml.YAMLError as error:
+        raise TestFileError(path, None, 'Invalid YAML (%s)' % error)
+
+
+def _parse_test(test, path, location):
+    if not isinstance(test, dict):
+        raise TestFileError(path, location, 'Tests must be objects')
+
+    unknown_keys = sorted(set(test) - {'id', 'timeout', 'steps'})
+
+    if len(unknown_keys) > 0:
+        raise TestFileError(path, location, 'Unknown keys %s' % ', '.join(unknown_keys))
+
+    test_id = test.get('id')
+
+    if not isinstance(test_id, str) or test_id == '':
+        raise TestFileError(path, location, 'Tests must have an id')
+
+    timeout = test.get('timeout')
+
+    if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0):
+        raise TestFileError(path, location, 'The timeout must be a positive number of seconds')
+
+    steps = test.get('steps')
+
+    if not isinstance(steps, list):
+        raise TestFileError(path, location, 'Tests must have a list of steps')
+
+    if len(steps) == 0:
+        raise TestFileError(path, location, 'Tests must have at least one step')
+
+    return TestDefinition(test_id, timeout, [_parse_step(step, path, '%s.steps[%d]' % (location, step_index))
+                                             for step_index, step in enumerate(steps)])
+
+
+def _parse_step(step, path, location):
+    if not isinstance(step, dict):
+        raise TestFileError(path, location, 'Steps must be objects')
+
+    name = step.get('step')
+
+    if not isinstance(name, str) or name not in STEP_TYPES:
+        raise TestFileError(path, location, 'Unknown step %r, expected one of %s' % (name,
+                                                                                     ', '.join(sorted(STEP_TYPES))))
+
+    arguments = {key: value for key, value in step.items() if key != 'step'}
+    required_parameters, optional_parameters = _STEP_PARAMETERS[name]
+
+    missing_parameters = [parameter for parameter in required_parameters if parameter not in arguments]
+
+    if len(missing_parameters) > 0:
+        raise TestFileError(path, location, '%s is missing %s' % (name, ', '.join(missing_parameters)))
+
+    unknown_parameters = sorted(set(arguments) - set(required_parameters) - set(optional_parameters))
+
+    if len(unknown_parameters) > 0:
+        raise TestFileError(path, location, '%s takes no %s' % (name, ', '.join(unknown_parameters)))
+
+    for key, value in arguments.items():
+        if not isinstance(value, _VALUE_TYPES):
+            raise TestFileError(path, location, 'The %s of %s must be a string, a number, a boolean or null'
+                                % (key, name))
+
+    return [name, arguments]
+
+
+def _get_parameters(step_type):
+    # The parameters are read from the code of the initializer, since importing inspect takes longer than loading files
+    initializer = step_type.__init__
+    code = initializer.__code__
+    parameters = code.co_varnames[1:code.co_argcount]
+    required_count = len(parameters) - len(initializer.__defaults__ or ())
+
+    return parameters[:required_count], parameters[required_count:]
+
+
+# The required and the optional parameters of the steps, by the name of the steps
+_STEP_PARAMETERS = {name: _get_parameters(step_type) for name, step_type in STEP_TYPES.items()}
+
+
+def _get_step_definition(step, test_id):
+    name = type(step).__name__
+
+    if STEP_TYPES.get(name) is not type(step):
+        raise ValueError('%s of %s can not be written to test files' % (name, test_id))
+
+    required_parameters, optional_parameters = _STEP_PARAMETERS[name]
+    values = vars(step)
+
+    return [name, {parameter: values[parameter] for parameter in required_parameters + optional_parameters}]
+
+
+def _get_cache_path(cache_directory, content_hash):
+    key = hashlib.sha256(('%s:%s' % (CACHE_FORMAT, content_hash)).encode('ascii')).hexdigest()
+
+    return os.path.join(cache_directory, '%s.json' % key)
+
+
+def _read_cached_definitions(cache_directory, content_hash):
+    if cache_directory is None:
+        return None
+
+    try:
+        with open(_get_cache_path(cache_directory, content_hash), encoding='utf-8') as file:
+            tests = json.load(file)
+        # The steps are kept as they were cached, being [name, arguments] lists already
+        return [TestDefinition(test['id'], test['timeout'], test['steps']) for test in tests]
+    except (OSError, ValueError, KeyError, TypeError):
+        # Broken cache files, such as those written by other versions, are parsed again
+        return None
+
+
+def _write_cached_definitions(cache_directory, content_hash, definitions):
+    if cache_directory is None:
+        return
+
+    tests = [{'id': definition.test_id, 'timeout': definition.timeout, 'steps': definition.steps}
+             for definition in definitions]
+
+    os.makedirs(cache_directory, exist_ok=True)
+
+    # The cache is written to a temporary file first, so that processes loading the same file at the same time never
+    # read half of it
+    descriptor, temporary_path = tempfile.mkstemp(suffix='.tmp', dir=cache_directory)
+
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            # json.dump writes piece by piece without the C encoder, which is many times slower for large suites
+            file.write(json.dumps(tests, separators=(',', ':')))
+
+        os.replace(temporary_path, _get_cache_path(cache_directory, content_hash))
+    except OSError:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
@@ -1,9 +1,19 @@
+import sys
+
+
 class Test:
-    """"The base class for the tests"""
+    """"The base class for the tests
 
-    def __init__(self, test_id=''):
+    Attributes:
+        test_id -- The identifier of the test
+        timeout -- The time, in seconds, that the whole test may take. Steps that were not run by then fail.
+        None for no limit
+    """
+
+    def __init__(self, test_id='', timeout=None):
         self.steps = []
         self.test_id = test_id
+        self.timeout = timeout
 
     def add_step(self, step):
         """Adds a test step to the test"""
@@ -22,9 +32,40 @@ class Step:
 
 
 class ElementFinder:
-    """A base class that specifies that a step is able to find HTML elements"""
+    """A base class that specifies that a step is able to find HTML elements
+
+    Attributes:
+        css_path -- The CSS path of the element
+        hint -- The element hint
+        timeout -- The time, in seconds, to wait for the element to show up on the page. The default of the driver if
+        None
+    """
 
-    def __init__(self, css_path='', hint=''):
+    def __init__(self, css_path='', hint='', timeout=None):
         super().__init__()
-        self.css_path = css_path
-        self.hint = hint
+        # Interned, since data-driven suites build the same steps over and over
+        self.css_path = _intern(css_path)
+        self.hint = _intern(hint)
+        self.timeout = timeout
+
+
+class ElementReader(ElementFinder):
+    """A base class that specifies that a step only reads a value from an HTML element, either its text or the value of
+    one of its attributes, so that it can be run along with other readers in a single call to the browser
+
+    Attributes:
+        attribute_name -- The name of the attribute to be read. The text of the element is read if None
+    """
+
+    def __init__(self, css_path='', hint='', attribute_name=None, timeout=None):
+        super().__init__(css_path, hint, timeout)
+        self.attribute_name = _intern(attribute_name)
+
+    def check_value(self, value):
+        """Returns the result of the step given the value read from the element"""
+
+        pass
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
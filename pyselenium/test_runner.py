@@ -1,4 +1,13 @@
+import time
+
+from pyselenium._selenium_wrapper import DEFAULT_TIMEOUT
+from pyselenium._selenium_wrapper import CommandLatencies
 from pyselenium._selenium_wrapper import Driver
+from pyselenium.test_metadata import ElementFinder
+from pyselenium.test_metadata import ElementReader
+from pyselenium.test_steps import DeadlineExceededError
+from pyselenium.test_steps import ExceptionSummary
+from pyselenium.test_steps import StepResult
 
 
 class TestResult:
@@ -6,17 +15,75 @@ class TestResult:
 
     Attributes:
         step_results -- Holds the results of every step on the test
+        exception -- An exception that kept the test from running, such as a browser that failed to start, or the
+        ExceptionSummary of it once the result is compacted. None if the test ran
     """
 
+    __slots__ = ('step_results', 'test', 'exception', '_command_latencies')
+
     def __init__(self, test):
         self.step_results = []
         self.test = test
+        self.exception = None
+        self._command_latencies = CommandLatencies()
 
     def add_step_result(self, step_result):
         """Adds a new step execution result to the list"""
 
         self.step_results.append(step_result)
 
+        # Summed up as the steps are added, since compacted step results don't keep their latencies
+        if step_result.command_latencies is not None:
+            self._command_latencies.add(step_result.command_latencies)
+
+    @property
+    def success(self):
+        """Gets whether the test ran and every step of it was successful"""
+
+        return self.exception is None and all(step_result.success for step_result in self.step_results)
+
+    @property
+    def exception_name(self):
+        """Gets the name of the class of the exception that kept the test from running. None if the test ran."""
+
+        if self.exception is None:
+            return None
+
+        if isinstance(self.exception, ExceptionSummary):
+            return self.exception.type_name
+
+        return type(self.exception).__name__
+
+    @property
+    def duration(self):
+        """Gets the time, in seconds, that the steps took to run"""
+
+        return sum(step_result.duration for step_result in self.step_results)
+
+    @property
+    def wait_time(self):
+        """Gets the time, in seconds, that the steps spent waiting for elements"""
+
+        return sum(step_result.wait_time for step_result in self.step_results)
+
+    @property
+    def command_count(self):
+        """Gets the number of WebDriver commands that the steps sent to the browser"""
+
+        return sum(step_result.command_count for step_result in self.step_results)
+
+    @property
+    def wait_poll_count(self):
+        """Gets the number of times that the steps checked the page while waiting for elements"""
+
+        return sum(step_result.wait_poll_count for step_result in self.step_results)
+
+    @property
+    def command_latencies(self):
+        """Gets the CommandLatencies of the commands that the steps sent to the browser"""
+
+        return self._command_latencies
+
     def print_test_result(self):
         """"Prints the test result to the current default stream"""
 
@@ -24,41 +91,292 @@ class TestResult:
             print(type(step_result.step).__name__ + ' - ' + "Success" if step_result.success
                   else str(step_result.exception) + 'Hint')
 
+    def format_command_latencies(self):
+        """Returns a table of how long each kind of WebDriver command took during the test"""
+
+        return "[%s] command latencies\n%s" % (self.test.test_id, self.command_latencies)
+
     def __str__(self):
-        string = "[%s] test result" % self.test.test_id
-        string += "\n________________________"
-        string += "\nSteps:\n"
+        lines = ["[%s] test result" % self.test.test_id,
+                 "________________________",
+                 "Steps:",
+                 ""]
 
         for step_result in self.step_results:
-            line = "- [%s] - " % type(step_result.step).__name__
-            line += "Success" if step_result.success \
-                else "%s - %s" % (type(step_result.exception).__name__, str(step_result.exception))
+            if step_result.skipped:
+                outcome = "Skipped"
+            else:
+                if step_result.restored:
+                    outcome = "Restored from checkpoint"
+                else:
+                    outcome = "Success" if step_result.success \
+                        else "%s - %s" % (step_result.exception_name, str(step_result.exception))
+
+                outcome += " (%s)" % self._format_timing(step_result.duration, step_result.wait_time,
+                                                         step_result.command_count, step_result.wait_poll_count)
+
+            lines.append("- [%s] - %s" % (type(step_result.step).__name__, outcome))
+
+        if self.exception is not None:
+            lines.append("")
+            lines.append("Error: %s - %s" % (self.exception_name, str(self.exception)))
 
-            string += "\n%s" % line
+        lines.append("")
+        lines.append("Total: %s" % self._format_timing(self.duration, self.wait_time, self.command_count,
+                                                       self.wait_poll_count))
 
-        return string
+        return "\n".join(lines)
+
+    def _format_timing(self, duration, wait_time, command_count, wait_poll_count):
+        return "%.3fs, %.3fs waiting, %d commands, %d polls" % (duration, wait_time, command_count, wait_poll_count)
 
 
 class TestRunner:
-    """Runs every test step and collects the execution result"""
+    """Runs every test step and collects the execution result
 
-    def __init__(self, test):
+    Attributes:
+        test -- The test to be run
+        driver_pool -- A DriverPool to take the browser session from. A new browser is started for the test if None
+        driver_factory -- A callable that creates the driver when there is no pool, such as Driver or a partial of it
+        batch_assertions -- If True, consecutive steps that only read from elements are run in a single call to the
+        browser. The steps whose elements are not on the page yet are run one by one, waiting for their elements.
+        fail_fast -- If True, the steps that follow a failed step are skipped instead of run
+        launch_profile -- The LaunchProfile, or the name of one, that the driver launches the browser with when there
+        is no pool. The default of the driver if None
+        reporters -- The Reporters that the result of every step and the result of the test are handed to as soon as
+        they are known
+        compact_results -- If True, the results of the steps are compacted once they are reported and added to the test
+        result, keeping a summary of their exceptions instead of the exceptions
+        payload_directory -- The directory that compacted results write the full details of their exceptions to. The
+        details are dropped if None
+        checkpoint_store -- A CheckpointStore of the steps that the test shares with other tests at its start. The first
+        test to run the steps saves a checkpoint of the browser after them and the others restore it instead of running
+        them, on drivers that support checkpoints. The steps are always run if None
+    """
+
+    def __init__(self, test, driver_pool=None, driver_factory=Driver, batch_assertions=False, fail_fast=False,
+                 launch_profile=None, reporters=None, compact_results=False, payload_directory=None,
+                 checkpoint_store=None):
         self.test = test
+        self.driver_pool = driver_pool
+        self.driver_factory = driver_factory
+        self.batch_assertions = batch_assertions
+        self.fail_fast = fail_fast
+        self.launch_profile = launch_profile
+        self.reporters = reporters or []
+        self.compact_results = compact_results
+        self.payload_directory = payload_directory
+        self.checkpoint_store = checkpoint_store
 
     def run_test(self):
         """"Runs the supplied test and returns the result of the execution"""
 
+        test_result = TestResult(self.test)
+
+        for step_result in self.iter_test():
+            test_result.add_step_result(step_result)
+
+            if self.compact_results:
+                step_result.compact(self.payload_directory)
+
+        for reporter in self.reporters:
+            reporter.report_test_result(test_result)
+
+        return test_result
+
+    def iter_test(self):
+        """Runs the supplied test and yields the result of every step as soon as the step is run"""
+
+        for index, step_result in enumerate(self._iter_steps()):
+            for reporter in self.reporters:
+                reporter.report_step_result(self.test, index, step_result)
+
+            yield step_result
+
+    def _iter_steps(self):
         if len(self.test.steps) == 0:
             raise ValueError('no steps on the test')
 
-        test_result = TestResult(self.test)
+        deadline = None if self.test.timeout is None else time.monotonic() + self.test.timeout
+        step_count = 0
+        failed = False
 
-        with self._get_web_driver() as driver:
-            for step in self.test.steps:
-                step_result = step.run(driver)
-                test_result.add_step_result(step_result)
+        with self._get_driver_context() as driver:
+            prefix_length = self._get_checkpoint_prefix_length(driver)
 
-        return test_result
+            try:
+                for step_result in self._restore_checkpoint(driver, prefix_length):
+                    step_count += 1
+
+                    yield step_result
+
+                for steps in self._group_steps(step_count):
+                    if (self.fail_fast and failed) or (deadline is not None and time.monotonic() >= deadline):
+                        break
+
+                    for step_result in self._run_measured_steps(steps, driver, deadline):
+                        step_count += 1
+                        failed = failed or not step_result.success
+
+                        yield step_result
+
+                        if step_count == prefix_length and not failed:
+                            self._save_checkpoint(driver)
+
+                        if self.fail_fast and failed:
+                            break
+            finally:
+                driver.set_timeout_budget()
+
+        for step in self.test.steps[step_count:]:
+            yield self._get_skipped_result(step) if self.fail_fast and failed \
+                else self._get_deadline_exceeded_result(step)
+
+    def _group_steps(self, start_index=0):
+        """Splits the steps of the test, from the given index on, into the groups that are run together"""
+
+        groups = []
+
+        for step in self.test.steps[start_index:]:
+            if self.batch_assertions and isinstance(step, ElementReader) and len(groups) > 0 and \
+                    isinstance(groups[-1][0], ElementReader):
+                groups[-1].append(step)
+            else:
+                groups.append([step])
+
+        return groups
+
+    def _run_measured_steps(self, steps, driver, deadline):
+        """Runs the steps like _run_steps does, recording the time each step took and the work it made the driver do.
+        The single call reading a batch of steps is accounted to the first step of the batch."""
+
+        step_results = self._run_steps(steps, driver, deadline)
+
+        while True:
+            started_at = time.time()
+            metrics = driver.metrics.snapshot()
+
+            step_result = next(step_results, None)
+
+            if step_result is None:
+                return
+
+            step_result.record_timing(started_at, time.time(), driver.metrics.since(metrics))
+
+            yield step_result
+
+    def _run_steps(self, steps, driver, deadline):
+        values = None
+
+        if len(steps) > 1:
+            try:
+                values = driver.read_elements([(step.css_path, step.attribute_name) for step in steps])
+            except Exception:
+                # The steps find and read their elements one by one instead
+                pass
+
+        if values is None:
+            for step in steps:
+                yield self._run_step(step, driver, deadline)
+            return
+
+        for index, (step, (found, value)) in enumerate(zip(steps, values)):
+            if found:
+                yield step.check_value(value)
+            else:
+                yield self._run_step(step, driver, deadline)
+
+                # The step waited for its element, so the values read for the steps after it may have changed since
+                yield from self._run_steps(steps[index + 1:], driver, deadline)
+                return
+
+    def _run_step(self, step, driver, deadline):
+        driver.set_timeout_budget(getattr(step, 'timeout', None), deadline)
+        started_at = time.monotonic()
+
+        step_result = step.run(driver)
+
+        if is_cut_short_by_deadline(step_result, started_at, deadline):
+            step_result.exception = DeadlineExceededError(self.test.timeout)
+
+        return step_result
+
+    def _get_checkpoint_prefix_length(self, driver):
+        if self.checkpoint_store is None or not getattr(driver, 'checkpoints_supported', False):
+            return 0
+
+        return self.checkpoint_store.get_prefix_length(self.test)
+
+    def _restore_checkpoint(self, driver, prefix_length):
+        """Restores the checkpoint of the steps at the start of the test, if one was saved, and returns the results of
+        those steps, the first of which accounts for the restore. Returns no results if the steps are to be run."""
+
+        checkpoint = None if prefix_length == 0 else self.checkpoint_store.get(self.test)
+
+        if checkpoint is None:
+            return []
+
+        started_at = time.time()
+        metrics = driver.metrics.snapshot()
+
+        try:
+            driver.restore_checkpoint(checkpoint)
+        except Exception:
+            # The steps are run instead, and the ones that fail report why
+            return []
+
+        step_results = [StepResult(step) for step in self.test.steps[:prefix_length]]
+
+        for step_result in step_results:
+            step_result.restore()
+
+        step_results[0].record_timing(started_at, time.time(), driver.metrics.since(metrics))
+
+        return step_results
+
+    def _save_checkpoint(self, driver):
+        if self.checkpoint_store.get(self.test) is not None:
+            return
+
+        try:
+            self.checkpoint_store.put(self.test, driver.save_checkpoint())
+        except Exception:
+            # The tests that share the steps run them instead
+            pass
+
+    def _get_skipped_result(self, step):
+        step_result = StepResult(step)
+        step_result.skip()
+
+        return step_result
+
+    def _get_deadline_exceeded_result(self, step):
+        step_result = StepResult(step)
+        step_result.exception = DeadlineExceededError(self.test.timeout)
+
+        return step_result
+
+    def _get_driver_context(self):
+        if self.driver_pool is not None:
+            return self.driver_pool.session()
+
+        return self._get_web_driver()
 
     def _get_web_driver(self):
-        return Driver()
+        if self.launch_profile is not None:
+            return self.driver_factory(launch_profile=self.launch_profile)
+
+        return self.driver_factory()
+
+
+def is_cut_short_by_deadline(step_result, started_at, deadline):
+    """Tells whether a step that waited for an element failed because the deadline of the test ended its wait before
+    the timeout of the step did, given the time.monotonic() value the step started at"""
+
+    if step_result.success or deadline is None or not isinstance(step_result.step, ElementFinder) or \
+            time.monotonic() < deadline:
+        return False
+
+    step_timeout = step_result.step.timeout
+
+    return deadline - started_at < (DEFAULT_TIMEOUT if step_timeout is None else step_timeout)
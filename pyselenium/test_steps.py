@@ -1,94 +1,124 @@
+import base64
+import os
+import sys
+import tempfile
+import traceback
+
+from pyselenium._selenium_wrapper import NoSuchAttributeError
 from pyselenium.test_metadata import ElementFinder
+from pyselenium.test_metadata import ElementReader
 from pyselenium.test_metadata import Step
 
+KEYSTROKES_TYPING_MODE = 'keystrokes'
+FAST_TYPING_MODE = 'fast'
 
-class Click(ElementFinder, Step):
-    """A test step that simulates a click on an element"""
 
-    def __init__(self, css_path, hint):
-        super().__init__(css_path, hint)
+class DriverCallStep(Step):
+    """A base class for the test steps that make a single call to the driver and whose result only depends on the
+    value the call returns, so that the same step runs on both Driver and AsyncDriver"""
 
     def run(self, driver):
-        step_result = StepResult(self)
+        """Runs the step on a Driver and returns the result of the execution"""
+
+        try:
+            value = self.call_driver(driver)
+        except Exception as exception:
+            return self._get_failed_result(exception)
+
+        return self.check_value(value)
+
+    async def run_async(self, driver):
+        """Runs the step on an AsyncDriver and returns the result of the execution"""
 
         try:
-            driver.click(self.css_path, self.hint)
+            value = await self.call_driver(driver)
         except Exception as exception:
-            step_result.exception = exception
+            return self._get_failed_result(exception)
+
+        return self.check_value(value)
+
+    def call_driver(self, driver):
+        """Makes the call to the driver that the step consists of and returns what the call returns"""
+
+        pass
+
+    def check_value(self, value):
+        """Returns the result of the step given the value returned by the call to the driver"""
+
+        return StepResult(self)
+
+    def _get_failed_result(self, exception):
+        step_result = StepResult(self)
+        step_result.exception = exception
 
         return step_result
 
 
-class Navigate(Step):
+class Click(ElementFinder, DriverCallStep):
+    """A test step that simulates a click on an element"""
+
+    def __init__(self, css_path, hint, timeout=None):
+        super().__init__(css_path, hint, timeout)
+
+    def call_driver(self, driver):
+        return driver.click(self.css_path, self.hint)
+
+
+class Navigate(DriverCallStep):
     """A test step that navigates to a given URL"""
 
     def __init__(self, url):
         super().__init__()
         self.url = url
 
-    def run(self, driver):
-        step_result = StepResult(self)
-
-        try:
-            driver.navigate(self.url)
-        except Exception as exception:
-            step_result.exception = exception
-
-        return step_result
+    def call_driver(self, driver):
+        return driver.navigate(self.url)
 
 
-class AssertElementValue(ElementFinder, Step):
+class AssertElementValue(ElementReader, DriverCallStep):
     """A test step that asserts the value (text) inside an element"""
 
-    def __init__(self, css_path, hint, expected_value):
-        super().__init__(css_path, hint)
+    def __init__(self, css_path, hint, expected_value, timeout=None):
+        super().__init__(css_path, hint, timeout=timeout)
 
         self.expected_value = expected_value
 
-    def run(self, driver):
+    def call_driver(self, driver):
+        return driver.get_element_value(self.css_path, self.hint)
+
+    def check_value(self, value):
         step_result = StepResult(self)
 
-        element_value = None
-
-        try:
-            element_value = driver.get_element_value(self.css_path, self.hint)
-        except Exception as exception:
-            step_result.exception = exception
-        else:
-            if element_value != self.expected_value:
-                step_result.exception = ElementValueIncorrectError(self.css_path, self.hint, element_value,
-                                                                   self.expected_value)
+        if value != self.expected_value:
+            step_result.exception = ElementValueIncorrectError(self.css_path, self.hint, value, self.expected_value)
 
         return step_result
 
 
-class AssertElementAttributeValue(ElementFinder, Step):
+class AssertElementAttributeValue(ElementReader, DriverCallStep):
     """A test step that compares a given value to a given attribute value of the web element"""
 
-    def __init__(self, css_path, hint, attribute_name, expected_value):
-        super().__init__(css_path, hint)
+    def __init__(self, css_path, hint, attribute_name, expected_value, timeout=None):
+        super().__init__(css_path, hint, attribute_name, timeout)
 
-        self.attribute_name = attribute_name
         self.expected_value = expected_value
 
-    def run(self, driver):
+    def call_driver(self, driver):
+        return driver.get_element_attribute(self.css_path, self.hint, self.attribute_name)
+
+    def check_value(self, value):
         step_result = StepResult(self)
-        attribute_value = None
 
-        try:
-            attribute_value = driver.get_element_attribute(self.css_path, self.hint, self.attribute_name)
-        except Exception as exception:
-            step_result.exception = exception
-        else:
-            if attribute_value != self.expected_value:
-                step_result.exception = ElementAttributeValueIncorrectError(self.css_path, self.hint,
-                                                                            self.attribute_name,
-                                                                            attribute_value, self.expected_value)
+        if value is None or value == '':
+            step_result.exception = NoSuchAttributeError(self.css_path, self.hint, self.attribute_name, None)
+        elif value != self.expected_value:
+            step_result.exception = ElementAttributeValueIncorrectError(self.css_path, self.hint, self.attribute_name,
+                                                                        value, self.expected_value)
 
         return step_result
 
 
-class ClickIfFound(ElementFinder, Step):
+class ClickIfFound(ElementFinder, DriverCallStep):
     """A test step that clicks an element if it is found but doesn't fail if it's not found"""
 
     def __init__(self, css_path, hint, wait_time):
@@ -96,18 +126,11 @@ class ClickIfFound(ElementFinder, Step):
 
         self.wait_time = wait_time
 
-    def run(self, driver):
-        step_result = StepResult(self)
-
-        try:
-            driver.click_if_found(self.css_path, self.hint, self.wait_time)
-        except Exception as exception:
-            step_result.exception = exception
-
-        return step_result
+    def call_driver(self, driver):
+        return driver.click_if_found(self.css_path, self.hint, self.wait_time)
 
 
-class AssertElementNotPresent(ElementFinder, Step):
+class AssertElementNotPresent(ElementFinder, DriverCallStep):
     """Asserts that an element at a given CSS path is not present on the web page
      after trying to find it for a given time"""
 
@@ -116,138 +139,190 @@ class AssertElementNotPresent(ElementFinder, Step):
 
         self.wait_time = wait_time
 
-    def run(self, driver):
+    def call_driver(self, driver):
+        return driver.can_find_element(self.css_path, self.wait_time)
+
+    def check_value(self, value):
         step_result = StepResult(self)
 
-        try:
-            element_found = driver.can_find_element(self.css_path, self.wait_time)
-        except Exception as exception:
-            step_result.exception = exception
-        else:
-            if element_found:
-                step_result.exception = ElementShouldNotBePresentError(self.css_path, self.hint, self.wait_time)
+        if value:
+            step_result.exception = ElementShouldNotBePresentError(self.css_path, self.hint, self.wait_time)
 
         return step_result
 
 
-class TypeText(ElementFinder, Step):
-    """Selects an element and simulates the user typing the specified text in the element"""
+class TypeText(ElementFinder, DriverCallStep):
+    """Selects an element and simulates the user typing the specified text in the element
 
-    def __init__(self, css_path, hint, text):
-        super().__init__(css_path, hint)
+    Attributes:
+        mode -- KEYSTROKES_TYPING_MODE to type the text key by key, as the user would, or FAST_TYPING_MODE to set the
+        whole text at once, firing only the input and change events
+    """
+
+    def __init__(self, css_path, hint, text, mode=KEYSTROKES_TYPING_MODE, timeout=None):
+        super().__init__(css_path, hint, timeout)
 
         self.text = text
+        self.mode = mode
 
-    def run(self, driver):
-        step_result = StepResult(self)
+    def call_driver(self, driver):
+        if self.mode == KEYSTROKES_TYPING_MODE:
+            return driver.send_text(self.css_path, self.hint, self.text)
 
-        try:
-            driver.send_text(self.css_path, self.hint, self.text)
-        except Exception as exception:
-            step_result.exception = exception
+        if self.mode == FAST_TYPING_MODE:
+            return driver.set_text(self.css_path, self.hint, self.text)
 
-        return step_result
+        raise ValueError('mode')
 
 
-class SendEnter(Step):
+class SendEnter(DriverCallStep):
     """Sends the enter key to simulate the user hitting the return button on the keyboard"""
 
     def __init__(self):
         super().__init__()
 
-    def run(self, driver):
-        step_result = StepResult(self)
-
-        try:
-            driver.send_enter_key()
-        except Exception as exception:
-            step_result.exception = exception
-
-        return step_result
+    def call_driver(self, driver):
+        return driver.send_enter_key()
 
 
-class SelectDropDownItemByText(ElementFinder, Step):
+class SelectDropDownItemByText(ElementFinder, DriverCallStep):
     """Selects an item inside a dropdown control by its text"""
 
-    def __init__(self, css_path, hint, item_text):
-        super().__init__(css_path, hint)
+    def __init__(self, css_path, hint, item_text, timeout=None):
+        super().__init__(css_path, hint, timeout)
 
         self.item_text = item_text
 
-    def run(self, driver):
-        step_result = StepResult(self)
-
-        try:
-            driver.select_drop_down_item_by_text(self.css_path, self.hint, self.item_text)
-        except Exception as exception:
-            step_result.exception = exception
-
-        return step_result
+    def call_driver(self, driver):
+        return driver.select_drop_down_item_by_text(self.css_path, self.hint, self.item_text)
 
 
-class SetCheckbox(ElementFinder, Step):
+class SetCheckbox(ElementFinder, DriverCallStep):
     """Checks or unchecks a checkbox web element"""
 
-    def __init__(self, css_path, hint, checked):
-        super().__init__(css_path, hint)
+    def __init__(self, css_path, hint, checked, timeout=None):
+        super().__init__(css_path, hint, timeout)
 
         self.checked = checked
 
-    def run(self, driver):
-        step_result = StepResult(self)
-
-        try:
-            driver.set_checkbox(self.css_path, self.hint, self.checked)
-        except Exception as exception:
-            step_result.exception = exception
-
-        return step_result
+    def call_driver(self, driver):
+        return driver.set_checkbox(self.css_path, self.hint, self.checked)
 
 
-class SwitchFrame(ElementFinder, Step):
+class SwitchFrame(ElementFinder, DriverCallStep):
     """"Switches the context of the web driver to the iFrame found at the specified CSS path"""
 
-    def __init__(self, css_path, hint):
-        super().__init__(css_path, hint)
-
-    def run(self, driver):
-        step_result = StepResult(self)
-
-        try:
-            driver.switch_to_frame(self.css_path, self.hint)
-        except Exception as exception:
-            step_result.exception = exception
+    def __init__(self, css_path, hint, timeout=None):
+        super().__init__(css_path, hint, timeout)
 
-        return step_result
+    def call_driver(self, driver):
+        return driver.switch_to_frame(self.css_path, self.hint)
 
 
-class SwitchToDefaultContent(Step):
+class SwitchToDefaultContent(DriverCallStep):
     """Switches the context of the web driver back to the default content of the web page"""
 
-    def run(self, driver):
-        step_result = StepResult(self)
-
-        try:
-            driver.switch_to_default_content()
-        except Exception as exception:
-            step_result.exception = exception
-
-        return step_result
+    def call_driver(self, driver):
+        return driver.switch_to_default_content()
 
 
 class StepResult:
     """Represents the result of the execution of a test step.
 
+    Step results are slotted, since large suites keep many of them, and can be compacted once the step is run to keep a
+    summary of their exception instead of the exception itself.
+
     Attributes:
         success -- True if the step execution was successful, false otherwise
-        exception -- An exception that might have occurred during step execution. None if no exception occurred
+        skipped -- True if the step was not run, false otherwise
+        restored -- True if the step was not run because the state of the browser it leads to was restored from a
+        checkpoint, false otherwise
+        exception -- An exception that might have occurred during step execution, or the ExceptionSummary of it once
+        the result is compacted. None if no exception occurred
         step -- The step that was executed
+        started_at -- The time (as in time.time()) the step started running at. None if the step was not run
+        finished_at -- The time (as in time.time()) the step finished running at. None if the step was not run
+        wait_time -- The time, in seconds, the step spent waiting for elements
+        command_count -- The number of WebDriver commands the step sent to the browser
+        wait_poll_count -- The number of times the step checked the page while waiting for elements
+        command_latencies -- The CommandLatencies of the commands the step sent to the browser. None if the step was
+        not run or if the result is compacted
      """
 
+    __slots__ = ('success', 'skipped', 'restored', 'step', '_exception', 'started_at', 'finished_at', 'wait_time',
+                 'command_count', 'wait_poll_count', 'command_latencies')
+
     def __init__(self, step):
         self.success = True
+        self.skipped = False
+        self.restored = False
         self.step = step
         self._exception = None
+        self.started_at = None
+        self.finished_at = None
+        self.wait_time = 0.0
+        self.command_count = 0
+        self.wait_poll_count = 0
+        self.command_latencies = None
+
+    def skip(self):
+        """Marks the step as not run."""
+
+        self.skipped = True
+        self.success = False
+
+    def restore(self):
+        """Marks the step as not run, the state of the browser it leads to having been restored from a checkpoint."""
+
+        self.restored = True
+
+    def record_timing(self, started_at, finished_at, metrics):
+        """Records when the step ran and the work it made the driver do, as DriverMetrics."""
+
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.wait_time = metrics.wait_time
+        self.command_count = metrics.command_count
+        self.wait_poll_count = metrics.wait_poll_count
+        self.command_latencies = metrics.command_latencies
+
+    def compact(self, payload_directory=None):
+        """Replaces the exception with an ExceptionSummary of it and drops the command latencies, so that the result no
+        longer holds on to the exception, its traceback and the stacktraces and screenshots of the browser it carries.
+        The full details of the exception are written to a file in the payload directory first, if there is one."""
+
+        if isinstance(self._exception, BaseException):
+            self._exception = summarize_exception(self._exception, payload_directory)
+
+        self.command_latencies = None
+
+    @property
+    def exception_name(self):
+        """Gets the name of the class of the exception, whether the result is compacted or not. None if there is no
+        exception."""
+
+        if self._exception is None:
+            return None
+
+        if isinstance(self._exception, ExceptionSummary):
+            return self._exception.type_name
+
+        return type(self._exception).__name__
+
+    @property
+    def duration(self):
+        """Gets the time, in seconds, the step took to run."""
+
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+
+        return self.finished_at - self.started_at
+
+    @property
+    def action_time(self):
+        """Gets the time, in seconds, the step spent doing anything but waiting for elements."""
+
+        return max(0.0, self.duration - self.wait_time)
 
     @property
     def exception(self):
@@ -263,6 +338,93 @@ class StepResult:
         self.success = False
 
 
+class ExceptionSummary:
+    """What compacted step results keep of the exception their step failed with: enough to report the failure, without
+    the references the exception holds on to.
+
+    Attributes:
+        type_name -- The name of the class of the exception
+        message -- The message of the exception, or its attributes if it has no message
+        location -- Where the exception was raised, as file:line in function. None if it was never raised
+        payload_path -- The file the full details of the exception were written to. None if they were not written
+    """
+
+    __slots__ = ('type_name', 'message', 'location', 'payload_path')
+
+    def __init__(self, type_name, message, location=None, payload_path=None):
+        self.type_name = type_name
+        self.message = message
+        self.location = location
+        self.payload_path = payload_path
+
+    def read_payload(self):
+        """Returns the full details of the exception, as written to the payload file. None if they were not written."""
+
+        if self.payload_path is None:
+            return None
+
+        with open(self.payload_path, encoding='utf-8') as file:
+            return file.read()
+
+    def __str__(self):
+        return self.message
+
+
+def summarize_exception(exception, payload_directory=None):
+    """Returns the ExceptionSummary of an exception. If a payload directory is given, the tracebacks of the exception
+    and of its inner exception, along with the stacktrace of the browser, are written to a file in it, and a
+    screenshot the browser sent along is saved next to the file."""
+
+    frames = traceback.extract_tb(exception.__traceback__)
+    location = None if len(frames) == 0 else sys.intern('%s:%d in %s' % (frames[-1].filename, frames[-1].lineno,
+                                                                         frames[-1].name))
+    payload_path = None if payload_directory is None else _write_exception_payload(exception, payload_directory)
+
+    return ExceptionSummary(sys.intern(type(exception).__name__), get_exception_message(exception), location,
+                            payload_path)
+
+
+def get_exception_message(exception):
+    """Returns the message of an exception, or its attributes if it has no message"""
+
+    message = str(exception)
+
+    if message != '':
+        return message
+
+    # The step execution errors keep what went wrong in their attributes rather than in their message
+    return ', '.join('%s=%r' % (name, value) for name, value in getattr(exception, '__dict__', {}).items()
+                     if isinstance(value, (str, int, float, bool, type(None))))
+
+
+def _write_exception_payload(exception, payload_directory):
+    descriptor, path = tempfile.mkstemp(prefix='%s-' % type(exception).__name__, suffix='.txt', dir=payload_directory)
+    inner_exception = getattr(exception, 'inner_exception', None)
+
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+        file.write(''.join(traceback.format_exception(type(exception), exception, exception.__traceback__)))
+
+        if inner_exception is not None:
+            file.write('\nInner exception:\n')
+            file.write(''.join(traceback.format_exception(type(inner_exception), inner_exception,
+                                                          inner_exception.__traceback__)))
+
+            for line in getattr(inner_exception, 'stacktrace', None) or []:
+                file.write('%s\n' % line)
+
+            screen = getattr(inner_exception, 'screen', None)
+
+            if screen:
+                screenshot_path = path[:-len('.txt')] + '.png'
+
+                with open(screenshot_path, 'wb') as screenshot_file:
+                    screenshot_file.write(base64.b64decode(screen))
+
+                file.write('\nScreenshot: %s\n' % screenshot_path)
+
+    return path
+
+
 class StepExecutionError(Exception):
     """"Represents failures in test steps execution"""
     pass
@@ -307,3 +469,16 @@ class ElementShouldNotBePresentError(StepExecutionError):
         self.css_path = css_path
         self.hint = hint
         self.wait_time = wait_time
+
+
+class DeadlineExceededError(StepExecutionError):
+    """An exception set on the steps that were not run because the test ran out of time
+
+    Attributes:
+        - timeout: The time, in seconds, that the whole test was allowed to take
+    """
+
+    def __init__(self, timeout):
+        super().__init__()
+
+        self.timeout = timeout
@@ -41,6 +41,12 @@ setup(
         'Topic :: Utilities'
     ],
     install_requires=[
-        "selenium"
-    ]
+        # The pooled connections to chromedriver replace the http.client connection of RemoteConnection (_conn and
+        # _request), which Selenium 3.14 replaced with urllib3, and the drivers are started with the chrome_options
+        # and desired_capabilities arguments of Selenium 3
+        "selenium>=3.0,<3.14"
+    ],
+    extras_require={
+        'yaml': ['PyYAML']
+    }
 )
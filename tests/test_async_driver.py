@@ -0,0 +1,272 @@
+import asyncio
+import time
+from unittest import TestCase
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.keys import Keys
+
+from pyselenium._selenium_wrapper import ElementNotFoundError
+from pyselenium._selenium_wrapper import InvalidElementException
+from pyselenium._selenium_wrapper import InvalidOptionTextException
+from pyselenium._selenium_wrapper import NoSuchAttributeError
+from pyselenium._webdriver_http import WebDriverHttpClient
+from pyselenium.async_driver import AsyncDriver
+from tests.testables import FakeElement
+from tests.testables import FakeWebDriverServer
+from tests.testables import run_coroutine
+
+
+def run_on_driver(server, action, launch_profile='headless-fast'):
+    async def run():
+        async with AsyncDriver(server.url, launch_profile) as driver:
+            return await action(driver)
+
+    return run_coroutine(run())
+
+
+class TestAsyncDriver(TestCase):
+    """Has unit tests for the AsyncDriver class, against a fake WebDriver server"""
+
+    def test_initializer_error(self):
+        self.assertRaises(ValueError, AsyncDriver, None)
+        self.assertRaises(ValueError, AsyncDriver, '')
+
+    def test_session(self):
+        with FakeWebDriverServer() as server:
+            run_on_driver(server, lambda driver: driver.navigate('http://any.url'), launch_profile='default')
+
+        self.assertEqual([('POST', '/session'),
+                          ('POST', '/session/fake-session/window/current/maximize'),
+                          ('POST', '/session/fake-session/url'),
+                          ('DELETE', '/session/fake-session')], server.commands)
+        self.assertEqual(1, server.connection_count)
+
+    def test_w3c_session(self):
+        with FakeWebDriverServer(w3c=True) as server:
+            server.elements['#button'] = FakeElement()
+            server.elements['#input'] = FakeElement(tag_name='input')
+
+            async def run(driver):
+                await driver.click('#button', 'hint')
+                await driver.send_text('#input', 'hint', 'any text')
+                await driver.click('#input', 'hint')
+                await driver.send_enter_key()
+
+                return driver.w3c
+
+            self.assertTrue(run_on_driver(server, run, launch_profile='default'))
+
+        self.assertIn(('POST', '/session/fake-session/window/maximize'), server.commands)
+        self.assertIn(('POST', '/session/fake-session/execute/sync'), server.commands)
+        self.assertEqual(1, server.elements['#button'].click_count)
+        self.assertEqual([Keys.NUMPAD1, 'any text', Keys.RETURN], server.elements['#input'].typed_keys)
+
+    def test_send_enter_key(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#input'] = FakeElement(tag_name='input')
+            server.active_element = '#input'
+
+            run_on_driver(server, lambda driver: driver.send_enter_key())
+
+        self.assertEqual([Keys.RETURN], server.elements['#input'].typed_keys)
+
+    def test_click(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#button'] = FakeElement()
+
+            run_on_driver(server, lambda driver: driver.click('#button', 'hint'))
+
+        self.assertEqual(1, server.elements['#button'].click_count)
+
+    def test_click_waits_for_element(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#button'] = FakeElement(appears_after=0.2)
+
+            async def click(driver):
+                await driver.navigate('http://any.url')
+                await driver.click('#button', 'hint')
+
+                return driver.metrics
+
+            metrics = run_on_driver(server, click)
+
+        self.assertEqual(1, server.elements['#button'].click_count)
+        self.assertEqual(2, metrics.wait_poll_count)
+        self.assertGreater(metrics.wait_time, 0.1)
+
+    def test_click_error(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#hidden'] = FakeElement(displayed=False)
+
+            async def click(driver):
+                driver.set_timeout_budget(step_timeout=0)
+
+                with self.assertRaises(ElementNotFoundError):
+                    await driver.click('#hidden', 'hint')
+
+                with self.assertRaises(ElementNotFoundError) as context:
+                    await driver.click('#missing', 'hint')
+
+                self.assertIsInstance(context.exception.inner_exception, NoSuchElementException)
+
+            run_on_driver(server, click)
+
+        self.assertEqual(0, server.elements['#hidden'].click_count)
+
+    def test_deadline(self):
+        with FakeWebDriverServer() as server:
+            async def find(driver):
+                driver.set_timeout_budget(deadline=time.monotonic() + 0.1)
+
+                with self.assertRaises(ElementNotFoundError):
+                    await driver.find_element('#missing', 'hint')
+
+            start_time = time.monotonic()
+            run_on_driver(server, find)
+            elapsed_time = time.monotonic() - start_time
+
+        self.assertLess(elapsed_time, 1)
+
+    def test_click_if_found(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#button'] = FakeElement()
+
+            async def click(driver):
+                await driver.click_if_found('#button', 'hint', 0)
+                await driver.click_if_found('#missing', 'hint', 0)
+
+            run_on_driver(server, click)
+
+        self.assertEqual(1, server.elements['#button'].click_count)
+
+    def test_get_element_value_and_attribute(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#text'] = FakeElement(text='any text', attributes={'class': 'any-class'})
+
+            async def read(driver):
+                value = await driver.get_element_value('#text', 'hint')
+                attribute_value = await driver.get_element_attribute('#text', 'hint', 'class')
+
+                with self.assertRaises(NoSuchAttributeError):
+                    await driver.get_element_attribute('#text', 'hint', 'missing')
+
+                return value, attribute_value
+
+            self.assertEqual(('any text', 'any-class'), run_on_driver(server, read))
+
+    def test_can_find_element(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#found'] = FakeElement()
+
+            async def find(driver):
+                return await driver.can_find_element('#found', 0), await driver.can_find_element('#missing', 0)
+
+            self.assertEqual((True, False), run_on_driver(server, find))
+
+    def test_send_text(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#input'] = FakeElement(tag_name='input')
+
+            run_on_driver(server, lambda driver: driver.send_text('#input', 'hint', 'any text'))
+
+        self.assertEqual([Keys.NUMPAD1, 'any text'], server.elements['#input'].typed_keys)
+        self.assertIn(('POST', '/session/fake-session/element/element-0/clear'), server.commands)
+
+    def test_select_drop_down_item_by_text(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#select'] = FakeElement(tag_name='select', options=['first', 'second'])
+            server.elements['#div'] = FakeElement()
+
+            async def select(driver):
+                await driver.select_drop_down_item_by_text('#select', 'hint', 'second')
+
+                with self.assertRaises(InvalidOptionTextException):
+                    await driver.select_drop_down_item_by_text('#select', 'hint', 'third')
+
+                with self.assertRaises(InvalidElementException):
+                    await driver.select_drop_down_item_by_text('#div', 'hint', 'second')
+
+            run_on_driver(server, select)
+
+        self.assertEqual('second', server.elements['#select'].selected_option)
+
+    def test_select_drop_down_item_by_text_selects_first_match(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#select'] = FakeElement(tag_name='select', options=['same', 'same'])
+            server.elements['#multiple'] = FakeElement(tag_name='select', options=['same', 'same'],
+                                                       attributes={'multiple': 'true'})
+
+            async def select(driver):
+                await driver.select_drop_down_item_by_text('#select', 'hint', 'same')
+                await driver.select_drop_down_item_by_text('#multiple', 'hint', 'same')
+
+            run_on_driver(server, select)
+
+        clicks = [path for method, path in server.commands if path.endswith('/click')]
+        self.assertEqual(['/session/fake-session/element/element-0-0/click',
+                          '/session/fake-session/element/element-1-0/click',
+                          '/session/fake-session/element/element-1-1/click'], clicks)
+
+    def test_set_checkbox(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#checkbox'] = FakeElement(selected=True)
+
+            async def set_checkbox(driver):
+                await driver.set_checkbox('#checkbox', 'hint', True)
+                await driver.set_checkbox('#checkbox', 'hint', False)
+
+            run_on_driver(server, set_checkbox)
+
+        self.assertEqual(1, server.elements['#checkbox'].click_count)
+
+    def test_concurrent_sessions(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#button'] = FakeElement(appears_after=0.3)
+
+            async def click():
+                async with AsyncDriver(server.url, 'headless-fast') as driver:
+                    await driver.navigate('http://any.url')
+                    await driver.click('#button', 'hint')
+
+            async def run():
+                await asyncio.gather(*[click() for _ in range(10)])
+
+            start_time = time.monotonic()
+            run_coroutine(run())
+            elapsed_time = time.monotonic() - start_time
+
+        # The sessions wait for the element at the same time rather than one after the other
+        self.assertLess(elapsed_time, 2)
+        self.assertEqual(10, server.elements['#button'].click_count)
+
+
+class TestWebDriverHttpClient(TestCase):
+    """Has unit tests for the WebDriverHttpClient class"""
+
+    def test_errors(self):
+        client = WebDriverHttpClient('http://localhost')
+
+        async def request(method, path, body=None):
+            return 200, responses.pop(0)
+
+        client.request = request
+        responses = [{'status': 10, 'value': {'message': 'stale'}},
+                     {'value': {'error': 'no such element', 'message': 'missing'}},
+                     {'status': 13, 'value': {'message': 'unknown'}},
+                     {'status': 0, 'value': 'any value'}]
+
+        async def execute():
+            with self.assertRaises(StaleElementReferenceException):
+                await client.execute('GET', '/any')
+
+            with self.assertRaises(NoSuchElementException):
+                await client.execute('GET', '/any')
+
+            with self.assertRaises(WebDriverException):
+                await client.execute('GET', '/any')
+
+            return await client.execute('GET', '/any')
+
+        self.assertEqual('any value', run_coroutine(execute())['value'])
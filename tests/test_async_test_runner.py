@@ -0,0 +1,94 @@
+from functools import partial
+from unittest import TestCase
+
+from mock import Mock
+
+from pyselenium._selenium_wrapper import ElementNotFoundError
+from pyselenium.async_driver import AsyncDriver
+from pyselenium.async_test_runner import AsyncTestRunner
+from pyselenium.reporters import Reporter
+from pyselenium.test_metadata import Test
+from pyselenium.test_steps import AssertElementValue
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import DeadlineExceededError
+from pyselenium.test_steps import Navigate
+from tests.testables import FakeElement
+from tests.testables import FakeWebDriverServer
+from tests.testables import run_coroutine
+
+
+def get_test(timeout=None):
+    test = Test('any test', timeout)
+    test.add_step(Navigate('http://any.url'))
+    test.add_step(Click('#missing', 'hint', timeout=0))
+    test.add_step(AssertElementValue('#text', 'hint', 'any text'))
+
+    return test
+
+
+class TestAsyncTestRunner(TestCase):
+    """Has unit tests for the AsyncTestRunner class, against a fake WebDriver server"""
+
+    def test_initializer_error(self):
+        self.assertRaises(ValueError, AsyncTestRunner, Test(), None)
+
+    def test_run_test(self):
+        with FakeWebDriverServer() as server:
+            server.elements['#text'] = FakeElement(text='any text')
+
+            runner = AsyncTestRunner(get_test(), partial(AsyncDriver, server.url, 'headless-fast'))
+            test_result = run_coroutine(runner.run_test())
+
+        self.assertEqual([True, False, True], [step_result.success for step_result in test_result.step_results])
+        self.assertIsInstance(test_result.step_results[1].exception, ElementNotFoundError)
+        self.assertEqual(1, test_result.step_results[0].command_count)
+        self.assertEqual(('DELETE', '/session/fake-session'), server.commands[-1])
+
+    def test_run_test_fail_fast(self):
+        with FakeWebDriverServer() as server:
+            runner = AsyncTestRunner(get_test(), partial(AsyncDriver, server.url, 'headless-fast'), fail_fast=True)
+            test_result = run_coroutine(runner.run_test())
+
+        self.assertFalse(test_result.step_results[1].success)
+        self.assertTrue(test_result.step_results[2].skipped)
+
+    def test_run_test_reporters(self):
+        reporter = Mock(spec=Reporter)
+        test = get_test()
+
+        with FakeWebDriverServer() as server:
+            runner = AsyncTestRunner(test, partial(AsyncDriver, server.url, 'headless-fast'), fail_fast=True,
+                                     reporters=[reporter])
+            test_result = run_coroutine(runner.run_test())
+
+        self.assertEqual([(test, index, step_result) for index, step_result in enumerate(test_result.step_results)],
+                         [call_args[0] for call_args in reporter.report_step_result.call_args_list])
+        reporter.report_test_result.assert_called_once_with(test_result)
+
+    def test_run_test_deadline(self):
+        with FakeWebDriverServer() as server:
+            runner = AsyncTestRunner(get_test(timeout=0), partial(AsyncDriver, server.url, 'headless-fast'))
+            test_result = run_coroutine(runner.run_test())
+
+        self.assertEqual(3, len(test_result.step_results))
+        self.assertTrue(all(isinstance(step_result.exception, DeadlineExceededError)
+                            for step_result in test_result.step_results))
+
+    def test_run_test_deadline_cuts_wait_short(self):
+        test = Test('any test', 0.3)
+        test.add_step(Navigate('http://any.url'))
+        test.add_step(Click('#missing', 'hint'))
+        test.add_step(Click('#missing', 'hint', timeout=0))
+
+        with FakeWebDriverServer() as server:
+            runner = AsyncTestRunner(test, partial(AsyncDriver, server.url, 'headless-fast'))
+            test_result = run_coroutine(runner.run_test())
+
+        self.assertTrue(test_result.step_results[0].success)
+        self.assertIsInstance(test_result.step_results[1].exception, DeadlineExceededError)
+        self.assertIsInstance(test_result.step_results[2].exception, DeadlineExceededError)
+
+    def test_run_test_no_steps(self):
+        runner = AsyncTestRunner(Test(), partial(AsyncDriver, 'http://localhost'))
+
+        self.assertRaises(ValueError, run_coroutine, runner.run_test())
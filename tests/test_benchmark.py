@@ -0,0 +1,154 @@
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+from urllib.request import urlopen
+
+from pyselenium._selenium_wrapper import DriverMetrics
+from pyselenium.benchmark import Benchmark
+from pyselenium.benchmark import BenchmarkServer
+from pyselenium.benchmark import StepStatistics
+from pyselenium.benchmark import format_results
+from pyselenium.benchmark import get_results
+from pyselenium.benchmark import load_results
+from pyselenium.benchmark import main
+from pyselenium.benchmark import save_results
+from pyselenium.simulated_driver import SimulatedDriver
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import StepExecutionError
+from pyselenium.test_steps import StepResult
+
+STEP_NAMES = ['Navigate', 'Click', 'ClickIfFound', 'AssertElementValue', 'AssertElementAttributeValue',
+              'AssertElementNotPresent', 'TypeText', 'SendEnter', 'SelectDropDownItemByText', 'SetCheckbox',
+              'SwitchFrame', 'SwitchToDefaultContent']
+
+
+def get_step_result(duration, command_count=1, exception=None):
+    step_result = StepResult(Click('#any', 'hint'))
+    step_result.record_timing(10.0, 10.0 + duration, DriverMetrics(command_count=command_count))
+
+    if exception is not None:
+        step_result.exception = exception
+
+    return step_result
+
+
+class TestBenchmark(TestCase):
+    """Has unit tests for the Benchmark class"""
+
+    def test_run(self):
+        statistics = Benchmark(SimulatedDriver, iterations=4, warmup_iterations=1).run()
+
+        self.assertEqual(STEP_NAMES, list(statistics))
+
+        for name, step_statistics in statistics.items():
+            self.assertEqual(0, step_statistics.failure_count, name)
+            self.assertEqual(8 if name == 'SetCheckbox' else 4, step_statistics.count, name)
+
+        self.assertEqual([2] * 4, statistics['Click'].command_counts)
+        self.assertTrue(all(cpu_time > 0 for cpu_time in statistics['Navigate'].cpu_times))
+
+    def test_run_some_steps(self):
+        statistics = Benchmark(SimulatedDriver, iterations=2, warmup_iterations=0, step_names=['Click']).run()
+
+        self.assertEqual(['Click'], list(statistics))
+        self.assertEqual(2, statistics['Click'].count)
+
+    def test_fixture_pages(self):
+        with BenchmarkServer() as server:
+            with urlopen(server.url + '/index.html?q=any') as response:
+                self.assertIn(b'id="frame"', response.read())
+
+    def test_fixture_pages_are_served_by_another_process(self):
+        # The CPU time of the server would be counted as CPU time of the framework otherwise
+        with BenchmarkServer() as server:
+            self.assertNotEqual(os.getpid(), server._process.pid)
+            self.assertTrue(server._process.is_alive())
+
+        self.assertFalse(server._process.is_alive())
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            output = io.StringIO()
+
+            with redirect_stdout(output):
+                main(['--driver', 'simulated', '--iterations', '2', '--steps', 'Click,TypeText', '--output', path])
+
+            with open(path) as file:
+                results = json.load(file)
+
+            with redirect_stdout(io.StringIO()) as compared_output:
+                main(['--driver', 'simulated', '--iterations', '2', '--steps', 'Click', '--baseline', path])
+
+        self.assertEqual('pyselenium-benchmark', results['format'])
+        self.assertEqual('simulated', results['driver'])
+        self.assertEqual(['Click', 'TypeText'], list(results['steps']))
+        self.assertEqual(2, results['steps']['Click']['count'])
+        self.assertEqual(3, len(output.getvalue().splitlines()))
+        self.assertIn('p50 diff', compared_output.getvalue())
+        self.assertRegex(compared_output.getvalue().splitlines()[1], r'[+-]\d+\.\d%$')
+
+
+class TestStepStatistics(TestCase):
+    """Has unit tests for the StepStatistics class"""
+
+    def test_to_dict(self):
+        statistics = StepStatistics('Click')
+
+        for duration in range(1, 101):
+            statistics.record(get_step_result(duration / 1000, command_count=2), 0.5)
+
+        statistics.record(get_step_result(1.0, exception=StepExecutionError()), 0.5)
+
+        summary = statistics.to_dict()
+
+        self.assertEqual(101, summary['count'])
+        self.assertEqual(1, summary['failures'])
+        self.assertAlmostEqual(0.051, summary['p50'])
+        self.assertAlmostEqual(0.096, summary['p95'])
+        self.assertAlmostEqual(0.1, summary['p99'])
+        self.assertAlmostEqual(0.5, summary['cpu_time'])
+        self.assertAlmostEqual(201 / 101, summary['commands'])
+
+    def test_empty(self):
+        summary = StepStatistics('Click').to_dict()
+
+        self.assertEqual(0, summary['count'])
+        self.assertEqual(0.0, summary['p99'])
+
+
+class TestResults(TestCase):
+    """Has unit tests for saving, loading and formatting the results of benchmarks"""
+
+    def get_results(self, duration):
+        statistics = StepStatistics('Click')
+        statistics.record(get_step_result(duration), 0.001)
+
+        return get_results({'Click': statistics}, 'simulated', 1)
+
+    def test_save_and_load(self):
+        results = self.get_results(0.01)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            save_results(path, results)
+
+            self.assertEqual(results, load_results(path))
+
+    def test_load_other_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+
+            with open(path, 'w') as file:
+                file.write('[]')
+
+            self.assertRaises(ValueError, load_results, path)
+
+    def test_format_results(self):
+        lines = format_results(self.get_results(0.012), self.get_results(0.01)).splitlines()
+
+        self.assertEqual(2, len(lines))
+        self.assertRegex(lines[1], r'^Click\s+1\s+12\.000\s+12\.000\s+12\.000\s+1\.000\s+1\.0\s+\+20\.0%$')
@@ -0,0 +1,270 @@
+from unittest import TestCase
+
+from mock import patch
+
+from pyselenium._cdp import CdpError
+from pyselenium._selenium_wrapper import ElementNotFoundError
+from pyselenium._selenium_wrapper import InvalidElementException
+from pyselenium._selenium_wrapper import InvalidOptionTextException
+from pyselenium._selenium_wrapper import NoSuchAttributeError
+from pyselenium.cdp_driver import ELEMENT_OBJECT_GROUP
+from pyselenium.cdp_driver import FRAME_OBJECT_GROUP
+from pyselenium.cdp_driver import GET_CLICK_POINT_FUNCTION
+from pyselenium.cdp_driver import GET_TEXT_FUNCTION
+from pyselenium.cdp_driver import SELECT_OPTION_FUNCTION
+from pyselenium.cdp_driver import WAIT_FOR_ELEMENT_FUNCTION
+from pyselenium.cdp_driver import CdpDriver
+from tests.testables import FakeCdpServer
+
+ELEMENT_RESULT = {'result': {'type': 'object', 'subtype': 'node', 'objectId': 'element-1'}}
+NULL_RESULT = {'result': {'type': 'object', 'subtype': 'null', 'value': None}}
+
+
+def get_value_result(value):
+    return {'result': {'type': 'object', 'value': value}}
+
+
+def get_function_results(**values_by_function):
+    """Returns a scripted result for Runtime.callFunctionOn that depends on the function called"""
+
+    def call_function(params):
+        for function, value in values_by_function.items():
+            if function in params['functionDeclaration']:
+                return get_value_result(value)
+
+        return get_value_result(None)
+
+    return call_function
+
+
+class TestCdpDriver(TestCase):
+    """Has unit tests for the CdpDriver class, against a scripted DevTools stand-in"""
+
+    def test_enter(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            self.assertIsNotNone(driver.startup_time)
+            self.assertIsNone(driver.get_process_id())
+
+        self.assertEqual(['Page.enable'], server.get_methods())
+
+    def test_navigate(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            driver.navigate('http://any.url')
+
+        self.assertEqual(('Page.navigate', {'url': 'http://any.url'}), server.commands[-1])
+
+    def test_navigate_error(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Page.navigate'] = {'errorText': 'net::ERR_NAME_NOT_RESOLVED'}
+
+            self.assertRaises(Exception, driver.navigate, 'http://any.url')
+
+    def test_click(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+            server.results['Runtime.callFunctionOn'] = get_value_result([10, 20])
+
+            driver.click('#button', 'hint')
+
+        wait_params = server.commands[1][1]
+        mouse_events = [params for method, params in server.commands if method == 'Input.dispatchMouseEvent']
+
+        self.assertIn(WAIT_FOR_ELEMENT_FUNCTION, wait_params['expression'])
+        self.assertIn('["#button", 10000, true]', wait_params['expression'])
+        self.assertEqual(['mouseMoved', 'mousePressed', 'mouseReleased'], [params['type'] for params in mouse_events])
+        self.assertEqual((10, 20), (mouse_events[1]['x'], mouse_events[1]['y']))
+        self.assertEqual(1, driver.metrics.wait_poll_count)
+        self.assertEqual(6, driver.metrics.command_count)
+        self.assertEqual(3, driver.metrics.command_latencies.get_count('Input.dispatchMouseEvent'))
+
+    def test_click_not_found(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = NULL_RESULT
+
+            driver.set_timeout_budget(step_timeout=1)
+
+            self.assertRaises(ElementNotFoundError, driver.click, '#button', 'hint')
+
+        self.assertIn('["#button", 1000, true]', server.commands[-1][1]['expression'])
+
+    def test_click_if_found(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = NULL_RESULT
+
+            driver.click_if_found('#button', 'hint', 0)
+
+        self.assertNotIn('Input.dispatchMouseEvent', server.get_methods())
+
+    def test_get_element_value(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+            server.results['Runtime.callFunctionOn'] = get_function_results(**{GET_TEXT_FUNCTION: 'any text'})
+
+            self.assertEqual('any text', driver.get_element_value('#text', 'hint'))
+
+        self.assertEqual('element-1', server.commands[-1][1]['objectId'])
+
+    def test_get_element_attribute(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+            server.results['Runtime.callFunctionOn'] = get_value_result('any value')
+
+            self.assertEqual('any value', driver.get_element_attribute('#text', 'hint', 'class'))
+
+            server.results['Runtime.callFunctionOn'] = get_value_result(None)
+
+            self.assertRaises(NoSuchAttributeError, driver.get_element_attribute, '#text', 'hint', 'class')
+
+    def test_script_error(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = {'result': {'type': 'undefined'},
+                                                  'exceptionDetails': {'text': 'Uncaught',
+                                                                       'exception': {'description': 'Error: frame'}}}
+
+            with self.assertRaises(ElementNotFoundError) as context:
+                driver.find_element('#element', 'hint')
+
+            self.assertIsInstance(context.exception.inner_exception, CdpError)
+            self.assertEqual('Error: frame', context.exception.inner_exception.message)
+
+    def test_protocol_error(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = Exception('Cannot find context')
+
+            with self.assertRaises(ElementNotFoundError) as context:
+                driver.find_element('#element', 'hint')
+
+            self.assertEqual('Cannot find context', context.exception.inner_exception.message)
+
+    def test_send_text(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+
+            driver.send_text('#input', 'hint', 'ab')
+
+        key_events = [(params['type'], params.get('text')) for method, params in server.commands
+                      if method == 'Input.dispatchKeyEvent']
+
+        self.assertEqual([('keyDown', 'a'), ('keyUp', None), ('keyDown', 'b'), ('keyUp', None)], key_events)
+
+    def test_set_text(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+
+            driver.set_text('#input', 'hint', 'any text')
+
+        self.assertEqual([{'objectId': 'element-1'}, {'value': 'any text'}], server.commands[-1][1]['arguments'])
+
+    def test_select_drop_down_item_by_text(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+            server.results['Runtime.callFunctionOn'] = get_function_results(**{SELECT_OPTION_FUNCTION: 'selected'})
+
+            driver.select_drop_down_item_by_text('#select', 'hint', 'any item')
+
+            server.results['Runtime.callFunctionOn'] = get_value_result('no such option')
+
+            self.assertRaises(InvalidOptionTextException, driver.select_drop_down_item_by_text, '#select', 'hint',
+                              'any item')
+
+            server.results['Runtime.callFunctionOn'] = get_value_result('not a select')
+
+            self.assertRaises(InvalidElementException, driver.select_drop_down_item_by_text, '#select', 'hint',
+                              'any item')
+
+    def test_set_checkbox(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+            server.results['Runtime.callFunctionOn'] = get_function_results(**{'this.checked': True,
+                                                                               GET_CLICK_POINT_FUNCTION: [1, 2]})
+
+            driver.set_checkbox('#checkbox', 'hint', True)
+
+            self.assertNotIn('Input.dispatchMouseEvent', server.get_methods())
+
+            driver.set_checkbox('#checkbox', 'hint', False)
+
+            self.assertIn('Input.dispatchMouseEvent', server.get_methods())
+
+    def test_switch_to_frame(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+            server.results['Runtime.callFunctionOn'] = get_function_results(contentDocument=True)
+
+            driver.switch_to_frame('#frame', 'hint')
+
+            server.results['Runtime.callFunctionOn'] = lambda params: \
+                {'result': {'type': 'object', 'subtype': 'node', 'objectId': 'element-2'}}
+
+            # Elements are looked for in the document of the frame
+            self.assertEqual('element-2', driver.find_element('#element', 'hint'))
+            self.assertEqual('element-1', server.commands[-1][1]['objectId'])
+
+            driver.switch_to_default_content()
+
+            self.assertEqual('element-1', driver.find_element('#element', 'hint'))
+            self.assertEqual('Runtime.evaluate', server.commands[-1][0])
+
+    def test_switch_to_inaccessible_frame(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+            server.results['Runtime.callFunctionOn'] = get_value_result(False)
+
+            self.assertRaises(InvalidElementException, driver.switch_to_frame, '#frame', 'hint')
+
+    def test_read_elements(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = get_value_result([['any text'], None])
+
+            values = driver.read_elements([('#found', None), ('#missing', None)])
+
+        self.assertEqual([(True, 'any text'), (False, None)], values)
+
+    def test_send_enter_key(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            driver.send_enter_key()
+
+        self.assertEqual(['Input.dispatchKeyEvent'] * 2, server.get_methods()[1:])
+        self.assertEqual('Enter', server.commands[-1][1]['key'])
+
+    def test_reset(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            driver.set_timeout_budget(step_timeout=1)
+            driver.reset()
+
+        self.assertEqual(['Page.enable', 'Runtime.evaluate', 'Network.clearBrowserCookies', 'Page.navigate'],
+                         server.get_methods())
+        self.assertIsNone(driver._step_timeout)
+
+    def test_elements_are_released(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver, \
+                patch('pyselenium.cdp_driver.MAX_HELD_ELEMENTS', 2):
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+
+            for _ in range(3):
+                driver.find_element('#element', 'hint')
+
+            self.assertEqual(['Page.enable', 'Runtime.evaluate', 'Runtime.evaluate', 'Runtime.releaseObjectGroup',
+                              'Runtime.evaluate'], server.get_methods())
+            self.assertEqual(ELEMENT_OBJECT_GROUP, server.commands[1][1]['objectGroup'])
+            self.assertEqual({'objectGroup': ELEMENT_OBJECT_GROUP}, server.commands[3][1])
+
+            # The elements of the previous page went away with it
+            driver.navigate('http://any.url')
+            driver.find_element('#element', 'hint')
+            driver.find_element('#element', 'hint')
+
+            self.assertNotIn('Runtime.releaseObjectGroup', server.get_methods()[5:])
+
+    def test_frames_are_released(self):
+        with FakeCdpServer() as server, CdpDriver(debugger_url=server.url) as driver:
+            server.results['Runtime.evaluate'] = ELEMENT_RESULT
+            server.results['Runtime.callFunctionOn'] = get_function_results(contentDocument=True)
+
+            driver.switch_to_frame('#frame', 'hint')
+            driver.switch_to_default_content()
+            driver.switch_to_default_content()
+
+        self.assertEqual(FRAME_OBJECT_GROUP, server.commands[1][1]['objectGroup'])
+        self.assertEqual([('Runtime.releaseObjectGroup', {'objectGroup': FRAME_OBJECT_GROUP})],
+                         [command for command in server.commands if command[0].startswith('Runtime.release')])
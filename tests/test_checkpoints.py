@@ -0,0 +1,197 @@
+from unittest import TestCase
+
+from mock import patch
+
+from pyselenium._selenium_wrapper import BrowserCheckpoint
+from pyselenium.checkpoints import CheckpointStore
+from pyselenium.checkpoints import StepPrefixTrie
+from pyselenium.checkpoints import get_step_key
+from pyselenium.test_metadata import Test
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import Navigate
+from pyselenium.test_steps import SendEnter
+from pyselenium.test_steps import TypeText
+from tests.test_data import ANY_URL
+from tests.testables import DriverTestable
+from tests.testables import SuiteRunnerTestable
+from tests.testables import TestRunnerTestable
+
+LOGIN_STEPS = [Navigate(ANY_URL), Click('#user', 'User'), Click('#password', 'Password'), Click('#login', 'Log in')]
+
+
+def get_test(test_id, steps):
+    test = Test(test_id)
+
+    for step in steps:
+        test.add_step(step)
+
+    return test
+
+
+def get_login_tests(count):
+    return [get_test('test %d' % i, LOGIN_STEPS + [Click('#item-%d' % i, 'Item')]) for i in range(count)]
+
+
+def any_checkpoint():
+    return BrowserCheckpoint(ANY_URL, [{'name': 'session', 'value': 'any session'}], {}, {})
+
+
+class TestStepPrefixTrie(TestCase):
+    """Has unit tests for the StepPrefixTrie class and the get_step_key function"""
+
+    def test_get_step_key(self):
+        self.assertEqual(get_step_key(Click('#any', 'Any', 1)), get_step_key(Click('#any', 'Any', 1)))
+        self.assertNotEqual(get_step_key(Click('#any', 'Any', 1)), get_step_key(Click('#any', 'Any', 2)))
+        self.assertNotEqual(get_step_key(Navigate('#any')), get_step_key(Click('#any', '')))
+
+    def test_get_shared_prefix_length(self):
+        trie = StepPrefixTrie()
+        trie.add(LOGIN_STEPS + [Click('#first', 'First')])
+        trie.add(LOGIN_STEPS[:2] + [Click('#other', 'Other')])
+        trie.add([Navigate('other url')])
+
+        self.assertEqual(5, trie.get_shared_prefix_length(LOGIN_STEPS + [Click('#first', 'First')], 1))
+        self.assertEqual(2, trie.get_shared_prefix_length(LOGIN_STEPS + [Click('#first', 'First')]))
+        self.assertEqual(0, trie.get_shared_prefix_length(LOGIN_STEPS, 3))
+        self.assertEqual(0, trie.get_shared_prefix_length([Navigate('other url')]))
+
+
+class TestCheckpointStore(TestCase):
+    """Has unit tests for the CheckpointStore class"""
+
+    def test_initializer_error(self):
+        self.assertRaises(ValueError, CheckpointStore, [], 0)
+
+    def test_get_prefix_length(self):
+        login_tests = get_login_tests(3)
+        short_test = get_test('short test', LOGIN_STEPS)
+        # Shares its first three steps with the other tests only, which share a longer prefix among themselves
+        partial_test = get_test('partial test', LOGIN_STEPS[:3] + [Click('#other', 'Other')])
+        other_test = get_test('other test', [Navigate('other url'), Click('#any', 'Any')])
+
+        checkpoint_store = CheckpointStore(login_tests + [short_test, partial_test, other_test])
+
+        self.assertEqual([4, 4, 4], [checkpoint_store.get_prefix_length(test) for test in login_tests])
+        # Every test runs at least its last step
+        self.assertEqual(3, checkpoint_store.get_prefix_length(short_test))
+        self.assertEqual(3, checkpoint_store.get_prefix_length(partial_test))
+        self.assertEqual(0, checkpoint_store.get_prefix_length(other_test))
+        self.assertEqual(0, CheckpointStore(login_tests, 5).get_prefix_length(login_tests[0]))
+
+    def test_prefix_of_a_single_test(self):
+        tests = get_login_tests(1) + [get_test('other test', LOGIN_STEPS[:3] + [Click('#other', 'Other')])]
+
+        checkpoint_store = CheckpointStore(tests)
+
+        self.assertEqual(3, checkpoint_store.get_prefix_length(tests[0]))
+
+        tests = get_login_tests(2) + [get_test('other test', LOGIN_STEPS[:3] + [Click('#other', 'Other')])]
+
+        self.assertEqual(0, CheckpointStore(tests).get_prefix_length(tests[2]))
+
+    def test_prefix_ends_with_step_that_survives_reload(self):
+        typing_steps = [Navigate(ANY_URL), Click('#menu', 'Menu'), TypeText('#user', 'User', 'any user'),
+                        TypeText('#password', 'Password', 'any password')]
+        remember_test = get_test('remember test', typing_steps + [Click('#remember', 'Remember me'), SendEnter()])
+        enter_test = get_test('enter test', typing_steps + [SendEnter(), Click('#any', 'Any')])
+
+        # The typed values would be lost when restoring, so only the steps before typing are shared
+        self.assertEqual(0, CheckpointStore([remember_test, enter_test]).get_prefix_length(enter_test))
+        self.assertEqual(2, CheckpointStore([remember_test, enter_test], 2).get_prefix_length(enter_test))
+
+    def test_get_and_put(self):
+        tests = get_login_tests(2)
+        checkpoint = any_checkpoint()
+
+        checkpoint_store = CheckpointStore(tests + [get_test('other test', [Navigate(ANY_URL)])])
+
+        self.assertIsNone(checkpoint_store.get(tests[1]))
+
+        checkpoint_store.put(tests[0], checkpoint)
+        checkpoint_store.put(tests[1], any_checkpoint())
+
+        self.assertIs(checkpoint, checkpoint_store.get(tests[1]))
+        self.assertRaises(ValueError, checkpoint_store.put, Test(), checkpoint)
+
+
+class TestTestRunnerCheckpoints(TestCase):
+    """Has unit tests for the restoring of checkpoints by the TestRunner class"""
+
+    def run_tests(self, tests, checkpoint_store):
+        test_results = []
+
+        for test in tests:
+            test_runner = TestRunnerTestable(test)
+            test_runner.checkpoint_store = checkpoint_store
+
+            test_results.append(test_runner.run_test())
+
+        return test_results
+
+    def test_restore_checkpoint(self):
+        tests = get_login_tests(3)
+        checkpoint = any_checkpoint()
+
+        with patch.object(DriverTestable, 'save_checkpoint', return_value=checkpoint) as save_checkpoint_mock, \
+                patch.object(DriverTestable, 'restore_checkpoint') as restore_checkpoint_mock, \
+                patch.object(DriverTestable, 'click') as click_mock:
+            test_results = self.run_tests(tests, CheckpointStore(tests))
+
+            self.assertEqual(1, save_checkpoint_mock.call_count)
+            self.assertEqual(2, restore_checkpoint_mock.call_count)
+            restore_checkpoint_mock.assert_called_with(checkpoint)
+            # The three clicks of the login are run by the first test only
+            self.assertEqual(3 + 3, click_mock.call_count)
+
+        self.assertEqual([False] * 5, [step_result.restored for step_result in test_results[0].step_results])
+
+        for test_result in test_results[1:]:
+            self.assertEqual([True] * 4 + [False], [step_result.restored for step_result in test_result.step_results])
+            self.assertTrue(all(step_result.success for step_result in test_result.step_results))
+            self.assertIsNotNone(test_result.step_results[0].started_at)
+            self.assertIsNone(test_result.step_results[1].started_at)
+            self.assertIn('- [Navigate] - Restored from checkpoint (', str(test_result))
+
+    def test_prefix_failed(self):
+        tests = get_login_tests(2)
+
+        with patch.object(DriverTestable, 'save_checkpoint') as save_checkpoint_mock, \
+                patch.object(DriverTestable, 'click', side_effect=ValueError()):
+            self.run_tests(tests, CheckpointStore(tests))
+
+            self.assertFalse(save_checkpoint_mock.called)
+
+    def test_restore_failed(self):
+        tests = get_login_tests(2)
+        checkpoint_store = CheckpointStore(tests)
+        checkpoint_store.put(tests[0], any_checkpoint())
+
+        with patch.object(DriverTestable, 'restore_checkpoint', side_effect=ValueError()), \
+                patch.object(DriverTestable, 'click') as click_mock:
+            test_results = self.run_tests(tests[1:], checkpoint_store)
+
+            self.assertEqual(4, click_mock.call_count)
+
+        self.assertFalse(any(step_result.restored for step_result in test_results[0].step_results))
+
+    def test_checkpoints_not_supported(self):
+        tests = get_login_tests(2)
+
+        with patch.object(DriverTestable, 'checkpoints_supported', False), \
+                patch.object(DriverTestable, 'save_checkpoint') as save_checkpoint_mock:
+            self.run_tests(tests, CheckpointStore(tests))
+
+            self.assertFalse(save_checkpoint_mock.called)
+
+    def test_suite_runner(self):
+        tests = get_login_tests(4)
+        suite_runner = SuiteRunnerTestable(tests)
+        suite_runner.restore_checkpoints = True
+
+        with patch.object(DriverTestable, 'save_checkpoint', return_value=any_checkpoint()), \
+                patch.object(DriverTestable, 'restore_checkpoint') as restore_checkpoint_mock:
+            suite_result = suite_runner.run_suite()
+
+            self.assertEqual(3, restore_checkpoint_mock.call_count)
+
+        self.assertEqual(3, sum(test_result.step_results[0].restored for test_result in suite_result.test_results))
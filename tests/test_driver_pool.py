@@ -0,0 +1,152 @@
+import threading
+import time
+from queue import Empty
+from queue import Queue
+from unittest import TestCase
+
+from mock import Mock
+from mock import patch
+
+from tests.testables import DriverPoolTestable
+
+
+class TestDriverPool(TestCase):
+    """Has unit tests for the DriverPool class"""
+
+    def test_initializer_error(self):
+        self.assertRaises(ValueError, DriverPoolTestable, 0)
+        self.assertRaises(ValueError, DriverPoolTestable, None)
+
+    def test_acquire_starts_driver(self):
+        driver_pool = DriverPoolTestable()
+
+        driver = driver_pool.acquire()
+
+        self.assertEqual(driver_pool.started_drivers, [driver])
+
+    def test_acquire_reuses_released_driver(self):
+        driver_pool = DriverPoolTestable(2)
+
+        driver = driver_pool.acquire()
+        driver_pool.release(driver)
+
+        self.assertIs(driver, driver_pool.acquire())
+        self.assertEqual(1, len(driver_pool.started_drivers))
+
+    def test_acquire_does_not_exceed_size(self):
+        driver_pool = DriverPoolTestable(2)
+
+        driver_pool.acquire()
+        driver_pool.acquire()
+
+        self.assertRaises(Empty, driver_pool.acquire, 0.01)
+        self.assertEqual(2, len(driver_pool.started_drivers))
+
+    def test_release_resets_driver(self):
+        driver_pool = DriverPoolTestable()
+
+        driver = driver_pool.acquire()
+
+        with patch.object(driver, 'reset') as reset_mock:
+            driver_pool.release(driver)
+
+            self.assertTrue(reset_mock.called)
+
+    def test_release_discards_driver_that_cannot_be_reset(self):
+        driver_pool = DriverPoolTestable()
+
+        driver = driver_pool.acquire()
+
+        with patch.object(driver, 'reset', side_effect=Exception()):
+            driver_pool.release(driver)
+
+        self.assertIsNone(driver.driver)
+        self.assertIsNot(driver, driver_pool.acquire())
+        self.assertEqual(2, len(driver_pool.started_drivers))
+
+    def test_session(self):
+        driver_pool = DriverPoolTestable()
+
+        with driver_pool.session() as driver:
+            self.assertRaises(Empty, driver_pool.acquire, 0.01)
+
+        self.assertIs(driver, driver_pool.acquire())
+
+    def test_close(self):
+        with DriverPoolTestable(2) as driver_pool:
+            first_driver = driver_pool.acquire()
+            second_driver = driver_pool.acquire()
+
+        self.assertIsNone(first_driver.driver)
+        self.assertIsNone(second_driver.driver)
+
+    def test_close_goes_on_after_errors(self):
+        lifecycle_manager = Mock()
+        driver_pool = DriverPoolTestable(2, lifecycle_manager=lifecycle_manager)
+        first_driver = driver_pool.acquire()
+        second_driver = driver_pool.acquire()
+
+        with patch.object(first_driver, '__exit__', side_effect=Exception()):
+            driver_pool.close()
+
+        self.assertIsNone(second_driver.driver)
+        self.assertEqual(2, lifecycle_manager.forget.call_count)
+        self.assertTrue(lifecycle_manager.reap.called)
+
+    def test_close_wakes_up_waiting_threads(self):
+        driver_pool = DriverPoolTestable()
+        driver_pool.acquire()
+        errors = Queue()
+
+        def acquire():
+            try:
+                driver_pool.acquire(5)
+            except Exception as exception:
+                errors.put(exception)
+
+        threads = [threading.Thread(target=acquire) for _ in range(2)]
+
+        for thread in threads:
+            thread.start()
+
+        # Gives the threads the time to start waiting
+        time.sleep(0.1)
+        driver_pool.close()
+
+        for thread in threads:
+            thread.join(5)
+
+        self.assertIsInstance(errors.get(timeout=1), RuntimeError)
+        self.assertIsInstance(errors.get(timeout=1), RuntimeError)
+
+    def test_lifecycle_manager_tracks_drivers(self):
+        lifecycle_manager = Mock()
+        lifecycle_manager.record_test.return_value = False
+
+        with DriverPoolTestable(lifecycle_manager=lifecycle_manager) as driver_pool:
+            driver = driver_pool.acquire()
+            driver_pool.release(driver)
+
+            lifecycle_manager.track.assert_called_once_with(driver)
+            lifecycle_manager.record_test.assert_called_once_with(driver)
+
+        lifecycle_manager.forget.assert_called_once_with(driver)
+        self.assertTrue(lifecycle_manager.reap.called)
+
+    def test_lifecycle_manager_recycles_driver(self):
+        lifecycle_manager = Mock()
+        lifecycle_manager.record_test.return_value = True
+
+        driver_pool = DriverPoolTestable(lifecycle_manager=lifecycle_manager)
+
+        driver = driver_pool.acquire()
+
+        with patch.object(driver, 'reset') as reset_mock:
+            driver_pool.release(driver)
+
+            self.assertFalse(reset_mock.called)
+
+        self.assertIsNone(driver.driver)
+        lifecycle_manager.forget.assert_called_once_with(driver)
+        self.assertIsNot(driver, driver_pool.acquire())
+        self.assertEqual(2, len(driver_pool.started_drivers))
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from pyselenium._remote_connection import PooledRemoteConnection
+from tests.testables import DriverServiceTestable
+
+
+class TestDriverService(TestCase):
+    """Has unit tests for the DriverService class"""
+
+    def test_start(self):
+        driver_service = DriverServiceTestable()
+
+        self.assertIsNone(driver_service.url)
+        self.assertFalse(driver_service.is_running)
+
+        driver_service.start()
+        driver_service.start()
+
+        self.assertEqual(1, driver_service.service_stub.start_count)
+        self.assertEqual('http://localhost:9515', driver_service.url)
+        self.assertTrue(driver_service.is_running)
+
+    def test_stop(self):
+        driver_service = DriverServiceTestable()
+
+        driver_service.start()
+        driver_service.stop()
+        driver_service.stop()
+
+        self.assertEqual(1, driver_service.service_stub.stop_count)
+        self.assertIsNone(driver_service.url)
+
+    def test_context(self):
+        with DriverServiceTestable() as driver_service:
+            self.assertTrue(driver_service.is_running)
+
+        self.assertFalse(driver_service.is_running)
+        self.assertEqual(1, driver_service.service_stub.stop_count)
+
+    def test_get_connection(self):
+        driver_service = DriverServiceTestable()
+
+        connection = driver_service.get_connection()
+
+        self.assertTrue(driver_service.is_running)
+        self.assertIsInstance(connection, PooledRemoteConnection)
+        self.assertIs(connection, driver_service.get_connection())
+
+        driver_service.stop()
+        driver_service.start()
+
+        self.assertIsNot(connection, driver_service.get_connection())
+        self.assertEqual(0, connection.max_idle_connections)
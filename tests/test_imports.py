@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+from unittest import TestCase
+
+# The modules that build, run and report tests without starting a browser
+LIGHT_MODULES = ['pyselenium',
+                 'pyselenium.test_steps',
+                 'pyselenium.test_metadata',
+                 'pyselenium.test_runner',
+                 'pyselenium.suite_runner',
+                 'pyselenium.reporters',
+                 'pyselenium.checkpoints',
+                 'pyselenium.test_files']
+
+# The time, in seconds, the modules that don't start browsers may take to import in a new interpreter. Generous, so
+# that slow CI machines pass, yet well under what importing the web drivers of Selenium takes along with them.
+IMPORT_TIME_BUDGET = 0.5
+
+# The number of times the import is timed. The fastest time is checked, since the others may include disk reads.
+IMPORT_TIME_RUNS = 3
+
+
+def get_import_time(modules):
+    """Returns the time, in seconds, that importing the given modules takes in a new interpreter"""
+
+    script = 'import time\nstart_time = time.perf_counter()\n%s\nprint(time.perf_counter() - start_time)' % '\n'.join(
+        'import %s' % module for module in modules)
+
+    return float(subprocess.check_output([sys.executable, '-c', script]).decode('utf-8'))
+
+
+class TestImports(TestCase):
+    """Has unit tests for what importing PySelenium imports and how long it takes"""
+
+    def test_light_modules_do_not_import_web_drivers(self):
+        # A new interpreter is needed, since the tests that ran before this one have imported Selenium already
+        script = 'import sys\n%s\nprint(json.dumps(sorted(sys.modules)))' % '\n'.join(
+            ['import json'] + ['import %s' % module for module in LIGHT_MODULES])
+
+        output = subprocess.check_output([sys.executable, '-c', script])
+        modules = json.loads(output.decode('utf-8'))
+
+        self.assertEqual([], [module for module in modules if module.startswith('selenium.webdriver')])
+        self.assertIn('pyselenium.test_runner', modules)
+
+    def test_web_drivers_are_imported_once_a_browser_is_needed(self):
+        script = 'import sys\nfrom pyselenium._selenium_wrapper import Driver\n' \
+                 'Driver()._get_presence_of_element_located("#id")\n' \
+                 'print("selenium.webdriver" in sys.modules)'
+
+        output = subprocess.check_output([sys.executable, '-c', script])
+
+        self.assertEqual('True', output.decode('utf-8').strip())
+
+    def test_light_modules_import_time(self):
+        import_time = min(get_import_time(LIGHT_MODULES) for _ in range(IMPORT_TIME_RUNS))
+
+        self.assertLess(import_time, IMPORT_TIME_BUDGET,
+                        'Importing %s took %.0fms' % (', '.join(LIGHT_MODULES), import_time * 1000))
+
+    def test_light_modules_import_faster_than_web_drivers(self):
+        import_time = min(get_import_time(LIGHT_MODULES) for _ in range(IMPORT_TIME_RUNS))
+        web_drivers_import_time = min(get_import_time(LIGHT_MODULES + ['selenium.webdriver'])
+                                      for _ in range(IMPORT_TIME_RUNS))
+
+        self.assertLess(import_time, web_drivers_import_time)
@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from pyselenium.launch_profiles import *
+
+
+class TestLaunchProfile(TestCase):
+    """Has unit tests for the LaunchProfile class"""
+
+    def test_get_chrome_options(self):
+        launch_profile = LaunchProfile('any profile', arguments=['--headless'], window_size=(800, 600))
+
+        options = launch_profile.get_chrome_options()
+
+        self.assertEqual(['--headless', '--window-size=800,600'], options.arguments)
+
+    def test_get_chrome_options_maximized(self):
+        options = DEFAULT_LAUNCH_PROFILE.get_chrome_options()
+
+        self.assertEqual([], options.arguments)
+
+    def test_get_capabilities(self):
+        launch_profile = LaunchProfile('any profile', page_load_strategy='eager')
+
+        self.assertEqual({'pageLoadStrategy': 'eager'}, launch_profile.get_capabilities())
+        self.assertEqual({}, DEFAULT_LAUNCH_PROFILE.get_capabilities())
+
+    def test_headless_profiles(self):
+        for launch_profile in [HEADLESS_FAST_LAUNCH_PROFILE, CI_MINIMAL_LAUNCH_PROFILE]:
+            self.assertIn('--headless', launch_profile.arguments)
+            self.assertIsNotNone(launch_profile.window_size)
+
+
+class TestGetLaunchProfile(TestCase):
+    """Has unit tests for the get_launch_profile function"""
+
+    def test_by_name(self):
+        self.assertIs(HEADLESS_FAST_LAUNCH_PROFILE, get_launch_profile('headless-fast'))
+        self.assertIs(CI_MINIMAL_LAUNCH_PROFILE, get_launch_profile('ci-minimal'))
+        self.assertIs(DEFAULT_LAUNCH_PROFILE, get_launch_profile('default'))
+
+    def test_profile(self):
+        launch_profile = LaunchProfile('any profile')
+
+        self.assertIs(launch_profile, get_launch_profile(launch_profile))
+
+    def test_unknown_name(self):
+        self.assertRaises(ValueError, get_launch_profile, 'any profile')
+        self.assertRaises(ValueError, get_launch_profile, None)
@@ -0,0 +1,237 @@
+import gc
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import weakref
+from contextlib import contextmanager
+from unittest import TestCase
+from unittest import skipUnless
+
+from mock import patch
+
+from pyselenium import _processes
+from pyselenium.process_lifecycle import ProcessLifecycleManager
+from tests.testables import ProcessDriverStub
+from tests.testables import ProcessLifecycleManagerTestable
+
+MEGABYTE = 1024 * 1024
+
+
+class ProcessTable:
+    """A fake process table that stands in for the processes of the system"""
+
+    def __init__(self):
+        self.names = {}
+        self.rss = {}
+        self.children = {}
+        self.killed = []
+
+    def add(self, pid, name, rss=MEGABYTE, parent_pid=None):
+        self.names[pid] = name
+        self.rss[pid] = rss
+
+        if parent_pid is not None:
+            self.children.setdefault(parent_pid, []).append(pid)
+
+    def get_descendant_process_ids(self, pid):
+        descendants = []
+
+        for child_pid in self.children.get(pid, []):
+            descendants.append(child_pid)
+            descendants.extend(self.get_descendant_process_ids(child_pid))
+
+        return descendants
+
+    def is_process_alive(self, pid):
+        return pid in self.names
+
+    def kill_process(self, pid):
+        self.killed.append(pid)
+        self.names.pop(pid, None)
+
+    @contextmanager
+    def patched(self):
+        with patch.object(_processes, 'get_descendant_process_ids', side_effect=self.get_descendant_process_ids), \
+                patch.object(_processes, 'is_process_alive', side_effect=self.is_process_alive), \
+                patch.object(_processes, 'get_process_name', side_effect=self.names.get), \
+                patch.object(_processes, 'get_process_rss', side_effect=lambda pid: self.rss.get(pid, 0)), \
+                patch.object(_processes, 'kill_process', side_effect=self.kill_process):
+            yield self
+
+
+def get_browser_process_table():
+    process_table = ProcessTable()
+    process_table.add(100, 'chromedriver')
+    process_table.add(101, 'chrome', parent_pid=100)
+    process_table.add(102, 'chrome', parent_pid=101)
+
+    return process_table
+
+
+class TestProcessLifecycleManager(TestCase):
+    """Has unit tests for the ProcessLifecycleManager class"""
+
+    def test_initializer_error(self):
+        self.assertRaises(ValueError, ProcessLifecycleManagerTestable, 0)
+        self.assertRaises(ValueError, ProcessLifecycleManagerTestable, None, 0)
+
+    def test_track(self):
+        with get_browser_process_table().patched():
+            manager = ProcessLifecycleManagerTestable()
+            manager.track(ProcessDriverStub(100))
+
+            stats = manager.get_stats()
+
+        self.assertEqual(1, stats.driver_count)
+        self.assertEqual(3, stats.process_count)
+        self.assertEqual(3 * MEGABYTE, stats.rss)
+
+    def test_track_driver_without_process(self):
+        with get_browser_process_table().patched():
+            manager = ProcessLifecycleManagerTestable()
+            manager.track(ProcessDriverStub(None))
+
+            stats = manager.get_stats()
+
+        self.assertEqual(1, stats.driver_count)
+        self.assertEqual(0, stats.process_count)
+
+    def test_record_test_recycles_after_max_tests(self):
+        driver = ProcessDriverStub(100)
+
+        with get_browser_process_table().patched():
+            manager = ProcessLifecycleManagerTestable(max_tests_per_browser=2)
+            manager.track(driver)
+
+            self.assertFalse(manager.record_test(driver))
+            self.assertTrue(manager.record_test(driver))
+
+        self.assertEqual(1, manager.recycled_count)
+
+    def test_record_test_recycles_above_max_rss(self):
+        driver = ProcessDriverStub(100)
+
+        with get_browser_process_table().patched() as process_table:
+            manager = ProcessLifecycleManagerTestable(max_rss=5 * MEGABYTE)
+            manager.track(driver)
+
+            self.assertFalse(manager.record_test(driver))
+
+            # Renderers started after the driver are counted as well
+            process_table.add(103, 'chrome', rss=4 * MEGABYTE, parent_pid=101)
+
+            self.assertTrue(manager.record_test(driver))
+
+    def test_record_test_untracked_driver(self):
+        manager = ProcessLifecycleManagerTestable(max_tests_per_browser=1)
+
+        self.assertFalse(manager.record_test(ProcessDriverStub(100)))
+
+    def test_forget_kills_leftover_processes(self):
+        driver = ProcessDriverStub(100)
+
+        with get_browser_process_table().patched() as process_table:
+            manager = ProcessLifecycleManagerTestable()
+            manager.track(driver)
+
+            process_table.kill_process(100)
+            process_table.killed = []
+
+            manager.forget(driver)
+
+            stats = manager.get_stats()
+
+        self.assertEqual([101, 102], sorted(process_table.killed))
+        self.assertEqual(0, stats.driver_count)
+
+    def test_forget_does_not_kill_reused_process_ids(self):
+        driver = ProcessDriverStub(100)
+
+        with get_browser_process_table().patched() as process_table:
+            manager = ProcessLifecycleManagerTestable()
+            manager.track(driver)
+
+            process_table.names[101] = 'python'
+            manager.forget(driver)
+
+        self.assertEqual([100, 102], sorted(process_table.killed))
+
+    def test_reap(self):
+        with get_browser_process_table().patched() as process_table:
+            manager = ProcessLifecycleManagerTestable()
+            manager.track(ProcessDriverStub(100))
+
+            manager.reap()
+
+            stats = manager.get_stats()
+
+        self.assertEqual([100, 101, 102], sorted(process_table.killed))
+        self.assertEqual(0, stats.driver_count)
+
+    def test_pid_file(self):
+        pid_file_path = os.path.join(tempfile.mkdtemp(), 'browsers.pid')
+
+        with get_browser_process_table().patched() as process_table:
+            manager = ProcessLifecycleManagerTestable(pid_file=pid_file_path)
+            manager.track(ProcessDriverStub(100))
+
+            pid_file_paths = glob.glob(pid_file_path + '.*')
+
+            self.assertEqual(1, len(pid_file_paths))
+
+            with open(pid_file_paths[0]) as pid_file:
+                self.assertEqual(['100', '101', '102'], pid_file.read().split())
+
+            # The manager of another worker running at the same time leaves the processes alone
+            process_table.add(os.getpid(), 'python')
+            ProcessLifecycleManagerTestable(pid_file=pid_file_path)
+
+            self.assertEqual([], process_table.killed)
+
+            # The manager of a worker started after a crash kills the processes left in the file
+            del process_table.names[os.getpid()]
+            ProcessLifecycleManagerTestable(pid_file=pid_file_path)
+
+        self.assertEqual([100, 101, 102], sorted(process_table.killed))
+        self.assertEqual([], glob.glob(pid_file_path + '.*'))
+
+    def test_pid_file_removed_once_processes_are_gone(self):
+        pid_file_path = os.path.join(tempfile.mkdtemp(), 'browsers.pid')
+
+        with get_browser_process_table().patched():
+            manager = ProcessLifecycleManagerTestable(pid_file=pid_file_path)
+            other_manager = ProcessLifecycleManagerTestable(pid_file=pid_file_path)
+            manager.track(ProcessDriverStub(100))
+            other_manager.track(ProcessDriverStub(101))
+
+            self.assertEqual(2, len(glob.glob(pid_file_path + '.*')))
+
+            manager.reap()
+
+        self.assertEqual(1, len(glob.glob(pid_file_path + '.*')))
+
+    def test_managers_are_not_kept_alive(self):
+        manager = ProcessLifecycleManager()
+        manager_reference = weakref.ref(manager)
+
+        del manager
+        gc.collect()
+
+        self.assertIsNone(manager_reference())
+
+    @skipUnless(hasattr(os, 'waitpid'), 'Processes are not reaped on this system')
+    def test_kill_process_reaps_child(self):
+        process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+
+        _processes.kill_process(process.pid)
+
+        self.assertRaises(ChildProcessError, os.waitpid, process.pid, os.WNOHANG)
+
+    def test_missing_pid_file(self):
+        pid_file_path = os.path.join(tempfile.mkdtemp(), 'browsers.pid')
+
+        manager = ProcessLifecycleManagerTestable(pid_file=pid_file_path)
+
+        self.assertEqual(0, manager.get_stats().process_count)
@@ -0,0 +1,115 @@
+import threading
+import time
+from unittest import TestCase
+
+from selenium import webdriver
+from selenium.webdriver.remote.command import Command
+
+from pyselenium._remote_connection import PooledRemoteConnection
+from tests.testables import FakeWebDriverServer
+
+
+def get_web_driver(connection):
+    return webdriver.Remote(command_executor=connection, desired_capabilities={})
+
+
+class TestPooledRemoteConnection(TestCase):
+    """Has unit tests for the PooledRemoteConnection class, against a fake WebDriver server"""
+
+    def test_initializer_error(self):
+        self.assertRaises(ValueError, PooledRemoteConnection, 'http://127.0.0.1:9515', 0)
+
+    def test_keep_alive(self):
+        with FakeWebDriverServer() as server:
+            connection = PooledRemoteConnection(server.url)
+            web_driver = get_web_driver(connection)
+
+            for _ in range(3):
+                web_driver.get('http://any.url')
+
+            web_driver.quit()
+            connection.close()
+
+        self.assertEqual(5, len(server.commands))
+        self.assertEqual(1, connection.connection_count)
+
+    def test_reconnect_after_connection_dropped(self):
+        with FakeWebDriverServer() as server:
+            server.drop_connections = True
+
+            connection = PooledRemoteConnection(server.url)
+            web_driver = get_web_driver(connection)
+
+            for _ in range(2):
+                # Gives the server thread the time to drop the connection, as chromedriver does while it is idle
+                time.sleep(0.05)
+                web_driver.get('http://any.url')
+
+            connection.close()
+
+        self.assertEqual(['/session', '/session/fake-session/url', '/session/fake-session/url'],
+                         [path for method, path in server.commands])
+        # Every command finds the connection of the command before dropped and opens a new connection
+        self.assertEqual(3, connection.connection_count)
+
+    def test_resend_only_commands_safe_to_run_twice(self):
+        with FakeWebDriverServer() as server:
+            connection = PooledRemoteConnection(server.url)
+            web_driver = get_web_driver(connection)
+
+            # The connection is dropped once the command is read, as if chromedriver had closed it in the meantime
+            server.hang_up_on = ('GET', '/session/fake-session/url')
+            web_driver.execute(Command.GET_CURRENT_URL)
+
+            server.hang_up_on = ('POST', '/session/fake-session/url')
+
+            with self.assertRaises(ConnectionError):
+                web_driver.get('http://any.url')
+
+            connection.close()
+
+        self.assertEqual(['/session', '/session/fake-session/url', '/session/fake-session/url',
+                          '/session/fake-session/url'], [path for method, path in server.commands])
+        self.assertEqual(['POST', 'GET', 'GET', 'POST'], [method for method, path in server.commands])
+
+    def test_shared_between_threads(self):
+        with FakeWebDriverServer() as server:
+            connection = PooledRemoteConnection(server.url, max_idle_connections=2)
+            errors = []
+
+            def navigate():
+                try:
+                    web_driver = get_web_driver(connection)
+
+                    for _ in range(10):
+                        web_driver.get('http://any.url')
+                except Exception as exception:
+                    errors.append(exception)
+
+            threads = [threading.Thread(target=navigate) for _ in range(4)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+            idle_connection_count = len(connection._idle_connections)
+            connection.close()
+
+        self.assertEqual([], errors)
+        self.assertEqual(44, len(server.commands))
+        self.assertLessEqual(idle_connection_count, 2)
+        self.assertLessEqual(connection.connection_count, 44)
+
+    def test_close(self):
+        with FakeWebDriverServer() as server:
+            connection = PooledRemoteConnection(server.url)
+            web_driver = get_web_driver(connection)
+
+            connection.close()
+
+            # Connections are not kept once the pool is closed
+            web_driver.get('http://any.url')
+
+            self.assertEqual([], connection._idle_connections)
@@ -0,0 +1,145 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+from functools import partial
+from unittest import TestCase
+
+from selenium.common.exceptions import WebDriverException
+
+from pyselenium._recording import RECORDING_HEADER
+from pyselenium._recording import ReplayConnection
+from pyselenium.replay_driver import ReplayDriver
+from pyselenium.test_metadata import Test
+from pyselenium.test_runner import TestRunner
+from pyselenium.test_steps import AssertElementAttributeValue
+from pyselenium.test_steps import AssertElementValue
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import ClickIfFound
+from pyselenium.test_steps import Navigate
+from tests.testables import FakeElement
+from tests.testables import FakeWebDriverServer
+from tests.testables import RemoteDriverTestable
+
+
+def get_test():
+    test = Test('any test')
+    test.add_step(Navigate('http://any.url'))
+    test.add_step(Click('#button', 'hint'))
+    test.add_step(AssertElementValue('#text', 'hint', 'any text'))
+    test.add_step(AssertElementAttributeValue('#text', 'hint', 'class', 'other-class'))
+    test.add_step(ClickIfFound('#missing', 'hint', 0.1))
+
+    return test
+
+
+def get_outcomes(test_result):
+    return [(step_result.success, type(step_result.exception).__name__) for step_result in test_result.step_results]
+
+
+def write_recording(path, lines):
+    with open(path, 'w', encoding='utf-8') as file:
+        for line in [RECORDING_HEADER] + lines:
+            file.write(json.dumps(line) + '\n')
+
+
+class TestReplayDriver(TestCase):
+    """Has unit tests for the ReplayDriver class and for the recordings of the Driver class"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, path):
+        with FakeWebDriverServer() as server:
+            server.elements['#button'] = FakeElement(appears_after=0.2)
+            server.elements['#text'] = FakeElement(text='any text', attributes={'class': 'any-class'})
+
+            start_time = time.monotonic()
+            test_result = TestRunner(get_test(), driver_factory=partial(RemoteDriverTestable, server.url,
+                                                                        record_to=path)).run_test()
+
+            return test_result, time.monotonic() - start_time
+
+    def test_record_and_replay(self):
+        path = os.path.join(self.directory.name, 'recording.jsonl')
+
+        recorded_result, recorded_time = self.record(path)
+
+        replay_driver = ReplayDriver(path, launch_profile='headless-fast')
+
+        start_time = time.monotonic()
+        replayed_result = TestRunner(get_test(), driver_factory=lambda: replay_driver).run_test()
+        replayed_time = time.monotonic() - start_time
+
+        self.assertEqual([(True, 'NoneType'), (True, 'NoneType'), (True, 'NoneType'),
+                          (False, 'ElementAttributeValueIncorrectError'), (True, 'NoneType')],
+                         get_outcomes(recorded_result))
+        self.assertEqual(get_outcomes(recorded_result), get_outcomes(replayed_result))
+        self.assertEqual(replay_driver.connection.recorded_count, replay_driver.connection.replayed_count)
+        self.assertGreater(recorded_time, 0.5)
+        self.assertLess(replayed_time, 0.2)
+
+    def test_gzipped_recording(self):
+        path = os.path.join(self.directory.name, 'recording.jsonl.gz')
+
+        self.record(path)
+
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            lines = [json.loads(line) for line in file]
+
+        self.assertEqual(RECORDING_HEADER, lines[0])
+        self.assertEqual(['newSession', {}], lines[1][:2])
+        self.assertEqual('quit', lines[-1][0])
+
+        test_result = TestRunner(get_test(),
+                                 driver_factory=partial(ReplayDriver, path, launch_profile='headless-fast')).run_test()
+
+        self.assertEqual(4, sum(step_result.success for step_result in test_result.step_results))
+
+    def test_command_not_recorded(self):
+        path = os.path.join(self.directory.name, 'recording.jsonl')
+
+        self.record(path)
+
+        test = Test('any test')
+        test.add_step(Navigate('http://other.url'))
+
+        test_result = TestRunner(test,
+                                 driver_factory=partial(ReplayDriver, path, launch_profile='headless-fast')).run_test()
+
+        self.assertIsInstance(test_result.step_results[0].exception, WebDriverException)
+        self.assertIn('no response to get', test_result.step_results[0].exception.msg)
+
+    def test_not_a_recording(self):
+        path = os.path.join(self.directory.name, 'recording.jsonl')
+
+        with open(path, 'w') as file:
+            file.write('{}\n')
+
+        self.assertRaises(ValueError, ReplayConnection, path)
+
+
+class TestReplayConnection(TestCase):
+    """Has unit tests for the ReplayConnection class"""
+
+    def test_execute(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'recording.jsonl')
+
+            write_recording(path, [['executeAsyncScript', {'script': 'any', 'args': [1000]}, {'status': 0, 'value': 1}],
+                                   ['executeAsyncScript', {'script': 'any', 'args': [900]}, {'status': 0, 'value': 2}],
+                                   ['executeAsyncScript', {'script': 'other', 'args': []}, {'status': 0, 'value': 3}]])
+
+            connection = ReplayConnection(path)
+
+        # Numbers don't tell commands apart
+        self.assertEqual(1, connection.execute('executeAsyncScript', {'script': 'any', 'args': [500]})['value'])
+        self.assertEqual(3, connection.execute('executeAsyncScript', {'script': 'other', 'args': []})['value'])
+        self.assertEqual(2, connection.execute('executeAsyncScript', {'script': 'any', 'args': [1000]})['value'])
+        self.assertEqual(21, connection.execute('executeAsyncScript', {'script': 'any', 'args': [1000]})['status'])
+        self.assertEqual(13, connection.execute('executeScript', {'script': 'any', 'args': []})['status'])
+        self.assertEqual(3, connection.replayed_count)
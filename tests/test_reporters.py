@@ -0,0 +1,229 @@
+import json
+import os
+import tempfile
+import tracemalloc
+import xml.etree.ElementTree as ElementTree
+from functools import partial
+from unittest import TestCase
+
+from mock import patch
+
+from pyselenium.reporters import JUnitXmlReporter
+from pyselenium.reporters import JsonLinesReporter
+from pyselenium.test_metadata import Test
+from pyselenium.test_runner import TestResult
+from pyselenium.test_runner import TestRunner
+from pyselenium.test_steps import AssertElementValue
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import DeadlineExceededError
+from pyselenium.test_steps import ElementValueIncorrectError
+from pyselenium.test_steps import Navigate
+from pyselenium.test_steps import Step
+from pyselenium.test_steps import StepResult
+from tests.test_data import any_click
+from tests.testables import SimulatedDriverTestable
+from tests.testables import SuiteRunnerTestable
+
+PAGE_URL = 'http://any.url/page'
+
+PAGE = '<html><body><h1 id="title">Any title</h1><button id="button">Any button</button></body></html>'
+
+
+def get_test(test_id='any test'):
+    test = Test(test_id)
+    test.add_step(Navigate(PAGE_URL))
+    test.add_step(Click('#missing', 'Missing & hidden'))
+    test.add_step(AssertElementValue('#title', 'Title', 'Any title'))
+
+    return test
+
+
+def run_test(test, reporters, fail_fast=False):
+    return TestRunner(test, driver_factory=partial(SimulatedDriverTestable, {PAGE_URL: PAGE}), fail_fast=fail_fast,
+                      reporters=reporters).run_test()
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+
+class TestJsonLinesReporter(TestCase):
+    """Has unit tests for the JsonLinesReporter class"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'results.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_report(self):
+        with JsonLinesReporter(self.path) as reporter:
+            run_test(get_test(), [reporter])
+
+            # Every line is on disk as soon as it is reported
+            lines = read_lines(self.path)
+
+        self.assertEqual(['step', 'step', 'step', 'test'], [line['type'] for line in lines])
+        self.assertEqual([0, 1, 2], [line['index'] for line in lines[:3]])
+        self.assertEqual(['Navigate', 'Click', 'AssertElementValue'], [line['step'] for line in lines[:3]])
+        self.assertEqual([None, '#missing', '#title'], [line['css_path'] for line in lines[:3]])
+        self.assertEqual([True, False, True], [line['success'] for line in lines[:3]])
+        self.assertEqual('ElementNotFoundError', lines[1]['error'])
+        self.assertIn('#missing', lines[1]['message'])
+        self.assertEqual(1, lines[1]['command_count'])
+
+        self.assertEqual('any test', lines[3]['test_id'])
+        self.assertFalse(lines[3]['success'])
+        self.assertEqual(3, lines[3]['step_count'])
+        self.assertEqual(1, lines[3]['failure_count'])
+        self.assertEqual(0, lines[3]['skipped_count'])
+
+    def test_report_skipped_steps(self):
+        with JsonLinesReporter(self.path) as reporter:
+            run_test(get_test(), [reporter], fail_fast=True)
+
+        lines = read_lines(self.path)
+
+        self.assertTrue(lines[2]['skipped'])
+        self.assertEqual(0.0, lines[2]['duration'])
+        self.assertEqual(1, lines[3]['failure_count'])
+        self.assertEqual(1, lines[3]['skipped_count'])
+
+    def test_report_test_error(self):
+        test_result = TestResult(Test('any test'))
+        test_result.exception = ValueError('no steps on the test')
+
+        with JsonLinesReporter(self.path) as reporter:
+            reporter.report_test_result(test_result)
+
+        line = read_lines(self.path)[0]
+
+        self.assertFalse(line['success'])
+        self.assertEqual('ValueError', line['error'])
+        self.assertEqual('no steps on the test', line['message'])
+
+    def test_report_exception_without_message(self):
+        test_result = TestResult(Test('any test'))
+        test_result.exception = DeadlineExceededError(30)
+
+        with JsonLinesReporter(self.path) as reporter:
+            reporter.report_test_result(test_result)
+
+        line = read_lines(self.path)[0]
+
+        self.assertEqual('DeadlineExceededError', line['error'])
+        self.assertEqual('timeout=30', line['message'])
+
+    def test_append(self):
+        with JsonLinesReporter(self.path) as reporter:
+            run_test(get_test('first test'), [reporter])
+
+        with JsonLinesReporter(self.path, append=True) as reporter:
+            run_test(get_test('second test'), [reporter])
+
+        self.assertEqual(['first test', 'second test'],
+                         [line['test_id'] for line in read_lines(self.path) if line['type'] == 'test'])
+
+        with JsonLinesReporter(self.path) as reporter:
+            run_test(get_test('third test'), [reporter])
+
+        self.assertEqual(4, len(read_lines(self.path)))
+
+    def test_suite_memory(self):
+        test_count = 300
+        tests = [Test('test %d' % i) for i in range(test_count)]
+
+        for test in tests:
+            test.add_step(any_click())
+
+        def measure(count):
+            suite_runner = SuiteRunnerTestable(tests[:count], 2)
+            suite_runner.reporters = [reporter]
+            suite_runner.keep_results = False
+
+            tracemalloc.start()
+
+            try:
+                suite_runner.run_suite()
+
+                return suite_runner, tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        def run_step(step, driver):
+            return StepResult(any_click())
+
+        # A plain function rather than a mock, since mocks keep every call they get
+        with JsonLinesReporter(self.path) as reporter, patch.object(Step, 'run', run_step):
+            # Warms up first, since the first calls to functions allocate memory that is kept, up to Python 3.10
+            measure(test_count // 10)
+            suite_runner, peak_memory = measure(test_count)
+            _, small_peak_memory = measure(test_count // 10)
+
+        self.assertEqual(test_count, suite_runner.suite_result.test_count)
+        self.assertEqual([], suite_runner.suite_result.test_results)
+        self.assertEqual(2 * (test_count + 2 * (test_count // 10)), len(read_lines(self.path)))
+        self.assertLess(peak_memory, small_peak_memory + test_count * 100)
+
+
+class TestJUnitXmlReporter(TestCase):
+    """Has unit tests for the JUnitXmlReporter class"""
+
+    def test_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.xml')
+
+            with JUnitXmlReporter(path, 'any suite') as reporter:
+                run_test(get_test('failed test'), [reporter])
+
+                passed_test = Test('passed test')
+                passed_test.add_step(Navigate(PAGE_URL))
+                run_test(passed_test, [reporter])
+
+                skipped_result = StepResult(any_click())
+                skipped_result.skip()
+                skipped_test_result = TestResult(Test('skipped test'))
+                skipped_test_result.add_step_result(skipped_result)
+                reporter.report_test_result(skipped_test_result)
+
+                error_test_result = TestResult(Test('error test'))
+                error_test_result.exception = ValueError('no "steps" on the test')
+                reporter.report_test_result(error_test_result)
+
+            test_suite = ElementTree.parse(path).getroot()
+
+        test_cases = test_suite.findall('testcase')
+
+        self.assertEqual('testsuite', test_suite.tag)
+        self.assertEqual('any suite', test_suite.get('name'))
+        self.assertEqual(['failed test', 'passed test', 'skipped test', 'error test'],
+                         [test_case.get('name') for test_case in test_cases])
+        self.assertEqual('ElementNotFoundError', test_cases[0].find('failure').get('type'))
+        self.assertIn('Missing & hidden', test_cases[0].find('failure').text)
+        self.assertIn('3. [AssertElementValue] - Success', test_cases[0].find('system-out').text)
+        self.assertIsNone(test_cases[1].find('failure'))
+        self.assertEqual('Skipped', test_cases[2].find('failure').get('type'))
+        self.assertIsNone(test_cases[3].find('failure'))
+        self.assertEqual('ValueError', test_cases[3].find('error').get('type'))
+        self.assertEqual('no "steps" on the test', test_cases[3].find('error').get('message'))
+
+    def test_report_unusual_values(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.xml')
+
+            with JUnitXmlReporter(path) as reporter:
+                error_test_result = TestResult(Test(42))
+                error_test_result.exception = ValueError('no \x1b[1msteps\x00 on the test')
+                reporter.report_test_result(error_test_result)
+
+                error_test_result = TestResult(Test('incorrect value test'))
+                error_test_result.exception = ElementValueIncorrectError('#title', 'Title', 'Other title', 'Any title')
+                reporter.report_test_result(error_test_result)
+
+            test_cases = ElementTree.parse(path).getroot().findall('testcase')
+
+        self.assertEqual('42', test_cases[0].get('name'))
+        self.assertEqual('no [1msteps on the test', test_cases[0].find('error').get('message'))
+        self.assertIn("actual_value='Other title'", test_cases[1].find('error').get('message'))
@@ -1,12 +1,24 @@
+import json
+import shutil
+import subprocess
+import time
 from unittest import TestCase
+from unittest import skipUnless
 
+from mock import ANY
+from mock import Mock
 from mock import PropertyMock
 from mock import call
 from mock import patch
 from selenium.webdriver.support.expected_conditions import presence_of_element_located
+from selenium.webdriver.common.keys import Keys
 
+from pyselenium._measured_wait import MeasuredWebDriverWait
+from pyselenium._remote_connection import PooledRemoteConnection
 from pyselenium._selenium_wrapper import *
+from pyselenium.driver_service import DriverService
 from tests.test_data import *
+from tests.testables import DriverStub
 from tests.testables import DriverTestable
 from tests.testables import SwitchToStub
 from tests.testables import WebDriverWaitTestable
@@ -33,14 +45,182 @@ class TestDriver(TestCase):
         self.assertRaises(ValueError, testable_driver.navigate, '')
         self.assertRaises(TypeError, testable_driver.navigate, None)
 
+    def test_enter(self):
+        testable_driver = DriverTestable()
+
+        with patch.object(testable_driver.driver, 'maximize_window') as maximize_mock:
+            testable_driver.__enter__()
+
+            self.assertTrue(maximize_mock.called)
+            self.assertGreaterEqual(testable_driver.startup_time, 0)
+
+    def test_enter_window_size(self):
+        testable_driver = DriverTestable(launch_profile='headless-fast')
+
+        with patch.object(testable_driver.driver, 'maximize_window') as maximize_mock:
+            testable_driver.__enter__()
+
+            self.assertFalse(maximize_mock.called)
+
+    def test_invalid_launch_profile(self):
+        self.assertRaises(ValueError, DriverTestable, launch_profile='any profile')
+
+    def test_get_web_driver(self):
+        driver = Driver(launch_profile='ci-minimal')
+
+        with patch('selenium.webdriver.Chrome') as chrome_mock:
+            chrome_mock.return_value.service.service_url = 'http://127.0.0.1:9515'
+
+            web_driver = driver._get_web_driver()
+
+            options = chrome_mock.call_args[1]['chrome_options']
+
+            self.assertIn('--no-sandbox', options.arguments)
+            self.assertEqual({'pageLoadStrategy': 'eager'}, chrome_mock.call_args[1]['desired_capabilities'])
+            self.assertIsInstance(web_driver.command_executor, PooledRemoteConnection)
+            self.assertTrue(web_driver.command_executor._url.endswith(':9515'))
+
+    def test_get_web_driver_shared_service(self):
+        driver_service = DriverService()
+        driver = Driver(launch_profile='headless-fast', service=driver_service)
+
+        with patch.object(driver_service, 'start') as start_mock, \
+                patch.object(DriverService, 'url', new_callable=PropertyMock, return_value='http://localhost:9515'), \
+                patch('selenium.webdriver.Remote') as remote_mock, \
+                patch('selenium.webdriver.Chrome') as chrome_mock:
+            driver._get_web_driver()
+
+            self.assertTrue(start_mock.called)
+            self.assertFalse(chrome_mock.called)
+
+            command_executor = remote_mock.call_args[1]['command_executor']
+            capabilities = remote_mock.call_args[1]['desired_capabilities']
+
+            self.assertIs(driver_service.get_connection(), command_executor)
+            self.assertTrue(command_executor._url.endswith(':9515'))
+            self.assertIn('--headless', capabilities['chromeOptions']['args'])
+            self.assertEqual('eager', capabilities['pageLoadStrategy'])
+
     def test_exit(self):
         testable_driver = DriverTestable()
 
-        with patch.object(testable_driver.driver, 'close') as driver_mock:
+        with patch.object(testable_driver.driver, 'quit') as driver_mock:
             testable_driver.__exit__(None, None, None)
             self.assertTrue(driver_mock.called)
             self.assertIsNone(testable_driver.driver)
 
+    def test_get_process_id(self):
+        testable_driver = DriverTestable()
+
+        self.assertIsNone(testable_driver.get_process_id())
+
+        testable_driver.driver.service = Mock()
+        testable_driver.driver.service.process.pid = 100
+
+        self.assertEqual(100, testable_driver.get_process_id())
+
+        testable_driver.__exit__(None, None, None)
+
+        self.assertIsNone(testable_driver.get_process_id())
+
+    def test_reset(self):
+        testable_driver = DriverTestable()
+        switch_to = SwitchToStub()
+
+        testable_driver.driver.inject_switch_to(switch_to)
+        testable_driver.driver.window_handles = ['first window', 'second window']
+
+        with patch.object(switch_to, 'window') as window_mock, \
+                patch.object(testable_driver.driver, 'close') as close_mock, \
+                patch.object(testable_driver.driver, 'execute_script') as execute_script_mock, \
+                patch.object(testable_driver.driver, 'delete_all_cookies') as delete_all_cookies_mock, \
+                patch.object(testable_driver.driver, 'get') as get_mock:
+            testable_driver.reset()
+
+            window_mock.assert_has_calls([call('second window'), call('first window')])
+            self.assertEqual(1, close_mock.call_count)
+            execute_script_mock.assert_called_with(CLEAR_WEB_STORAGE_SCRIPT)
+            self.assertTrue(delete_all_cookies_mock.called)
+            get_mock.assert_called_with(BLANK_PAGE_URL)
+
+    def test_reset_clears_visited_origins(self):
+        testable_driver = DriverTestable()
+        manager = Mock()
+
+        with patch.object(testable_driver.driver, 'execute_script') as execute_script_mock, \
+                patch.object(testable_driver.driver, 'delete_all_cookies') as delete_all_cookies_mock, \
+                patch.object(testable_driver.driver, 'get') as get_mock:
+            manager.attach_mock(execute_script_mock, 'execute_script')
+            manager.attach_mock(delete_all_cookies_mock, 'delete_all_cookies')
+            manager.attach_mock(get_mock, 'get')
+
+            testable_driver.navigate('https://login.any.url/sign-in?next=/')
+            testable_driver.navigate('http://any.url/page')
+            testable_driver.navigate('http://any.url/other-page')
+            testable_driver.navigate('data:text/html,<p>any</p>')
+            testable_driver.driver.current_url = 'http://any.url/other-page'
+            manager.reset_mock()
+
+            testable_driver.reset()
+
+            self.assertEqual([call.execute_script(CLEAR_WEB_STORAGE_SCRIPT), call.delete_all_cookies(),
+                              call.get('https://login.any.url/'),
+                              call.execute_script(CLEAR_WEB_STORAGE_SCRIPT), call.delete_all_cookies(),
+                              call.get(BLANK_PAGE_URL)], manager.mock_calls)
+
+            manager.reset_mock()
+            testable_driver.driver.current_url = BLANK_PAGE_URL
+            testable_driver.reset()
+
+            self.assertEqual([call.execute_script(CLEAR_WEB_STORAGE_SCRIPT), call.delete_all_cookies(),
+                              call.get(BLANK_PAGE_URL)], manager.mock_calls)
+
+    def test_save_checkpoint(self):
+        testable_driver = DriverTestable()
+        testable_driver.driver.current_url = ANY_URL
+        testable_driver._frame_context = (ANY_CSS_PATH,)
+        switch_to = SwitchToStub()
+        testable_driver.driver.inject_switch_to(switch_to)
+        cookies = [{'name': 'session', 'value': 'any session'}]
+
+        with patch.object(testable_driver.driver, 'execute_script', return_value=[{'a': '1'}, {'b': '2'}]) \
+                as execute_script_mock, \
+                patch.object(testable_driver.driver, 'get_cookies', return_value=cookies), \
+                patch.object(switch_to, 'default_content') as default_content_mock, \
+                patch.object(testable_driver, 'switch_to_frame') as switch_to_frame_mock:
+            checkpoint = testable_driver.save_checkpoint()
+
+            execute_script_mock.assert_called_once_with(READ_WEB_STORAGE_SCRIPT)
+            self.assertTrue(default_content_mock.called)
+            switch_to_frame_mock.assert_called_once_with(ANY_CSS_PATH, ANY)
+
+        self.assertEqual(ANY_URL, checkpoint.url)
+        self.assertEqual(cookies, checkpoint.cookies)
+        self.assertEqual({'a': '1'}, checkpoint.local_storage)
+        self.assertEqual({'b': '2'}, checkpoint.session_storage)
+        self.assertEqual((ANY_CSS_PATH,), checkpoint.frame_context)
+
+    def test_restore_checkpoint(self):
+        testable_driver = DriverTestable()
+        cookies = [{'name': 'session', 'value': 'any session'}, {'name': 'theme', 'value': 'dark'}]
+        checkpoint = BrowserCheckpoint(ANY_URL, cookies, {'a': '1'}, {'b': '2'}, (ANY_CSS_PATH,))
+        manager = Mock()
+
+        with patch.object(testable_driver.driver, 'get', manager.get), \
+                patch.object(testable_driver.driver, 'delete_all_cookies', manager.delete_all_cookies), \
+                patch.object(testable_driver.driver, 'add_cookie', manager.add_cookie), \
+                patch.object(testable_driver.driver, 'execute_script', manager.execute_script), \
+                patch.object(testable_driver, 'switch_to_frame', manager.switch_to_frame):
+            testable_driver.restore_checkpoint(checkpoint)
+
+        self.assertEqual([call.get(ANY_URL),
+                          call.delete_all_cookies(),
+                          call.add_cookie(cookies[0]),
+                          call.add_cookie(cookies[1]),
+                          call.execute_script(WRITE_WEB_STORAGE_SCRIPT, {'a': '1'}, {'b': '2'}),
+                          call.get(ANY_URL),
+                          call.switch_to_frame(ANY_CSS_PATH, ANY)], manager.mock_calls)
+
     def test_click(self):
         testable_driver = DriverTestable()
 
@@ -135,6 +315,22 @@ class TestDriver(TestCase):
                 self.assertEqual(ex.css_path, ANY_CSS_PATH)
                 self.assertEqual(ex.hint, ANY_HINT)
 
+    def test_read_elements(self):
+        testable_driver = DriverTestable()
+
+        with patch.object(testable_driver.driver, 'execute_script', return_value=[[ANY_VALUE], None]) as script_mock:
+            values = testable_driver.read_elements([(ANY_CSS_PATH, None), ('#missing', ANY_ATTRIBUTE_NAME)])
+
+            script_mock.assert_called_once_with(READ_ELEMENTS_SCRIPT, [[ANY_CSS_PATH, None],
+                                                                       ['#missing', ANY_ATTRIBUTE_NAME]])
+            self.assertEqual([(True, ANY_VALUE), (False, None)], values)
+
+    def test_read_elements_empty_args(self):
+        testable_driver = DriverTestable()
+
+        self.assertRaises(ValueError, testable_driver.read_elements, [])
+        self.assertRaises(ValueError, testable_driver.read_elements, None)
+
     def test_find_element_css_path_empty(self):
         driver_testable = DriverTestable()
 
@@ -335,6 +531,39 @@ class TestDriver(TestCase):
         self.assertRaises(ValueError, driver_testable.send_text, '', ANY_HINT, ANY_TEXT)
         self.assertRaises(ValueError, driver_testable.send_text, None, ANY_HINT, ANY_TEXT)
 
+    def test_set_text(self):
+        element_stub = WebElementStub()
+
+        driver_testable = DriverTestable()
+
+        with patch.object(driver_testable, 'find_element', return_value=element_stub) as find_element_mock, \
+                patch.object(driver_testable.driver, 'execute_script') as execute_script_mock:
+            driver_testable.set_text(ANY_CSS_PATH, ANY_HINT, ANY_TEXT)
+
+            find_element_mock.assert_called_with(ANY_CSS_PATH, ANY_HINT)
+            execute_script_mock.assert_called_once_with(SET_TEXT_SCRIPT, element_stub, ANY_TEXT)
+
+    def test_set_text_exception(self):
+        exception_to_be_thrown = WebDriverException()
+
+        driver_testable = DriverTestable()
+
+        with patch.object(driver_testable, 'find_element', return_value=WebElementStub()), \
+                patch.object(driver_testable.driver, 'execute_script', side_effect=exception_to_be_thrown):
+            try:
+                driver_testable.set_text(ANY_CSS_PATH, ANY_HINT, ANY_TEXT)
+            except CannotTypeTextError as exception:
+                self.assertEqual(exception.text, ANY_TEXT)
+                self.assertEqual(exception.inner_exception, exception_to_be_thrown)
+            else:
+                self.fail('CannotTypeTextError not raised')
+
+    def test_set_text_empty_text(self):
+        driver_testable = DriverTestable()
+
+        self.assertRaises(ValueError, driver_testable.set_text, ANY_CSS_PATH, ANY_HINT, '')
+        self.assertRaises(ValueError, driver_testable.set_text, ANY_CSS_PATH, ANY_HINT, None)
+
     def test_select_drop_down_item_by_text(self):
         driver_testable = DriverTestable()
 
@@ -537,6 +766,471 @@ class TestDriver(TestCase):
                 self.assertEqual(exception_caught.inner_exception, exception)
 
 
+class TestDriverElementCache(TestCase):
+    """Has unit tests for the element cache of the Driver class"""
+
+    def test_cache_disabled_by_default(self):
+        self.assertIsNone(DriverTestable().element_cache)
+
+    def test_find_element_cached(self):
+        driver_testable = DriverTestable(element_cache=True)
+
+        with patch.object(driver_testable, '_find_element_with_timeout') as find_mock:
+            first_element = driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+            second_element = driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+
+            self.assertEqual(1, find_mock.call_count)
+            self.assertIs(first_element, second_element)
+            self.assertEqual(1, driver_testable.element_cache.hits)
+            self.assertEqual(1, driver_testable.element_cache.misses)
+
+    def test_navigate_invalidates_cache(self):
+        driver_testable = DriverTestable(element_cache=True)
+
+        with patch.object(driver_testable, '_find_element_with_timeout') as find_mock:
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+            driver_testable.navigate(ANY_URL)
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+
+            self.assertEqual(2, find_mock.call_count)
+            self.assertEqual(1, driver_testable.element_cache.invalidations)
+
+    def test_frame_switches_invalidate_cache(self):
+        driver_testable = DriverTestable(element_cache=True)
+
+        with patch.object(driver_testable, '_find_element_with_timeout') as find_mock:
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+            driver_testable.switch_to_frame('iframe', ANY_HINT)
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+            driver_testable.switch_to_default_content()
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+
+            self.assertEqual(4, find_mock.call_count)
+            self.assertEqual(2, driver_testable.element_cache.invalidations)
+
+    def test_stale_element_found_again(self):
+        driver_testable = DriverTestable(element_cache=True)
+
+        stale_element = WebElementStub()
+        fresh_element = WebElementStub()
+
+        with patch.object(driver_testable, '_find_element_with_timeout', side_effect=[stale_element, fresh_element]), \
+                patch.object(stale_element, 'get_attribute', side_effect=StaleElementReferenceException()), \
+                patch.object(fresh_element, 'get_attribute', return_value=ANY_VALUE):
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+
+            attribute_value = driver_testable.get_element_attribute(ANY_CSS_PATH, ANY_HINT, ANY_ATTRIBUTE_NAME)
+
+            self.assertEqual(ANY_VALUE, attribute_value)
+            self.assertIs(fresh_element, driver_testable.find_element(ANY_CSS_PATH, ANY_HINT))
+
+    def test_stale_frame_found_again(self):
+        driver_testable = DriverTestable(element_cache=True)
+        switch_to = SwitchToStub()
+        driver_testable.driver.inject_switch_to(switch_to)
+
+        stale_frame = WebElementStub()
+        fresh_frame = WebElementStub()
+
+        with patch.object(driver_testable, '_find_element_with_timeout', side_effect=[stale_frame, fresh_frame]), \
+                patch.object(switch_to, 'frame', side_effect=[StaleElementReferenceException(), None]) as frame_mock:
+            driver_testable.find_element('iframe', ANY_HINT)
+
+            driver_testable.switch_to_frame('iframe', ANY_HINT)
+
+            frame_mock.assert_has_calls([call(stale_frame), call(fresh_frame)])
+            self.assertEqual(('iframe',), driver_testable._frame_context)
+
+    def test_stale_element_without_cache(self):
+        driver_testable = DriverTestable()
+        element_stub = WebElementStub()
+
+        with patch.object(driver_testable, 'find_element', return_value=element_stub), \
+                patch.object(element_stub, 'is_selected', side_effect=StaleElementReferenceException()):
+            self.assertRaises(StaleElementReferenceException, driver_testable.set_checkbox, ANY_CSS_PATH, ANY_HINT,
+                              True)
+
+
+@skipUnless(shutil.which('node'), 'Node.js is not installed')
+class TestNormalizeText(TestCase):
+    """Has unit tests for the script that normalizes the text read by batches of assertions as WebElement.text does"""
+
+    def normalize_text(self, inner_text):
+        script = 'process.stdout.write(JSON.stringify((%s)(%s)));' % (NORMALIZE_TEXT_FUNCTION, json.dumps(inner_text))
+
+        return json.loads(subprocess.check_output(['node', '-e', script]).decode('utf-8'))
+
+    def test_non_breaking_spaces(self):
+        self.assertEqual('Total:  10 USD', self.normalize_text('Total:\u00a0\u00a010 \t USD'))
+
+    def test_multiple_lines(self):
+        self.assertEqual('First  line\nSecond line\nThird line',
+                         self.normalize_text('  First\u00a0 line \n\n\t Second\t line  \r\nThird line\n'))
+
+    def test_read_elements_script_normalizes_text(self):
+        self.assertIn('normalizeText(element.innerText)', READ_ELEMENTS_SCRIPT)
+        self.assertIn(NORMALIZE_TEXT_FUNCTION, READ_ELEMENTS_SCRIPT)
+
+
+class TestDriverMutationObserverWaitEngine(TestCase):
+    """Has unit tests for the mutation observer wait engine of the Driver class"""
+
+    def test_invalid_wait_engine(self):
+        self.assertRaises(ValueError, DriverTestable, False, 'any wait engine')
+
+    def test_find_element(self):
+        driver_testable = DriverTestable(wait_engine=MUTATION_OBSERVER_WAIT_ENGINE)
+        element_stub = WebElementStub()
+
+        with patch.object(driver_testable.driver, 'execute_async_script', return_value=element_stub) as script_mock, \
+                patch.object(driver_testable.driver, 'set_script_timeout') as script_timeout_mock, \
+                patch.object(driver_testable.web_driver_wait_testable, 'until') as until_mock:
+            self.assertIs(element_stub, driver_testable.find_element(ANY_CSS_PATH, ANY_HINT))
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+
+            script_mock.assert_called_with(WAIT_FOR_ELEMENT_SCRIPT, ANY_CSS_PATH, 10000)
+            script_timeout_mock.assert_called_once_with(11)
+            self.assertFalse(until_mock.called)
+
+    def test_find_element_timeout(self):
+        driver_testable = DriverTestable(wait_engine=MUTATION_OBSERVER_WAIT_ENGINE)
+
+        with patch.object(driver_testable.driver, 'execute_async_script', return_value=None):
+            try:
+                driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+            except ElementNotFoundError as exception:
+                self.assertIsInstance(exception.inner_exception, TimeoutException)
+            else:
+                self.fail('ElementNotFoundError not raised')
+
+    def test_find_element_falls_back_to_polling(self):
+        driver_testable = DriverTestable(wait_engine=MUTATION_OBSERVER_WAIT_ENGINE)
+        element_stub = WebElementStub()
+
+        driver_testable.web_driver_wait_testable.inject_web_element_stub(element_stub)
+
+        with patch.object(driver_testable.driver, 'execute_async_script', side_effect=WebDriverException()):
+            self.assertIs(element_stub, driver_testable.find_element(ANY_CSS_PATH, ANY_HINT))
+
+    def test_click_waits_for_presence(self):
+        driver_testable = DriverTestable(wait_engine=MUTATION_OBSERVER_WAIT_ENGINE)
+
+        with patch.object(driver_testable.driver, 'execute_async_script', return_value=None):
+            self.assertRaises(ElementNotFoundError, driver_testable.click, ANY_CSS_PATH, ANY_HINT)
+
+    def test_click_waits_for_clickable_for_the_rest_of_the_timeout(self):
+        driver_testable = DriverTestable(wait_engine=MUTATION_OBSERVER_WAIT_ENGINE)
+
+        with patch.object(driver_testable, '_find_element_with_timeout', side_effect=lambda *args: time.sleep(0.2)), \
+                patch.object(driver_testable, '_get_web_driver_wait',
+                             return_value=driver_testable.web_driver_wait_testable) as wait_mock:
+            driver_testable.click(ANY_CSS_PATH, ANY_HINT)
+
+        timeout = wait_mock.call_args[0][1]
+
+        self.assertLessEqual(timeout, DEFAULT_TIMEOUT - 0.2)
+        self.assertGreater(timeout, DEFAULT_TIMEOUT - 1)
+
+
+class TestDriverSettledPage(TestCase):
+    """Has unit tests for giving up on elements once the page settles in the Driver class"""
+
+    def test_invalid_settle_time(self):
+        self.assertRaises(ValueError, DriverTestable, settle_time=-1)
+
+    def test_can_find_element_page_settled(self):
+        driver_testable = DriverTestable(settle_time=0.5)
+
+        with patch.object(driver_testable.driver, 'execute_async_script', return_value=None) as script_mock, \
+                patch.object(driver_testable, '_find_element_with_timeout') as find_mock:
+            self.assertFalse(driver_testable.can_find_element(ANY_CSS_PATH, ANY_WAIT_TIME))
+
+            script_mock.assert_called_with(WAIT_FOR_ELEMENT_OR_SETTLED_PAGE_SCRIPT, ANY_CSS_PATH, 500,
+                                           ANY_WAIT_TIME * 1000)
+            self.assertFalse(find_mock.called)
+
+    def test_can_find_element_found(self):
+        driver_testable = DriverTestable(settle_time=0.5)
+
+        with patch.object(driver_testable.driver, 'execute_async_script', return_value=WebElementStub()):
+            self.assertTrue(driver_testable.can_find_element(ANY_CSS_PATH, ANY_WAIT_TIME))
+
+    def test_can_find_element_falls_back_to_waiting(self):
+        driver_testable = DriverTestable(settle_time=0.5)
+
+        with patch.object(driver_testable.driver, 'execute_async_script', side_effect=WebDriverException()), \
+                patch.object(driver_testable, '_find_element_with_timeout') as find_mock:
+            self.assertTrue(driver_testable.can_find_element(ANY_CSS_PATH, ANY_WAIT_TIME))
+
+            find_mock.assert_called_with(ANY_CSS_PATH, '', ANY_WAIT_TIME)
+
+    def test_click_if_found_page_settled(self):
+        driver_testable = DriverTestable(settle_time=0.5)
+        element_stub = WebElementStub()
+
+        with patch.object(driver_testable.driver, 'execute_async_script', side_effect=[None, element_stub]), \
+                patch.object(element_stub, 'click') as click_mock:
+            driver_testable.click_if_found(ANY_CSS_PATH, ANY_HINT, ANY_WAIT_TIME)
+            self.assertFalse(click_mock.called)
+
+            driver_testable.click_if_found(ANY_CSS_PATH, ANY_HINT, ANY_WAIT_TIME)
+            self.assertTrue(click_mock.called)
+
+    def test_requests_are_watched_before_steps_that_start_them(self):
+        driver_testable = DriverTestable(settle_time=0.5)
+        manager = Mock()
+        element_stub = driver_testable.web_driver_wait_testable.web_element_stub
+
+        with patch.object(driver_testable.driver, 'execute_script') as script_mock, \
+                patch.object(element_stub, 'click') as click_mock, \
+                patch.object(driver_testable.driver, 'get'):
+            manager.attach_mock(script_mock, 'execute_script')
+            manager.attach_mock(click_mock, 'click')
+
+            driver_testable.navigate(ANY_URL)
+            driver_testable.click(ANY_CSS_PATH, ANY_HINT)
+            driver_testable.send_enter_key()
+
+        watch_call = call.execute_script(WATCH_PAGE_ACTIVITY_SCRIPT)
+
+        self.assertEqual([watch_call, watch_call, call.click(), watch_call], manager.mock_calls)
+
+    def test_requests_are_not_watched_without_settle_time(self):
+        driver_testable = DriverTestable()
+
+        with patch.object(driver_testable.driver, 'execute_script') as script_mock, \
+                patch.object(driver_testable.driver, 'get'):
+            driver_testable.navigate(ANY_URL)
+            driver_testable.click(ANY_CSS_PATH, ANY_HINT)
+
+        self.assertFalse(script_mock.called)
+
+    def test_settled_page_script_watches_requests_too(self):
+        self.assertTrue(WAIT_FOR_ELEMENT_OR_SETTLED_PAGE_SCRIPT.startswith(WATCH_PAGE_ACTIVITY_SCRIPT))
+
+
+class TestDriverTimeoutBudget(TestCase):
+    """Has unit tests for the timeout budget of the Driver class"""
+
+    def test_default_timeout(self):
+        driver_testable = DriverTestable()
+
+        with patch.object(driver_testable, '_get_web_driver_wait',
+                          return_value=driver_testable.web_driver_wait_testable) as wait_mock:
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+
+            wait_mock.assert_called_with(driver_testable.driver, DEFAULT_TIMEOUT)
+
+    def test_step_timeout(self):
+        driver_testable = DriverTestable()
+        driver_testable.set_timeout_budget(step_timeout=3)
+
+        with patch.object(driver_testable, '_get_web_driver_wait',
+                          return_value=driver_testable.web_driver_wait_testable) as wait_mock:
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+            driver_testable.click(ANY_CSS_PATH, ANY_HINT)
+
+            wait_mock.assert_has_calls([call(driver_testable.driver, 3), call(driver_testable.driver, 3)])
+
+    def test_deadline(self):
+        driver_testable = DriverTestable()
+        driver_testable.set_timeout_budget(deadline=time.monotonic() + 2)
+
+        with patch.object(driver_testable, '_get_web_driver_wait',
+                          return_value=driver_testable.web_driver_wait_testable) as wait_mock:
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+
+            timeout = wait_mock.call_args[0][1]
+            self.assertGreater(timeout, 0)
+            self.assertLessEqual(timeout, 2)
+
+    def test_deadline_expired(self):
+        driver_testable = DriverTestable()
+        driver_testable.set_timeout_budget(deadline=time.monotonic() - 1)
+
+        with patch.object(driver_testable, '_get_web_driver_wait',
+                          return_value=driver_testable.web_driver_wait_testable) as wait_mock:
+            driver_testable.can_find_element(ANY_CSS_PATH, ANY_WAIT_TIME)
+
+            wait_mock.assert_called_with(driver_testable.driver, 0)
+
+    def test_invalid_step_timeout(self):
+        self.assertRaises(ValueError, DriverTestable().set_timeout_budget, -1)
+
+
+class TestDriverMetrics(TestCase):
+    """Has unit tests for the DriverMetrics class and how the Driver class fills it"""
+
+    def test_since(self):
+        metrics = DriverMetrics(1, 2, 0.5)
+
+        snapshot = metrics.snapshot()
+        metrics.command_count += 3
+        metrics.wait_poll_count += 4
+        metrics.wait_time += 1.5
+
+        difference = metrics.since(snapshot)
+
+        self.assertEqual(3, difference.command_count)
+        self.assertEqual(4, difference.wait_poll_count)
+        self.assertEqual(1.5, difference.wait_time)
+
+    def test_since_command_latencies(self):
+        metrics = DriverMetrics()
+        metrics.command_latencies.record('findElement', 0.01)
+
+        snapshot = metrics.snapshot()
+        metrics.command_latencies.record('findElement', 0.02)
+        metrics.command_latencies.record('clickElement', 0.03)
+
+        command_latencies = metrics.since(snapshot).command_latencies
+
+        self.assertEqual(1, snapshot.command_latencies.get_count('findElement'))
+        self.assertEqual(1, command_latencies.get_count('findElement'))
+        self.assertAlmostEqual(0.02, command_latencies.total_times['findElement'])
+        self.assertEqual(['clickElement', 'findElement'], command_latencies.commands)
+
+    def test_commands_counted(self):
+        with DriverTestable() as driver_testable:
+            driver_testable.driver.execute('any command')
+            driver_testable.driver.execute('any other command', {})
+            driver_testable.driver.execute('any command')
+
+            self.assertEqual(3, driver_testable.metrics.command_count)
+            self.assertEqual(2, driver_testable.metrics.command_latencies.get_count('any command'))
+            self.assertEqual(1, driver_testable.metrics.command_latencies.get_count('any other command'))
+
+    def test_failed_command_latency_recorded(self):
+        driver_testable = DriverTestable()
+
+        with patch.object(driver_testable.driver, 'execute', side_effect=WebDriverException()), driver_testable:
+            self.assertRaises(WebDriverException, driver_testable.driver.execute, 'any command')
+
+        self.assertEqual(1, driver_testable.metrics.command_latencies.get_count('any command'))
+
+    def test_measured_web_driver_wait(self):
+        metrics = DriverMetrics()
+        conditions = iter([False, WebElementStub()])
+
+        measured_wait = MeasuredWebDriverWait(DriverStub(), 5, metrics)
+        measured_wait._poll = 0.01
+
+        measured_wait.until(lambda driver: next(conditions))
+
+        self.assertEqual(2, metrics.wait_poll_count)
+        self.assertGreater(metrics.wait_time, 0)
+
+    def test_measured_web_driver_wait_timeout(self):
+        metrics = DriverMetrics()
+
+        measured_wait = MeasuredWebDriverWait(DriverStub(), 0, metrics)
+
+        self.assertRaises(TimeoutException, measured_wait.until, lambda driver: False)
+        self.assertEqual(1, metrics.wait_poll_count)
+
+    def test_waiting_script_measured(self):
+        driver_testable = DriverTestable(wait_engine=MUTATION_OBSERVER_WAIT_ENGINE)
+
+        with patch.object(driver_testable.driver, 'execute_async_script', return_value=WebElementStub()):
+            driver_testable.find_element(ANY_CSS_PATH, ANY_HINT)
+
+            self.assertEqual(1, driver_testable.metrics.wait_poll_count)
+
+
+class TestCommandLatencies(TestCase):
+    """Has unit tests for the CommandLatencies class"""
+
+    def test_record(self):
+        command_latencies = CommandLatencies()
+
+        command_latencies.record('findElement', 0.0015)
+        command_latencies.record('findElement', 0.003)
+        command_latencies.record('findElement', 100)
+
+        self.assertEqual(3, command_latencies.get_count('findElement'))
+        self.assertEqual(0, command_latencies.get_count('clickElement'))
+        self.assertEqual(1, command_latencies.bucket_counts['findElement'][1])
+        self.assertEqual(1, command_latencies.bucket_counts['findElement'][2])
+        self.assertEqual(1, command_latencies.bucket_counts['findElement'][-1])
+        self.assertAlmostEqual(100.0045, command_latencies.total_times['findElement'])
+
+    def test_get_percentile(self):
+        command_latencies = CommandLatencies()
+
+        for _ in range(98):
+            command_latencies.record('findElement', 0.0005)
+
+        command_latencies.record('findElement', 0.05)
+        command_latencies.record('findElement', 100)
+
+        self.assertEqual(0.001, command_latencies.get_percentile('findElement', 50))
+        self.assertEqual(0.064, command_latencies.get_percentile('findElement', 99))
+        self.assertEqual(float('inf'), command_latencies.get_percentile('findElement', 100))
+        self.assertIsNone(command_latencies.get_percentile('clickElement', 50))
+
+    def test_add(self):
+        command_latencies = CommandLatencies()
+        command_latencies.record('findElement', 0.01)
+
+        other_command_latencies = CommandLatencies()
+        other_command_latencies.record('findElement', 0.01)
+        other_command_latencies.record('clickElement', 0.01)
+
+        command_latencies.add(other_command_latencies)
+
+        self.assertEqual(2, command_latencies.get_count('findElement'))
+        self.assertEqual(1, command_latencies.get_count('clickElement'))
+        self.assertEqual(1, other_command_latencies.get_count('findElement'))
+
+    def test_str(self):
+        command_latencies = CommandLatencies()
+        command_latencies.record('findElement', 0.003)
+        command_latencies.record('clickElement', 0.05)
+
+        lines = str(command_latencies).split('\n')
+
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[1].startswith('clickElement'))
+        self.assertIn('<=4ms', lines[2])
+
+
+class TestElementCache(TestCase):
+    """Has unit tests for the ElementCache class"""
+
+    def test_get_miss(self):
+        element_cache = ElementCache()
+
+        self.assertIsNone(element_cache.get((), ANY_CSS_PATH))
+        self.assertEqual(1, element_cache.misses)
+        self.assertEqual(0, element_cache.hits)
+
+    def test_get_keyed_by_frame_context(self):
+        element_cache = ElementCache()
+        element_stub = WebElementStub()
+
+        element_cache.put(('iframe',), ANY_CSS_PATH, element_stub)
+
+        self.assertIsNone(element_cache.get((), ANY_CSS_PATH))
+        self.assertIs(element_stub, element_cache.get(('iframe',), ANY_CSS_PATH))
+
+    def test_remove(self):
+        element_cache = ElementCache()
+
+        element_cache.put((), ANY_CSS_PATH, WebElementStub())
+        element_cache.remove((), ANY_CSS_PATH)
+
+        self.assertIsNone(element_cache.get((), ANY_CSS_PATH))
+
+    def test_clear(self):
+        element_cache = ElementCache()
+
+        element_cache.put((), ANY_CSS_PATH, WebElementStub())
+        element_cache.clear()
+
+        self.assertIsNone(element_cache.get((), ANY_CSS_PATH))
+        self.assertEqual(1, element_cache.invalidations)
+
+
 class TestElementNotFoundError(TestCase):
     """Has unit tests for the ElementNotFoundError class"""
 
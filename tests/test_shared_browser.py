@@ -0,0 +1,159 @@
+from unittest import TestCase
+
+from selenium.webdriver.remote.command import Command
+
+from pyselenium._selenium_wrapper import BLANK_PAGE_URL
+from pyselenium._selenium_wrapper import POLLING_WAIT_ENGINE
+from tests.testables import SharedBrowserTestable
+from tests.testables import WindowDriverFactoryTestable
+
+
+def switch_to_window_command(window_handle):
+    return Command.SWITCH_TO_WINDOW, {'name': window_handle, 'handle': window_handle}
+
+
+class TestSharedBrowser(TestCase):
+    """Has unit tests for the SharedBrowser and WindowDriver classes"""
+
+    def test_window_drivers_open_windows(self):
+        with SharedBrowserTestable() as shared_browser:
+            first_window_driver = shared_browser.get_window_driver().__enter__()
+            second_window_driver = shared_browser.get_window_driver().__enter__()
+
+            self.assertEqual(['host window', 'window 1', 'window 2'], shared_browser.browser_stub.window_handles)
+            self.assertEqual(2, shared_browser.window_count)
+            self.assertIsNot(first_window_driver.driver, second_window_driver.driver)
+            self.assertIsNone(first_window_driver.get_process_id())
+
+    def test_commands_switch_to_window(self):
+        shared_browser = SharedBrowserTestable()
+        first_window_driver = shared_browser.get_window_driver().__enter__()
+        second_window_driver = shared_browser.get_window_driver().__enter__()
+        commands = shared_browser.browser_stub.commands
+
+        del commands[:]
+
+        first_window_driver.navigate('http://first')
+        first_window_driver.navigate('http://second')
+        second_window_driver.navigate('http://third')
+        first_window_driver.navigate('http://fourth')
+
+        self.assertEqual([switch_to_window_command('window 1'),
+                          (Command.GET, {'url': 'http://first'}),
+                          (Command.GET, {'url': 'http://second'}),
+                          switch_to_window_command('window 2'),
+                          (Command.GET, {'url': 'http://third'}),
+                          switch_to_window_command('window 1'),
+                          (Command.GET, {'url': 'http://fourth'})], commands)
+
+    def test_commands_switch_to_frames(self):
+        shared_browser = SharedBrowserTestable()
+        first_window_driver = shared_browser.get_window_driver().__enter__()
+        second_window_driver = shared_browser.get_window_driver().__enter__()
+        commands = shared_browser.browser_stub.commands
+
+        first_window_driver.driver.execute(Command.SWITCH_TO_FRAME, {'id': 'outer'})
+        first_window_driver.driver.execute(Command.SWITCH_TO_FRAME, {'id': 'inner'})
+        first_window_driver.driver.execute(Command.SWITCH_TO_PARENT_FRAME)
+        second_window_driver.navigate('http://second')
+
+        del commands[:]
+
+        first_window_driver.navigate('http://first')
+        second_window_driver.navigate('http://second')
+        first_window_driver.navigate('http://first')
+
+        self.assertEqual([switch_to_window_command('window 1'),
+                          (Command.SWITCH_TO_FRAME, {'id': 'outer'}),
+                          (Command.GET, {'url': 'http://first'}),
+                          switch_to_window_command('window 2'),
+                          (Command.GET, {'url': 'http://second'}),
+                          switch_to_window_command('window 1'),
+                          (Command.GET, {'url': 'http://first'})], commands)
+
+    def test_commands_follow_switched_window(self):
+        shared_browser = SharedBrowserTestable()
+        first_window_driver = shared_browser.get_window_driver().__enter__()
+        second_window_driver = shared_browser.get_window_driver().__enter__()
+        commands = shared_browser.browser_stub.commands
+
+        first_window_driver.driver.execute(*switch_to_window_command('popup'))
+        second_window_driver.navigate('http://second')
+
+        del commands[:]
+
+        first_window_driver.navigate('http://first')
+
+        self.assertEqual([switch_to_window_command('popup'), (Command.GET, {'url': 'http://first'})], commands)
+
+    def test_reset(self):
+        shared_browser = SharedBrowserTestable()
+        window_driver = shared_browser.get_window_driver().__enter__()
+        commands = shared_browser.browser_stub.commands
+
+        window_driver.driver.execute(*switch_to_window_command('popup'))
+
+        del commands[:]
+
+        window_driver.reset()
+
+        self.assertEqual([(Command.CLOSE, None),
+                          switch_to_window_command('window 1'),
+                          (Command.GET, {'url': BLANK_PAGE_URL})], commands)
+
+    def test_exit_closes_window(self):
+        shared_browser = SharedBrowserTestable()
+        window_driver = shared_browser.get_window_driver().__enter__()
+        commands = shared_browser.browser_stub.commands
+
+        del commands[:]
+
+        window_driver.__exit__(None, None, None)
+
+        self.assertEqual([switch_to_window_command('window 1'), (Command.CLOSE, None)], commands)
+        self.assertIsNone(window_driver.driver)
+        self.assertEqual(0, shared_browser.window_count)
+        self.assertEqual(0, shared_browser.browser_stub.quit_count)
+
+    def test_close(self):
+        shared_browser = SharedBrowserTestable()
+        window_driver = shared_browser.get_window_driver().__enter__()
+
+        shared_browser.close()
+        shared_browser.close()
+        window_driver.__exit__(None, None, None)
+
+        self.assertEqual(1, shared_browser.browser_stub.quit_count)
+
+
+class TestWindowDriverFactory(TestCase):
+    """Has unit tests for the WindowDriverFactory class"""
+
+    def test_initializer_error(self):
+        self.assertRaises(ValueError, WindowDriverFactoryTestable, 0)
+        self.assertRaises(ValueError, WindowDriverFactoryTestable, None)
+
+    def test_fills_browsers_first(self):
+        with WindowDriverFactoryTestable(windows_per_browser=2) as window_driver_factory:
+            first_window_driver = window_driver_factory()
+            second_window_driver = window_driver_factory()
+            third_window_driver = window_driver_factory()
+
+            self.assertEqual(2, len(window_driver_factory.shared_browsers))
+            self.assertIs(first_window_driver.shared_browser, second_window_driver.shared_browser)
+            self.assertIsNot(first_window_driver.shared_browser, third_window_driver.shared_browser)
+
+            first_window_driver.__exit__(None, None, None)
+
+            self.assertIs(first_window_driver.shared_browser, window_driver_factory().shared_browser)
+
+        self.assertEqual([], window_driver_factory.shared_browsers)
+
+    def test_window_driver_options(self):
+        window_driver_factory = WindowDriverFactoryTestable(element_cache=True)
+
+        window_driver = window_driver_factory()
+
+        self.assertIsNotNone(window_driver.element_cache)
+        self.assertEqual(POLLING_WAIT_ENGINE, window_driver.wait_engine)
+        self.assertIsNone(window_driver.settle_time)
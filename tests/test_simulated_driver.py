@@ -0,0 +1,325 @@
+import tempfile
+from functools import partial
+from pathlib import Path
+from unittest import TestCase
+
+from selenium.common.exceptions import ElementNotVisibleException
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.common.exceptions import NoSuchElementException
+
+from pyselenium._html_dom import parse_document
+from pyselenium._html_dom import select_all
+from pyselenium._selenium_wrapper import CannotTypeTextError
+from pyselenium._selenium_wrapper import ElementNotFoundError
+from pyselenium._selenium_wrapper import InvalidElementException
+from pyselenium._selenium_wrapper import InvalidOptionTextException
+from pyselenium._selenium_wrapper import NoSuchAttributeError
+from pyselenium.simulated_driver import SimulatedDriver
+from pyselenium.test_metadata import Test
+from pyselenium.test_runner import TestRunner
+from pyselenium.test_steps import AssertElementAttributeValue
+from pyselenium.test_steps import AssertElementValue
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import Navigate
+from pyselenium.test_steps import SendEnter
+from pyselenium.test_steps import TypeText
+from tests.testables import SimulatedDriverTestable
+
+PAGE_URL = 'http://any.url/page'
+
+FORM_PAGE = '''
+<html>
+<head><title>Any title</title></head>
+<body>
+    <h1 id="title">Sign <b>in</b></h1>
+    <p class="hint" style="display: none">Hidden hint</p>
+    <form action="/login" method="post">
+        <input id="user" name="user" value="default">
+        <input id="secret" type="hidden" name="secret" value="1">
+        <input id="remember" type="checkbox" name="remember">
+        <label for="terms">Terms</label><input id="terms" type="checkbox" name="terms">
+        <input type="radio" name="plan" value="free" checked><input id="paid" type="radio" name="plan" value="paid">
+        <select id="country" name="country">
+            <option value="br">Brazil
+            <option value="us">United States
+        </select>
+        <textarea id="notes" name="notes">Any notes</textarea>
+        <button id="disabled" disabled>Disabled</button>
+        <button id="submit" name="action" value="login">Log in</button>
+    </form>
+    <a id="link" href="other"><span id="link-text">Other page</span></a>
+    <iframe id="frame" src="/frame"></iframe>
+</body>
+</html>
+'''
+
+
+def get_driver(**pages):
+    pages.setdefault(PAGE_URL, FORM_PAGE)
+
+    driver = SimulatedDriverTestable(pages)
+    driver.__enter__()
+    driver.navigate(PAGE_URL)
+
+    return driver
+
+
+class TestSimulatedDriver(TestCase):
+    """Has unit tests for the SimulatedDriver class"""
+
+    def test_navigate(self):
+        driver = get_driver()
+
+        self.assertEqual(PAGE_URL, driver.current_url)
+        self.assertEqual([(PAGE_URL, None)], driver.loaded_pages)
+        self.assertRaises(ValueError, driver.navigate, '')
+        self.assertRaises(TypeError, driver.navigate, None)
+
+    def test_find_element(self):
+        driver = get_driver()
+
+        self.assertEqual('user', driver.find_element('form > input', 'hint').attributes['id'])
+        self.assertTrue(driver.can_find_element('#title b', 0))
+        self.assertFalse(driver.can_find_element('#missing', 0))
+        self.assertEqual(3, driver.metrics.command_latencies.get_count('findElement'))
+
+        with self.assertRaises(ElementNotFoundError) as context:
+            driver.find_element('#missing', 'hint')
+
+        self.assertIsInstance(context.exception.inner_exception, NoSuchElementException)
+
+        with self.assertRaises(ElementNotFoundError) as context:
+            driver.find_element('div::before', 'hint')
+
+        self.assertIsInstance(context.exception.inner_exception, InvalidSelectorException)
+
+    def test_get_element_value(self):
+        driver = get_driver()
+
+        self.assertEqual('Sign in', driver.get_element_value('#title', 'hint'))
+        self.assertEqual('', driver.get_element_value('.hint', 'hint'))
+        self.assertEqual('Brazil\nUnited States', driver.get_element_value('#country', 'hint'))
+
+    def test_get_element_attribute(self):
+        driver = get_driver()
+
+        self.assertEqual('default', driver.get_element_attribute('#user', 'hint', 'value'))
+        self.assertEqual('br', driver.get_element_attribute('#country', 'hint', 'value'))
+        self.assertEqual('Any notes', driver.get_element_attribute('#notes', 'hint', 'value'))
+        self.assertEqual('true', driver.get_element_attribute('#disabled', 'hint', 'disabled'))
+        self.assertRaises(NoSuchAttributeError, driver.get_element_attribute, '#user', 'hint', 'checked')
+        self.assertRaises(NoSuchAttributeError, driver.get_element_attribute, '#user', 'hint', 'class')
+
+    def test_read_elements(self):
+        driver = get_driver()
+
+        values = driver.read_elements([('#title', None), ('#user', 'name'), ('#missing', None)])
+
+        self.assertEqual([(True, 'Sign in'), (True, 'user'), (False, None)], values)
+
+    def test_send_text(self):
+        driver = get_driver()
+
+        driver.send_text('#user', 'hint', 'any user')
+        driver.set_text('#notes', 'hint', 'other notes')
+
+        self.assertEqual('any user', driver.get_element_attribute('#user', 'hint', 'value'))
+        self.assertEqual('other notes', driver.get_element_attribute('#notes', 'hint', 'value'))
+        self.assertRaises(CannotTypeTextError, driver.send_text, '#title', 'hint', 'any text')
+        self.assertRaises(CannotTypeTextError, driver.send_text, '#secret', 'hint', 'any text')
+
+    def test_click_not_clickable(self):
+        driver = get_driver()
+
+        with self.assertRaises(ElementNotFoundError) as context:
+            driver.click('.hint', 'hint')
+
+        self.assertIsInstance(context.exception.inner_exception, ElementNotVisibleException)
+        self.assertRaises(ElementNotFoundError, driver.click, '#disabled', 'hint')
+
+        driver.click_if_found('#missing', 'hint', 0)
+
+    def test_checkboxes_and_radio_buttons(self):
+        driver = get_driver()
+
+        driver.set_checkbox('#remember', 'hint', True)
+        driver.set_checkbox('#remember', 'hint', True)
+        driver.click('label', 'hint')
+        driver.click('#paid', 'hint')
+
+        self.assertEqual('true', driver.get_element_attribute('#remember', 'hint', 'checked'))
+        self.assertEqual('true', driver.get_element_attribute('#terms', 'hint', 'checked'))
+        self.assertEqual('true', driver.get_element_attribute('#paid', 'hint', 'checked'))
+        self.assertFalse(driver.can_find_element('[value=free]:checked', 0))
+
+        driver.set_checkbox('#remember', 'hint', False)
+
+        self.assertRaises(NoSuchAttributeError, driver.get_element_attribute, '#remember', 'hint', 'checked')
+
+    def test_select_drop_down_item_by_text(self):
+        driver = get_driver()
+
+        driver.select_drop_down_item_by_text('#country', 'hint', 'United States')
+
+        self.assertEqual('us', driver.get_element_attribute('#country', 'hint', 'value'))
+        self.assertRaises(InvalidOptionTextException, driver.select_drop_down_item_by_text, '#country', 'hint',
+                          'Canada')
+        self.assertRaises(InvalidElementException, driver.select_drop_down_item_by_text, '#user', 'hint', 'Canada')
+
+    def test_submit_form(self):
+        driver = get_driver()
+
+        driver.send_text('#user', 'hint', 'any user')
+        driver.click('#terms', 'hint')
+        driver.click('#submit', 'hint')
+
+        self.assertEqual(('http://any.url/login', b'user=any+user&secret=1&terms=on&plan=free&country=br&'
+                                                  b'notes=Any+notes&action=login'), driver.loaded_pages[-1])
+
+    def test_submit_form_with_enter(self):
+        driver = get_driver(**{'http://any.url/search': '<form><input name="q"><input type="submit"></form>'})
+
+        driver.navigate('http://any.url/search')
+        driver.send_text('input', 'hint', 'any text')
+        driver.send_enter_key()
+
+        self.assertEqual(('http://any.url/search?q=any+text', None), driver.loaded_pages[-1])
+
+    def test_follow_link(self):
+        driver = get_driver(**{'http://any.url/other': '<p id="other">Other</p>'})
+
+        driver.click('#link-text', 'hint')
+
+        self.assertEqual('http://any.url/other', driver.current_url)
+        self.assertEqual('Other', driver.get_element_value('#other', 'hint'))
+
+    def test_switch_to_frame(self):
+        driver = get_driver(**{'http://any.url/frame': '<a id="framed" href="/framed">Framed</a>',
+                               'http://any.url/framed': '<p id="inner">Inner</p>'})
+
+        driver.switch_to_frame('#frame', 'hint')
+        driver.click('#framed', 'hint')
+
+        self.assertEqual('Inner', driver.get_element_value('#inner', 'hint'))
+        self.assertEqual(PAGE_URL, driver.current_url)
+        self.assertFalse(driver.can_find_element('#title', 0))
+
+        driver.switch_to_default_content()
+
+        self.assertTrue(driver.can_find_element('#title', 0))
+        self.assertRaises(InvalidElementException, driver.switch_to_frame, '#title', 'hint')
+
+    def test_reset(self):
+        driver = get_driver()
+
+        driver.reset()
+
+        self.assertEqual('about:blank', driver.current_url)
+        self.assertFalse(driver.can_find_element('#title', 0))
+
+    def test_load_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, 'page.html').write_text('<p id="text">Saved page</p>', encoding='utf-8')
+
+            url_rewrites = {'https://example.com/': Path(directory).as_uri() + '/'}
+
+            with SimulatedDriver(url_rewrites=url_rewrites) as driver:
+                driver.navigate('https://example.com/page.html')
+
+                self.assertEqual('Saved page', driver.get_element_value('#text', 'hint'))
+                self.assertEqual(Path(directory, 'page.html').as_uri(), driver.current_url)
+
+    def test_run_test(self):
+        test = Test('any test')
+        test.add_step(Navigate(PAGE_URL))
+        test.add_step(TypeText('#user', 'hint', 'any user'))
+        test.add_step(AssertElementAttributeValue('#user', 'hint', 'value', 'any user'))
+        test.add_step(AssertElementValue('#title', 'hint', 'Sign in'))
+        test.add_step(Click('#missing', 'hint'))
+        test.add_step(SendEnter())
+
+        test_result = TestRunner(test, driver_factory=partial(SimulatedDriverTestable, {PAGE_URL: FORM_PAGE}),
+                                 batch_assertions=True).run_test()
+
+        self.assertEqual([True, True, True, True, False, True],
+                         [step_result.success for step_result in test_result.step_results])
+
+
+class TestSelectors(TestCase):
+    """Has unit tests for the CSS selectors of simulated pages"""
+
+    DOCUMENT = parse_document('''
+        <ul id="list" class="items main">
+            <li lang="en-US" data-index="1">One
+            <li class="item" data-index="2">Two
+            <li class="item last" data-index="3">Three
+        </ul>
+        <p id="été">Summer</p>
+        <div><span>First</span><em>Second</em><span>Third</span></div>
+    ''', PAGE_URL)
+
+    def select_texts(self, css_path):
+        return [element.get_text() for element in select_all(self.DOCUMENT, css_path)]
+
+    def test_simple_selectors(self):
+        self.assertEqual(['One', 'Two', 'Three'], self.select_texts('li'))
+        self.assertEqual(['Two', 'Three'], self.select_texts('.item'))
+        self.assertEqual(['Three'], self.select_texts('li.item.last'))
+        self.assertEqual(['Summer'], self.select_texts('#été'))
+        self.assertEqual(['Summer'], self.select_texts('#\\e9 t\\e9'))
+        self.assertEqual(['One'], self.select_texts('li:not(.item)'))
+        self.assertEqual(['Summer', 'First', 'Second', 'Third'], self.select_texts('p , div > *'))
+
+    def test_attribute_selectors(self):
+        self.assertEqual(['One', 'Two', 'Three'], self.select_texts('[data-index]'))
+        self.assertEqual(['Two'], self.select_texts('[data-index="2"]'))
+        self.assertEqual(['One'], self.select_texts('[lang|=en]'))
+        self.assertEqual(['Three'], self.select_texts('[class~=last]'))
+        self.assertEqual(['Two', 'Three'], self.select_texts('li[class^=item]'))
+        self.assertEqual(['Three'], self.select_texts('[class$=LAST i]'))
+        self.assertEqual(['One', 'Two', 'Three'], self.select_texts('ul[class*=ma] li'))
+
+    def test_combinators(self):
+        self.assertEqual(['One', 'Two', 'Three'], self.select_texts('#list li'))
+        self.assertEqual(['Two', 'Three'], self.select_texts('li ~ li'))
+        self.assertEqual(['Three'], self.select_texts('.item+li'))
+        self.assertEqual([], self.select_texts('ul > span'))
+
+    def test_structural_pseudo_classes(self):
+        self.assertEqual(['Two'], self.select_texts('li:nth-child(2)'))
+        self.assertEqual(['One', 'Three'], self.select_texts('li:nth-child(odd)'))
+        self.assertEqual(['One', 'Two'], self.select_texts('li:nth-child(-n+2)'))
+        self.assertEqual(['Third'], self.select_texts('span:nth-of-type(2)'))
+        self.assertEqual(['Third'], self.select_texts('div > :last-child'))
+        self.assertEqual(['First'], self.select_texts('div span:first-of-type'))
+        self.assertEqual(['Second'], self.select_texts('div :only-of-type'))
+
+    def test_invalid_selectors(self):
+        for css_path in ('li:hover', 'li::after', 'li >', '[data-index', 'li:nth-child(x)', '#'):
+            self.assertRaises(InvalidSelectorException, select_all, self.DOCUMENT, css_path)
+
+    def test_implicitly_closed_elements(self):
+        document = parse_document('<p>One<p>Two<div>Three</div><br/>Four', PAGE_URL)
+
+        self.assertEqual(['p', 'p', 'div', 'br'], [element.tag for element in document.iter()])
+        self.assertEqual(['One', 'Two'], [element.get_text() for element in select_all(document, 'p')])
+
+    def test_implicit_table_bodies(self):
+        document = parse_document('<table id="table"><tr><th>Name<th>Price<tr><td>a<td>b</table>'
+                                  '<table><thead><tr><td>Head</td></tr></thead><tr><td>Body</td></tr></table>',
+                                  PAGE_URL)
+
+        self.assertEqual(['a', 'b', 'Body'],
+                         [element.get_text() for element in select_all(document, 'table tbody tr td')])
+        self.assertEqual(['b'], [element.get_text() for element in
+                                 select_all(document, '#table > tbody > tr:nth-child(2) > td:nth-child(2)')])
+        self.assertEqual(['Head'], [element.get_text() for element in select_all(document, 'thead > tr > td')])
+        self.assertEqual(['Body'], [element.get_text() for element in select_all(document, 'thead ~ tbody td')])
+
+    def test_table_cell_text(self):
+        document = parse_document('<table><tr><th>Name</th><th>Price</th></tr><tr><td>a</td><td>b</td></tr></table>'
+                                  '<p><span>c</span><span>d</span></p>', PAGE_URL)
+
+        self.assertEqual(['Name Price\na b'], [element.get_text() for element in select_all(document, 'table')])
+        self.assertEqual(['a b'], [element.get_text() for element in select_all(document, 'tbody > tr:last-child')])
+        self.assertEqual(['cd'], [element.get_text() for element in select_all(document, 'p')])
@@ -0,0 +1,133 @@
+from unittest import TestCase
+
+from mock import patch
+from selenium.common.exceptions import WebDriverException
+
+from pyselenium.suite_runner import SuiteResult
+from pyselenium.suite_runner import SuiteRunner
+from pyselenium.test_metadata import Test
+from pyselenium.test_runner import TestResult
+from pyselenium.test_steps import Step
+from pyselenium.test_steps import StepResult
+from tests.test_data import any_click
+from tests.testables import SuiteRunnerTestable
+
+
+def any_tests(count):
+    tests = []
+
+    for i in range(count):
+        test = Test('test %d' % i)
+        test.add_step(any_click())
+        tests.append(test)
+
+    return tests
+
+
+class TestSuiteResult(TestCase):
+    """Has unit tests for the SuiteResult class"""
+
+    def test_tests_per_minute(self):
+        suite_result = SuiteResult()
+
+        suite_result.add_test_result(TestResult(Test()))
+        suite_result.add_test_result(TestResult(Test()))
+        suite_result.elapsed_time = 30
+
+        self.assertEqual(4, suite_result.tests_per_minute)
+
+    def test_add_test_result_not_kept(self):
+        suite_result = SuiteResult()
+
+        suite_result.add_test_result(TestResult(Test()))
+        suite_result.add_test_result(TestResult(Test()), keep=False)
+        suite_result.elapsed_time = 60
+
+        self.assertEqual(1, len(suite_result.test_results))
+        self.assertEqual(2, suite_result.test_count)
+        self.assertEqual(2, suite_result.tests_per_minute)
+        self.assertIn("2 tests in 60.00 seconds", str(suite_result))
+
+    def test_tests_per_minute_no_time_elapsed(self):
+        self.assertEqual(0, SuiteResult().tests_per_minute)
+
+
+class TestSuiteRunner(TestCase):
+    """Has unit tests for the SuiteRunner class"""
+
+    def test_initializer_error(self):
+        self.assertRaises(ValueError, SuiteRunner, [])
+        self.assertRaises(ValueError, SuiteRunner, None)
+        self.assertRaises(ValueError, SuiteRunner, any_tests(1), 0)
+
+    def test_run_suite(self):
+        tests = any_tests(10)
+
+        suite_runner = SuiteRunnerTestable(tests, 3)
+
+        with patch.object(Step, 'run', return_value=StepResult(any_click())):
+            suite_result = suite_runner.run_suite()
+
+        self.assertEqual(set(tests), set(test_result.test for test_result in suite_result.test_results))
+        self.assertLessEqual(len(suite_runner.driver_pool_testable.started_drivers), 3)
+        self.assertGreater(suite_result.elapsed_time, 0)
+
+    def test_iter_results(self):
+        tests = any_tests(4)
+
+        suite_runner = SuiteRunnerTestable(tests, 2)
+
+        with patch.object(Step, 'run', return_value=StepResult(any_click())):
+            for i, test_result in enumerate(suite_runner.iter_results()):
+                self.assertIn(test_result.test, tests)
+                self.assertEqual(i + 1, len(suite_runner.suite_result.test_results))
+
+    def test_iter_results_closes_drivers(self):
+        suite_runner = SuiteRunnerTestable(any_tests(2), 2)
+
+        with patch.object(Step, 'run', return_value=StepResult(any_click())):
+            suite_runner.run_suite()
+
+        for driver in suite_runner.driver_pool_testable.started_drivers:
+            self.assertIsNone(driver.driver)
+
+    def test_run_suite_test_error(self):
+        tests = any_tests(5)
+        tests[2].steps = []
+
+        suite_runner = SuiteRunnerTestable(tests, 2)
+
+        with patch.object(Step, 'run', return_value=StepResult(any_click())):
+            suite_result = suite_runner.run_suite()
+
+        self.assertEqual(5, suite_result.test_count)
+
+        test_results = {test_result.test: test_result for test_result in suite_result.test_results}
+
+        self.assertIsInstance(test_results[tests[2]].exception, ValueError)
+        self.assertFalse(test_results[tests[2]].success)
+        self.assertTrue(all(test_results[test].success for test in tests if test is not tests[2]))
+
+    def test_run_suite_driver_error(self):
+        tests = any_tests(3)
+
+        suite_runner = SuiteRunnerTestable(tests, 1)
+
+        run_test = suite_runner._run_test
+
+        def run_test_or_fail(test, driver_pool):
+            if test is tests[0]:
+                raise WebDriverException('Chrome failed to start')
+
+            return run_test(test, driver_pool)
+
+        with patch.object(Step, 'run', return_value=StepResult(any_click())), \
+                patch.object(suite_runner, '_run_test', side_effect=run_test_or_fail):
+            suite_result = suite_runner.run_suite()
+
+        failed_result = next(test_result for test_result in suite_result.test_results if test_result.test is tests[0])
+
+        self.assertEqual(3, suite_result.test_count)
+        self.assertEqual('WebDriverException', failed_result.exception_name)
+        self.assertEqual([True], [step_result.skipped for step_result in failed_result.step_results])
+        self.assertIn('Error: WebDriverException', str(failed_result))
@@ -0,0 +1,283 @@
+import json
+import os
+import shutil
+import tempfile
+from functools import partial
+from unittest import TestCase
+from unittest import skipUnless
+
+from mock import patch
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from pyselenium.test_files import STEP_TYPES
+from pyselenium.test_files import TestFileError
+from pyselenium.test_files import get_shard_index
+from pyselenium.test_files import load_test_file
+from pyselenium.test_files import parse_test_definitions
+from pyselenium.test_files import save_test_file
+from pyselenium.suite_runner import SuiteRunner
+from pyselenium.test_metadata import Test
+from pyselenium.test_steps import AssertElementValue
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import FAST_TYPING_MODE
+from pyselenium.test_steps import Navigate
+from pyselenium.test_steps import SendEnter
+from pyselenium.test_steps import Step
+from pyselenium.test_steps import TypeText
+from tests.test_data import ANY_CSS_PATH
+from tests.test_data import ANY_HINT
+from tests.test_data import ANY_URL
+from tests.testables import SimulatedDriverTestable
+
+PAGE_URL = 'http://any.url/page'
+
+PAGE = '<html><body><h1 id="title">Any title</h1><input id="search"></body></html>'
+
+DOCUMENT = {'tests': [{'id': 'search',
+                       'timeout': 30,
+                       'steps': [{'step': 'Navigate', 'url': PAGE_URL},
+                                 {'step': 'TypeText', 'css_path': '#search', 'hint': 'Search', 'text': 'any text',
+                                  'mode': FAST_TYPING_MODE},
+                                 {'step': 'SendEnter'},
+                                 {'step': 'AssertElementValue', 'css_path': '#title', 'hint': 'Title',
+                                  'expected_value': 'Any title'}]},
+                      {'id': 'click',
+                       'steps': [{'step': 'Navigate', 'url': PAGE_URL},
+                                 {'step': 'Click', 'css_path': '#title', 'hint': 'Title', 'timeout': 1}]}]}
+
+YAML_DOCUMENT = '''
+tests:
+  - id: search
+    timeout: 30
+    steps:
+      - step: Navigate
+        url: http://any.url/page
+      - step: SendEnter
+'''
+
+
+class TestTestFiles(TestCase):
+    """Has unit tests for loading, validating, compiling and sharding test files"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        # Every test starts with none of the files loaded, as a new process would
+        loaded_definitions_patch = patch('pyselenium.test_files._loaded_definitions', {})
+        loaded_definitions_patch.start()
+        self.addCleanup(loaded_definitions_patch.stop)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory, name)
+
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content if isinstance(content, str) else json.dumps(content))
+
+        return path
+
+    def test_step_types_are_the_steps(self):
+        self.assertEqual(12, len(STEP_TYPES))
+        self.assertIs(Click, STEP_TYPES['Click'])
+
+        for step_type in STEP_TYPES.values():
+            self.assertTrue(issubclass(step_type, Step))
+
+    def test_load_test_file(self):
+        test_file = load_test_file(self.write_file('tests.json', DOCUMENT))
+
+        self.assertEqual(2, len(test_file))
+        self.assertEqual(['search', 'click'], [test.test_id for test in test_file])
+
+        test = test_file[0]
+
+        self.assertIsInstance(test, Test)
+        self.assertEqual(30, test.timeout)
+        self.assertEqual([Navigate, TypeText, SendEnter, AssertElementValue], [type(step) for step in test.steps])
+        self.assertEqual(FAST_TYPING_MODE, test.steps[1].mode)
+        self.assertEqual('Any title', test.steps[3].expected_value)
+        self.assertIsNone(test_file[1].timeout)
+        self.assertEqual(1, test_file[1].steps[1].timeout)
+
+    @skipUnless(yaml, 'PyYAML is not installed')
+    def test_load_yaml_test_file(self):
+        test_file = load_test_file(self.write_file('tests.yaml', YAML_DOCUMENT))
+
+        self.assertEqual(['search'], [test.test_id for test in test_file])
+        self.assertEqual([Navigate, SendEnter], [type(step) for step in test_file[0].steps])
+        self.assertEqual(PAGE_URL, test_file[0].steps[0].url)
+
+    def test_tests_are_compiled_lazily_and_once(self):
+        test_file = load_test_file(self.write_file('tests.json', DOCUMENT))
+
+        with patch('pyselenium.test_files.Test', wraps=Test) as test_mock:
+            self.assertEqual(0, test_mock.call_count)
+
+            first_test = test_file[1]
+
+            self.assertEqual(1, test_mock.call_count)
+            self.assertIs(first_test, test_file[1])
+            self.assertEqual(1, test_mock.call_count)
+
+    def test_same_content_is_parsed_once(self):
+        path = self.write_file('tests.json', DOCUMENT)
+        other_path = self.write_file('other.json', DOCUMENT)
+
+        first_test_file = load_test_file(path)
+
+        with patch('pyselenium.test_files.parse_test_definitions') as parse_mock:
+            second_test_file = load_test_file(other_path)
+
+        parse_mock.assert_not_called()
+        self.assertEqual(other_path, second_test_file.path)
+        self.assertEqual(first_test_file.content_hash, second_test_file.content_hash)
+        self.assertIs(first_test_file[0], second_test_file[0])
+
+    @skipUnless(yaml, 'PyYAML is not installed')
+    def test_cache_directory(self):
+        cache_directory = os.path.join(self.directory, 'cache')
+        path = self.write_file('tests.yaml', YAML_DOCUMENT)
+
+        load_test_file(path, cache_directory)
+
+        self.assertEqual(1, len(os.listdir(cache_directory)))
+
+        # A new process has none of the files loaded before
+        with patch('pyselenium.test_files._loaded_definitions', {}), \
+                patch('pyselenium.test_files.parse_test_definitions') as parse_mock:
+            test_file = load_test_file(path, cache_directory)
+
+        parse_mock.assert_not_called()
+        self.assertEqual(['search'], [test.test_id for test in test_file])
+        self.assertEqual([Navigate, SendEnter], [type(step) for step in test_file[0].steps])
+        self.assertEqual(30, test_file[0].timeout)
+
+    def test_cache_directory_ignores_broken_files(self):
+        cache_directory = os.path.join(self.directory, 'cache')
+        path = self.write_file('tests.json', dict(DOCUMENT, tests=DOCUMENT['tests'][:1]))
+
+        load_test_file(path, cache_directory)
+
+        for content in ['{"broken', '[{"id": "search"}]', '{"tests": []}', '[1]']:
+            for name in os.listdir(cache_directory):
+                with open(os.path.join(cache_directory, name), 'w') as file:
+                    file.write(content)
+
+            with patch('pyselenium.test_files._loaded_definitions', {}):
+                test_file = load_test_file(path, cache_directory)
+
+            self.assertEqual(['search'], [test.test_id for test in test_file])
+
+    def test_get_shard(self):
+        tests = [{'id': 'test %d' % i, 'steps': [{'step': 'Navigate', 'url': ANY_URL}]} for i in range(100)]
+        test_file = load_test_file(self.write_file('tests.json', {'tests': tests}))
+
+        with patch('pyselenium.test_files.Test', wraps=Test) as test_mock:
+            shards = [test_file.get_shard(shard_index, 3) for shard_index in range(3)]
+
+        test_mock.assert_not_called()
+        self.assertEqual(100, sum(len(shard) for shard in shards))
+        self.assertEqual(sorted(test['id'] for test in tests),
+                         sorted(test.test_id for shard in shards for test in shard))
+
+        for shard_index, shard in enumerate(shards):
+            self.assertGreater(len(shard), 10)
+
+            for definition in shard.definitions:
+                self.assertEqual(shard_index, get_shard_index(definition.test_id, 3))
+
+    def test_get_shard_error(self):
+        test_file = load_test_file(self.write_file('tests.json', DOCUMENT))
+
+        self.assertRaises(ValueError, test_file.get_shard, 0, 0)
+        self.assertRaises(ValueError, test_file.get_shard, 2, 2)
+        self.assertRaises(ValueError, test_file.get_shard, -1, 2)
+
+    def test_test_file_runs_in_suite(self):
+        test_file = load_test_file(self.write_file('tests.json', DOCUMENT))
+
+        suite_runner = SuiteRunner(test_file, workers=2,
+                                   driver_factory=partial(SimulatedDriverTestable, {PAGE_URL: PAGE}))
+        suite_result = suite_runner.run_suite()
+
+        self.assertEqual(2, suite_result.test_count)
+        self.assertTrue(all(step_result.success for test_result in suite_result.test_results
+                            for step_result in test_result.step_results))
+
+    def test_save_test_file(self):
+        test = Test('saved', timeout=10)
+        test.add_step(Navigate(ANY_URL))
+        test.add_step(Click(ANY_CSS_PATH, ANY_HINT, timeout=2))
+        test.add_step(AssertElementValue(ANY_CSS_PATH, ANY_HINT, 'any value'))
+        path = os.path.join(self.directory, 'saved.json')
+
+        save_test_file(path, [test])
+        loaded_test = load_test_file(path)[0]
+
+        self.assertEqual('saved', loaded_test.test_id)
+        self.assertEqual(10, loaded_test.timeout)
+        self.assertEqual([vars(step) for step in test.steps], [vars(step) for step in loaded_test.steps])
+
+    def test_save_test_file_error(self):
+        test = Test('saved')
+        test.add_step(Step())
+
+        self.assertRaises(ValueError, save_test_file, os.path.join(self.directory, 'saved.json'), [test])
+
+    def test_load_test_file_errors(self):
+        self.assertRaises(TestFileError, load_test_file, self.write_file('tests.json', '{"tests": ['))
+        self.assertRaises(TestFileError, load_test_file, self.write_file('tests.yaml', 'tests: [{'))
+
+
+class TestParseTestDefinitions(TestCase):
+    """Has unit tests for the validation of test files"""
+
+    def assert_error(self, document, location, message):
+        with self.assertRaises(TestFileError) as context:
+            parse_test_definitions(document, 'tests.json')
+
+        self.assertEqual('tests.json', context.exception.path)
+        self.assertEqual(location, context.exception.location)
+        self.assertIn(message, context.exception.message)
+
+    def test_parse_test_definitions(self):
+        definitions = parse_test_definitions(DOCUMENT)
+
+        self.assertEqual(['search', 'click'], [definition.test_id for definition in definitions])
+        self.assertEqual(['Navigate', {'url': PAGE_URL}], definitions[0].steps[0])
+        self.assertEqual(DOCUMENT['tests'], [definition.to_dict() for definition in definitions])
+
+    def test_document_errors(self):
+        self.assert_error([], None, 'list of tests')
+        self.assert_error({'tests': {}}, None, 'list of tests')
+        self.assert_error({'tests': [], 'suite': 'any'}, None, 'Unknown keys suite')
+
+    def test_test_errors(self):
+        self.assert_error({'tests': ['search']}, 'tests[0]', 'must be objects')
+        self.assert_error({'tests': [{'steps': []}]}, 'tests[0]', 'must have an id')
+        self.assert_error({'tests': [{'id': 'any'}]}, 'tests[0]', 'list of steps')
+        self.assert_error({'tests': [{'id': 'any', 'timeout': -1, 'steps': []}]}, 'tests[0]', 'timeout')
+        self.assert_error({'tests': [{'id': 'any', 'timeout': True, 'steps': []}]}, 'tests[0]', 'timeout')
+        self.assert_error({'tests': [{'id': 'any', 'steps': [], 'name': 'any'}]}, 'tests[0]', 'Unknown keys name')
+        self.assert_error({'tests': [{'id': 'any', 'steps': []}]}, 'tests[0]', 'at least one step')
+        self.assert_error({'tests': [{'id': 'any', 'steps': [{'step': 'SendEnter'}]},
+                                     {'id': 'any', 'steps': [{'step': 'SendEnter'}]}]}, 'tests[1]',
+                          "The id 'any' is taken")
+
+    def test_step_errors(self):
+        def get_document(step):
+            return {'tests': [{'id': 'any', 'steps': [{'step': 'SendEnter'}, step]}]}
+
+        self.assert_error(get_document('SendEnter'), 'tests[0].steps[1]', 'must be objects')
+        self.assert_error(get_document({'step': 'Scroll'}), 'tests[0].steps[1]', "Unknown step 'Scroll'")
+        self.assert_error(get_document({'step': ['Click']}), 'tests[0].steps[1]', 'Unknown step')
+        self.assert_error(get_document({'step': 'Click', 'css_path': ANY_CSS_PATH}), 'tests[0].steps[1]',
+                          'Click is missing hint')
+        self.assert_error(get_document({'step': 'Navigate', 'url': ANY_URL, 'hint': ANY_HINT}), 'tests[0].steps[1]',
+                          'Navigate takes no hint')
+        self.assert_error(get_document({'step': 'Navigate', 'url': [ANY_URL]}), 'tests[0].steps[1]',
+                          'The url of Navigate must be')
@@ -1,5 +1,6 @@
 from unittest import TestCase
 
+from pyselenium.test_metadata import ElementReader
 from pyselenium.test_metadata import Test
 from tests.test_data import any_click
 
@@ -21,3 +22,19 @@ class TestTest(TestCase):
         test = Test(test_id)
 
         self.assertEqual(test_id, test.test_id)
+
+    def test_init_timeout(self):
+        self.assertIsNone(Test().timeout)
+        self.assertEqual(30, Test(timeout=30).timeout)
+
+
+class TestElementFinder(TestCase):
+    """Has unit tests for the ElementFinder class"""
+
+    def test_init_interns_strings(self):
+        first_step = ElementReader(''.join(['#any', '-path']), ''.join(['any', ' hint']), ''.join(['any', '-name']))
+        second_step = ElementReader('#any-path', 'any hint', 'any-name')
+
+        self.assertIs(first_step.css_path, second_step.css_path)
+        self.assertIs(first_step.hint, second_step.hint)
+        self.assertIs(first_step.attribute_name, second_step.attribute_name)
@@ -1,15 +1,35 @@
+import gc
+import time
+import tracemalloc
+from functools import partial
 from unittest import TestCase
 
+from mock import ANY
+from mock import call
 from mock import patch
+from pyselenium._selenium_wrapper import DriverMetrics
+from pyselenium._selenium_wrapper import ElementNotFoundError
 from pyselenium.test_metadata import Test
+from pyselenium.test_steps import AssertElementValue
+from pyselenium.test_steps import Click
+from pyselenium.test_steps import DeadlineExceededError
+from pyselenium.test_steps import ExceptionSummary
+from pyselenium.test_steps import ElementValueIncorrectError
+from pyselenium.test_steps import Navigate
 from pyselenium.test_steps import Step
 from pyselenium.test_steps import StepResult
 
 from pyselenium.test_runner import TestResult
 from pyselenium.test_runner import TestRunner
+from tests.test_data import ANY_CSS_PATH
+from tests.test_data import ANY_HINT
+from tests.test_data import ANY_VALUE
+from tests.test_data import any_assert_attribute
 from tests.test_data import any_click
 from tests.test_data import any_navigate
+from tests.testables import DriverPoolTestable
 from tests.testables import DriverTestable
+from tests.testables import SimulatedDriverTestable
 from tests.testables import TestRunnerTestable
 
 
@@ -25,6 +45,52 @@ class TestTestResult(TestCase):
 
         self.assertEqual(3, len(test_result.step_results))
 
+    def test_aggregates(self):
+        test_result = TestResult(Test())
+
+        for i in range(2):
+            step_result = StepResult(any_click())
+            step_result.record_timing(0.0, 2.0, DriverMetrics(command_count=3, wait_poll_count=1, wait_time=0.5))
+            test_result.add_step_result(step_result)
+
+        self.assertEqual(4.0, test_result.duration)
+        self.assertEqual(1.0, test_result.wait_time)
+        self.assertEqual(6, test_result.command_count)
+        self.assertEqual(2, test_result.wait_poll_count)
+        self.assertIn("Total: 4.000s, 1.000s waiting, 6 commands, 2 polls", str(test_result))
+
+    def test_command_latencies(self):
+        test_result = TestResult(Test('any test'))
+
+        for command in ['findElement', 'findElement', 'clickElement']:
+            metrics = DriverMetrics(command_count=1)
+            metrics.command_latencies.record(command, 0.01)
+
+            step_result = StepResult(any_click())
+            step_result.record_timing(0.0, 1.0, metrics)
+            test_result.add_step_result(step_result)
+
+        skipped_step_result = StepResult(any_click())
+        skipped_step_result.skip()
+        test_result.add_step_result(skipped_step_result)
+
+        self.assertEqual(2, test_result.command_latencies.get_count('findElement'))
+        self.assertEqual(1, test_result.command_latencies.get_count('clickElement'))
+        self.assertTrue(test_result.format_command_latencies().startswith('[any test] command latencies\nCommand'))
+        self.assertIn('findElement', test_result.format_command_latencies())
+
+    def test_slots(self):
+        self.assertRaises(AttributeError, setattr, TestResult(Test()), 'any_attribute', ANY_VALUE)
+
+    def test_str_skipped_step(self):
+        test_result = TestResult(Test())
+
+        step_result = StepResult(any_click())
+        step_result.skip()
+        test_result.add_step_result(step_result)
+
+        self.assertIn("- [Click] - Skipped", str(test_result))
+
 
 class TestTestRunner(TestCase):
     """"Has unit tests for the TestRunner class"""
@@ -52,3 +118,247 @@ class TestTestRunner(TestCase):
             test_result = test_runner_testable.run_test()
 
             self.assertEqual(len(test.steps), len(test_result.step_results))
+
+    def test_run_test_with_driver_pool(self):
+        test = Test()
+        test.add_step(any_click())
+
+        driver_pool = DriverPoolTestable()
+
+        with patch.object(Step, 'run', return_value=StepResult(any_click())):
+            TestRunner(test, driver_pool).run_test()
+            TestRunner(test, driver_pool).run_test()
+
+        self.assertEqual(1, len(driver_pool.started_drivers))
+
+    def test_run_test_batch_assertions(self):
+        test = Test()
+        test.add_step(any_navigate())
+        test.add_step(any_assert_attribute())
+        test.add_step(AssertElementValue(ANY_CSS_PATH, ANY_HINT, ANY_VALUE))
+        test.add_step(AssertElementValue('#missing', ANY_HINT, ANY_VALUE))
+
+        test_runner_testable = TestRunnerTestable(test)
+        test_runner_testable.batch_assertions = True
+        driver_testable = test_runner_testable.driver_testable
+
+        read_values = [(True, ANY_VALUE), (True, 'another value'), (False, None)]
+
+        with patch.object(driver_testable, 'read_elements', return_value=read_values) as read_elements_mock, \
+                patch.object(driver_testable, 'get_element_value', return_value=ANY_VALUE) as get_value_mock:
+            test_result = test_runner_testable.run_test()
+
+            self.assertEqual(1, read_elements_mock.call_count)
+            get_value_mock.assert_called_once_with('#missing', ANY_HINT)
+
+        successes = [step_result.success for step_result in test_result.step_results]
+
+        self.assertEqual([True, True, False, True], successes)
+        self.assertIsInstance(test_result.step_results[2].exception, ElementValueIncorrectError)
+
+    def test_run_test_batch_assertions_read_again_after_waiting(self):
+        test = Test()
+        test.add_step(AssertElementValue('#missing', ANY_HINT, ANY_VALUE))
+        test.add_step(AssertElementValue('#first', ANY_HINT, ANY_VALUE))
+        test.add_step(AssertElementValue('#second', ANY_HINT, ANY_VALUE))
+
+        test_runner_testable = TestRunnerTestable(test)
+        test_runner_testable.batch_assertions = True
+        driver_testable = test_runner_testable.driver_testable
+
+        # The page shows the right values only once the missing element shows up
+        read_values = [[(False, None), (True, 'old value'), (True, 'old value')],
+                       [(True, ANY_VALUE), (True, ANY_VALUE)]]
+
+        with patch.object(driver_testable, 'read_elements', side_effect=read_values) as read_elements_mock, \
+                patch.object(driver_testable, 'get_element_value', return_value=ANY_VALUE) as get_value_mock:
+            test_result = test_runner_testable.run_test()
+
+            read_elements_mock.assert_called_with([('#first', None), ('#second', None)])
+            get_value_mock.assert_called_once_with('#missing', ANY_HINT)
+
+        self.assertTrue(all(step_result.success for step_result in test_result.step_results))
+
+    def test_run_test_batch_assertions_fallback(self):
+        test = Test()
+        test.add_step(any_assert_attribute())
+        test.add_step(any_assert_attribute())
+
+        test_runner_testable = TestRunnerTestable(test)
+        test_runner_testable.batch_assertions = True
+        driver_testable = test_runner_testable.driver_testable
+
+        with patch.object(driver_testable, 'read_elements', side_effect=Exception()), \
+                patch.object(driver_testable, 'get_element_attribute', return_value=ANY_VALUE) as get_attribute_mock:
+            test_result = test_runner_testable.run_test()
+
+            self.assertEqual(2, get_attribute_mock.call_count)
+            self.assertTrue(all(step_result.success for step_result in test_result.step_results))
+
+    def test_run_test_deadline_exceeded(self):
+        test = Test(timeout=0)
+        test.add_step(any_click())
+        test.add_step(any_navigate())
+
+        with patch.object(Step, 'run') as run_mock:
+            test_result = TestRunnerTestable(test).run_test()
+
+            self.assertFalse(run_mock.called)
+
+        for step_result, step in zip(test_result.step_results, test.steps):
+            self.assertEqual(step, step_result.step)
+            self.assertIsInstance(step_result.exception, DeadlineExceededError)
+            self.assertEqual(0, step_result.exception.timeout)
+
+    def test_run_test_deadline_cuts_wait_short(self):
+        def run(step):
+            def wait(driver):
+                time.sleep(0.1)
+
+                step_result = StepResult(step)
+                step_result.exception = ElementNotFoundError(step.css_path, step.hint, None)
+
+                return step_result
+
+            return wait
+
+        for step_timeout, exception_type in [(None, DeadlineExceededError), (0.01, ElementNotFoundError)]:
+            test = Test(timeout=0.05)
+            test.add_step(Click(ANY_CSS_PATH, ANY_HINT, timeout=step_timeout))
+            test.add_step(any_navigate())
+
+            with patch.object(Click, 'run', side_effect=run(test.steps[0])):
+                test_result = TestRunnerTestable(test).run_test()
+
+            # The step timed out on its own if its timeout ended before the deadline, even if it ended after it
+            self.assertIsInstance(test_result.step_results[0].exception, exception_type)
+            self.assertIsInstance(test_result.step_results[1].exception, DeadlineExceededError)
+
+    def test_run_test_timeout_budget(self):
+        test = Test(timeout=60)
+        test.add_step(Click(ANY_CSS_PATH, ANY_HINT, timeout=3))
+        test.add_step(any_navigate())
+
+        test_runner_testable = TestRunnerTestable(test)
+
+        with patch.object(Step, 'run', return_value=StepResult(any_click())), \
+                patch.object(test_runner_testable.driver_testable, 'set_timeout_budget') as budget_mock:
+            test_runner_testable.run_test()
+
+            budget_mock.assert_has_calls([call(3, ANY), call(None, ANY), call()])
+
+    def test_run_test_fail_fast(self):
+        test = Test()
+        test.add_step(any_click())
+        test.add_step(any_navigate())
+        test.add_step(any_click())
+
+        test_runner_testable = TestRunnerTestable(test)
+        test_runner_testable.fail_fast = True
+        driver_testable = test_runner_testable.driver_testable
+
+        with patch.object(driver_testable, 'click', side_effect=Exception()) as click_mock, \
+                patch.object(driver_testable, 'navigate') as navigate_mock:
+            test_result = test_runner_testable.run_test()
+
+            self.assertEqual(1, click_mock.call_count)
+            self.assertFalse(navigate_mock.called)
+
+        self.assertFalse(test_result.step_results[0].skipped)
+        self.assertIsNotNone(test_result.step_results[0].exception)
+        self.assertTrue(test_result.step_results[1].skipped)
+        self.assertTrue(test_result.step_results[2].skipped)
+
+    def test_run_test_without_fail_fast(self):
+        test = Test()
+        test.add_step(any_click())
+        test.add_step(any_navigate())
+
+        test_runner_testable = TestRunnerTestable(test)
+        driver_testable = test_runner_testable.driver_testable
+
+        with patch.object(driver_testable, 'click', side_effect=Exception()), \
+                patch.object(driver_testable, 'navigate') as navigate_mock:
+            test_result = test_runner_testable.run_test()
+
+            self.assertTrue(navigate_mock.called)
+            self.assertTrue(test_result.step_results[1].success)
+
+    def test_iter_test(self):
+        test = Test()
+        test.add_step(any_click())
+        test.add_step(any_navigate())
+
+        test_runner_testable = TestRunnerTestable(test)
+        driver_testable = test_runner_testable.driver_testable
+
+        with patch.object(driver_testable, 'navigate') as navigate_mock:
+            step_results = test_runner_testable.iter_test()
+
+            self.assertEqual(test.steps[0], next(step_results).step)
+            self.assertFalse(navigate_mock.called)
+
+            self.assertEqual(test.steps[1], next(step_results).step)
+            self.assertTrue(navigate_mock.called)
+
+            self.assertRaises(StopIteration, next, step_results)
+
+    def test_iter_test_exception(self):
+        self.assertRaises(ValueError, next, TestRunner(Test()).iter_test())
+
+    def test_run_test_records_timing(self):
+        test = Test()
+        test.add_step(any_navigate())
+
+        test_runner_testable = TestRunnerTestable(test)
+        driver_testable = test_runner_testable.driver_testable
+
+        def navigate(url):
+            driver_testable.driver.execute('get', {'url': url})
+
+        with patch.object(driver_testable, 'navigate', side_effect=navigate):
+            test_result = test_runner_testable.run_test()
+
+        step_result = test_result.step_results[0]
+
+        self.assertIsNotNone(step_result.started_at)
+        self.assertGreaterEqual(step_result.finished_at, step_result.started_at)
+        self.assertEqual(1, step_result.command_count)
+
+    def test_launch_profile(self):
+        test_runner = TestRunner(Test(), launch_profile='headless-fast')
+
+        self.assertEqual('headless-fast', test_runner._get_web_driver().launch_profile.name)
+        self.assertEqual('default', TestRunner(Test())._get_web_driver().launch_profile.name)
+
+    def test_run_test_compact_results(self):
+        def get_retained_memory(compact_results):
+            test = Test('any test')
+            test.add_step(Navigate('http://any.url/page'))
+
+            for i in range(1000):
+                test.add_step(Click('#missing', ANY_HINT))
+
+            test_runner = TestRunner(test, driver_factory=partial(SimulatedDriverTestable, {'http://any.url/page': ''}),
+                                     compact_results=compact_results)
+
+            gc.collect()
+            tracemalloc.start()
+
+            try:
+                test_result = test_runner.run_test()
+                gc.collect()
+
+                return test_result, tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+
+        test_result, memory = get_retained_memory(False)
+        compact_test_result, compact_memory = get_retained_memory(True)
+
+        self.assertIsInstance(compact_test_result.step_results[1].exception, ExceptionSummary)
+        self.assertEqual(str(test_result.step_results[1].exception), str(compact_test_result.step_results[1].exception))
+        self.assertIn('- [Click] - ElementNotFoundError - ', str(compact_test_result))
+        self.assertEqual(1000, compact_test_result.command_latencies.get_count('findElement'))
+        self.assertLess(compact_memory, memory / 4)
+        self.assertLess(compact_memory, 1000 * 600)
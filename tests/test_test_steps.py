@@ -1,10 +1,20 @@
+import base64
+import gc
+import os
+import tempfile
+import weakref
 from unittest import TestCase
 
 from mock import patch
 
+from selenium.common.exceptions import NoSuchElementException
+
+from pyselenium._selenium_wrapper import DriverMetrics
+from pyselenium._selenium_wrapper import ElementNotFoundError
 from pyselenium.test_steps import *
 from tests.test_data import *
 from tests.testables import DriverTestable
+from tests.testables import run_coroutine
 
 
 class TestStepResult(TestCase):
@@ -28,6 +38,112 @@ class TestStepResult(TestCase):
         self.assertEqual(step_result.exception, exception)
         self.assertFalse(step_result.success)
 
+    def test_skip(self):
+        step_result = StepResult(any_click())
+        step_result.skip()
+
+        self.assertTrue(step_result.skipped)
+        self.assertFalse(step_result.success)
+        self.assertIsNone(step_result.exception)
+
+    def test_record_timing(self):
+        step_result = StepResult(any_click())
+
+        step_result.record_timing(10.0, 12.5, DriverMetrics(command_count=3, wait_poll_count=2, wait_time=1.5))
+
+        self.assertEqual(10.0, step_result.started_at)
+        self.assertEqual(12.5, step_result.finished_at)
+        self.assertEqual(2.5, step_result.duration)
+        self.assertEqual(1.5, step_result.wait_time)
+        self.assertEqual(1.0, step_result.action_time)
+        self.assertEqual(3, step_result.command_count)
+        self.assertEqual(2, step_result.wait_poll_count)
+
+    def test_duration_not_run(self):
+        step_result = StepResult(any_click())
+
+        self.assertEqual(0, step_result.duration)
+        self.assertEqual(0, step_result.action_time)
+
+    def test_slots(self):
+        self.assertRaises(AttributeError, setattr, StepResult(any_click()), 'any_attribute', ANY_VALUE)
+
+    def test_compact(self):
+        class Screenshot:
+            pass
+
+        screenshot = Screenshot()
+
+        def click():
+            inner_exception = NoSuchElementException('no such element', screenshot, ['at browser.js:1'])
+            raise ElementNotFoundError(ANY_CSS_PATH, ANY_HINT, inner_exception)
+
+        step_result = StepResult(any_click())
+        step_result.record_timing(10.0, 11.0, DriverMetrics(command_count=1))
+
+        try:
+            click()
+        except ElementNotFoundError as exception:
+            step_result.exception = exception
+
+        message = str(step_result.exception)
+        screenshot = weakref.ref(screenshot)
+
+        step_result.compact()
+        gc.collect()
+
+        self.assertIsInstance(step_result.exception, ExceptionSummary)
+        self.assertEqual('ElementNotFoundError', step_result.exception_name)
+        self.assertEqual(message, str(step_result.exception))
+        self.assertRegex(step_result.exception.location, r'test_test_steps\.py:\d+ in click$')
+        self.assertIsNone(step_result.exception.read_payload())
+        self.assertIsNone(step_result.command_latencies)
+        self.assertFalse(step_result.success)
+        # Nothing holds on to the exception and its inner exception any longer
+        self.assertIsNone(screenshot())
+
+    def test_compact_no_exception(self):
+        step_result = StepResult(any_click())
+        step_result.compact()
+
+        self.assertIsNone(step_result.exception)
+        self.assertIsNone(step_result.exception_name)
+        self.assertTrue(step_result.success)
+
+
+class TestSummarizeException(TestCase):
+    """Has unit tests for the summarize_exception function"""
+
+    def test_message_from_attributes(self):
+        summary = summarize_exception(ElementValueIncorrectError(ANY_CSS_PATH, ANY_HINT, ANY_OTHER_VALUE, ANY_VALUE))
+
+        self.assertEqual('ElementValueIncorrectError', summary.type_name)
+        self.assertEqual('css_path=%r, hint=%r, actual_value=%r, expected_value=%r' % (
+            ANY_CSS_PATH, ANY_HINT, ANY_OTHER_VALUE, ANY_VALUE), summary.message)
+        self.assertIsNone(summary.location)
+
+    def test_payload(self):
+        inner_exception = NoSuchElementException('no such element', base64.b64encode(b'any image').decode(),
+                                                 ['at browser.js:1'])
+
+        try:
+            raise ElementNotFoundError(ANY_CSS_PATH, ANY_HINT, inner_exception)
+        except ElementNotFoundError as exception:
+            with tempfile.TemporaryDirectory() as directory:
+                summary = summarize_exception(exception, directory)
+                payload = summary.read_payload()
+
+                self.assertEqual(directory, os.path.dirname(summary.payload_path))
+                self.assertTrue(os.path.basename(summary.payload_path).startswith('ElementNotFoundError-'))
+
+                with open(summary.payload_path[:-len('.txt')] + '.png', 'rb') as file:
+                    self.assertEqual(b'any image', file.read())
+
+        self.assertIn('raise ElementNotFoundError(ANY_CSS_PATH, ANY_HINT, inner_exception)', payload)
+        self.assertIn('Inner exception:', payload)
+        self.assertIn('at browser.js:1', payload)
+        self.assertIn('Screenshot: ', payload)
+
 
 class TestElementAttributeValueIncorrectError(TestCase):
     """Has unit tests for the ElementAttributeValueIncorrectError class"""
@@ -43,6 +159,15 @@ class TestElementAttributeValueIncorrectError(TestCase):
         self.assertEqual(exception.expected_value, ANY_VALUE)
 
 
+class TestDeadlineExceededError(TestCase):
+    """Has unit tests for the DeadlineExceededError class"""
+
+    def test_initializer(self):
+        exception = DeadlineExceededError(ANY_WAIT_TIME)
+
+        self.assertEqual(exception.timeout, ANY_WAIT_TIME)
+
+
 class TestClick(TestCase):
     """"Has unit tests for the Click class"""
 
@@ -52,6 +177,12 @@ class TestClick(TestCase):
         self.assertEqual(ANY_CSS_PATH, click.css_path)
         self.assertEqual(ANY_HINT, click.hint)
 
+    def test_initializer_timeout(self):
+        click = Click(ANY_CSS_PATH, ANY_HINT, timeout=ANY_WAIT_TIME)
+
+        self.assertEqual(ANY_WAIT_TIME, click.timeout)
+        self.assertIsNone(any_click().timeout)
+
     def test_run_click_exception(self):
         driver_testable = DriverTestable()
 
@@ -225,6 +356,32 @@ class TestAssertElementAttributeValue(TestCase):
             self.assertEqual(step_result.step, assert_attribute)
             self.assertEqual(step_result.exception, exception)
 
+    def test_check_value(self):
+        assert_attribute = any_assert_attribute()
+
+        step_result = assert_attribute.check_value(assert_attribute.expected_value)
+
+        self.assertTrue(step_result.success)
+        self.assertEqual(step_result.step, assert_attribute)
+
+    def test_check_value_different_value(self):
+        assert_attribute = any_assert_attribute()
+
+        step_result = assert_attribute.check_value(ANY_OTHER_VALUE)
+
+        self.assertIsInstance(step_result.exception, ElementAttributeValueIncorrectError)
+        self.assertEqual(step_result.exception.actual_value, ANY_OTHER_VALUE)
+
+    def test_check_value_missing_attribute(self):
+        assert_attribute = any_assert_attribute()
+
+        for missing_value in [None, '']:
+            step_result = assert_attribute.check_value(missing_value)
+
+            self.assertIsInstance(step_result.exception, NoSuchAttributeError)
+            self.assertEqual(step_result.exception.attribute_name, assert_attribute.attribute_name)
+            self.assertIsNone(step_result.exception.inner_exception)
+
 
 class TestAssertElementValue(TestCase):
     """Has unit tests for the AssertElementValue class"""
@@ -285,6 +442,25 @@ class TestAssertElementValue(TestCase):
             self.assertEqual(step_result.exception, exception)
 
 
+class TestAssertElementValueCheckValue(TestCase):
+    """Has unit tests for checking values read in batch by the AssertElementValue class"""
+
+    def test_check_value(self):
+        assert_element = AssertElementValue(ANY_CSS_PATH, ANY_HINT, ANY_VALUE)
+
+        self.assertTrue(assert_element.check_value(ANY_VALUE).success)
+        self.assertIsNone(assert_element.attribute_name)
+
+    def test_check_value_different_value(self):
+        assert_element = AssertElementValue(ANY_CSS_PATH, ANY_HINT, ANY_VALUE)
+
+        step_result = assert_element.check_value(ANY_OTHER_VALUE)
+
+        self.assertIsInstance(step_result.exception, ElementValueIncorrectError)
+        self.assertEqual(step_result.exception.actual_value, ANY_OTHER_VALUE)
+        self.assertEqual(step_result.exception.expected_value, ANY_VALUE)
+
+
 class TestAssertElementNotPresent(TestCase):
     """Has unit tests for the AssertElementNotPresent class"""
 
@@ -386,6 +562,26 @@ class TestTypeText(TestCase):
             self.assertEqual(step_result.exception, exception)
             self.assertFalse(step_result.success)
 
+    def test_run_type_text_fast(self):
+        driver_testable = DriverTestable()
+
+        type_text = TypeText(ANY_CSS_PATH, ANY_HINT, ANY_TEXT, mode=FAST_TYPING_MODE)
+
+        with patch.object(driver_testable, 'set_text') as set_text_mock, \
+                patch.object(driver_testable, 'send_text') as send_text_mock:
+            step_result = type_text.run(driver_testable)
+
+            set_text_mock.assert_called_with(type_text.css_path, type_text.hint, type_text.text)
+            self.assertFalse(send_text_mock.called)
+            self.assertTrue(step_result.success)
+
+    def test_run_type_text_invalid_mode(self):
+        type_text = TypeText(ANY_CSS_PATH, ANY_HINT, ANY_TEXT, mode='any mode')
+
+        step_result = type_text.run(DriverTestable())
+
+        self.assertIsInstance(step_result.exception, ValueError)
+
 
 class TestSendEnter(TestCase):
     """Has unit tests for the SendEnter class"""
@@ -579,3 +775,51 @@ class TestSwitchToDefaultContent(TestCase):
             self.assertFalse(step_result.success)
             self.assertEqual(step_result.step, switch_default)
             self.assertEqual(step_result.exception, exception)
+
+
+class AsyncDriverStub:
+    """A stub of AsyncDriver whose coroutines return the given values or raise the given exceptions"""
+
+    def __init__(self, **results):
+        self.results = results
+
+    def __getattr__(self, name):
+        async def call_driver(*args):
+            result = self.results[name]
+
+            if isinstance(result, Exception):
+                raise result
+
+            return result
+
+        return call_driver
+
+
+class TestDriverCallStep(TestCase):
+    """Has unit tests for running the steps on an AsyncDriver"""
+
+    def test_run_async(self):
+        step_result = run_coroutine(any_click().run_async(AsyncDriverStub(click=None)))
+
+        self.assertTrue(step_result.success)
+
+    def test_run_async_with_exception(self):
+        exception = Exception()
+
+        step_result = run_coroutine(any_click().run_async(AsyncDriverStub(click=exception)))
+
+        self.assertEqual(exception, step_result.exception)
+
+    def test_run_async_checks_value(self):
+        assert_value = AssertElementValue(ANY_CSS_PATH, ANY_HINT, ANY_VALUE)
+
+        step_result = run_coroutine(assert_value.run_async(AsyncDriverStub(get_element_value='another value')))
+
+        self.assertIsInstance(step_result.exception, ElementValueIncorrectError)
+
+    def test_run_async_invalid_mode(self):
+        type_text = TypeText(ANY_CSS_PATH, ANY_HINT, ANY_VALUE, mode='any mode')
+
+        step_result = run_coroutine(type_text.run_async(AsyncDriverStub()))
+
+        self.assertIsInstance(step_result.exception, ValueError)
@@ -1,15 +1,72 @@
+import asyncio
+import base64
+import hashlib
+import json
+import re
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from socketserver import ThreadingMixIn
+
+from pyselenium._html_dom import parse_document
+from pyselenium._remote_connection import PooledRemoteConnection
 from pyselenium._selenium_wrapper import Driver
+from pyselenium._selenium_wrapper import POLLING_WAIT_ENGINE
+from selenium import webdriver
+from selenium.webdriver.remote.command import Command
 from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.ui import WebDriverWait
 
+from pyselenium.driver_pool import DriverPool
+from pyselenium.driver_service import DriverService
+from pyselenium.launch_profiles import DEFAULT_LAUNCH_PROFILE
+from pyselenium.process_lifecycle import ProcessLifecycleManager
+from pyselenium.simulated_driver import SimulatedDriver
+from pyselenium.shared_browser import SharedBrowser
+from pyselenium.shared_browser import WindowDriverFactory
+from pyselenium.suite_runner import SuiteRunner
 from pyselenium.test_runner import TestRunner
 
+W3C_ELEMENT_KEY = 'element-6066-11e4-a52e-4f973124dcf9'
+
+# The commands of FakeWebDriverServer that the W3C protocol does not have
+JSON_WIRE_ONLY_COMMANDS = {('POST', '/window/current/maximize'), ('POST', '/keys'), ('POST', '/execute'),
+                           ('POST', '/element/active')}
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """An HTTP server that handles every request on a thread of its own, as http.server.ThreadingHTTPServer does from
+    Python 3.7 on"""
+
+    daemon_threads = True
+
+
+def run_coroutine(coroutine):
+    """Runs a coroutine on a new event loop and returns what it returns, as asyncio.run does from Python 3.7 on"""
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
 
 class DriverStub:
     """A stub of Selenium's Driver class to enable unit testing of the wrapper class"""
 
     def __init__(self):
         self._switch_to = SwitchToStub()
+        self.window_handles = ['any window handle']
+        self.current_url = 'about:blank'
+
+    def execute(self, driver_command, params=None):
+        pass
 
     def get(self, url):
         pass
@@ -17,9 +74,33 @@ class DriverStub:
     def close(self):
         pass
 
+    def quit(self):
+        pass
+
+    def execute_script(self, script, *args):
+        pass
+
+    def execute_async_script(self, script, *args):
+        pass
+
+    def set_script_timeout(self, time_to_wait):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def get_cookies(self):
+        return []
+
+    def add_cookie(self, cookie_dict):
+        pass
+
     def maximize_window(self):
         pass
 
+    def set_window_size(self, width, height):
+        pass
+
     @property
     def switch_to(self):
         return self._switch_to
@@ -38,6 +119,9 @@ class SwitchToStub:
     def frame(self, frame):
         pass
 
+    def window(self, window_name):
+        pass
+
     def default_content(self):
         pass
 
@@ -74,7 +158,7 @@ class ActionChainsStub:
     """A stub that allows unit testing of action chaining in the web driver"""
 
     def send_keys(self, keys):
-        pass
+        return self
 
     def perform(self):
         pass
@@ -83,8 +167,9 @@ class ActionChainsStub:
 class DriverTestable(Driver):
     """A testable version of the Driver class which doesn't actually interact with Selenium"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, element_cache=False, wait_engine=POLLING_WAIT_ENGINE, settle_time=None,
+                 launch_profile=DEFAULT_LAUNCH_PROFILE, service=None):
+        super().__init__(element_cache, wait_engine, settle_time, launch_profile, service)
         self.driver = DriverStub()
         self.web_driver_wait_testable = WebDriverWaitTestable()
         self.presence_of_element_located = expected_conditions.presence_of_element_located(None)
@@ -115,6 +200,18 @@ class DriverTestable(Driver):
         self.action_chains = action_chains
 
 
+class RemoteDriverTestable(Driver):
+    """A testable version of the Driver class which connects to a running WebDriver server, such as a
+    FakeWebDriverServer, instead of starting chromedriver"""
+
+    def __init__(self, url, launch_profile='headless-fast', record_to=None):
+        super().__init__(launch_profile=launch_profile, record_to=record_to)
+        self.url = url
+
+    def _get_web_driver(self):
+        return webdriver.Remote(command_executor=PooledRemoteConnection(self.url), desired_capabilities={})
+
+
 class WebDriverWaitTestable(WebDriverWait):
     """"A testable version of the WebDriverWait class which doesn't actually interact with Selenium"""
 
@@ -149,3 +246,469 @@ class TestRunnerTestable(TestRunner):
 
     def inject_driver_testable(self, driver_testable):
         self.driver_testable = driver_testable
+
+
+class DriverPoolTestable(DriverPool):
+    """"A testable version of the DriverPool class which hands out testable drivers"""
+
+    def __init__(self, size=1, lifecycle_manager=None):
+        super().__init__(size, lifecycle_manager=lifecycle_manager)
+        self.started_drivers = []
+
+    def _get_web_driver(self):
+        driver_testable = DriverTestable()
+        self.started_drivers.append(driver_testable)
+
+        return driver_testable
+
+
+class SuiteRunnerTestable(SuiteRunner):
+    """"A testable version of the SuiteRunner class which runs its tests on testable drivers"""
+
+    def __init__(self, tests, workers=1):
+        super().__init__(tests, workers)
+        self.driver_pool_testable = DriverPoolTestable(workers)
+
+    def _get_driver_pool(self):
+        return self.driver_pool_testable
+
+
+class ServiceStub:
+    """A stub of Selenium's chromedriver Service class"""
+
+    def __init__(self):
+        self.service_url = 'http://localhost:9515'
+        self.start_count = 0
+        self.stop_count = 0
+
+    def start(self):
+        self.start_count += 1
+
+    def stop(self):
+        self.stop_count += 1
+
+
+class DriverServiceTestable(DriverService):
+    """"A testable version of the DriverService class which doesn't actually start chromedriver"""
+
+    def __init__(self):
+        super().__init__()
+        self.service_stub = ServiceStub()
+
+    def _get_service(self):
+        return self.service_stub
+
+
+class ProcessLifecycleManagerTestable(ProcessLifecycleManager):
+    """A testable version of the ProcessLifecycleManager class which doesn't reap its processes at exit"""
+
+    def _register_at_exit(self):
+        pass
+
+
+class ProcessDriverStub:
+    """A stub of a driver whose chromedriver process has a given id"""
+
+    def __init__(self, process_id):
+        self.process_id = process_id
+
+    def get_process_id(self):
+        return self.process_id
+
+
+class BrowserStub(DriverStub):
+    """A stub of the web driver of a browser shared by window drivers, which logs the commands sent by every window"""
+
+    def __init__(self):
+        super().__init__()
+        self.window_handles = ['host window']
+        self.current_window_handle = 'host window'
+        self.commands = []
+        self.quit_count = 0
+
+    def execute_script(self, script, *args):
+        self.window_handles = self.window_handles + ['window %d' % len(self.window_handles)]
+
+    def quit(self):
+        self.quit_count += 1
+
+
+class WindowWebDriverStub:
+    """A stub of the web driver of a window, which sends its commands to a browser stub"""
+
+    def __init__(self, browser_stub):
+        self.browser_stub = browser_stub
+
+    def execute(self, driver_command, params=None):
+        self.browser_stub.commands.append((driver_command, params))
+
+    def get(self, url):
+        self.execute(Command.GET, {'url': url})
+
+    def close(self):
+        self.execute(Command.CLOSE)
+
+    def maximize_window(self):
+        self.execute(Command.MAXIMIZE_WINDOW)
+
+
+class SharedBrowserTestable(SharedBrowser):
+    """"A testable version of the SharedBrowser class whose windows are stubs"""
+
+    def __init__(self):
+        self.browser_stub = BrowserStub()
+        super().__init__(self._get_host_driver)
+
+    def _get_host_driver(self):
+        host_driver = DriverTestable()
+        host_driver.driver = self.browser_stub
+
+        return host_driver
+
+    def _get_window_web_driver(self, host_web_driver):
+        return WindowWebDriverStub(self.browser_stub)
+
+
+class WindowDriverFactoryTestable(WindowDriverFactory):
+    """"A testable version of the WindowDriverFactory class whose browsers are testable"""
+
+    def _get_shared_browser(self):
+        return SharedBrowserTestable()
+
+
+class FakeElement:
+    """An element of the page served by a fake WebDriver server"""
+
+    def __init__(self, text='', attributes=None, tag_name='div', displayed=True, enabled=True, selected=False,
+                 options=None, appears_after=0):
+        self.text = text
+        self.attributes = attributes or {}
+        self.tag_name = tag_name
+        self.displayed = displayed
+        self.enabled = enabled
+        self.selected = selected
+        self.options = options or []
+        self.appears_after = appears_after
+        self.click_count = 0
+        self.typed_keys = []
+        self.selected_option = None
+
+
+class FakeWebDriverServer:
+    """A local HTTP server that answers the WebDriver commands of a single browser session on a fake page, for the
+    drivers that speak the protocol themselves to be tested without a browser.
+
+    Attributes:
+        w3c -- If True, the server speaks the W3C protocol and fails the commands only the JSON Wire Protocol has
+        drop_connections -- If True, connections are closed after every response without telling the client, as
+        chromedriver does with connections that are idle for too long
+        active_element -- The CSS path of the element that has the focus. Set when an element is clicked
+        hang_up_on -- The (method, path) of a command that the server reads and then drops the connection of without
+        answering, once
+    """
+
+    def __init__(self, w3c=False):
+        self.w3c = w3c
+        self.elements = {}
+        self.commands = []
+        self.connection_count = 0
+        self.drop_connections = False
+        self.active_element = None
+        self.hang_up_on = None
+        self.loaded_at = time.monotonic()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._get_handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                        daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self._server.server_address[1]
+
+    def handle(self, method, path, body):
+        self.commands.append((method, path))
+
+        if method == 'POST' and path == '/session':
+            if self.w3c:
+                return {'value': {'sessionId': 'fake-session', 'capabilities': {}}}
+
+            return {'sessionId': 'fake-session', 'status': 0, 'value': {}}
+
+        path = path[len('/session/fake-session'):]
+
+        if self.w3c and (method, path) in JSON_WIRE_ONLY_COMMANDS:
+            return {'value': {'error': 'unknown command', 'message': 'unknown command'}}
+
+        if method == 'POST' and path == '/url':
+            self.loaded_at = time.monotonic()
+            return self._success(None)
+
+        if method == 'POST' and path == '/element':
+            element = self.elements.get(body['value'])
+
+            if element is None or time.monotonic() - self.loaded_at < element.appears_after:
+                return self._error('no such element', 7)
+
+            return self._success(self._get_element_reference(self._get_element_id(body['value'])))
+
+        if path == '/element/active' and method == ('GET' if self.w3c else 'POST'):
+            if self.active_element is None:
+                return self._error('no such element', 7)
+
+            return self._success(self._get_element_reference(self._get_element_id(self.active_element)))
+
+        if method == 'POST' and path == ('/execute/sync' if self.w3c else '/execute'):
+            # Scripts that take an element tell whether it is displayed, the only ones that do not set its text
+            element_id = next(iter(body['args'][0].values()))
+            element = list(self.elements.values())[int(element_id.split('-')[1])]
+
+            return self._success(element.displayed if len(body['args']) == 1 else None)
+
+        match = re.match(r'^/element/([\w-]+)/(\w+)(?:/(\w+))?$', path)
+
+        if match is None:
+            return self._success(None)
+
+        element_ids = match.group(1).split('-')
+        element = list(self.elements.values())[int(element_ids[1])]
+        command = match.group(2)
+
+        if self.w3c and command == 'displayed':
+            return self._error('unknown command', 9)
+
+        if len(element_ids) > 2:
+            # An option of a select element
+            option = element.options[int(element_ids[2])]
+
+            if command == 'click':
+                element.selected_option = option
+
+            return self._success(False if command == 'selected' else None)
+
+        if command == 'click':
+            element.click_count += 1
+            element.selected = not element.selected
+            self.active_element = list(self.elements)[int(element_ids[1])]
+        elif command == 'value':
+            element.typed_keys.append(body['text'] if self.w3c else ''.join(body['value']))
+        elif command == 'elements':
+            return self._success([self._get_element_reference('%s-%d' % (match.group(1), index))
+                                  for index, option in enumerate(element.options) if '"%s"' % option in body['value']])
+
+        return self._success({'text': element.text,
+                              'attribute': element.attributes.get(match.group(3)),
+                              'displayed': element.displayed,
+                              'enabled': element.enabled,
+                              'selected': element.selected,
+                              'name': element.tag_name}.get(command))
+
+    def _get_element_id(self, css_path):
+        return 'element-%d' % list(self.elements).index(css_path)
+
+    def _get_element_reference(self, element_id):
+        return {W3C_ELEMENT_KEY if self.w3c else 'ELEMENT': element_id}
+
+    def _success(self, value):
+        if self.w3c:
+            return {'value': value}
+
+        return {'sessionId': 'fake-session', 'status': 0, 'value': value}
+
+    def _error(self, error, status):
+        if self.w3c:
+            return {'value': {'error': error, 'message': error}}
+
+        return {'status': status, 'value': {'message': error}}
+
+    def _get_handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                server.connection_count += 1
+
+            def do_GET(self):
+                self._respond()
+
+            def do_POST(self):
+                self._respond()
+
+            def do_DELETE(self):
+                self._respond()
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length).decode('utf-8')) if length else None
+
+                if (self.command, self.path) == server.hang_up_on:
+                    server.hang_up_on = None
+                    server.commands.append((self.command, self.path))
+                    self.close_connection = True
+                    return
+
+                data = json.dumps(server.handle(self.command, self.path, body)).encode('utf-8')
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+                if server.drop_connections:
+                    self.close_connection = True
+
+        return Handler
+
+
+class FakeCdpServer:
+    """A local stand-in for the DevTools endpoint of Chrome, which lists a single page and answers the commands sent
+    over its websocket as scripted, for CdpDriver to be tested without a browser.
+
+    Attributes:
+        results -- The result of each DevTools method, or a callable that takes the parameters of the command and
+        returns the result. Exceptions are sent as errors. Scripts return undefined and other methods return an empty
+        result unless scripted otherwise.
+        events -- The names of the events sent right after the response to each DevTools method
+        commands -- The (method, params) of every command received
+    """
+
+    def __init__(self):
+        self.results = {'Runtime.evaluate': {'result': {'type': 'undefined'}},
+                        'Runtime.callFunctionOn': {'result': {'type': 'undefined'}}}
+        self.events = {'Page.navigate': ['Page.loadEventFired']}
+        self.commands = []
+        self._socket = socket.socket()
+        self._socket.bind(('127.0.0.1', 0))
+        self._socket.listen(5)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self._socket.close()
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self._socket.getsockname()[1]
+
+    def get_methods(self):
+        return [method for method, params in self.commands]
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+
+            threading.Thread(target=self._handle_connection, args=(connection,), daemon=True).start()
+
+    def _handle_connection(self, connection):
+        with connection:
+            request = b''
+
+            while b'\r\n\r\n' not in request:
+                request += connection.recv(4096)
+
+            lines = request.decode('latin-1').split('\r\n')
+            headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+
+            if 'Sec-WebSocket-Key' not in headers:
+                body = json.dumps([{'type': 'page', 'webSocketDebuggerUrl': self.url.replace('http', 'ws') +
+                                    '/devtools/page/1'}]).encode('utf-8')
+                connection.sendall(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n'
+                                   b'Connection: close\r\n\r\n%s' % (len(body), body))
+                return
+
+            accept = base64.b64encode(hashlib.sha1((headers['Sec-WebSocket-Key'] +
+                                                    '258EAFA5-E914-47DA-95CA-C5AB0DC85B11').encode('ascii')).digest())
+            connection.sendall(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                               b'Sec-WebSocket-Accept: %s\r\n\r\n' % accept)
+
+            reader = connection.makefile('rb')
+
+            while True:
+                header = reader.read(2)
+
+                if len(header) < 2 or header[0] & 0x0F == 0x8:
+                    return
+
+                length = header[1] & 0x7F
+
+                if length == 126:
+                    length = struct.unpack('!H', reader.read(2))[0]
+                elif length == 127:
+                    length = struct.unpack('!Q', reader.read(8))[0]
+
+                mask = reader.read(4)
+                payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(reader.read(length)))
+
+                self._handle_message(connection, json.loads(payload.decode('utf-8')))
+
+    def _handle_message(self, connection, message):
+        method = message['method']
+        params = message.get('params', {})
+
+        self.commands.append((method, params))
+
+        result = self.results.get(method, {})
+
+        if callable(result):
+            result = result(params)
+
+        if isinstance(result, Exception):
+            response = {'id': message['id'], 'error': {'code': -32000, 'message': str(result)}}
+        else:
+            response = {'id': message['id'], 'result': result}
+
+        self._send(connection, response)
+
+        for event in self.events.get(method, []):
+            self._send(connection, {'method': event, 'params': {}})
+
+    def _send(self, connection, message):
+        payload = json.dumps(message).encode('utf-8')
+
+        if len(payload) < 126:
+            header = bytes([0x81, len(payload)])
+        else:
+            header = bytes([0x81, 126]) + struct.pack('!H', len(payload))
+
+        connection.sendall(header + payload)
+
+
+class SimulatedDriverTestable(SimulatedDriver):
+    """A testable version of the SimulatedDriver class which loads its pages from a dict instead of from URLs
+
+    Attributes:
+        pages -- The HTML of the pages, by URL. The query of the URLs is left out when looking for their page
+        loaded_pages -- The (url, data) of every page loaded
+    """
+
+    def __init__(self, pages, launch_profile=DEFAULT_LAUNCH_PROFILE):
+        super().__init__(launch_profile)
+        self.pages = pages
+        self.loaded_pages = []
+
+    def _load_page(self, url, data=None):
+        self.loaded_pages.append((url, data))
+
+        return parse_document(self.pages.get(url, self.pages.get(url.split('?')[0], '')), url)